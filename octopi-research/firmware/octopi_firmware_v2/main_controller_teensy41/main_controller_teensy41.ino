@@ -1927,6 +1927,9 @@ void loop() {
     buffer_tx[18] &= ~ (1 << BIT_POS_JOYSTICK_BUTTON); // clear the joystick button bit
     buffer_tx[18] = buffer_tx[18] | joystick_button_pressed << BIT_POS_JOYSTICK_BUTTON;
 
+    // checksum, so that the software can tell where packets start
+    buffer_tx[MSG_LENGTH-1] = crc8ccitt(buffer_tx, MSG_LENGTH-1);
+
     if(!DEBUG_MODE)
       SerialUSB.write(buffer_tx,MSG_LENGTH);
     else
@@ -80,6 +80,8 @@ class MicrocontrollerDef:
     MSG_LENGTH = 24
     CMD_LENGTH = 8
     N_BYTES_POS = 4
+    MAX_COMMANDS_IN_FLIGHT = 16 # send_command waits when this many commands haven't completed
+    COMMANDS_IN_FLIGHT_TIMEOUT_S = 20 # send_command raises TimeoutError if none of them completes in this long (unacknowledged commands are resent after 5 s)
 
 class Microcontroller2Def:
     MSG_LENGTH = 4
@@ -372,6 +374,20 @@ class AF:
     STOP_THRESHOLD = 0.85
     CROP_WIDTH = 800
     CROP_HEIGHT = 800
+    SEARCH_METHOD = 'sweep' # 'sweep', 'coarse_to_fine' or 'golden_section'
+    COARSE_STEP_FACTOR = 3 # coarse_to_fine: the coarse pass takes a frame every COARSE_STEP_FACTOR steps
+    FOCUS_MEASURE_DOWNSAMPLE = 2 # the focus measure is computed on the crop downsampled by this factor
+
+class FocusMap:
+    SURFACE_METHOD = 'thin_plate_spline' # 'plane', 'polynomial' or 'thin_plate_spline' - all fit 3 points with a plane
+    POLYNOMIAL_DEGREE = 2
+    SMOOTHING = 0 # thin-plate spline smoothing, 0 goes through every point
+    OUTLIER_THRESHOLD = 3.5 # points further than this many robust standard deviations from the surface are left out
+    OUTLIER_MIN_RESIDUAL_MM = 0.005
+    # add the autofocus results of a multipoint acquisition to the focus map as it runs, and move
+    # fovs that have a focus point within MIN_POINT_SPACING_MM to the focus map instead of autofocusing
+    UPDATE_DURING_ACQUISITION = False
+    MIN_POINT_SPACING_MM = 9
 
 class Tracking:
     SEARCH_AREA_RATIO = 10 #@@@ check
@@ -471,6 +487,9 @@ LASER_AF_AVERAGING_N = 5
 LASER_AF_DISPLAY_SPOT_IMAGE = True
 LASER_AF_CROP_WIDTH = 1536
 LASER_AF_CROP_HEIGHT = 256
+LASER_AF_STREAMING = False # in multipoint acquisitions, keep the laser on and correct z until within LASER_AF_STREAMING_TOLERANCE_UM
+LASER_AF_STREAMING_TOLERANCE_UM = 0.5
+LASER_AF_STREAMING_MAX_ITERATIONS = 3
 HAS_TWO_INTERFACES = True
 USE_GLASS_TOP = True
 SHOW_LEGACY_DISPLACEMENT_MEASUREMENT_WINDOWS = False
@@ -550,6 +569,10 @@ SCIMICROSCOPY_LED_ARRAY_TURN_ON_DELAY = 0.03 # time to wait before trigger the c
 # Tiled preview
 SHOW_TILED_PREVIEW = True
 PRVIEW_DOWNSAMPLE_FACTOR = 5
+# with the napari tiled display, place the fovs by the stage coordinates they were taken at, in a pyramid of memory-mapped levels
+USE_MOSAIC_FOR_TILED_DISPLAY = True
+MOSAIC_MIN_LEVEL_SIZE = 512 # the smallest level is at most this many pixels wide and high
+MOSAIC_SAVE_WITH_ACQUISITION = False # keep the levels in the acquisition folder, instead of a temporary folder
 
 # Stitcher
 ENABLE_STITCHER = False
@@ -572,6 +595,22 @@ USE_ZABER_EMISSION_FILTER_WHEEL = False
 # need redefine it with real USB device serial number
 FILTER_CONTROLLER_SERIAL_NUMBER = 'A10NG007' 
 
+# Multipoint image saving
+MULTIPOINT_SAVING_NUM_PROCESSES = 4 # 0: write images in the acquisition thread
+MULTIPOINT_SAVING_MAX_PENDING_TILES = 16 # images waiting to be written before the acquisition waits
+
+# FOV processing (ProcessingHandler)
+PROCESSING_NUM_PROCESSES = 4 # processes for submit_fov_task, 0: run fov tasks in the processing thread
+PROCESSING_MAX_PENDING_TASKS = 8 # fov tasks in flight before submit_fov_task waits
+PROCESSING_QUEUE_SIZE = 64 # tasks in the processing and upload queues before putting more waits, 0: unbounded
+
+# Image saver
+# 'files' (one image file per frame), 'ome_zarr' or 'tiff_stack' (BigTIFF, needs tifffile)
+IMAGE_SAVER_OUTPUT_FORMAT = 'files'
+IMAGE_SAVER_NUM_WRITER_THREADS = 4 # tiff stacks are always written by one thread
+IMAGE_SAVER_BUFFER_SIZE = 32 # number of preallocated frames
+IMAGE_SAVER_MAX_WAIT_S = None # None: block the camera until a frame can be buffered instead of discarding it
+
 ##########################################################
 #### start of loading machine specific configurations ####
 ##########################################################
@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+import control.utils as utils
+
+
+SEARCH_METHODS = ('sweep','coarse_to_fine','golden_section')
+GOLDEN_RATIO = (1 + 5**0.5)/2
+
+
+def calculate_focus_measure(image,method='LAPE',downsample=1):
+    """
+    :brief: focus measure of an image downsampled by an integer factor. a 2x
+        downsampled roi keeps the focus curve peaked at the same z while the
+        laplacian runs on a quarter of the pixels.
+    """
+    if downsample > 1:
+        image = cv2.resize(image,(image.shape[1]//downsample,image.shape[0]//downsample),interpolation=cv2.INTER_AREA)
+    return utils.calculate_focus_measure(image,method)
+
+
+class FocusSearch(object):
+    """
+    :brief: finds the z position with the highest focus measure.
+        the microscope is accessed through two callables, so that the same search
+        runs on hardware and against a simulated z stack:
+            move_z_usteps(usteps) - relative move, returns once the move is completed
+            acquire() - triggers the camera and returns the frame (None if there is no frame)
+        positions are in usteps relative to where the search started. moves that
+        end below the current position go backlash_usteps further down first, so
+        that every frame is taken approaching from below (set backlash_usteps to
+        0 with closed-loop z). focus measures are computed in a worker thread, so
+        in a sweep the measure of one frame overlaps the move to the next z and
+        the next exposure.
+    """
+    def __init__(self,move_z_usteps,acquire,focus_measure_operator='LAPE',downsample=1,backlash_usteps=0,stop_threshold=None):
+        self.move_z_usteps = move_z_usteps
+        self.acquire = acquire
+        self.focus_measure_operator = focus_measure_operator
+        self.downsample = downsample
+        self.backlash_usteps = backlash_usteps
+        self.stop_threshold = stop_threshold
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.z_usteps = 0
+        self.focus_measures = {} # z in usteps: focus measure
+        self.frames = 0
+        self.time_to_focus_s = None
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def move_to(self,z_usteps):
+        if z_usteps < self.z_usteps and self.backlash_usteps > 0:
+            self.move_z_usteps(z_usteps-self.z_usteps-self.backlash_usteps)
+            self.move_z_usteps(self.backlash_usteps)
+        elif z_usteps != self.z_usteps:
+            self.move_z_usteps(z_usteps-self.z_usteps)
+        self.z_usteps = z_usteps
+
+    def _acquire_at(self,z_usteps):
+        # returns a future for the focus measure, or None if no frame was returned
+        self.move_to(z_usteps)
+        image = self.acquire()
+        self.frames = self.frames + 1
+        if image is None:
+            return None
+        return self.executor.submit(calculate_focus_measure,image,self.focus_measure_operator,self.downsample)
+
+    def measure_at(self,z_usteps):
+        if z_usteps not in self.focus_measures:
+            future = self._acquire_at(z_usteps)
+            self.focus_measures[z_usteps] = future.result() if future is not None else 0
+        return self.focus_measures[z_usteps]
+
+    def sweep(self,positions,stop_threshold=None):
+        """
+        :brief: acquires at each position in turn. the focus measure of a frame is
+            collected after the next frame has been acquired, so with a stop
+            threshold the sweep ends one frame after the measure drops below
+            stop_threshold*max.
+        """
+        pending = None
+        for z_usteps in positions:
+            if z_usteps in self.focus_measures:
+                continue
+            future = self._acquire_at(z_usteps)
+            stop = pending is not None and self._collect(*pending,stop_threshold)
+            pending = (z_usteps,future)
+            if stop:
+                break
+        if pending is not None:
+            self._collect(*pending,stop_threshold)
+
+    def _collect(self,z_usteps,future,stop_threshold):
+        # stores the focus measure, returns whether it is below the stop threshold
+        focus_measure = future.result() if future is not None else 0
+        focus_measure_max = max(self.focus_measures.values(),default=0)
+        self.focus_measures[z_usteps] = focus_measure
+        print('z ' + str(z_usteps) + ' usteps: focus measure ' + str(focus_measure))
+        return stop_threshold is not None and focus_measure < focus_measure_max*stop_threshold
+
+    def golden_section(self,positions):
+        """
+        :brief: golden-section search over the positions, assuming the focus measure
+            is unimodal within them. each step depends on the previous measures, so
+            frames are not pipelined, but about log(N)/log(1.618)+2 frames are taken
+            instead of N.
+        """
+        a = 0
+        b = len(positions) - 1
+        while b - a > 2:
+            c = b - int(round((b-a)/GOLDEN_RATIO))
+            d = a + int(round((b-a)/GOLDEN_RATIO))
+            if c == d:
+                d = c + 1
+            # measure the lower one first, to move up when possible
+            if self.measure_at(positions[c]) >= self.measure_at(positions[d]):
+                b = d
+            else:
+                a = c
+        for i in range(a,b+1):
+            self.measure_at(positions[i])
+
+    def run(self,method,N,deltaZ_usteps,coarse_step_factor=3):
+        """
+        :brief: searches N positions deltaZ_usteps apart, centered around the
+            current position, moves to the best one and returns its z in usteps
+            relative to the starting position.
+        """
+        if method not in SEARCH_METHODS:
+            print('unknown autofocus search method ' + str(method) + ', using sweep')
+            method = 'sweep'
+        t_start = time.time()
+        z_af_offset_usteps = deltaZ_usteps*round(N/2)
+        positions = [(i+1)*deltaZ_usteps-z_af_offset_usteps for i in range(N)]
+        try:
+            if method == 'sweep':
+                self.sweep(positions,self.stop_threshold)
+            elif method == 'coarse_to_fine':
+                coarse_step_factor = max(1,coarse_step_factor)
+                coarse = positions[::coarse_step_factor]
+                if coarse[-1] != positions[-1]:
+                    coarse.append(positions[-1])
+                self.sweep(coarse,self.stop_threshold)
+                i = positions.index(self.best_z_usteps())
+                self.sweep(positions[max(0,i-coarse_step_factor+1):i+coarse_step_factor])
+            else:
+                self.golden_section(positions)
+        finally:
+            self.close()
+        z_in_focus_usteps = self.best_z_usteps()
+        self.move_to(z_in_focus_usteps)
+        self.time_to_focus_s = time.time() - t_start
+        if z_in_focus_usteps == positions[0]:
+            print('moved to the bottom end of the AF range')
+        if z_in_focus_usteps == positions[-1]:
+            print('moved to the top end of the AF range')
+        print('autofocus (' + method + '): ' + str(self.frames) + ' frames, ' + '{:.3f}'.format(self.time_to_focus_s) + ' s')
+        return z_in_focus_usteps
+
+    def best_z_usteps(self):
+        if len(self.focus_measures) == 0:
+            return 0
+        return max(self.focus_measures,key=self.focus_measures.get)
@@ -10,6 +10,11 @@ from qtpy.QtWidgets import *
 from qtpy.QtGui import *
 
 from control.processing_handler import ProcessingHandler
+import control.image_saver as image_saver
+import control.autofocus as autofocus
+import control.focus_map as focus_map
+import control.laser_spot as laser_spot
+import control.mosaic as mosaic
 
 import control.utils as utils
 from control._def import *
@@ -80,6 +85,8 @@ class StreamHandler(QObject):
         self.counter = 0
         self.fps_real = 0
 
+        self.frame_buffers = utils.FrameBuffers()
+
     def start_recording(self):
         self.save_image_flag = True
 
@@ -128,15 +135,9 @@ class StreamHandler(QObject):
             # # rotate and flip - eventually these should be done in the camera
             # camera.current_frame = utils.rotate_and_flip_image(camera.current_frame,rotate_image_angle=camera.rotate_image_angle,flip_image=camera.flip_image)
 
-            # crop image
-            image_cropped = utils.crop_image(camera.current_frame,self.crop_width,self.crop_height)
-            image_cropped = np.squeeze(image_cropped)
-            
-            # # rotate and flip - moved up (1/10/2022)
-            # image_cropped = utils.rotate_and_flip_image(image_cropped,rotate_image_angle=ROTATE_IMAGE_ANGLE,flip_image=FLIP_IMAGE)
-            # added on 1/30/2022
+            # crop, rotate and flip image, with a single copy into a reused (read-only) buffer
             # @@@ to move to camera 
-            image_cropped = utils.rotate_and_flip_image(image_cropped,rotate_image_angle=camera.rotate_image_angle,flip_image=camera.flip_image)
+            image_cropped = self.frame_buffers.transform(camera.current_frame,self.crop_width,self.crop_height,camera.rotate_image_angle,camera.flip_image,squeeze=True)
 
             # send image to display
             time_now = time.time()
@@ -194,58 +195,52 @@ class ImageSaver(QObject):
 
     stop_recording = Signal()
 
-    def __init__(self,image_format=Acquisition.IMAGE_FORMAT):
+    def __init__(self,image_format=Acquisition.IMAGE_FORMAT,output_format=IMAGE_SAVER_OUTPUT_FORMAT,num_writer_threads=IMAGE_SAVER_NUM_WRITER_THREADS,buffer_size=IMAGE_SAVER_BUFFER_SIZE,max_wait_s=IMAGE_SAVER_MAX_WAIT_S):
         QObject.__init__(self)
         self.base_path = './'
         self.experiment_ID = ''
         self.image_format = image_format
         self.max_num_image_per_folder = 1000
-        self.queue = Queue(10) # max 10 items in the queue
-        self.image_lock = Lock()
-        self.stop_signal_received = False
-        self.thread = Thread(target=self.process_queue)
-        self.thread.start()
-        self.counter = 0
+        writer = image_saver.create_writer(output_format,image_format=image_format)
+        self.saver = image_saver.FrameSaver(writer,num_writer_threads=num_writer_threads,buffer_size=buffer_size,max_wait_s=max_wait_s)
+        self.saver_started = False
+        self.saver_lock = Lock()
         self.recording_start_time = 0
         self.recording_time_limit = -1
 
-    def process_queue(self):
-        while True:
-            # stop the thread if stop signal is received
-            if self.stop_signal_received:
-                return
-            # process the queue
-            try:
-                [image,frame_ID,timestamp] = self.queue.get(timeout=0.1)
-                self.image_lock.acquire(True)
-                folder_ID = int(self.counter/self.max_num_image_per_folder)
-                file_ID = int(self.counter%self.max_num_image_per_folder)
-                # create a new folder
-                if file_ID == 0:
-                    os.mkdir(os.path.join(self.base_path,self.experiment_ID,str(folder_ID)))
+    def _start_saver(self):
+        # called with saver_lock held
+        path = os.path.join(self.base_path,self.experiment_ID)
+        os.makedirs(path,exist_ok=True)
+        self.saver.start(path)
+        self.saver_started = True
 
-                if image.dtype == np.uint16:
-                    # need to use tiff when saving 16 bit images
-                    saving_path = os.path.join(self.base_path,self.experiment_ID,str(folder_ID),str(file_ID) + '_' + str(frame_ID) + '.tiff')
-                    iio.imwrite(saving_path,image)
-                else:
-                    saving_path = os.path.join(self.base_path,self.experiment_ID,str(folder_ID),str(file_ID) + '_' + str(frame_ID) + '.' + self.image_format)
-                    cv2.imwrite(saving_path,image)
+    def _stop_saver(self):
+        # called with saver_lock held
+        if self.saver_started:
+            self.saver.stop()
+            self.saver_started = False
+            self.print_stats()
 
-                self.counter = self.counter + 1
-                self.queue.task_done()
-                self.image_lock.release()
-            except:
-                pass
-                            
     def enqueue(self,image,frame_ID,timestamp):
-        try:
-            self.queue.put_nowait([image,frame_ID,timestamp])
-            if ( self.recording_time_limit>0 ) and ( time.time()-self.recording_start_time >= self.recording_time_limit ):
-                self.stop_recording.emit()
-            # when using self.queue.put(str_), program can be slowed down despite multithreading because of the block and the GIL
-        except:
-            print('imageSaver queue is full, image discarded')
+        with self.saver_lock:
+            if not self.saver_started:
+                self._start_saver()
+        # blocks while the buffer is full rather than discarding the frame. streamHandler.packet_image_to_write
+        # is connected with Qt.DirectConnection, so this runs in the camera thread and holds up the camera, not the GUI
+        if not self.saver.enqueue(image,frame_ID,timestamp):
+            print('imageSaver buffer is full, image discarded')
+        if ( self.recording_time_limit>0 ) and ( time.time()-self.recording_start_time >= self.recording_time_limit ):
+            self.stop_recording.emit()
+
+    def get_stats(self):
+        return self.saver.stats.as_dict()
+
+    def print_stats(self):
+        stats = self.get_stats()
+        print('imageSaver: saved ' + str(stats['frames_saved']) + '/' + str(stats['frames_received']) + ' frames (' + str(stats['frames_dropped']) + ' discarded, ' + str(stats['frames_failed']) + ' failed), ' +
+            'blocked ' + str(stats['blocked_count']) + ' times for ' + '{:.3f}'.format(stats['blocked_time_s']) + ' s, ' +
+            'up to ' + str(stats['max_frames_pending']) + ' frames pending')
 
     def set_base_path(self,path):
         self.base_path = path
@@ -260,19 +255,15 @@ class ImageSaver(QObject):
         else:
             self.experiment_ID = experiment_ID
         self.recording_start_time = time.time()
-        # create a new folder
-        try:
-            os.mkdir(os.path.join(self.base_path,self.experiment_ID))
+        # finish the previous experiment, then create a new folder and reset the counter
+        with self.saver_lock:
+            self._stop_saver()
+            self._start_saver()
             # to do: save configuration
-        except:
-            pass
-        # reset the counter
-        self.counter = 0
 
     def close(self):
-        self.queue.join()
-        self.stop_signal_received = True
-        self.thread.join()
+        with self.saver_lock:
+            self._stop_saver()
 
 
 class ImageSaver_Tracking(QObject):
@@ -611,25 +602,27 @@ class LiveController(QObject):
         self.currentConfiguration = configuration
         print("setting microscope mode to " + self.currentConfiguration.name)
         
-        # temporarily stop live while changing mode
-        if self.is_live is True:
-            self.timer_trigger.stop()
+        # send the illumination commands to the mcu together
+        with self.microcontroller.batch():
+            # temporarily stop live while changing mode
+            if self.is_live is True:
+                self.timer_trigger.stop()
+                if self.control_illumination:
+                    self.turn_off_illumination()
+
+            # set camera exposure time and analog gain
+            self.camera.set_exposure_time(self.currentConfiguration.exposure_time)
+            self.camera.set_analog_gain(self.currentConfiguration.analog_gain)
+
+            # set illumination
             if self.control_illumination:
-                self.turn_off_illumination()
+                self.set_illumination(self.currentConfiguration.illumination_source,self.currentConfiguration.illumination_intensity)
 
-        # set camera exposure time and analog gain
-        self.camera.set_exposure_time(self.currentConfiguration.exposure_time)
-        self.camera.set_analog_gain(self.currentConfiguration.analog_gain)
-
-        # set illumination
-        if self.control_illumination:
-            self.set_illumination(self.currentConfiguration.illumination_source,self.currentConfiguration.illumination_intensity)
-
-        # restart live 
-        if self.is_live is True:
-            if self.control_illumination:
-                self.turn_on_illumination()
-            self.timer_trigger.start()
+            # restart live 
+            if self.is_live is True:
+                if self.control_illumination:
+                    self.turn_on_illumination()
+                self.timer_trigger.start()
 
     def get_trigger_mode(self):
         return self.trigger_mode
@@ -725,44 +718,58 @@ class NavigationController(QObject):
         offset_y_centered = int(tile_height / 2 - offset_y)
         self.move_from_click(offset_x_centered, offset_y_centered, tile_width, tile_height)
 
-    def move_from_click(self, click_x, click_y, image_width, image_height):
-        if self.click_to_move:
-            try:
-                highest_res = (0,0)
-                for res in self.parent.camera.res_list:
-                    if res[0] > highest_res[0] or res[1] > higest_res[1]:
-                        highest_res = res
-                resolution = self.parent.camera.resolution
+    def scan_preview_move_to(self, x_mm, y_mm):
+        """
+        napariTiledDisplay with a mosaic gives the stage coordinates of the click
+        """
+        if not self.click_to_move:
+            print("allow click to move")
+            return
+        self.move_to(x_mm, y_mm)
 
-                try:
-                    pixel_binning_x = highest_res[0]/resolution[0]
-                    pixel_binning_y = highest_res[1]/resolution[1]
-                    if pixel_binning_x < 1:
-                        pixel_binning_x = 1
-                    if pixel_binning_y < 1:
-                        pixel_binning_y = 1
-                except:
-                    pixel_binning_x=1
-                    pixel_binning_y=1
-            except AttributeError:
-                pixel_binning_x = 1
-                pixel_binning_y = 1
+    def get_pixel_size_um(self):
+        # size in the sample plane of a pixel of the camera frames, along x and y (unit: um)
+        try:
+            highest_res = (0,0)
+            for res in self.parent.camera.res_list:
+                if res[0] > highest_res[0] or res[1] > highest_res[1]:
+                    highest_res = res
+            resolution = self.parent.camera.resolution
 
             try:
-                current_objective = self.parent.objectiveStore.current_objective
-                objective_info = self.parent.objectiveStore.objectives_dict.get(current_objective, {})
-            except (AttributeError, KeyError):
-                objective_info = OBJECTIVES[DEFAULT_OBJECTIVE]
+                pixel_binning_x = highest_res[0]/resolution[0]
+                pixel_binning_y = highest_res[1]/resolution[1]
+                if pixel_binning_x < 1:
+                    pixel_binning_x = 1
+                if pixel_binning_y < 1:
+                    pixel_binning_y = 1
+            except:
+                pixel_binning_x=1
+                pixel_binning_y=1
+        except AttributeError:
+            pixel_binning_x = 1
+            pixel_binning_y = 1
+
+        try:
+            current_objective = self.parent.objectiveStore.current_objective
+            objective_info = self.parent.objectiveStore.objectives_dict.get(current_objective, {})
+        except (AttributeError, KeyError):
+            objective_info = OBJECTIVES[DEFAULT_OBJECTIVE]
 
-            magnification = objective_info["magnification"]
-            objective_tube_lens_mm = objective_info["tube_lens_f_mm"]
-            tube_lens_mm = TUBE_LENS_MM
-            pixel_size_um = CAMERA_PIXEL_SIZE_UM[CAMERA_SENSOR]
+        magnification = objective_info["magnification"]
+        objective_tube_lens_mm = objective_info["tube_lens_f_mm"]
+        tube_lens_mm = TUBE_LENS_MM
+        pixel_size_um = CAMERA_PIXEL_SIZE_UM[CAMERA_SENSOR]
 
-            pixel_size_xy = pixel_size_um/(magnification/(objective_tube_lens_mm/tube_lens_mm))
+        pixel_size_xy = pixel_size_um/(magnification/(objective_tube_lens_mm/tube_lens_mm))
 
-            pixel_size_x = pixel_size_xy*pixel_binning_x
-            pixel_size_y = pixel_size_xy*pixel_binning_y
+        pixel_size_x = pixel_size_xy*pixel_binning_x
+        pixel_size_y = pixel_size_xy*pixel_binning_y
+        return pixel_size_x, pixel_size_y
+
+    def move_from_click(self, click_x, click_y, image_width, image_height):
+        if self.click_to_move:
+            pixel_size_x, pixel_size_y = self.get_pixel_size_um()
 
             pixel_sign_x = 1
             pixel_sign_y = 1 if INVERTED_OBJECTIVE else -1
@@ -1241,105 +1248,57 @@ class AutofocusWorker(QObject):
         
         self.crop_width = self.autofocusController.crop_width
         self.crop_height = self.autofocusController.crop_height
+        self.frame_buffers = utils.FrameBuffers()
 
     def run(self):
         self.run_autofocus()
         self.finished.emit()
 
     def wait_till_operation_is_completed(self):
-        while self.microcontroller.is_busy():
-            time.sleep(SLEEP_TIME_S)
+        self.microcontroller.wait_for_commands()
 
     def run_autofocus(self):
         # @@@ to add: increase gain, decrease exposure time
         # @@@ can move the execution into a thread - done 08/21/2021
-        focus_measure_vs_z = [0]*self.N
-        focus_measure_max = 0
-
-        z_af_offset_usteps = self.deltaZ_usteps*round(self.N/2)
-        # self.navigationController.move_z_usteps(-z_af_offset_usteps) # combine with the back and forth maneuver below
-        # self.wait_till_operation_is_completed()
-
         # maneuver for achiving uniform step size and repeatability when using open-loop control
         # can be moved to the firmware
         if self.navigationController.get_pid_control_flag(2) is False:
             _usteps_to_clear_backlash = max(160,20*self.navigationController.z_microstepping)
-            self.navigationController.move_z_usteps(-_usteps_to_clear_backlash-z_af_offset_usteps)
-            self.wait_till_operation_is_completed()
-            self.navigationController.move_z_usteps(_usteps_to_clear_backlash)
-            self.wait_till_operation_is_completed()
         else:
-            self.navigationController.move_z_usteps(-z_af_offset_usteps)
-            self.wait_till_operation_is_completed()
-
-        steps_moved = 0
-        for i in range(self.N):
-            self.navigationController.move_z_usteps(self.deltaZ_usteps)
-            self.wait_till_operation_is_completed()
-            steps_moved = steps_moved + 1
-            # trigger acquisition (including turning on the illumination) and read frame
-            if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
-                self.liveController.turn_on_illumination()
-                self.wait_till_operation_is_completed()
-                self.camera.send_trigger()
-                image = self.camera.read_frame()
-            elif self.liveController.trigger_mode == TriggerMode.HARDWARE:
-                if 'Fluorescence' in config.name and ENABLE_NL5 and NL5_USE_DOUT:
-                    self.camera.image_is_ready = False # to remove
-                    self.microscope.nl5.start_acquisition()
-                    image = self.camera.read_frame(reset_image_ready_flag=False)
-                else:
-                    self.microcontroller.send_hardware_trigger(control_illumination=True,illumination_on_time_us=self.camera.exposure_time*1000)
-                    image = self.camera.read_frame()
-            if image is None:
-                continue
-            # tunr of the illumination if using software trigger
-            if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
-                self.liveController.turn_off_illumination()
-            image = utils.crop_image(image,self.crop_width,self.crop_height)
-            image = utils.rotate_and_flip_image(image,rotate_image_angle=self.camera.rotate_image_angle,flip_image=self.camera.flip_image)
-            self.image_to_display.emit(image)
-            QApplication.processEvents()
-            timestamp_0 = time.time()
-            focus_measure = utils.calculate_focus_measure(image,FOCUS_MEASURE_OPERATOR)
-            timestamp_1 = time.time()
-            print('             calculating focus measure took ' + str(timestamp_1-timestamp_0) + ' second')
-            focus_measure_vs_z[i] = focus_measure
-            print(i,focus_measure)
-            focus_measure_max = max(focus_measure, focus_measure_max)
-            if focus_measure < focus_measure_max*AF.STOP_THRESHOLD:
-                break
-
+            _usteps_to_clear_backlash = 0
+        focus_search = autofocus.FocusSearch(self.move_z_usteps,self.acquire_frame,FOCUS_MEASURE_OPERATOR,AF.FOCUS_MEASURE_DOWNSAMPLE,_usteps_to_clear_backlash,AF.STOP_THRESHOLD)
+        focus_search.run(AF.SEARCH_METHOD,self.N,self.deltaZ_usteps,AF.COARSE_STEP_FACTOR)
         QApplication.processEvents()
 
-        # move to the starting location
-        # self.navigationController.move_z_usteps(-steps_moved*self.deltaZ_usteps) # combine with the back and forth maneuver below
-        # self.wait_till_operation_is_completed()
+    def move_z_usteps(self,usteps):
+        self.navigationController.move_z_usteps(usteps)
+        self.wait_till_operation_is_completed()
 
-        # maneuver for achiving uniform step size and repeatability when using open-loop control
-        if self.navigationController.get_pid_control_flag(2) is False:
-            _usteps_to_clear_backlash = max(160,20*self.navigationController.z_microstepping)
-            self.navigationController.move_z_usteps(-_usteps_to_clear_backlash-steps_moved*self.deltaZ_usteps)
-            # determine the in-focus position
-            idx_in_focus = focus_measure_vs_z.index(max(focus_measure_vs_z))
-            self.wait_till_operation_is_completed()
-            self.navigationController.move_z_usteps(_usteps_to_clear_backlash+(idx_in_focus+1)*self.deltaZ_usteps)
-            self.wait_till_operation_is_completed()
-        else:
-            # determine the in-focus position
-            idx_in_focus = focus_measure_vs_z.index(max(focus_measure_vs_z))
-            self.navigationController.move_z_usteps((idx_in_focus+1)*self.deltaZ_usteps-steps_moved*self.deltaZ_usteps)
+    def acquire_frame(self):
+        # trigger acquisition (including turning on the illumination) and read frame
+        if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
+            self.liveController.turn_on_illumination()
             self.wait_till_operation_is_completed()
-
+            self.camera.send_trigger()
+            image = self.camera.read_frame()
+        elif self.liveController.trigger_mode == TriggerMode.HARDWARE:
+            if 'Fluorescence' in config.name and ENABLE_NL5 and NL5_USE_DOUT:
+                self.camera.image_is_ready = False # to remove
+                self.microscope.nl5.start_acquisition()
+                image = self.camera.read_frame(reset_image_ready_flag=False)
+            else:
+                self.microcontroller.send_hardware_trigger(control_illumination=True,illumination_on_time_us=self.camera.exposure_time*1000)
+                image = self.camera.read_frame()
+        if image is None:
+            return None
+        # tunr of the illumination if using software trigger
+        if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
+            self.liveController.turn_off_illumination()
+        # the focus measure is computed on the same crop that is displayed
+        image = self.frame_buffers.transform(image,self.crop_width,self.crop_height,self.camera.rotate_image_angle,self.camera.flip_image)
+        self.image_to_display.emit(image)
         QApplication.processEvents()
-
-        # move to the calculated in-focus position
-        # self.navigationController.move_z_usteps(idx_in_focus*self.deltaZ_usteps)
-        # self.wait_till_operation_is_completed() # combine with the movement above
-        if idx_in_focus == 0:
-            print('moved to the bottom end of the AF range')
-        if idx_in_focus == self.N-1:
-            print('moved to the top end of the AF range')
+        return image
 
 class AutoFocusController(QObject):
 
@@ -1360,6 +1319,7 @@ class AutoFocusController(QObject):
         self.autofocus_in_progress = False
         self.focus_map_coords = []
         self.use_focus_map = False
+        self.focus_surface = focus_map.FocusSurface(FocusMap.SURFACE_METHOD,FocusMap.POLYNOMIAL_DEGREE,FocusMap.SMOOTHING,FocusMap.OUTLIER_THRESHOLD,FocusMap.OUTLIER_MIN_RESIDUAL_MM)
 
     def set_N(self,N):
         self.N = N
@@ -1381,7 +1341,8 @@ class AutoFocusController(QObject):
             y = self.navigationController.y_pos_mm
             
             # z here is in mm because that's how the navigation controller stores it
-            target_z = utils.interpolate_plane(*self.focus_map_coords[:3], (x,y))
+            self.focus_surface.set_points(self.focus_map_coords)
+            target_z = self.focus_surface.interpolate(x,y)
             print(f"Interpolated target z as {target_z} mm from focus map, moving there.")
             self.navigationController.move_z_to(target_z)
             self.navigationController.microcontroller.wait_till_operation_is_completed()
@@ -1464,13 +1425,8 @@ class AutoFocusController(QObject):
             print("Not enough coordinates (less than 3) for focus map generation, disabling focus map.")
             self.use_focus_map = False
             return
-        x1,y1,_ = self.focus_map_coords[0]
-        x2,y2,_ = self.focus_map_coords[1]
-        x3,y3,_ = self.focus_map_coords[2]
-
-        detT = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
-        if detT == 0:
-            print("Your 3 x-y coordinates are linear, cannot use to interpolate, disabling focus map.")
+        if focus_map.points_are_collinear(self.focus_map_coords):
+            print("Your x-y coordinates are linear, cannot use to interpolate, disabling focus map.")
             self.use_focus_map = False
             return
 
@@ -1480,25 +1436,22 @@ class AutoFocusController(QObject):
 
     def clear_focus_map(self):
         self.focus_map_coords = []
+        self.focus_surface.clear()
         self.set_focus_map_use(False)
 
-    def gen_focus_map(self, coord1,coord2,coord3):
+    def gen_focus_map(self, *coords):
         """
-        Navigate to 3 coordinates and get your focus-map coordinates
+        Navigate to 3 or more coordinates and get your focus-map coordinates
         by autofocusing there and saving the z-values.
-        :param coord1-3: Tuples of (x,y) values, coordinates in mm.
+        :param coords: Tuples of (x,y) values, coordinates in mm.
         :raise: ValueError if coordinates are all on the same line
         """
-        x1,y1 = coord1
-        x2,y2 = coord2
-        x3,y3 = coord3
-        detT = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
-        if detT == 0:
-            raise ValueError("Your 3 x-y coordinates are linear")
+        if focus_map.points_are_collinear(coords):
+            raise ValueError("Your x-y coordinates are linear")
         
         self.focus_map_coords = []
 
-        for coord in [coord1,coord2,coord3]:
+        for coord in coords:
             print(f"Navigating to coordinates ({coord[0]},{coord[1]}) to sample for focus map")
             self.navigationController.move_to(coord[0],coord[1])
             self.navigationController.microcontroller.wait_till_operation_is_completed()
@@ -1515,8 +1468,6 @@ class AutoFocusController(QObject):
         print("Generated focus map.")
 
     def add_current_coords_to_focus_map(self):
-        if len(self.focus_map_coords) >= 3:
-            print("Replacing last coordinate on focus map.")
         self.navigationController.microcontroller.wait_till_operation_is_completed()
         print("Autofocusing")
         self.autofocus(True)
@@ -1525,20 +1476,34 @@ class AutoFocusController(QObject):
         x = self.navigationController.x_pos_mm
         y = self.navigationController.y_pos_mm
         z = self.navigationController.z_pos_mm
-        if len(self.focus_map_coords) >= 2:
-            x1,y1,_ = self.focus_map_coords[0]
-            x2,y2,_ = self.focus_map_coords[1]
-            x3 = x
-            y3 = y
-
-            detT = (y2-y3) * (x1-x3) + (x3-x2) * (y1-y3)
-            if detT == 0:
-                raise ValueError("Your 3 x-y coordinates are linear. Navigate to a different coordinate or clear and try again.")
-        if len(self.focus_map_coords) >= 3:
-            self.focus_map_coords.pop()
+        if len(self.focus_map_coords) >= 2 and focus_map.points_are_collinear(self.focus_map_coords + [(x,y,z)]):
+            raise ValueError("Your x-y coordinates are linear. Navigate to a different coordinate or clear and try again.")
         self.focus_map_coords.append((x,y,z))
         print(f"Added triple ({x},{y},{z}) to focus map")
 
+    def add_focus_map_point(self,x,y,z):
+        """
+        Add an (x,y,z) point measured elsewhere (e.g. by a multipoint acquisition
+        autofocusing) to the focus map, and use the focus map once there are 3
+        points not on a line.
+        """
+        self.focus_map_coords.append((x,y,z))
+        self.focus_surface.add_point(x,y,z)
+        if not self.use_focus_map and not focus_map.points_are_collinear(self.focus_map_coords):
+            self.set_focus_map_use(True)
+
+    def is_near_focus_map_point(self,x,y):
+        """
+        Whether the focus map has a point within FocusMap.MIN_POINT_SPACING_MM of (x,y), in mm.
+        """
+        # focus_map_coords is also changed directly, e.g. when loading a focus map
+        self.focus_surface.set_points(self.focus_map_coords)
+        return self.focus_surface.nearest_point_distance(x,y) <= FocusMap.MIN_POINT_SPACING_MM
+
+    def set_planned_coordinates(self,coordinates):
+        # (x,y) in mm that the focus map will be asked about, see FocusSurface.precompute
+        self.focus_surface.precompute(coordinates)
+
 
 class MultiPointWorker(QObject):
 
@@ -1553,6 +1518,8 @@ class MultiPointWorker(QObject):
     signal_z_piezo_um = Signal(float)
     napari_layers_update = Signal(np.ndarray, int, int, int, str)
     napari_layers_init = Signal(int, int, object, bool)
+    napari_mosaic_init = Signal(object)
+    napari_mosaic_update = Signal(str, int)
 
     signal_update_stats = Signal(object)
 
@@ -1563,6 +1530,7 @@ class MultiPointWorker(QObject):
         self.signal_update_stats.connect(self.update_stats)
         self.start_time = 0
         self.processingHandler = multiPointController.processingHandler
+        self.tileSaver = multiPointController.tileSaver
         self.camera = self.multiPointController.camera
         self.microcontroller = self.multiPointController.microcontroller
         self.usb_spectrometer = self.multiPointController.usb_spectrometer
@@ -1604,7 +1572,9 @@ class MultiPointWorker(QObject):
         self.t_over=[]
 
         self.tiled_preview = None
-        
+        self.mosaic = None
+
+        self.frame_buffers = utils.FrameBuffers()
 
     def update_stats(self, new_stats):
         for k in new_stats.keys():
@@ -1642,6 +1612,19 @@ class MultiPointWorker(QObject):
             self.scan_coordinates_name = None
             self.use_scan_coordinates = True
 
+        # evaluate the focus map at every fov up front (and again whenever a point is added)
+        if self.do_autofocus and (self.autofocusController.use_focus_map or FocusMap.UPDATE_DURING_ACQUISITION):
+            self.autofocusController.set_planned_coordinates(self.get_planned_fov_coordinates())
+
+        if USE_NAPARI_FOR_TILED_DISPLAY and USE_MOSAIC_FOR_TILED_DISPLAY and self.multiPointController.has_mosaic_display():
+            try:
+                self.init_mosaic()
+            except Exception as e:
+                # the mosaic is only a preview - go on with the acquisition without it
+                print('mosaic disabled for this acquisition: ' + str(e))
+                self.multiPointController.close_mosaic()
+                self.mosaic = None
+
         while self.time_point < self.Nt:
             # check if abort acquisition has been requested
             if self.multiPointController.abort_acqusition_requested:
@@ -1666,15 +1649,59 @@ class MultiPointWorker(QObject):
                     if self.multiPointController.abort_acqusition_requested:
                         break
                     time.sleep(0.05)
-        self.processingHandler.processing_queue.join()
-        self.processingHandler.upload_queue.join()
+        self.processingHandler.join()
+        # wait for the remaining images to be written, also when the acquisition was aborted
+        self.tileSaver.flush()
         elapsed_time = time.perf_counter_ns()-self.start_time
         print("Time taken for acquisition/processing: "+str(elapsed_time/10**9))
+        self.print_saving_stats()
+        self.processingHandler.print_stats()
+        if self.mosaic is not None:
+            self.mosaic.flush()
         self.finished.emit()
 
     def wait_till_operation_is_completed(self):
-        while self.microcontroller.is_busy():
-            time.sleep(SLEEP_TIME_S)
+        self.microcontroller.wait_for_commands()
+
+    def print_saving_stats(self):
+        # writing time is summed over the saving processes - if it is much longer than the time
+        # acquisition was blocked plus the time waited at the end, saving overlapped with acquisition
+        stats = self.tileSaver.get_stats()
+        print('saved ' + str(stats['tiles_saved']) + ' images (' + str(stats['tiles_failed']) + ' failed, ' + str(stats['tiles_pending']) + ' pending): ' +
+            'writing ' + '{:.2f}'.format(stats['write_time_s']) + ' s, ' +
+            'acquisition blocked on saving ' + '{:.2f}'.format(stats['blocked_time_s']) + ' s, ' +
+            'waited for saving to finish ' + '{:.2f}'.format(stats['flush_time_s']) + ' s')
+
+    def init_mosaic(self):
+        # the mosaic covers every planned fov, and is kept (by the controller) until the next acquisition
+        pixel_size_x_um, pixel_size_y_um = self.navigationController.get_pixel_size_um()
+        path = os.path.join(self.base_path,self.experiment_ID,'mosaic') if MOSAIC_SAVE_WITH_ACQUISITION else None
+        self.mosaic = mosaic.MosaicPyramid(self.get_planned_fov_coordinates(),pixel_size_x_um,self.NZ,PRVIEW_DOWNSAMPLE_FACTOR,MOSAIC_MIN_LEVEL_SIZE,INVERTED_OBJECTIVE,path)
+        self.multiPointController.mosaic = self.mosaic
+        self.napari_mosaic_init.emit(self.mosaic)
+
+    def add_to_mosaic(self,image,k,channel_name):
+        # the tile is written here, in the acquisition thread; the display is only told which layer changed
+        if self.mosaic is None:
+            return
+        self.mosaic.add_tile(image,self.navigationController.x_pos_mm,self.navigationController.y_pos_mm,k,channel_name)
+        self.napari_mosaic_update.emit(channel_name,k)
+
+    def get_planned_fov_coordinates(self):
+        # (x,y) in mm of every fov of a time point, in the order they are imaged
+        coordinates = []
+        for coordinate_mm in self.scan_coordinates_mm:
+            if self.use_scan_coordinates:
+                x0 = coordinate_mm[0]-self.deltaX*(self.NX-1)/2
+                y0 = coordinate_mm[1]-self.deltaY*(self.NY-1)/2
+            else:
+                x0 = coordinate_mm[0]
+                y0 = coordinate_mm[1]
+            for i in range(self.NY):
+                columns = range(self.NX) if i%2 == 0 else reversed(range(self.NX))
+                for j in columns:
+                    coordinates.append((x0+j*self.deltaX,y0+i*self.deltaY))
+        return coordinates
 
     def run_single_time_point(self):
         start = time.time()
@@ -1786,13 +1813,30 @@ class MultiPointWorker(QObject):
                         # autofocus
                         if self.do_reflection_af == False:
                             # contrast-based AF; perform AF only if when not taking z stack or doing z stack from center
-                            if ( (self.NZ == 1) or Z_STACKING_CONFIG == 'FROM CENTER' ) and (self.do_autofocus) and (self.FOV_counter%Acquisition.NUMBER_OF_FOVS_PER_AF==0):
+                            if FocusMap.UPDATE_DURING_ACQUISITION:
+                                # autofocus where the focus map has no point nearby, and add the result to it.
+                                # elsewhere, move to the focus map once it has 3 points, and stay at the z of the nearby point until then
+                                measure_focus = not self.autofocusController.is_near_focus_map_point(self.navigationController.x_pos_mm,self.navigationController.y_pos_mm)
+                            else:
+                                measure_focus = self.FOV_counter%Acquisition.NUMBER_OF_FOVS_PER_AF==0
+                            if ( (self.NZ == 1) or Z_STACKING_CONFIG == 'FROM CENTER' ) and (self.do_autofocus) and (measure_focus or self.autofocusController.use_focus_map):
                             # temporary: replace the above line with the line below to AF every FOV
                             # if (self.NZ == 1) and (self.do_autofocus):
-                                configuration_name_AF = MULTIPOINT_AUTOFOCUS_CHANNEL
-                                config_AF = next((config for config in self.configurationManager.configurations if config.name == configuration_name_AF))
-                                self.signal_current_configuration.emit(config_AF)
-                                if (self.FOV_counter%Acquisition.NUMBER_OF_FOVS_PER_AF==0) or self.autofocusController.use_focus_map:
+                                if measure_focus and FocusMap.UPDATE_DURING_ACQUISITION:
+                                    configuration_name_AF = MULTIPOINT_AUTOFOCUS_CHANNEL
+                                    config_AF = next((config for config in self.configurationManager.configurations if config.name == configuration_name_AF))
+                                    self.signal_current_configuration.emit(config_AF)
+                                    self.autofocusController.autofocus(focus_map_override=True)
+                                    self.autofocusController.wait_till_autofocus_has_completed()
+                                    self.autofocusController.add_focus_map_point(self.navigationController.x_pos_mm,self.navigationController.y_pos_mm,self.navigationController.z_pos_mm)
+                                elif self.autofocusController.use_focus_map:
+                                    # moves to the z of the focus map, no need to switch to the autofocus channel
+                                    self.autofocusController.autofocus()
+                                    self.autofocusController.wait_till_autofocus_has_completed()
+                                else:
+                                    configuration_name_AF = MULTIPOINT_AUTOFOCUS_CHANNEL
+                                    config_AF = next((config for config in self.configurationManager.configurations if config.name == configuration_name_AF))
+                                    self.signal_current_configuration.emit(config_AF)
                                     self.autofocusController.autofocus()
                                     self.autofocusController.wait_till_autofocus_has_completed()
                                 # upate z location of scan_coordinates_mm after AF
@@ -1819,7 +1863,10 @@ class MultiPointWorker(QObject):
                                 self.microscope.laserAutofocusController.set_reference()
                             else:
                                 try:
-                                    if self.navigationController.get_pid_control_flag(2) is False:
+                                    if LASER_AF_STREAMING:
+                                        # repeats until within tolerance, which also counters backlash in open loop
+                                        self.microscope.laserAutofocusController.move_to_target_streaming(0)
+                                    elif self.navigationController.get_pid_control_flag(2) is False:
                                         self.microscope.laserAutofocusController.move_to_target(0)
                                         self.microscope.laserAutofocusController.move_to_target(0) # for stepper in open loop mode, repeat the operation to counter backlash
                                     else:
@@ -1827,7 +1874,7 @@ class MultiPointWorker(QObject):
                                 except:
                                     file_ID = coordiante_name + str(i) + '_' + str(j if self.x_scan_direction==1 else self.NX-1-j)
                                     saving_path = os.path.join(current_path, file_ID + '_focus_camera.bmp')
-                                    iio.imwrite(saving_path,self.microscope.laserAutofocusController.image) 
+                                    self.tileSaver.save(saving_path,self.microscope.laserAutofocusController.image) 
                                     print('!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!! laser AF failed !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!')
 
                         if (self.NZ > 1):
@@ -1863,7 +1910,7 @@ class MultiPointWorker(QObject):
                             if LASER_AF_CHARACTERIZATION_MODE:
                                 image = self.microscope.laserAutofocusController.get_image()
                                 saving_path = os.path.join(current_path, file_ID + '_laser af camera' + '.bmp')
-                                iio.imwrite(saving_path,image)
+                                self.tileSaver.save(saving_path,image)
 
                             current_round_images = {}
                             # iterate through selected modes
@@ -1878,8 +1925,9 @@ class MultiPointWorker(QObject):
 
                                 if 'USB Spectrometer' not in config.name and 'RGB' not in config.name:
                                     # update the current configuration
+                                    # no need to wait for the mcu here - it executes commands in order, so the illumination
+                                    # is set before it is turned on or triggered, and waiting for that covers both
                                     self.signal_current_configuration.emit(config)
-                                    self.wait_till_operation_is_completed()
                                     # trigger acquisition (including turning on the illumination) and read frame
                                     if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
                                         self.liveController.turn_on_illumination()
@@ -1888,6 +1936,7 @@ class MultiPointWorker(QObject):
                                         image = self.camera.read_frame()
                                     elif self.liveController.trigger_mode == TriggerMode.HARDWARE:
                                         if 'Fluorescence' in config.name and ENABLE_NL5 and NL5_USE_DOUT:
+                                            self.wait_till_operation_is_completed() # the nl5 triggers without the mcu
                                             self.camera.image_is_ready = False # to remove
                                             self.microscope.nl5.start_acquisition()
                                             image = self.camera.read_frame(reset_image_ready_flag=False)
@@ -1903,8 +1952,7 @@ class MultiPointWorker(QObject):
                                         self.liveController.turn_off_illumination()
 
                                     # process the image -  @@@ to move to camera
-                                    image = utils.crop_image(image,self.crop_width,self.crop_height)
-                                    image = utils.rotate_and_flip_image(image,rotate_image_angle=self.camera.rotate_image_angle,flip_image=self.camera.flip_image)
+                                    image = self.frame_buffers.transform(image,self.crop_width,self.crop_height,self.camera.rotate_image_angle,self.camera.flip_image)
                                     # self.image_to_display.emit(cv2.resize(image,(round(self.crop_width*self.display_resolution_scaling), round(self.crop_height*self.display_resolution_scaling)),cv2.INTER_LINEAR))
 
                                     image_to_display = utils.crop_image(image,round(self.crop_width*self.display_resolution_scaling), round(self.crop_height*self.display_resolution_scaling))
@@ -1919,7 +1967,7 @@ class MultiPointWorker(QObject):
                                                     image = cv2.cvtColor(image,cv2.COLOR_RGB2GRAY)
                                                 elif MULTIPOINT_BF_SAVING_OPTION == 'Green Channel Only':
                                                     image = image[:,:,1]
-                                        iio.imwrite(saving_path,image)
+                                        self.tileSaver.save(saving_path,image)
                                     else:
                                         saving_path = os.path.join(current_path, file_ID + '_' + str(config.name).replace(' ','_') + '.' + Acquisition.IMAGE_FORMAT)
                                         if self.camera.is_color:
@@ -1928,7 +1976,7 @@ class MultiPointWorker(QObject):
                                                     image = cv2.cvtColor(image,cv2.COLOR_RGB2GRAY)
                                                 elif MULTIPOINT_BF_SAVING_OPTION == 'Green Channel Only':
                                                     image = image[:,:,1]
-                                        iio.imwrite(saving_path,image)
+                                        self.tileSaver.save(saving_path,image)
 
                                     if USE_NAPARI_FOR_MULTIPOINT or USE_NAPARI_FOR_TILED_DISPLAY:
                                         if not init_napari_layers:
@@ -1936,6 +1984,7 @@ class MultiPointWorker(QObject):
                                             init_napari_layers = True
                                             self.napari_layers_init.emit(image.shape[0],image.shape[1], image.dtype, False)
                                         self.napari_layers_update.emit(image, real_i, real_j, k, config.name)
+                                    self.add_to_mosaic(image, k, config.name)
 
                                     current_round_images[config.name] = np.copy(image)
 
@@ -1964,9 +2013,9 @@ class MultiPointWorker(QObject):
                                         if len(rgb_image.shape) == 3:
                                             print('writing RGB image')
                                             if rgb_image.dtype == np.uint16:
-                                                iio.imwrite(os.path.join(current_path, file_ID + '_BF_LED_matrix_full_RGB.tiff'), rgb_image)
+                                                self.tileSaver.save(os.path.join(current_path, file_ID + '_BF_LED_matrix_full_RGB.tiff'), rgb_image)
                                             else:
-                                                iio.imwrite(os.path.join(current_path, file_ID + '_BF_LED_matrix_full_RGB.' + Acquisition.IMAGE_FORMAT),rgb_image)
+                                                self.tileSaver.save(os.path.join(current_path, file_ID + '_BF_LED_matrix_full_RGB.' + Acquisition.IMAGE_FORMAT),rgb_image)
 
                                     QApplication.processEvents()
 
@@ -1978,9 +2027,8 @@ class MultiPointWorker(QObject):
 
                                     for config_ in self.configurationManager.configurations:
                                         if config_.name in channels:
-                                            # update the current configuration
+                                            # update the current configuration (the mcu executes commands in order, so no need to wait)
                                             self.signal_current_configuration.emit(config_)
-                                            self.wait_till_operation_is_completed()
 
                                             # trigger acquisition (including turning on the illumination)
                                             if self.liveController.trigger_mode == TriggerMode.SOFTWARE:
@@ -2001,8 +2049,7 @@ class MultiPointWorker(QObject):
                                                 self.liveController.turn_off_illumination()
 
                                             # process the image  -  @@@ to move to camera
-                                            image = utils.crop_image(image, self.crop_width, self.crop_height)
-                                            image = utils.rotate_and_flip_image(image, rotate_image_angle=self.camera.rotate_image_angle, flip_image=self.camera.flip_image)
+                                            image = self.frame_buffers.transform(image, self.crop_width, self.crop_height, self.camera.rotate_image_angle, self.camera.flip_image)
 
                                             # add the image to dictionary
                                             images[config_.name] = np.copy(image)
@@ -2026,9 +2073,10 @@ class MultiPointWorker(QObject):
                                                     init_napari_layers = True
                                                     self.napari_layers_init.emit(i_size[0], i_size[1], i_dtype, True)
                                                 self.napari_layers_update.emit(images[channel], real_i, real_j, k, config.name)
+                                            self.add_to_mosaic(images[channel], k, config.name)
 
                                             file_name = file_ID + '_' + channel.replace(' ', '_') + ('.tiff' if i_dtype == np.uint16 else '.' + Acquisition.IMAGE_FORMAT)
-                                            iio.imwrite(os.path.join(current_path, file_name), images[channel])
+                                            self.tileSaver.save(os.path.join(current_path, file_name), images[channel])
 
                                     else:
                                         # If monochrome, reconstruct RGB image
@@ -2051,11 +2099,12 @@ class MultiPointWorker(QObject):
                                                 print(rgb_image.dtype)
                                                 self.napari_layers_init.emit(rgb_image.shape[0], rgb_image.shape[1], rgb_image.dtype, True)
                                             self.napari_layers_update.emit(rgb_image, real_i, real_j, k, config.name)
+                                        self.add_to_mosaic(rgb_image, k, config.name)
 
                                         # write the RGB image
                                         print('writing RGB image')
                                         file_name = file_ID + '_BF_LED_matrix_full_RGB' + ('.tiff' if rgb_image.dtype == np.uint16 else '.' + Acquisition.IMAGE_FORMAT)
-                                        iio.imwrite(os.path.join(current_path, file_name), rgb_image)
+                                        self.tileSaver.save(os.path.join(current_path, file_name), rgb_image)
 
                                 # USB spectrometer
                                 else:
@@ -2273,6 +2322,7 @@ class MultiPointWorker(QObject):
         self.navigationController.enable_joystick_button_action = True
         print(time.time())
         print(time.time()-start)
+        self.print_saving_stats()
 
 class MultiPointController(QObject):
 
@@ -2286,13 +2336,16 @@ class MultiPointController(QObject):
     detection_stats = Signal(object)
     napari_layers_update = Signal(np.ndarray, int, int, int, str)
     napari_layers_init = Signal(int, int, object, bool)
+    napari_mosaic_init = Signal(object)
+    napari_mosaic_update = Signal(str, int)
     signal_z_piezo_um = Signal(float)
 
     def __init__(self,camera,navigationController,liveController,autofocusController,configurationManager,usb_spectrometer=None,scanCoordinates=None,parent=None):
         QObject.__init__(self)
 
         self.camera = camera
-        self.processingHandler = ProcessingHandler()
+        self.processingHandler = ProcessingHandler(num_processes=PROCESSING_NUM_PROCESSES,max_pending_tasks=PROCESSING_MAX_PENDING_TASKS,queue_size=PROCESSING_QUEUE_SIZE)
+        self.tileSaver = image_saver.TileSaver(num_processes=MULTIPOINT_SAVING_NUM_PROCESSES,max_pending_tiles=MULTIPOINT_SAVING_MAX_PENDING_TILES)
         self.microcontroller = navigationController.microcontroller # to move to gui for transparency
         self.navigationController = navigationController
         self.liveController = liveController
@@ -2317,6 +2370,7 @@ class MultiPointController(QObject):
         self.gen_focus_map = False
         self.focus_map_storage = []
         self.already_using_fmap = False
+        self.restore_focus_map = False
         self.crop_width = Acquisition.CROP_WIDTH
         self.crop_height = Acquisition.CROP_HEIGHT
         self.display_resolution_scaling = Acquisition.IMAGE_DISPLAY_SCALING_FACTOR
@@ -2328,6 +2382,7 @@ class MultiPointController(QObject):
         self.usb_spectrometer = usb_spectrometer
         self.scanCoordinates = scanCoordinates
         self.parent = parent
+        self.mosaic = None # of the last acquisition, for the tiled display
 
         self.old_images_per_page = 1
         try:
@@ -2461,6 +2516,14 @@ class MultiPointController(QObject):
         if SHOW_TILED_PREVIEW:
             self.navigationController.keep_scan_begin_position(self.navigationController.x_pos_mm, self.navigationController.y_pos_mm)
 
+        # the focus map is changed by generating it, or by adding autofocus results to it during the acquisition - keep the current one to restore afterwards
+        self.restore_focus_map = (self.gen_focus_map or (FocusMap.UPDATE_DURING_ACQUISITION and self.do_autofocus)) and not self.do_reflection_af
+        if self.restore_focus_map:
+            self.focus_map_storage = []
+            self.already_using_fmap = self.autofocusController.use_focus_map
+            for x,y,z in self.autofocusController.focus_map_coords:
+                self.focus_map_storage.append((x,y,z))
+
         # create a QThread object
         if self.gen_focus_map and not self.do_reflection_af:
             print("Generating focus map for multipoint grid")
@@ -2479,10 +2542,6 @@ class MultiPointController(QObject):
             elif fmap_dy == 0.0:
                 fmap_dy = 0.1
             try:
-                self.focus_map_storage = []
-                self.already_using_fmap = self.autofocusController.use_focus_map
-                for x,y,z in self.autofocusController.focus_map_coords:
-                    self.focus_map_storage.append((x,y,z))
                 coord1 = (starting_x_mm, starting_y_mm)
                 coord2 = (starting_x_mm+fmap_Nx*fmap_dx,starting_y_mm)
                 coord3 = (starting_x_mm,starting_y_mm+fmap_Ny*fmap_dy)
@@ -2496,8 +2555,12 @@ class MultiPointController(QObject):
 
         self.thread = QThread()
         # create a worker object
+        self.processingHandler.reset_stats()
         self.processingHandler.start_processing()
         self.processingHandler.start_uploading()
+        self.tileSaver.start()
+        self.tileSaver.reset_stats()
+        self.close_mosaic()
         self.multiPointWorker = MultiPointWorker(self)
         # move the worker to the thread
         self.multiPointWorker.moveToThread(self.thread)
@@ -2515,6 +2578,8 @@ class MultiPointController(QObject):
         self.multiPointWorker.signal_register_current_fov.connect(self.slot_register_current_fov)
         self.multiPointWorker.napari_layers_init.connect(self.slot_napari_layers_init)
         self.multiPointWorker.napari_layers_update.connect(self.slot_napari_layers_update)
+        self.multiPointWorker.napari_mosaic_init.connect(self.slot_napari_mosaic_init)
+        self.multiPointWorker.napari_mosaic_update.connect(self.slot_napari_mosaic_update)
         self.multiPointWorker.signal_z_piezo_um.connect(self.slot_z_piezo_um)
         # self.thread.finished.connect(self.thread.deleteLater)
         self.thread.finished.connect(self.thread.quit)
@@ -2523,7 +2588,7 @@ class MultiPointController(QObject):
 
     def _on_acquisition_completed(self):
         # restore the previous selected mode
-        if self.gen_focus_map:
+        if self.restore_focus_map:
             self.autofocusController.clear_focus_map()
             for x,y,z in self.focus_map_storage:
                 self.autofocusController.focus_map_coords.append((x,y,z))
@@ -2585,6 +2650,27 @@ class MultiPointController(QObject):
     def slot_napari_layers_init(self, image_height, image_width, dtype, rgb):
         self.napari_layers_init.emit(image_height, image_width, dtype, rgb)
 
+    def slot_napari_mosaic_init(self, mosaic):
+        self.napari_mosaic_init.emit(mosaic)
+
+    def has_mosaic_display(self):
+        # the mosaic is only built when a tiled display is connected to show it
+        return self.receivers(self.napari_mosaic_init) > 0
+
+    def close_mosaic(self):
+        # removes the temporary files of the last acquisition's mosaic
+        if self.mosaic is not None:
+            self.mosaic.close()
+            self.mosaic = None
+
+    def close(self):
+        # frees what is kept between acquisitions, when the GUI closes
+        self.close_mosaic()
+        self.processingHandler.close()
+
+    def slot_napari_mosaic_update(self, channel, k):
+        self.napari_mosaic_update.emit(channel, k)
+
     def slot_z_piezo_um(self, displacement_um):
         self.signal_z_piezo_um.emit(displacement_um)
 
@@ -2977,8 +3063,7 @@ class TrackingWorker(QObject):
         self.finished.emit()
 
     def wait_till_operation_is_completed(self):
-        while self.microcontroller.is_busy():
-            time.sleep(SLEEP_TIME_S)
+        self.microcontroller.wait_for_commands()
 
 
 class ImageDisplayWindow(QMainWindow):
@@ -3592,6 +3677,7 @@ class LaserAutofocusController(QObject):
         self.has_two_interfaces = has_two_interfaces # e.g. air-glass and glass water, set to false when (1) using oil immersion (2) using 1 mm thick slide (3) using metal coated slide or Si wafer
         self.use_glass_top = use_glass_top
         self.spot_spacing_pixels = None # spacing between the spots from the two interfaces (unit: pixel)
+        self.spot_centroid = laser_spot.SpotCentroid(has_two_interfaces,use_glass_top)
         
         self.look_for_cache = look_for_cache
 
@@ -3630,6 +3716,7 @@ class LaserAutofocusController(QObject):
         self.height = int((height//2)*2)
         self.x_reference = x_reference - self.x_offset # self.x_reference is relative to the cropped region
         self.camera.set_ROI(self.x_offset,self.y_offset,self.width,self.height)
+        self.spot_centroid.reset()
         self.is_initialized = True
 
     def initialize_auto(self):
@@ -3640,6 +3727,7 @@ class LaserAutofocusController(QObject):
         # set camera to use full sensor
         self.camera.set_ROI(0,0,None,None) # set offset first
         self.camera.set_ROI(0,0,3088,2064)
+        self.spot_centroid.reset()
         # update camera settings
         self.camera.set_exposure_time(FOCUS_CAMERA_EXPOSURE_TIME_MS)
         self.camera.set_analog_gain(FOCUS_CAMERA_ANALOG_GAIN)
@@ -3752,6 +3840,33 @@ class LaserAutofocusController(QObject):
         # update the displacement measurement
         self.measure_displacement()
 
+    def move_to_target_streaming(self,target_um,tolerance_um=LASER_AF_STREAMING_TOLERANCE_UM,max_iterations=LASER_AF_STREAMING_MAX_ITERATIONS):
+        """
+        Closed-loop version of move_to_target: the laser stays on while the
+        displacement is measured and z corrected, until the displacement is
+        within tolerance_um of target_um or max_iterations moves were made.
+        Returns the last measured displacement.
+        """
+        self.microcontroller.turn_on_AF_laser()
+        self.wait_till_operation_is_completed()
+        try:
+            for i in range(max_iterations+1):
+                x,y = self._get_laser_spot_centroid()
+                displacement_um = (x - self.x_reference)*self.pixel_to_um
+                self.signal_displacement_um.emit(displacement_um)
+                um_to_move = target_um - displacement_um
+                if abs(um_to_move) <= tolerance_um or i == max_iterations:
+                    break
+                # limit the range of movement
+                um_to_move = min(um_to_move,200)
+                um_to_move = max(um_to_move,-200)
+                self.navigationController.move_z(um_to_move/1000)
+                self.wait_till_operation_is_completed()
+        finally:
+            self.microcontroller.turn_off_AF_laser()
+            self.wait_till_operation_is_completed()
+        return displacement_um
+
     def set_reference(self):
         # turn on the laser
         self.microcontroller.turn_on_AF_laser()
@@ -3765,59 +3880,11 @@ class LaserAutofocusController(QObject):
         self.signal_displacement_um.emit(0)
 
     def _caculate_centroid(self,image):
-        if self.has_two_interfaces == False:
-            h,w = image.shape
-            x,y = np.meshgrid(range(w),range(h))
-            I = image.astype(float)
-            I = I - np.amin(I)
-            I[I/np.amax(I)<0.2] = 0
-            x = np.sum(x*I)/np.sum(I)
-            y = np.sum(y*I)/np.sum(I)
-            return x,y
-        else:
-            I = image
-            # get the y position of the spots
-            tmp = np.sum(I,axis=1)
-            y0 = np.argmax(tmp)
-            # crop along the y axis
-            I = I[y0-96:y0+96,:]
-            # signal along x
-            tmp = np.sum(I,axis=0)
-            # find peaks
-            peak_locations,_ = scipy.signal.find_peaks(tmp,distance=100)
-            idx = np.argsort(tmp[peak_locations])
-            peak_0_location = peak_locations[idx[-1]]
-            peak_1_location = peak_locations[idx[-2]] # for air-glass-water, the smaller peak corresponds to the glass-water interface
-            self.spot_spacing_pixels = peak_1_location-peak_0_location
-            '''
-            # find peaks - alternative
-            if self.spot_spacing_pixels is not None:
-                peak_locations,_ = scipy.signal.find_peaks(tmp,distance=100)
-                idx = np.argsort(tmp[peak_locations])
-                peak_0_location = peak_locations[idx[-1]]
-                peak_1_location = peak_locations[idx[-2]] # for air-glass-water, the smaller peak corresponds to the glass-water interface
-                self.spot_spacing_pixels = peak_1_location-peak_0_location
-            else:
-                peak_0_location = np.argmax(tmp)
-                peak_1_location = peak_0_location + self.spot_spacing_pixels
-            '''
-            # choose which surface to use
-            if self.use_glass_top:
-                x1 = peak_1_location
-            else:
-                x1 = peak_0_location
-            # find centroid
-            h,w = I.shape
-            x,y = np.meshgrid(range(w),range(h))
-            I = I[:,max(0,x1-64):min(w-1,x1+64)]
-            x = x[:,max(0,x1-64):min(w-1,x1+64)]
-            y = y[:,max(0,x1-64):min(w-1,x1+64)]
-            I = I.astype(float)
-            I = I - np.amin(I)
-            I[I/np.amax(I)<0.1] = 0
-            x1 = np.sum(x*I)/np.sum(I)
-            y1 = np.sum(y*I)/np.sum(I)
-            return x1,y0-96+y1
+        self.spot_centroid.has_two_interfaces = self.has_two_interfaces
+        self.spot_centroid.use_glass_top = self.use_glass_top
+        x,y = self.spot_centroid.calculate(image)
+        self.spot_spacing_pixels = self.spot_centroid.spot_spacing_pixels
+        return x,y
 
     def _get_laser_spot_centroid(self):
         # disable camera callback
@@ -3846,8 +3913,7 @@ class LaserAutofocusController(QObject):
         return x,y
 
     def wait_till_operation_is_completed(self):
-        while self.microcontroller.is_busy():
-            time.sleep(SLEEP_TIME_S)
+        self.microcontroller.wait_for_commands()
 
     def get_image(self):
         # turn on the laser
@@ -0,0 +1,172 @@
+import numpy as np
+
+try:
+    from scipy.interpolate import RBFInterpolator
+except ImportError:
+    RBFInterpolator = None
+    print('scipy RBFInterpolator import error - thin-plate spline focus maps fall back to polynomial surfaces')
+
+
+SURFACE_METHODS = ('plane','polynomial','thin_plate_spline')
+
+
+def points_are_collinear(points):
+    """
+    :brief: whether the x-y coordinates of the (x,y,z) points lie on a line (or
+        there are fewer than 3), in which case no surface can be fitted
+    """
+    if len(points) < 3:
+        return True
+    xy = np.asarray(points,dtype=float)[:,:2]
+    return np.linalg.matrix_rank(xy - xy.mean(axis=0),tol=1e-9) < 2
+
+
+def polynomial_terms(xy,degree):
+    # monomials x^a*y^b with a+b <= degree, one column per monomial
+    return np.stack([xy[:,0]**(d-b)*xy[:,1]**b for d in range(degree+1) for b in range(d+1)],axis=1)
+
+
+def number_of_polynomial_terms(degree):
+    return (degree+1)*(degree+2)//2
+
+
+class FocusSurface(object):
+    """
+    :brief: z of the focal plane as a function of stage x and y, fitted to any
+        number (3 or more) of measured (x,y,z) focus points, in mm.
+        methods:
+            plane - least-squares plane, which goes through the points when there are 3
+            polynomial - least-squares polynomial of up to degree (lower while there are
+                too few points for all the terms)
+            thin_plate_spline - thin-plate spline through the points (with smoothing), which
+                follows a warped plate better than a polynomial. needs scipy >= 1.7
+        the fit is robust: points further than outlier_threshold robust standard deviations
+        (and at least outlier_min_residual_mm) from a polynomial fit are left out, e.g. an
+        autofocus that locked onto debris.
+        coordinates passed to precompute() (the planned fovs) are evaluated once per fit,
+        in one go, so that interpolate() is a lookup during an acquisition. points can be
+        added at any time - the surface is refitted, and the lookup grid updated, the next
+        time it is used.
+    """
+    def __init__(self,method='thin_plate_spline',degree=2,smoothing=0,outlier_threshold=3.5,outlier_min_residual_mm=0.005,lookup_tolerance_mm=0.005):
+        if method not in SURFACE_METHODS:
+            print('unknown focus surface method ' + str(method) + ', using plane')
+            method = 'plane'
+        if method == 'thin_plate_spline' and RBFInterpolator is None:
+            method = 'polynomial'
+        self.method = method
+        self.degree = degree if method != 'plane' else 1
+        self.smoothing = smoothing
+        self.outlier_threshold = outlier_threshold
+        self.outlier_min_residual_mm = outlier_min_residual_mm
+        self.lookup_tolerance_mm = lookup_tolerance_mm
+        self.points = []
+        self.outliers = []
+        self.planned_xy = np.zeros((0,2))
+        self.planned_z = np.zeros(0)
+        self._model = None
+
+    def set_points(self,points):
+        points = [tuple(point) for point in points]
+        if points != self.points:
+            self.points = points
+            self._model = None
+
+    def add_point(self,x,y,z):
+        self.points.append((x,y,z))
+        self._model = None
+
+    def clear(self):
+        self.points = []
+        self.outliers = []
+        self._model = None
+
+    def is_valid(self):
+        return not points_are_collinear(self.points)
+
+    def nearest_point_distance(self,x,y):
+        if len(self.points) == 0:
+            return np.inf
+        xy = np.asarray(self.points,dtype=float)[:,:2]
+        return np.sqrt(np.min(np.sum((xy - (x,y))**2,axis=1)))
+
+    def precompute(self,coordinates):
+        """
+        :brief: sets the (x,y) coordinates, in mm, that interpolate() will be asked about
+        """
+        self.planned_xy = np.asarray(coordinates,dtype=float).reshape(-1,2)
+        self.planned_z = np.full(len(self.planned_xy),np.nan)
+        if self._model is not None:
+            self.planned_z = self._evaluate(self.planned_xy)
+
+    def fit(self):
+        if not self.is_valid():
+            raise ValueError('focus surface needs at least 3 points that are not on a line')
+        points = np.asarray(self.points,dtype=float)
+        # center and scale the coordinates, for a well-conditioned fit
+        self._center = points[:,:2].mean(axis=0)
+        self._scale = max(np.abs(points[:,:2] - self._center).max(),1e-6)
+        xy = (points[:,:2] - self._center)/self._scale
+        z = points[:,2]
+
+        # polynomial fit, with the points it doesn't explain left out
+        inliers = np.ones(len(z),dtype=bool)
+        for i in range(3):
+            degree = self._degree_for(np.count_nonzero(inliers))
+            coefficients = np.linalg.lstsq(polynomial_terms(xy[inliers],degree),z[inliers],rcond=None)[0]
+            residuals = z - polynomial_terms(xy,degree) @ coefficients
+            # only points beyond the number of terms tell outliers apart
+            if np.count_nonzero(inliers) <= number_of_polynomial_terms(degree) + 1:
+                break
+            sigma = 1.4826*np.median(np.abs(residuals[inliers] - np.median(residuals[inliers])))
+            new_inliers = np.abs(residuals) <= max(self.outlier_threshold*sigma,self.outlier_min_residual_mm)
+            if np.array_equal(new_inliers,inliers) or points_are_collinear(points[new_inliers]) or np.count_nonzero(new_inliers) < 3:
+                break
+            inliers = new_inliers
+        degree = self._degree_for(np.count_nonzero(inliers))
+        coefficients = np.linalg.lstsq(polynomial_terms(xy[inliers],degree),z[inliers],rcond=None)[0]
+        self.outliers = [self.points[i] for i in np.flatnonzero(~inliers)]
+        if len(self.outliers) > 0:
+            print('focus surface: left out ' + str(len(self.outliers)) + ' outlier(s) ' + str(self.outliers))
+
+        if self.method == 'thin_plate_spline':
+            self._model = ('thin_plate_spline',RBFInterpolator(xy[inliers],z[inliers],kernel='thin_plate_spline',smoothing=self.smoothing))
+        else:
+            self._model = ('polynomial',(degree,coefficients))
+        if len(self.planned_xy) > 0:
+            self.planned_z = self._evaluate(self.planned_xy)
+
+    def _degree_for(self,number_of_points):
+        degree = self.degree
+        while degree > 1 and number_of_polynomial_terms(degree) > number_of_points:
+            degree = degree - 1
+        return degree
+
+    def _evaluate(self,coordinates):
+        xy = (np.asarray(coordinates,dtype=float).reshape(-1,2) - self._center)/self._scale
+        kind, model = self._model
+        if kind == 'thin_plate_spline':
+            return model(xy)
+        degree, coefficients = model
+        return polynomial_terms(xy,degree) @ coefficients
+
+    def evaluate(self,coordinates):
+        """
+        :brief: z, in mm, at each of the (x,y) coordinates
+        """
+        if self._model is None:
+            self.fit()
+        return self._evaluate(coordinates)
+
+    def interpolate(self,x,y):
+        """
+        :brief: z, in mm, at (x,y) - from the precomputed coordinates when (x,y) is one of them
+        """
+        if self._model is None:
+            self.fit()
+        if len(self.planned_xy) > 0:
+            distances = np.sum((self.planned_xy - (x,y))**2,axis=1)
+            i = np.argmin(distances)
+            if distances[i] <= self.lookup_tolerance_mm**2:
+                return float(self.planned_z[i])
+        return float(self._evaluate((x,y))[0])
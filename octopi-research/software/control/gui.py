@@ -159,7 +159,7 @@ class OctopiGUI(QMainWindow):
         # make connections
         self.streamHandler.signal_new_frame_received.connect(self.liveController.on_new_frame)
         self.streamHandler.image_to_display.connect(self.imageDisplay.enqueue)
-        self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue)
+        self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue,type=Qt.DirectConnection)
         # self.streamHandler.packet_image_for_tracking.connect(self.trackingController.on_new_frame)
         self.imageDisplay.image_to_display.connect(self.imageDisplayWindow.display_image) # may connect streamHandler directly to imageDisplayWindow
         self.navigationController.xPos.connect(self.navigationWidget.label_Xpos.setNum)
@@ -185,6 +185,7 @@ class OctopiGUI(QMainWindow):
         self.liveController.stop_live()
         self.camera.close()
         self.imageSaver.close()
+        self.multipointController.close()
         self.imageDisplay.close()
         if not SINGLE_WINDOW:
             self.imageDisplayWindow.close()
@@ -91,13 +91,13 @@ class OctopiGUI(QMainWindow):
 		# make connections
 		self.streamHandler_1.signal_new_frame_received.connect(self.liveController_1.on_new_frame)
 		self.streamHandler_1.image_to_display.connect(self.imageDisplay_1.enqueue)
-		self.streamHandler_1.packet_image_to_write.connect(self.imageSaver_1.enqueue)
+		self.streamHandler_1.packet_image_to_write.connect(self.imageSaver_1.enqueue,type=Qt.DirectConnection)
 		self.streamHandler_1.packet_image_for_tracking.connect(self.trackingController.on_new_frame)
 		self.imageDisplay_1.image_to_display.connect(self.imageDisplayWindow_1.display_image) # may connect streamHandler directly to imageDisplayWindow
 
 		self.streamHandler_2.signal_new_frame_received.connect(self.liveController_2.on_new_frame)
 		self.streamHandler_2.image_to_display.connect(self.imageDisplay_2.enqueue)
-		self.streamHandler_2.packet_image_to_write.connect(self.imageSaver_2.enqueue)
+		self.streamHandler_2.packet_image_to_write.connect(self.imageSaver_2.enqueue,type=Qt.DirectConnection)
 		self.imageDisplay_2.image_to_display.connect(self.imageDisplayWindow_2.display_image) # may connect streamHandler directly to imageDisplayWindow
 		
 		self.navigationController.xPos.connect(self.navigationWidget.label_Xpos.setNum)
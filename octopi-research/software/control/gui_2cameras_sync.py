@@ -139,7 +139,7 @@ class OctopiGUI(QMainWindow):
 		for i in range(len(channels)): 
 			self.streamHandler[channels[i]].signal_new_frame_received.connect(self.liveController[channels[i]].on_new_frame)
 			self.streamHandler[channels[i]].image_to_display.connect(self.imageDisplayWindow[channels[i]].display_image)
-			self.streamHandler[channels[i]].packet_image_to_write.connect(self.imageSaver[channels[i]].enqueue)
+			self.streamHandler[channels[i]].packet_image_to_write.connect(self.imageSaver[channels[i]].enqueue,type=Qt.DirectConnection)
 			self.liveControlWidget[channels[i]].signal_newExposureTime.connect(self.cameraSettingWidget[channels[i]].set_exposure_time)
 			self.liveControlWidget[channels[i]].signal_newAnalogGain.connect(self.cameraSettingWidget[channels[i]].set_analog_gain)
 			self.liveControlWidget[channels[i]].update_camera_settings()
@@ -104,7 +104,7 @@ class OctopiGUI(QMainWindow):
 
 		self.streamHandler_1.signal_new_frame_received.connect(self.liveController_1.on_new_frame)
 		self.streamHandler_1.image_to_display.connect(self.imageDisplayWindow_1.display_image)
-		self.streamHandler_1.packet_image_to_write.connect(self.imageSaver_1.enqueue)
+		self.streamHandler_1.packet_image_to_write.connect(self.imageSaver_1.enqueue,type=Qt.DirectConnection)
 		#self.streamHandler_1.packet_image_for_tracking.connect(self.trackingController.on_new_frame)
 
 		self.liveControlWidget_1.signal_newExposureTime.connect(self.cameraSettingWidget_1.set_exposure_time)
@@ -113,7 +113,7 @@ class OctopiGUI(QMainWindow):
 
 		self.streamHandler_2.signal_new_frame_received.connect(self.liveController_2.on_new_frame)
 		self.streamHandler_2.image_to_display.connect(self.imageDisplayWindow_2.display_image)
-		self.streamHandler_2.packet_image_to_write.connect(self.imageSaver_2.enqueue)
+		self.streamHandler_2.packet_image_to_write.connect(self.imageSaver_2.enqueue,type=Qt.DirectConnection)
 
 		self.liveControlWidget_2.signal_newExposureTime.connect(self.cameraSettingWidget_2.set_exposure_time)
 		self.liveControlWidget_2.signal_newAnalogGain.connect(self.cameraSettingWidget_2.set_analog_gain)
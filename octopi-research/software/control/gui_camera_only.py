@@ -62,7 +62,7 @@ class OctopiGUI(QMainWindow):
 		# make connections
 		self.streamHandler.signal_new_frame_received.connect(self.liveController.on_new_frame)
 		self.streamHandler.image_to_display.connect(self.imageDisplay.enqueue)
-		self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue)
+		self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue,type=Qt.DirectConnection)
 		self.imageDisplay.image_to_display.connect(self.imageDisplayWindow.display_image) # may connect streamHandler directly to imageDisplayWindow
 		self.liveControlWidget.signal_newExposureTime.connect(self.cameraSettingWidget.set_exposure_time)
 		self.liveControlWidget.signal_newAnalogGain.connect(self.cameraSettingWidget.set_analog_gain)
@@ -410,7 +410,7 @@ class OctopiGUI(QMainWindow):
 
         # make connections
         self.streamHandler.signal_new_frame_received.connect(self.liveController.on_new_frame)          
-        self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue)
+        self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue,type=Qt.DirectConnection)
         # self.streamHandler.packet_image_for_tracking.connect(self.trackingController.on_new_frame)
         self.navigationController.xPos.connect(lambda x:self.navigationWidget.label_Xpos.setText("{:.2f}".format(x)))
         self.navigationController.yPos.connect(lambda x:self.navigationWidget.label_Ypos.setText("{:.2f}".format(x)))
@@ -478,9 +478,14 @@ class OctopiGUI(QMainWindow):
                 if ENABLE_FLEXIBLE_MULTIPOINT:
                     self.multiPointWidget2.signal_acquisition_channels.connect(self.napariTiledDisplayWidget.initChannels)
                     self.multiPointWidget2.signal_acquisition_shape.connect(self.napariTiledDisplayWidget.initLayersShape)
-                self.multipointController.napari_layers_init.connect(self.napariTiledDisplayWidget.initLayers)
-                self.multipointController.napari_layers_update.connect(self.napariTiledDisplayWidget.updateLayers)
-                self.napariTiledDisplayWidget.signal_coordinates_clicked.connect(self.navigationController.scan_preview_move_from_click)
+                if USE_MOSAIC_FOR_TILED_DISPLAY:
+                    self.multipointController.napari_mosaic_init.connect(self.napariTiledDisplayWidget.initMosaic)
+                    self.multipointController.napari_mosaic_update.connect(self.napariTiledDisplayWidget.updateMosaic)
+                    self.napariTiledDisplayWidget.signal_stage_coordinates_clicked.connect(self.navigationController.scan_preview_move_to)
+                else:
+                    self.multipointController.napari_layers_init.connect(self.napariTiledDisplayWidget.initLayers)
+                    self.multipointController.napari_layers_update.connect(self.napariTiledDisplayWidget.updateLayers)
+                    self.napariTiledDisplayWidget.signal_coordinates_clicked.connect(self.navigationController.scan_preview_move_from_click)
                 if USE_NAPARI_FOR_LIVE_VIEW:
                     self.napariTiledDisplayWidget.signal_layer_contrast_limits.connect(self.napariLiveWidget.saveContrastLimits)
                     self.napariLiveWidget.signal_layer_contrast_limits.connect(self.napariTiledDisplayWidget.saveContrastLimits)
@@ -643,6 +648,9 @@ class OctopiGUI(QMainWindow):
             self.cellx.close()
 
         self.imageSaver.close()
+        if SHOW_TILED_PREVIEW and USE_NAPARI_FOR_TILED_DISPLAY and USE_MOSAIC_FOR_TILED_DISPLAY:
+            self.napariTiledDisplayWidget.releaseMosaic()
+        self.multipointController.close()
         self.imageDisplay.close()
         if not SINGLE_WINDOW:
             self.imageDisplayWindow.close()
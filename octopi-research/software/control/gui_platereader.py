@@ -75,7 +75,7 @@ class OctopiGUI(QMainWindow):
 		# make connections
 		self.streamHandler.signal_new_frame_received.connect(self.liveController.on_new_frame)
 		self.streamHandler.image_to_display.connect(self.imageDisplayWindow.display_image)
-		self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue)
+		self.streamHandler.packet_image_to_write.connect(self.imageSaver.enqueue,type=Qt.DirectConnection)
 		# self.plateReaderNavigationController.xPos.connect(self.navigationWidget.label_Xpos.setNum)
 		# self.plateReaderNavigationController.yPos.connect(self.navigationWidget.label_Ypos.setNum)
 		# self.plateReaderNavigationController.zPos.connect(self.navigationWidget.label_Zpos.setNum)
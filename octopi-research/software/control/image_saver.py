@@ -0,0 +1,477 @@
+import os
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue, Empty
+
+import numpy as np
+import cv2
+import imageio as iio
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+    print('tifffile import error - tiff stack output is not available')
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+    print('zarr import error - ome-zarr output is not available')
+
+
+class SaverStats(object):
+    """
+    :brief: counters for monitoring whether saving keeps up with acquisition.
+        frames are never discarded because the writers are busy - instead, the
+        time the producer spends waiting for a free slot is accumulated in
+        blocked_time_s, which is the backpressure metric to watch.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.frames_received = 0
+        self.frames_saved = 0
+        self.frames_failed = 0
+        self.frames_dropped = 0 # only when max_wait_s is set and runs out
+        self.blocked_count = 0
+        self.blocked_time_s = 0
+        self.max_frames_pending = 0
+        self.write_time_s = 0
+        self.bytes_saved = 0
+        self.start_time = time.time()
+
+    def as_dict(self):
+        with self.lock:
+            elapsed = max(time.time() - self.start_time, 1e-9)
+            return {
+                'frames_received': self.frames_received,
+                'frames_saved': self.frames_saved,
+                'frames_failed': self.frames_failed,
+                'frames_dropped': self.frames_dropped,
+                'blocked_count': self.blocked_count,
+                'blocked_time_s': self.blocked_time_s,
+                'max_frames_pending': self.max_frames_pending,
+                'mean_write_time_ms': 1000*self.write_time_s/max(self.frames_saved,1),
+                'throughput_fps': self.frames_saved/elapsed,
+                'throughput_MBps': self.bytes_saved/elapsed/1e6,
+            }
+
+
+class FrameRingBuffer(object):
+    """
+    :brief: a fixed number of preallocated frame slots. put() copies a frame into
+        a free slot (so the camera can reuse its own buffer right away) and blocks
+        while all slots are waiting to be written. slots are allocated on the
+        first frame, and reallocated if the frame shape or dtype changes.
+    """
+    def __init__(self, num_slots):
+        self.num_slots = num_slots
+        self.slots = None
+        self.free_slots = Queue()
+        self.pending = Queue() # (slot index, metadata) in the order frames were put
+        self.allocation_lock = threading.Lock()
+
+    def _allocate(self, shape, dtype):
+        # wait until every slot is back, so that no writer is reading a slot we free
+        if self.slots is not None:
+            for i in range(self.num_slots):
+                self.free_slots.get()
+        self.slots = np.empty((self.num_slots,) + shape, dtype=dtype)
+        for i in range(self.num_slots):
+            self.free_slots.put(i)
+
+    def put(self, image, metadata, timeout=None):
+        """
+        :return: True if the frame was buffered, False if no slot became
+            free within timeout (None waits indefinitely)
+        """
+        with self.allocation_lock:
+            if self.slots is None or self.slots.shape[1:] != image.shape or self.slots.dtype != image.dtype:
+                self._allocate(image.shape, image.dtype)
+        try:
+            index = self.free_slots.get(timeout=timeout)
+        except Empty:
+            return False
+        np.copyto(self.slots[index], image)
+        self.pending.put((index, metadata))
+        return True
+
+    def get(self, timeout=None):
+        """
+        :return: (slot index, image view, metadata) - call release(slot index)
+            when done with the image view. raises queue.Empty on timeout
+        """
+        index, metadata = self.pending.get(timeout=timeout)
+        if index is None:
+            return None, None, metadata
+        return index, self.slots[index], metadata
+
+    def release(self, index):
+        self.free_slots.put(index)
+
+    def num_free(self):
+        return self.free_slots.qsize()
+
+    def wake_consumer(self):
+        self.pending.put((None, None))
+
+
+class ImageFileWriter(object):
+    """
+    :brief: one file per frame, split into numbered subfolders, which is what
+        ImageSaver has always written. thread-safe, so frames can be encoded and
+        written by several threads at once.
+    """
+    supports_parallel_writes = True
+
+    def __init__(self, image_format='bmp', max_num_image_per_folder=1000):
+        self.image_format = image_format
+        self.max_num_image_per_folder = max_num_image_per_folder
+        self.path = None
+
+    def open(self, path):
+        self.path = path
+
+    def write(self, image, counter, frame_ID, timestamp):
+        folder_ID = int(counter/self.max_num_image_per_folder)
+        file_ID = int(counter%self.max_num_image_per_folder)
+        folder = os.path.join(self.path,str(folder_ID))
+        if file_ID == 0 or not os.path.isdir(folder):
+            # writers may reach frames of a new folder out of order
+            os.makedirs(folder,exist_ok=True)
+        if image.dtype == np.uint16:
+            # need to use tiff when saving 16 bit images
+            saving_path = os.path.join(folder,str(file_ID) + '_' + str(frame_ID) + '.tiff')
+            iio.imwrite(saving_path,image)
+        else:
+            saving_path = os.path.join(folder,str(file_ID) + '_' + str(frame_ID) + '.' + self.image_format)
+            cv2.imwrite(saving_path,image)
+
+    def close(self):
+        pass
+
+
+class TiffStackWriter(object):
+    """
+    :brief: appends frames to BigTIFF stacks (stack_0.tiff, stack_1.tiff, ...),
+        starting a new stack every max_frames_per_file frames, with frame IDs and
+        timestamps in timestamps.csv. a stack has to be written in order, so this
+        uses a single writer thread.
+    """
+    supports_parallel_writes = False
+
+    def __init__(self, max_frames_per_file=10000):
+        if tifffile is None:
+            raise RuntimeError('tiff stack output requires tifffile')
+        self.max_frames_per_file = max_frames_per_file
+        self.path = None
+        self.tiff = None
+        self.timestamp_file = None
+        self.frames_in_file = 0
+        self.file_ID = 0
+
+    def open(self, path):
+        self.path = path
+        self.file_ID = 0
+        self.frames_in_file = 0
+        self.timestamp_file = open(os.path.join(path,'timestamps.csv'),'w')
+        self.timestamp_file.write('counter,file,page,frame_ID,timestamp\n')
+
+    def write(self, image, counter, frame_ID, timestamp):
+        if self.tiff is None or self.frames_in_file >= self.max_frames_per_file:
+            if self.tiff is not None:
+                self.tiff.close()
+                self.file_ID = self.file_ID + 1
+            self.tiff = tifffile.TiffWriter(os.path.join(self.path,'stack_' + str(self.file_ID) + '.tiff'),bigtiff=True)
+            self.frames_in_file = 0
+        # contiguous pages are written without per-page tags, so appending stays fast
+        self.tiff.write(image,contiguous=True,photometric='rgb' if image.ndim == 3 else 'minisblack')
+        self.timestamp_file.write(','.join([str(counter),str(self.file_ID),str(self.frames_in_file),str(frame_ID),repr(timestamp)]) + '\n')
+        self.frames_in_file = self.frames_in_file + 1
+
+    def close(self):
+        if self.tiff is not None:
+            self.tiff.close()
+            self.tiff = None
+        if self.timestamp_file is not None:
+            self.timestamp_file.close()
+            self.timestamp_file = None
+
+
+class OmeZarrWriter(object):
+    """
+    :brief: writes frames into a single OME-Zarr image (axes t, [c,] y, x) with
+        one chunk per frame, and the frame IDs and timestamps as arrays next to it.
+        frames go to separate chunks, so several threads can write at once.
+    """
+    supports_parallel_writes = True
+
+    def __init__(self, growth_step=256):
+        if zarr is None:
+            raise RuntimeError('ome-zarr output requires zarr')
+        self.growth_step = growth_step
+        self.group = None
+        self.image_array = None
+        self.lock = threading.Lock()
+        self.num_frames = 0
+
+    def open(self, path):
+        self.group = zarr.open_group(os.path.join(path,'frames.ome.zarr'),mode='w')
+        self.image_array = None
+        self.num_frames = 0
+
+    def _create_arrays(self, image):
+        frame_shape = image.shape if image.ndim == 2 else (image.shape[2],) + image.shape[:2]
+        self.image_array = self.group.create_dataset('0',shape=(0,) + frame_shape,chunks=(1,) + frame_shape,dtype=image.dtype)
+        self.frame_ID_array = self.group.create_dataset('frame_ID',shape=(0,),chunks=(self.growth_step,),dtype=np.int64,fill_value=-1)
+        self.timestamp_array = self.group.create_dataset('timestamp',shape=(0,),chunks=(self.growth_step,),dtype=np.float64,fill_value=np.nan)
+        axes = [{'name':'t','type':'time','unit':'second'}]
+        if image.ndim == 3:
+            axes.append({'name':'c','type':'channel'})
+        axes = axes + [{'name':'y','type':'space'},{'name':'x','type':'space'}]
+        self.group.attrs['multiscales'] = [{
+            'version': '0.4',
+            'axes': axes,
+            'datasets': [{'path':'0','coordinateTransformations':[{'type':'scale','scale':[1.0]*len(axes)}]}],
+        }]
+
+    def write(self, image, counter, frame_ID, timestamp):
+        with self.lock:
+            if self.image_array is None:
+                self._create_arrays(image)
+            if counter >= self.image_array.shape[0]:
+                # grow in steps, since resizing rewrites the array metadata
+                length = (counter//self.growth_step + 1)*self.growth_step
+                self.image_array.resize((length,) + self.image_array.shape[1:])
+                self.frame_ID_array.resize((length,))
+                self.timestamp_array.resize((length,))
+            self.num_frames = max(self.num_frames,counter + 1)
+        if image.ndim == 3:
+            image = np.moveaxis(image,-1,0)
+        self.image_array[counter] = image
+        with self.lock:
+            # frame_ID and timestamp chunks hold many frames, so don't write them concurrently
+            self.frame_ID_array[counter] = frame_ID
+            self.timestamp_array[counter] = timestamp
+
+    def close(self):
+        if self.image_array is not None:
+            self.image_array.resize((self.num_frames,) + self.image_array.shape[1:])
+            self.frame_ID_array.resize((self.num_frames,))
+            self.timestamp_array.resize((self.num_frames,))
+        self.group = None
+        self.image_array = None
+
+
+def create_writer(output_format, image_format='bmp'):
+    if output_format == 'files':
+        return ImageFileWriter(image_format=image_format)
+    elif output_format == 'tiff_stack':
+        return TiffStackWriter()
+    elif output_format == 'ome_zarr':
+        return OmeZarrWriter()
+    raise ValueError('unknown image saver output format ' + str(output_format))
+
+
+class FrameSaver(object):
+    """
+    :brief: saves frames from a ring buffer with a pool of writer threads.
+        frames are numbered in the order they're enqueued, whichever thread
+        ends up writing them.
+    """
+    def __init__(self, writer, num_writer_threads=4, buffer_size=32, max_wait_s=None):
+        self.writer = writer
+        if not writer.supports_parallel_writes:
+            num_writer_threads = 1
+        self.num_writer_threads = num_writer_threads
+        self.max_wait_s = max_wait_s # None: block until a slot is free, never drop
+        self.buffer = FrameRingBuffer(buffer_size)
+        self.stats = SaverStats()
+        self.counter = 0
+        self.counter_lock = threading.Lock()
+        self.outstanding = 0
+        self.outstanding_cv = threading.Condition()
+        self.threads = []
+        self.stop_signal_received = False
+
+    def start(self, path):
+        self.writer.open(path)
+        self.counter = 0
+        self.stats.reset()
+        self.stop_signal_received = False
+        self.threads = [threading.Thread(target=self.process_buffer,daemon=True) for i in range(self.num_writer_threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def enqueue(self, image, frame_ID, timestamp):
+        """
+        :return: False if the frame was dropped because no slot became free
+            within max_wait_s
+        """
+        with self.counter_lock:
+            counter = self.counter
+            self.counter = self.counter + 1
+        with self.stats.lock:
+            self.stats.frames_received = self.stats.frames_received + 1
+        wait_start = time.time()
+        blocked = self.buffer.num_free() == 0
+        with self.outstanding_cv:
+            self.outstanding = self.outstanding + 1
+        if not self.buffer.put(image,(counter,frame_ID,timestamp),timeout=self.max_wait_s):
+            with self.outstanding_cv:
+                self.outstanding = self.outstanding - 1
+                self.outstanding_cv.notify_all()
+            with self.stats.lock:
+                self.stats.frames_dropped = self.stats.frames_dropped + 1
+            return False
+        with self.stats.lock:
+            if blocked:
+                self.stats.blocked_count = self.stats.blocked_count + 1
+                self.stats.blocked_time_s = self.stats.blocked_time_s + time.time() - wait_start
+            self.stats.max_frames_pending = max(self.stats.max_frames_pending,self.buffer.num_slots - self.buffer.num_free())
+        return True
+
+    def process_buffer(self):
+        while True:
+            index, image, metadata = self.buffer.get()
+            if index is None:
+                return
+            counter, frame_ID, timestamp = metadata
+            t0 = time.time()
+            try:
+                self.writer.write(image,counter,frame_ID,timestamp)
+                succeeded = True
+            except Exception as e:
+                print('failed to save frame ' + str(frame_ID) + ': ' + str(e))
+                succeeded = False
+            with self.stats.lock:
+                if succeeded:
+                    self.stats.frames_saved = self.stats.frames_saved + 1
+                    self.stats.bytes_saved = self.stats.bytes_saved + image.nbytes
+                    self.stats.write_time_s = self.stats.write_time_s + time.time() - t0
+                else:
+                    self.stats.frames_failed = self.stats.frames_failed + 1
+            self.buffer.release(index)
+            with self.outstanding_cv:
+                self.outstanding = self.outstanding - 1
+                self.outstanding_cv.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        :brief: wait until every enqueued frame has been written
+        """
+        with self.outstanding_cv:
+            return self.outstanding_cv.wait_for(lambda: self.outstanding == 0,timeout=timeout)
+
+    def stop(self):
+        self.flush()
+        for thread in self.threads:
+            self.buffer.wake_consumer()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.writer.close()
+
+
+def write_tile(saving_path, image):
+    """
+    :brief: runs in a TileSaver process
+    :return: seconds spent encoding and writing the image
+    """
+    t0 = time.time()
+    iio.imwrite(saving_path,image)
+    return time.time() - t0
+
+
+class TileSaver(object):
+    """
+    :brief: encodes and writes multipoint images in a pool of processes, so that
+        the acquisition can move on to the next image right away. at most
+        max_pending_tiles images are waiting to be written at any time - beyond
+        that, save() blocks until one is done. with num_processes = 0, images are
+        written in the calling thread, like before.
+    """
+    def __init__(self, num_processes=4, max_pending_tiles=16):
+        self.num_processes = num_processes
+        self.max_pending_tiles = max_pending_tiles
+        self.pool = None
+        self.slots = threading.BoundedSemaphore(max_pending_tiles)
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.tiles_saved = 0
+        self.tiles_failed = 0
+        self.blocked_time_s = 0 # time save() waited for a free slot
+        self.write_time_s = 0 # encoding and writing, summed over processes
+        self.flush_time_s = 0 # time flush() waited for the remaining images
+
+    def start(self):
+        # the pool is kept between acquisitions, since starting the processes takes a while
+        if self.num_processes > 0 and self.pool is None:
+            # spawn rather than fork - the acquisition process is full of (qt) threads
+            self.pool = ProcessPoolExecutor(max_workers=self.num_processes,mp_context=multiprocessing.get_context('spawn'))
+
+    def save(self, saving_path, image):
+        if self.pool is None:
+            t = write_tile(saving_path,image)
+            self.write_time_s = self.write_time_s + t
+            self.tiles_saved = self.tiles_saved + 1
+            return
+        t0 = time.time()
+        self.slots.acquire()
+        self.blocked_time_s = self.blocked_time_s + time.time() - t0
+        # the image is pickled in the background after submit() returns, so the
+        # caller must not be able to change it
+        future = self.pool.submit(write_tile,saving_path,np.array(image,copy=True))
+        with self.lock:
+            self.pending.add(future)
+        future.add_done_callback(lambda future, saving_path=saving_path: self._on_tile_saved(future,saving_path))
+
+    def _on_tile_saved(self, future, saving_path):
+        with self.lock:
+            self.pending.discard(future)
+            try:
+                self.write_time_s = self.write_time_s + future.result()
+                self.tiles_saved = self.tiles_saved + 1
+            except Exception as e:
+                self.tiles_failed = self.tiles_failed + 1
+                print('failed to save ' + saving_path + ': ' + str(e))
+        self.slots.release()
+
+    def flush(self):
+        """
+        :brief: wait until every image passed to save() has been written
+        """
+        t0 = time.time()
+        with self.lock:
+            pending = list(self.pending)
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass # reported by _on_tile_saved
+        self.flush_time_s = self.flush_time_s + time.time() - t0
+
+    def close(self):
+        self.flush()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'tiles_saved': self.tiles_saved,
+                'tiles_failed': self.tiles_failed,
+                'tiles_pending': len(self.pending),
+                'blocked_time_s': self.blocked_time_s,
+                'write_time_s': self.write_time_s,
+                'flush_time_s': self.flush_time_s,
+            }
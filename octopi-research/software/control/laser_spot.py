@@ -0,0 +1,109 @@
+import math
+
+import cv2
+import numpy as np
+import scipy.signal
+
+
+class SpotCentroid(object):
+    """
+    :brief: locates the laser spot(s) reflected onto the focus camera, for the laser
+        (reflection) autofocus.
+        with has_two_interfaces (e.g. air-glass and glass-water), two spots are found
+        along x in a band of rows around the brightest row, and the centroid of one
+        of them (the glass-water one with use_glass_top) is returned; otherwise the
+        centroid of the whole frame.
+        frames are processed as the integer data the camera delivers, and the
+        centroid of each roi is taken in a single pass (image moments) instead of
+        on float coordinate grids. the spot row and peak positions are kept between
+        calls: the next frame is first searched within search_margin_pixels of
+        them, and the full frame is only searched again when the spots are not found
+        there. call reset() when the camera roi changes.
+    """
+    def __init__(self,has_two_interfaces=True,use_glass_top=True,band_half_height=96,spot_half_width=64,min_peak_distance=100,search_margin_pixels=32):
+        self.has_two_interfaces = has_two_interfaces
+        self.use_glass_top = use_glass_top
+        self.band_half_height = band_half_height
+        self.spot_half_width = spot_half_width
+        self.min_peak_distance = min_peak_distance
+        self.search_margin_pixels = search_margin_pixels
+        self.spot_spacing_pixels = None # spacing between the spots from the two interfaces (unit: pixel)
+        self.full_searches = 0
+        self.reset()
+
+    def reset(self):
+        self.spot_row = None
+        self.peaks = None
+
+    def calculate(self,image):
+        if self.has_two_interfaces == False:
+            return self._centroid(image,0.2)
+        # band of rows around the spots
+        y0 = self._find_spot_row(image)
+        band_top = max(0,y0-self.band_half_height)
+        band = image[band_top:y0+self.band_half_height,:]
+        # signal along x
+        profile = np.add.reduce(band,axis=0,dtype=np.int64)
+        peak_0_location, peak_1_location = self._find_peaks(profile)
+        self.spot_spacing_pixels = peak_1_location-peak_0_location
+        # choose which surface to use
+        if self.use_glass_top:
+            x1 = peak_1_location
+        else:
+            x1 = peak_0_location
+        left = max(0,x1-self.spot_half_width)
+        right = min(band.shape[1]-1,x1+self.spot_half_width)
+        x,y = self._centroid(band[:,left:right],0.1)
+        return left+x, band_top+y
+
+    def _centroid(self,image,threshold):
+        # intensity-weighted centroid, with the minimum subtracted and pixels below threshold*(max-min) left out
+        I_min, I_max, _, _ = cv2.minMaxLoc(image)
+        if I_max == I_min:
+            return float('nan'), float('nan')
+        I = cv2.subtract(image,I_min)
+        # THRESH_TOZERO keeps I > thresh - the same as I >= threshold*(I_max-I_min) for integer data
+        thresh = math.ceil(threshold*(I_max-I_min)) - 1 if np.issubdtype(image.dtype,np.integer) else threshold*(I_max-I_min)
+        _, I = cv2.threshold(I,thresh,0,cv2.THRESH_TOZERO)
+        moments = cv2.moments(I)
+        return moments['m10']/moments['m00'], moments['m01']/moments['m00']
+
+    def _find_spot_row(self,image):
+        if self.spot_row is not None:
+            top = max(0,self.spot_row-self.search_margin_pixels)
+            bottom = min(image.shape[0],self.spot_row+self.search_margin_pixels+1)
+            rows = np.add.reduce(image[top:bottom],axis=1,dtype=np.int64)
+            i = int(np.argmax(rows))
+            # a maximum on the edge of the window may continue outside it
+            if (0 < i or top == 0) and (i < len(rows)-1 or bottom == image.shape[0]):
+                self.spot_row = top + i
+                return self.spot_row
+        self.spot_row = int(np.argmax(np.add.reduce(image,axis=1,dtype=np.int64)))
+        return self.spot_row
+
+    def _find_peaks(self,profile):
+        if self.peaks is not None:
+            peaks = []
+            for peak in self.peaks:
+                left = max(0,peak-self.search_margin_pixels)
+                right = min(len(profile),peak+self.search_margin_pixels+1)
+                window = profile[left:right]
+                # the middle of a flat peak, like find_peaks (which picks either of two separate equal maxima)
+                maxima = np.flatnonzero(window == window.max())
+                plateau_start = len(maxima) - 1
+                while plateau_start > 0 and maxima[plateau_start-1] == maxima[plateau_start]-1:
+                    plateau_start = plateau_start - 1
+                i = int((maxima[plateau_start]+maxima[-1])//2)
+                if (0 < i or left == 0) and (i < right-left-1 or right == len(profile)):
+                    peaks.append(left+i)
+            # still two separate spots, the brighter one first
+            if len(peaks) == 2 and abs(peaks[1]-peaks[0]) >= self.min_peak_distance and profile[peaks[0]] >= profile[peaks[1]]:
+                self.peaks = peaks
+                return peaks
+        self.full_searches = self.full_searches + 1
+        peak_locations,_ = scipy.signal.find_peaks(profile,distance=self.min_peak_distance)
+        idx = np.argsort(profile[peak_locations])
+        peak_0_location = peak_locations[idx[-1]]
+        peak_1_location = peak_locations[idx[-2]] # for air-glass-water, the smaller peak corresponds to the glass-water interface
+        self.peaks = [int(peak_0_location),int(peak_1_location)]
+        return self.peaks
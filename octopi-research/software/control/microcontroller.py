@@ -3,8 +3,12 @@ import serial
 import sys
 import serial.tools.list_ports
 import time
+import struct
 import numpy as np
 import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
 from crc import CrcCalculator, Crc8
 
 from control._def import *
@@ -21,6 +25,130 @@ from qtpy.QtGui import *
 
 # to do (7/28/2021) - add functions for configuring the stepper motors
 
+# packet from the mcu:
+# command ID (1 byte), execution status (1 byte), X, Y, Z and theta pos (4 bytes each, signed, big endian),
+# buttons and switches (1 byte), reserved (4 bytes), CRC (1 byte)
+MCU_PACKET = struct.Struct('>BBiiiiB4xB')
+
+class PacketReader():
+    """
+    :brief: frames fixed-length packets from a serial port. reads block (up to the
+        port's timeout) until data arrives, and take everything that has arrived at
+        once. every packet carries the complete mcu state, so only the latest valid
+        packet is returned. packets are validated with their CRC. the packet
+        boundaries are only trusted once two consecutive packets with valid nonzero
+        CRCs are found, and found again the same way after a bad packet. firmware
+        that doesn't send CRCs (the CRC byte and the reserved bytes are always 0) is
+        detected from several whole packets like that, and then packets are framed
+        by how they arrive, like before.
+    """
+    LEGACY_SYNC_PACKETS = 4 # whole packets with zero CRCs that have to arrive before trusting firmware without CRCs
+    LEGACY_ZERO_BYTES = 5 # the reserved bytes and the CRC byte at the end of a packet
+
+    def __init__(self,serial,packet_length,crc_calculator):
+        self.serial = serial
+        self.packet_length = packet_length
+        self.crc_calculator = crc_calculator
+        self.buffer = bytearray()
+        self.crc_seen = False # becomes True once the mcu has sent valid nonzero CRCs
+        self.legacy = False # becomes True once the mcu is found to send no CRCs
+        self.aligned = False # whether the buffer starts at a packet boundary
+        self.packets_received = 0
+        self.packets_superseded = 0
+        self.crc_errors = 0
+        self.bytes_discarded = 0
+
+    def read(self):
+        """
+        :return: the latest valid packet received, or None
+        """
+        data = self.serial.read(max(1,self.serial.in_waiting))
+        if not data:
+            # the mcu sends a packet every 10 ms, so after a pause anything left is a fragment
+            if self.buffer:
+                self._discard(len(self.buffer))
+                self.aligned = self.legacy
+            return None
+        self.buffer += data
+        return self.parse()
+
+    def parse(self):
+        L = self.packet_length
+        if self.legacy and len(self.buffer) % L != 0:
+            # without CRCs, a packet boundary is only known when whole packets have arrived
+            if len(self.buffer) > 4*L:
+                self._discard(len(self.buffer))
+            return None
+        if not self.aligned and not self._align():
+            return None
+        packet = None
+        while len(self.buffer) >= L:
+            start = (len(self.buffer)//L - 1)*L # the latest complete packet
+            if self._is_valid(self.buffer,start):
+                packet = bytes(self.buffer[start:start+L])
+                self.packets_received = self.packets_received + 1
+                self.packets_superseded = self.packets_superseded + start//L
+                del self.buffer[:start+L]
+            else:
+                self.crc_errors = self.crc_errors + 1
+                if self.legacy:
+                    self._discard(len(self.buffer))
+                    break
+                # bytes were lost or corrupted, so the packet boundaries are unknown again
+                self.aligned = False
+                if not self._align():
+                    break
+        return packet
+
+    def _align(self):
+        """
+        :brief: finds the packet boundaries, discarding the bytes before them
+        :return: whether the buffer now starts at a packet boundary
+        """
+        L = self.packet_length
+        if self._sync_to_crc():
+            self.aligned = True
+            return True
+        if not self.crc_seen and self._looks_like_legacy():
+            print('microcontroller packets have no CRC, framing them by how they arrive')
+            self.legacy = True
+            self.aligned = True
+            return True
+        if len(self.buffer) > (self.LEGACY_SYNC_PACKETS + 1)*L:
+            # start again from the next data, which also brings arrivals back in line with packets
+            self._discard(len(self.buffer))
+        return False
+
+    def _sync_to_crc(self):
+        # look for two consecutive packets with valid nonzero CRCs, which won't happen by chance
+        L = self.packet_length
+        calculate_checksum = self.crc_calculator.calculate_checksum
+        for i in range(len(self.buffer) - 2*L + 1):
+            if all(self.buffer[j+L-1] != 0 and calculate_checksum(self.buffer[j:j+L-1]) == self.buffer[j+L-1] for j in (i,i+L)):
+                self._discard(i)
+                self.crc_seen = True
+                return True
+        return False
+
+    def _looks_like_legacy(self):
+        # several whole packets have arrived, all ending in the zeros of firmware without CRCs
+        L = self.packet_length
+        n = len(self.buffer)//L
+        if len(self.buffer) % L != 0 or n < self.LEGACY_SYNC_PACKETS:
+            return False
+        return all(not any(self.buffer[(i+1)*L-self.LEGACY_ZERO_BYTES:(i+1)*L]) for i in range(n))
+
+    def _is_valid(self,buffer,start):
+        L = self.packet_length
+        if self.legacy:
+            # firmware that doesn't send CRCs leaves the CRC byte at 0
+            return buffer[start+L-1] == 0
+        return self.crc_calculator.calculate_checksum(buffer[start:start+L-1]) == buffer[start+L-1]
+
+    def _discard(self,n):
+        self.bytes_discarded = self.bytes_discarded + n
+        del self.buffer[:n]
+
 class Microcontroller():    
     def __init__(self,version='Arduino Due',sn=None,parent=None):
         self.serial = None
@@ -41,11 +169,20 @@ class Microcontroller():
         self.joystick_button_pressed = 0
         self.signal_joystick_button_pressed_event = False
         self.switch_state = 0
+        self.packet_timestamp = None # when the packet the current state comes from was received
 
         self.last_command = None
         self.timeout_counter = 0
         self.last_command_timestamp = time.time()
 
+        # commands sent but not yet completed, oldest first, as [cmd id, command, future]. the mcu
+        # executes commands in order and reports the id of the last one it received, with a status
+        # that covers everything it has received, so a completed report completes all commands up to it
+        self.commands_in_flight = deque()
+        self.command_lock = threading.Condition()
+        self.batched_commands = None
+        self.batch_depth = 0
+
         self.crc_calculator = CrcCalculator(Crc8.CCITT,table_based=True)
         self.retry = 0
 
@@ -67,9 +204,11 @@ class Microcontroller():
         if len(controller_ports) > 1:
             print('multiple controller found - using the first')
         
-        self.serial = serial.Serial(controller_ports[0],2000000)
+        # reads time out so that the read thread can be stopped
+        self.serial = serial.Serial(controller_ports[0],2000000,timeout=0.1)
         time.sleep(0.2)
         print('controller connected')
+        self.packet_reader = PacketReader(self.serial,self.rx_buffer_length,self.crc_calculator)
 
         self.new_packet_callback_external = None
         self.terminate_reading_received_packet_thread = False
@@ -624,93 +763,140 @@ class Microcontroller():
         self.set_pin_level(MCU_PINS.AF_LASER,0)
 
     def send_command(self,command):
-        self._cmd_id = (self._cmd_id + 1)%256
-        command[0] = self._cmd_id
-        command[-1] = self.crc_calculator.calculate_checksum(command[:-1])
-        self.serial.write(command)
-        self.mcu_cmd_execution_in_progress = True
-        self.last_command = command
-        self.timeout_counter = 0
-        self.last_command_timestamp = time.time()
-        self.retry = 0
+        """
+        :return: a concurrent.futures.Future that completes, with the time of the
+            acknowledgement, when the mcu reports that the command has been executed
+        :raises TimeoutError: if MAX_COMMANDS_IN_FLIGHT commands are waiting and the
+            mcu doesn't complete any of them within COMMANDS_IN_FLIGHT_TIMEOUT_S
+        """
+        with self.command_lock:
+            if self.batched_commands is None and threading.current_thread() is not self.thread_read_received_packet:
+                if not self.command_lock.wait_for(lambda: len(self.commands_in_flight) < MicrocontrollerDef.MAX_COMMANDS_IN_FLIGHT,timeout=MicrocontrollerDef.COMMANDS_IN_FLIGHT_TIMEOUT_S):
+                    raise TimeoutError('the microcontroller has not completed command ' + str(self.commands_in_flight[0][0]) + ' in ' + str(MicrocontrollerDef.COMMANDS_IN_FLIGHT_TIMEOUT_S) + ' s')
+            self._cmd_id = (self._cmd_id + 1)%256
+            command[0] = self._cmd_id
+            command[-1] = self.crc_calculator.calculate_checksum(command[:-1])
+            future = Future()
+            self.commands_in_flight.append([self._cmd_id,command,future])
+            if self.batched_commands is not None:
+                self.batched_commands.append(command)
+            else:
+                self.serial.write(command)
+            self.mcu_cmd_execution_in_progress = True
+            self.last_command = command
+            self.timeout_counter = 0
+            self.last_command_timestamp = time.time()
+            self.retry = 0
+        return future
+
+    @contextmanager
+    def batch(self):
+        """
+        :brief: commands sent inside the with block are written to the mcu together when
+            it ends, e.g. setting the illumination and triggering the camera. they're still
+            executed in order, and each has its own future. a nested batch is part of the
+            outermost one.
+        """
+        with self.command_lock:
+            if self.batch_depth == 0:
+                self.batched_commands = []
+            self.batch_depth = self.batch_depth + 1
+        try:
+            yield
+        finally:
+            with self.command_lock:
+                self.batch_depth = self.batch_depth - 1
+                if self.batch_depth == 0:
+                    commands = self.batched_commands
+                    self.batched_commands = None
+                    if commands:
+                        self.serial.write(b''.join(commands))
 
     def resend_last_command(self):
-        self.serial.write(self.last_command)
+        # resend every command the mcu hasn't reported yet
+        with self.command_lock:
+            commands = [command for cmd_id, command, future in self.commands_in_flight]
+            if not commands and self.last_command is not None:
+                commands = [self.last_command]
+            self._resend(commands)
+
+    def _resend(self,commands):
+        self.serial.write(b''.join(commands))
         self.mcu_cmd_execution_in_progress = True
         self.timeout_counter = 0
         self.retry = self.retry + 1
 
+    def wait_for_commands(self,timeout=None):
+        """
+        :return: True once every command sent has been completed, False if that takes longer than timeout
+        """
+        with self.command_lock:
+            return self.command_lock.wait_for(lambda: not self.commands_in_flight,timeout=timeout)
+
     def read_received_packet(self):
         while self.terminate_reading_received_packet_thread == False:
-            # wait to receive data
-            if self.serial.in_waiting==0:
-                continue
-            if self.serial.in_waiting % self.rx_buffer_length != 0:
+            try:
+                packet = self.packet_reader.read()
+            except serial.SerialException as e:
+                print('error reading from the microcontroller: ' + str(e))
+                time.sleep(0.1)
                 continue
-            
-            # get rid of old data
-            num_bytes_in_rx_buffer = self.serial.in_waiting
-            if num_bytes_in_rx_buffer > self.rx_buffer_length:
-                # print('getting rid of old data')
-                for i in range(num_bytes_in_rx_buffer-self.rx_buffer_length):
-                    self.serial.read()
-            
-            # read the buffer
-            msg=[]
-            for i in range(self.rx_buffer_length):
-                msg.append(ord(self.serial.read()))
-
-            # parse the message
-            '''
-            - command ID (1 byte)
-            - execution status (1 byte)
-            - X pos (4 bytes)
-            - Y pos (4 bytes)
-            - Z pos (4 bytes)
-            - Theta (4 bytes)
-            - buttons and switches (1 byte)
-            - reserved (4 bytes)
-            - CRC (1 byte)
-            '''
-            self._cmd_id_mcu = msg[0]
-            self._cmd_execution_status = msg[1]
-            if (self._cmd_id_mcu == self._cmd_id) and (self._cmd_execution_status == CMD_EXECUTION_STATUS.COMPLETED_WITHOUT_ERRORS):
-                if self.mcu_cmd_execution_in_progress == True:
-                    self.mcu_cmd_execution_in_progress = False
-                    print('   mcu command ' + str(self._cmd_id) + ' complete')
-            elif self._cmd_id_mcu != self._cmd_id and time.time() - self.last_command_timestamp > 5 and self.last_command != None:
-                self.timeout_counter = self.timeout_counter + 1
-                if self.timeout_counter > 10:
-                    self.resend_last_command()
-                    print('      *** resend the last command')
-            elif self._cmd_execution_status == CMD_EXECUTION_STATUS.CMD_CHECKSUM_ERROR:
+            if packet is not None:
+                self.process_packet(packet,time.time())
+
+    def process_packet(self,packet,timestamp):
+        [self._cmd_id_mcu,self._cmd_execution_status,x_pos,y_pos,z_pos,theta_pos,button_and_switch_state,crc] = MCU_PACKET.unpack(packet)
+        completed = []
+        with self.command_lock:
+            in_flight_ids = [cmd_id for cmd_id, command, future in self.commands_in_flight]
+            if self._cmd_execution_status == CMD_EXECUTION_STATUS.CMD_CHECKSUM_ERROR and self.commands_in_flight:
+                # the mcu drops everything that has arrived after a corrupted command (whose id may be corrupted too)
+                n = in_flight_ids.index(self._cmd_id_mcu) if self._cmd_id_mcu in in_flight_ids else 0
                 print('! cmd checksum error, resending command')
                 if self.retry > 10:
                     print('!! resending command failed for more than 10 times, the program will exit')
                     sys.exit(1)
                 else:
-                    self.resend_last_command()
-            # print('command id ' + str(self._cmd_id) + '; mcu command ' + str(self._cmd_id_mcu) + ' status: ' + str(msg[1]) )
-
-            self.x_pos = self._payload_to_int(msg[2:6],MicrocontrollerDef.N_BYTES_POS) # unit: microstep or encoder resolution
-            self.y_pos = self._payload_to_int(msg[6:10],MicrocontrollerDef.N_BYTES_POS) # unit: microstep or encoder resolution
-            self.z_pos = self._payload_to_int(msg[10:14],MicrocontrollerDef.N_BYTES_POS) # unit: microstep or encoder resolution
-            self.theta_pos = self._payload_to_int(msg[14:18],MicrocontrollerDef.N_BYTES_POS) # unit: microstep or encoder resolution
-
-            self.button_and_switch_state = msg[18]
-            # joystick button
-            tmp = self.button_and_switch_state & (1 << BIT_POS_JOYSTICK_BUTTON)
-            joystick_button_pressed = tmp > 0
-            if self.joystick_button_pressed == False and joystick_button_pressed == True:
-                self.signal_joystick_button_pressed_event = True
-                self.ack_joystick_button_pressed()
-            self.joystick_button_pressed = joystick_button_pressed
-            # switch
-            tmp = self.button_and_switch_state & (1 << BIT_POS_SWITCH)
-            self.switch_state = tmp > 0
-
-            if self.new_packet_callback_external is not None:
-                self.new_packet_callback_external(self)
+                    self._resend([command for cmd_id, command, future in list(self.commands_in_flight)[n:]])
+            elif self._cmd_id_mcu in in_flight_ids:
+                if self._cmd_execution_status == CMD_EXECUTION_STATUS.COMPLETED_WITHOUT_ERRORS:
+                    for i in range(in_flight_ids.index(self._cmd_id_mcu)+1):
+                        completed.append(self.commands_in_flight.popleft()[2])
+                    if not self.commands_in_flight:
+                        self.mcu_cmd_execution_in_progress = False
+                        print('   mcu command ' + str(self._cmd_id_mcu) + ' complete')
+                    self.command_lock.notify_all()
+            elif self.commands_in_flight and time.time() - self.last_command_timestamp > 5:
+                # the mcu hasn't received any of the commands in flight
+                self.timeout_counter = self.timeout_counter + 1
+                if self.timeout_counter > 10:
+                    self._resend([command for cmd_id, command, future in self.commands_in_flight])
+                    print('      *** resend the last command')
+        for future in completed:
+            future.set_result(timestamp)
+        # print('command id ' + str(self._cmd_id) + '; mcu command ' + str(self._cmd_id_mcu) + ' status: ' + str(self._cmd_execution_status) )
+
+        # unit: microstep or encoder resolution
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+        self.z_pos = z_pos
+        self.theta_pos = theta_pos
+        self.packet_timestamp = timestamp
+
+        self.button_and_switch_state = button_and_switch_state
+        # joystick button
+        tmp = self.button_and_switch_state & (1 << BIT_POS_JOYSTICK_BUTTON)
+        joystick_button_pressed = tmp > 0
+        if self.joystick_button_pressed == False and joystick_button_pressed == True:
+            self.signal_joystick_button_pressed_event = True
+            self.ack_joystick_button_pressed()
+        self.joystick_button_pressed = joystick_button_pressed
+        # switch
+        tmp = self.button_and_switch_state & (1 << BIT_POS_SWITCH)
+        self.switch_state = tmp > 0
+
+        if self.new_packet_callback_external is not None:
+            self.new_packet_callback_external(self)
 
     def get_pos(self):
         return self.x_pos, self.y_pos, self.z_pos, self.theta_pos
@@ -725,12 +911,9 @@ class Microcontroller():
         self.new_packet_callback_external = function
 
     def wait_till_operation_is_completed(self, TIMEOUT_LIMIT_S=5):
-        timestamp_start = time.time()
-        while self.is_busy():
-            time.sleep(0.02)
-            if time.time() - timestamp_start > TIMEOUT_LIMIT_S:
-                print('Error - microcontroller timeout, the program will exit')
-                sys.exit(1)
+        if not self.wait_for_commands(timeout=TIMEOUT_LIMIT_S):
+            print('Error - microcontroller timeout, the program will exit')
+            sys.exit(1)
 
     def _int_to_payload(self,signed_int,number_of_bytes):
         if signed_int >= 0:
@@ -781,12 +964,17 @@ class Microcontroller_Simulation():
         self.signal_joystick_button_pressed_event = False
         self.switch_state = 0
 
+        self.packet_timestamp = None
+
          # for simulation
         self.timestamp_last_command = time.time() # for simulation only
         self._mcu_cmd_execution_status = None
         self.timer_update_command_execution_status = QTimer()
         self.timer_update_command_execution_status.timeout.connect(self._simulation_update_cmd_execution_status)
 
+        self.commands_in_flight = deque()
+        self.command_lock = threading.Condition()
+
         self.new_packet_callback_external = None
         self.terminate_reading_received_packet_thread = False
         self.thread_read_received_packet = threading.Thread(target=self.read_received_packet, daemon=True)
@@ -1058,6 +1246,12 @@ class Microcontroller_Simulation():
                 if self._mcu_cmd_execution_status !=  CMD_EXECUTION_STATUS.COMPLETED_WITHOUT_ERRORS:
                     self._mcu_cmd_execution_status = CMD_EXECUTION_STATUS.COMPLETED_WITHOUT_ERRORS
                     print('   mcu command ' + str(self._cmd_id) + ' complete')
+                with self.command_lock:
+                    completed = [future for cmd_id, command, future in self.commands_in_flight]
+                    self.commands_in_flight.clear()
+                    self.command_lock.notify_all()
+                for future in completed:
+                    future.set_result(time.time())
 
             # read and parse message
             msg=[]
@@ -1079,6 +1273,7 @@ class Microcontroller_Simulation():
             # self.theta_pos = utils.unsigned_to_signed(msg[14:18],MicrocontrollerDef.N_BYTES_POS) # unit: microstep or encoder resolution
             
             self.button_and_switch_state = msg[18]
+            self.packet_timestamp = time.time()
 
             if self.new_packet_callback_external is not None:
                 self.new_packet_callback_external(self)
@@ -1153,9 +1348,13 @@ class Microcontroller_Simulation():
         self.set_pin_level(MCU_PINS.AF_LASER,0)
 
     def send_command(self,command):
-        self._cmd_id = (self._cmd_id + 1)%256
-        command[0] = self._cmd_id
-        command[-1] = self.crc_calculator.calculate_checksum(command[:-1])
+        with self.command_lock:
+            self.timestamp_last_command = time.time()
+            self._cmd_id = (self._cmd_id + 1)%256
+            command[0] = self._cmd_id
+            command[-1] = self.crc_calculator.calculate_checksum(command[:-1])
+            future = Future()
+            self.commands_in_flight.append([self._cmd_id,command,future])
         self.mcu_cmd_execution_in_progress = True
         # for simulation
         self._mcu_cmd_execution_status = CMD_EXECUTION_STATUS.IN_PROGRESS
@@ -1164,6 +1363,22 @@ class Microcontroller_Simulation():
         # print('start timer')
         # timer cannot be started from another thread
         self.timestamp_last_command = time.time()
+        return future
+
+    @contextmanager
+    def batch(self):
+        # commands aren't sent anywhere in the simulation
+        yield
+
+    def wait_for_commands(self,timeout=None):
+        with self.command_lock:
+            return self.command_lock.wait_for(lambda: not self.commands_in_flight,timeout=timeout)
+
+    def _simulation_build_packet(self):
+        # the packet the mcu would send for the simulated state, e.g. for testing PacketReader
+        packet = bytearray(MCU_PACKET.pack(self._cmd_id,self._mcu_cmd_execution_status or 0,self.x_pos,self.y_pos,self.z_pos,self.theta_pos,self.button_and_switch_state,0))
+        packet[-1] = self.crc_calculator.calculate_checksum(packet[:-1])
+        return bytes(packet)
 
     def _simulation_update_cmd_execution_status(self):
         # print('simulation - MCU command execution finished')
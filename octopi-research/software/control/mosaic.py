@@ -0,0 +1,139 @@
+import gc
+import math
+import os
+import re
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+
+class MosaicPyramid(object):
+    """
+    :brief: mosaic of the fovs of a multipoint acquisition, each placed by the stage
+        coordinates it was taken at, for the tiled preview.
+        the mosaic is kept, per channel, as a pyramid of levels of shape (Nz, height, width)
+        (with a 3rd axis for rgb): level 0 is downsample times smaller than the camera
+        frames, and each next level is half the size of the previous one, down to
+        min_level_size. adding a tile writes it (resized once) into level 0 and updates
+        only the region it covers in the other levels, so that each tile costs the same
+        however large the scan is. the levels are memory-mapped files - in path, or in a
+        temporary folder that close() removes - so the mosaic does not have to fit in
+        memory, and a viewer that reads just the part of the level it shows (e.g. a napari
+        multiscale layer) does not load the rest. the levels are written back to the files
+        every flush_interval tiles, so that the memory they take can be reclaimed.
+        coordinates_mm are the (x,y) of the fovs that will be added, in mm, and set the
+        extent of the mosaic; tiles outside it are cropped.
+    """
+    def __init__(self,coordinates_mm,pixel_size_um,Nz=1,downsample=5,min_level_size=512,flip_y=False,path=None,flush_interval=64):
+        xy = np.asarray(coordinates_mm,dtype=float).reshape(-1,2)
+        self.x_min, self.y_min = xy.min(axis=0)
+        self.x_max, self.y_max = xy.max(axis=0)
+        self.pixel_size_mm = pixel_size_um*downsample/1000 # level 0 pixel
+        self.Nz = Nz
+        self.downsample = downsample
+        self.min_level_size = min_level_size
+        self.flip_y = flip_y # for an inverted objective, rows go along -y
+        self.flush_interval = flush_interval
+        if path is None:
+            self.path = tempfile.mkdtemp(prefix='mosaic_')
+            self.remove_on_close = True
+        else:
+            self.path = path
+            self.remove_on_close = False
+            os.makedirs(path,exist_ok=True)
+        self.tile_height = None
+        self.tile_width = None
+        self.height = None
+        self.width = None
+        self.levels = {} # channel name: [level 0, level 1, ...]
+        self.tiles_added = 0
+
+    def _init_size(self,image):
+        # the first tile sets the tile size (unit: level 0 pixels) and the size of level 0
+        self.tile_height = max(1,int(round(image.shape[0]/self.downsample)))
+        self.tile_width = max(1,int(round(image.shape[1]/self.downsample)))
+        self.height = int(math.ceil((self.y_max-self.y_min)/self.pixel_size_mm)) + self.tile_height
+        self.width = int(math.ceil((self.x_max-self.x_min)/self.pixel_size_mm)) + self.tile_width
+
+    def _init_levels(self,channel_name,image):
+        if self.tile_height is None:
+            self._init_size(image)
+        filename = re.sub(r'[^0-9a-zA-Z]+','_',channel_name) + '_' + str(len(self.levels))
+        levels = []
+        height, width = self.height, self.width
+        while True:
+            shape = (self.Nz,height,width) + image.shape[2:]
+            levels.append(np.memmap(os.path.join(self.path,filename + '_level_' + str(len(levels)) + '.dat'),dtype=image.dtype,mode='w+',shape=shape))
+            if max(height,width) <= self.min_level_size:
+                break
+            height, width = (height+1)//2, (width+1)//2
+        self.levels[channel_name] = levels
+
+    def get_levels(self,channel_name):
+        return self.levels.get(channel_name)
+
+    def add_tile(self,image,x_mm,y_mm,k,channel_name):
+        """
+        :brief: places the fov taken at (x_mm,y_mm), slice k of the z stack, into the mosaic
+        """
+        if channel_name not in self.levels:
+            self._init_levels(channel_name,image)
+        levels = self.levels[channel_name]
+        tile = cv2.resize(image,(self.tile_width,self.tile_height),interpolation=cv2.INTER_AREA)
+        if tile.ndim < image.ndim:
+            tile = tile[:,:,np.newaxis] # cv2 drops a single color axis
+        # top-left corner of the tile in level 0
+        left = int(round((x_mm-self.x_min)/self.pixel_size_mm))
+        if self.flip_y:
+            top = int(round((self.y_max-y_mm)/self.pixel_size_mm))
+        else:
+            top = int(round((y_mm-self.y_min)/self.pixel_size_mm))
+        bottom = min(top+self.tile_height,self.height)
+        right = min(left+self.tile_width,self.width)
+        top_clipped, left_clipped = max(top,0), max(left,0)
+        if bottom <= top_clipped or right <= left_clipped:
+            return
+        levels[0][k,top_clipped:bottom,left_clipped:right] = tile[top_clipped-top:bottom-top,left_clipped-left:right-left]
+        top, left = top_clipped, left_clipped
+        # each next level from the changed region of the previous one
+        for level in range(1,len(levels)):
+            previous = levels[level-1]
+            current = levels[level]
+            top, left = top//2, left//2
+            bottom, right = min((bottom+1)//2,current.shape[1]), min((right+1)//2,current.shape[2])
+            region = previous[k,2*top:min(2*bottom,previous.shape[1]),2*left:min(2*right,previous.shape[2])]
+            reduced = cv2.resize(np.ascontiguousarray(region),(right-left,bottom-top),interpolation=cv2.INTER_AREA)
+            if reduced.ndim < region.ndim:
+                reduced = reduced[:,:,np.newaxis]
+            current[k,top:bottom,left:right] = reduced
+        self.tiles_added = self.tiles_added + 1
+        if self.flush_interval and self.tiles_added % self.flush_interval == 0:
+            self.flush()
+
+    def to_stage_mm(self,row,column):
+        """
+        :brief: stage (x,y), in mm, that centers the fov on the level 0 pixel (row,column)
+        """
+        x_mm = self.x_min + (column-self.tile_width/2)*self.pixel_size_mm
+        if self.flip_y:
+            y_mm = self.y_max - (row-self.tile_height/2)*self.pixel_size_mm
+        else:
+            y_mm = self.y_min + (row-self.tile_height/2)*self.pixel_size_mm
+        return x_mm, y_mm
+
+    def flush(self):
+        for levels in self.levels.values():
+            for level in levels:
+                level.flush()
+
+    def close(self):
+        if self.remove_on_close:
+            self.levels = {}
+            # a file can't be removed on windows while it is memory-mapped, and the maps are
+            # only closed once nothing (e.g. a reference cycle in a viewer) refers to them
+            gc.collect()
+            shutil.rmtree(self.path,ignore_errors=True)
+        else:
+            self.flush()
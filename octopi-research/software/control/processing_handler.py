@@ -1,9 +1,16 @@
 import threading
 import queue
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 import pandas as pd
 import control.utils as utils
 
+SHARED_RESULT_MIN_BYTES = 65536 # arrays returned by fov tasks from this size on come back through shared memory
+
 def default_image_preprocessor(image, callable_list):
     """
     :param image: ndarray representing an image
@@ -19,13 +26,174 @@ def default_image_preprocessor(image, callable_list):
         output_image = c['func'](output_image, *c['args'],**c['kwargs'])
     return output_image
 
+class SharedFrame():
+    """
+    :brief: an image in shared memory - what is passed between processes instead
+        of the image itself
+    """
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+_attached_frames = {} # in the processing processes: shared memory name -> SharedMemory
+
+def _frame_to_array(frame):
+    # a view of the shared memory, no copy
+    shm = _attached_frames.get(frame.name)
+    if shm is None:
+        if len(_attached_frames) >= 64:
+            # buffers that were replaced by larger ones
+            for stale in _attached_frames.values():
+                stale.close()
+            _attached_frames.clear()
+        shm = shared_memory.SharedMemory(name=frame.name)
+        _attached_frames[frame.name] = shm
+    return np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)
+
+def _share_arrays(result):
+    # large arrays in a fov task result are put in new shared memory, which
+    # ProcessingHandler copies out of and unlinks
+    if isinstance(result, np.ndarray) and result.nbytes >= SHARED_RESULT_MIN_BYTES:
+        shm = shared_memory.SharedMemory(create=True, size=result.nbytes)
+        np.ndarray(result.shape, dtype=result.dtype, buffer=shm.buf)[...] = result
+        frame = SharedFrame(shm.name, result.shape, result.dtype)
+        shm.close()
+        return frame
+    if isinstance(result, (tuple, list)):
+        return type(result)(_share_arrays(r) for r in result)
+    if isinstance(result, dict):
+        return {k: _share_arrays(v) for k, v in result.items()}
+    return result
+
+def _unshare_arrays(result):
+    if isinstance(result, SharedFrame):
+        shm = shared_memory.SharedMemory(name=result.name)
+        array = np.array(np.ndarray(result.shape, dtype=result.dtype, buffer=shm.buf), copy=True)
+        shm.close()
+        shm.unlink()
+        return array
+    if isinstance(result, (tuple, list)):
+        return type(result)(_unshare_arrays(r) for r in result)
+    if isinstance(result, dict):
+        return {k: _unshare_arrays(v) for k, v in result.items()}
+    return result
+
+def run_fov_task(function, frames, args, kwargs):
+    """
+    :brief: runs in a processing process - calls function with the shared
+        frames as arrays, followed by args and kwargs
+    :return: (result, time the task started, seconds computing, seconds sharing the result)
+    """
+    t_start = time.time()
+    images = [_frame_to_array(frame) for frame in frames]
+    result = function(*images, *args, **kwargs)
+    t_computed = time.time()
+    result = _share_arrays(result)
+    return result, t_start, t_computed - t_start, time.time() - t_computed
+
+class SharedFramePool():
+    """
+    :brief: shared memory buffers that frames are copied into for the
+        processing processes. a buffer is reused once the task that used it is
+        done (and replaced when a larger frame comes along).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.free = [] # unused SharedMemory, to be reused
+        self.in_use = {} # name -> SharedMemory
+
+    def put(self, image):
+        image = np.asarray(image)
+        nbytes = max(image.nbytes, 1)
+        shm = None
+        with self.lock:
+            for i in range(len(self.free)):
+                if self.free[i].size >= nbytes:
+                    shm = self.free.pop(i)
+                    break
+        if shm is None:
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+        with self.lock:
+            self.in_use[shm.name] = shm
+        return SharedFrame(shm.name, image.shape, image.dtype)
+
+    def release(self, frame):
+        with self.lock:
+            shm = self.in_use.pop(frame.name, None)
+            if shm is not None:
+                self.free.append(shm)
+
+    def close(self):
+        with self.lock:
+            for shm in self.free + list(self.in_use.values()):
+                shm.close()
+                shm.unlink()
+            self.free = []
+            self.in_use = {}
+
+class TaskStats():
+    """
+    :brief: per-function timing of fov tasks
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tasks = {}
+            self.blocked_time_s = 0 # time submit_fov_task waited for a free task slot
+
+    def add(self, name, copy_in_s=0, queued_s=0, compute_s=0, copy_out_s=0, latency_s=0, failed=False):
+        with self.lock:
+            task = self.tasks.setdefault(name, {'count': 0, 'failed': 0, 'copy_in_s': 0, 'queued_s': 0,
+                                                'compute_s': 0, 'copy_out_s': 0, 'latency_s': 0, 'max_latency_s': 0})
+            if failed:
+                task['failed'] = task['failed'] + 1
+                return
+            task['count'] = task['count'] + 1
+            task['copy_in_s'] = task['copy_in_s'] + copy_in_s
+            task['queued_s'] = task['queued_s'] + queued_s
+            task['compute_s'] = task['compute_s'] + compute_s
+            task['copy_out_s'] = task['copy_out_s'] + copy_out_s
+            task['latency_s'] = task['latency_s'] + latency_s
+            task['max_latency_s'] = max(task['max_latency_s'], latency_s)
+
+    def as_dict(self):
+        with self.lock:
+            stats = {'blocked_time_s': self.blocked_time_s, 'tasks': {}}
+            for name, task in self.tasks.items():
+                n = max(task['count'], 1)
+                stats['tasks'][name] = {
+                    'count': task['count'],
+                    'failed': task['failed'],
+                    'mean_copy_in_ms': 1000*task['copy_in_s']/n,
+                    'mean_queued_ms': 1000*task['queued_s']/n,
+                    'mean_compute_ms': 1000*task['compute_s']/n,
+                    'mean_copy_out_ms': 1000*task['copy_out_s']/n,
+                    'mean_latency_ms': 1000*task['latency_s']/n, # from submitting to delivering the result
+                    'max_latency_ms': 1000*task['max_latency_s'],
+                }
+            return stats
+
 class ProcessingHandler():
     """
     :brief: Handler class for parallelizing FOV processing. GENERAL NOTE:
         REMEMBER TO PASS COPIES OF IMAGES WHEN QUEUEING THEM FOR PROCESSING
+        (not needed for submit_fov_task, which copies them into shared memory).
+        CPU-heavy work should go through submit_fov_task, which runs it in a
+        pool of num_processes processes instead of the GIL-bound processing
+        thread. at most max_pending_tasks fov tasks are in flight - beyond that,
+        submit_fov_task blocks, and the two queues block when they hold
+        queue_size tasks, so a producer that is faster than processing is held
+        back instead of filling up memory.
     """
-    def __init__(self):
-        self.processing_queue = queue.Queue() # elements in this queue are
+    def __init__(self, num_processes=0, max_pending_tasks=8, queue_size=0):
+        self.num_processes = num_processes
+        self.max_pending_tasks = max_pending_tasks
+        self.processing_queue = queue.Queue(queue_size) # elements in this queue are
                                               # dicts in the form
                                               # {'function': callable, 'args':list
                                               # of positional arguments to pass,
@@ -37,15 +205,24 @@ class ProcessingHandler():
                                               # in appropriate form to pass to the
                                               # upload queue
 
-        self.upload_queue = queue.Queue()     # elements in this queue are
+        self.upload_queue = queue.Queue(queue_size) # elements in this queue are
                                               # dicts in the form
                                               # {'function': callable, 'args':list
                                               # of positional arguments to pass,
                                               # 'kwargs': dict of kwargs to pass}
                                               # a dict in the form {'function':'end'}
                                               # will cause the uploading to terminate
+        self.fov_task_queue = queue.Queue() # fov tasks in the order they were
+                                            # submitted, for their results to be
+                                            # delivered in that order. None ends
+                                            # the delivery
         self.processing_thread = None
         self.uploading_thread = None
+        self.delivery_thread = None
+        self.pool = None
+        self.frame_pool = SharedFramePool()
+        self.task_slots = threading.BoundedSemaphore(max_pending_tasks)
+        self.stats = TaskStats()
 
     def processing_queue_handler(self, queue_timeout=None):
         while True:
@@ -78,7 +255,110 @@ class ProcessingHandler():
                 upload_task['function'](*upload_task['args'],**upload_task['kwargs'])
                 self.upload_queue.task_done()
 
+    def fov_task_delivery_handler(self):
+        # delivers fov task results to the upload queue in the order the tasks were submitted
+        while True:
+            task = self.fov_task_queue.get()
+            if task is None:
+                self.fov_task_queue.task_done()
+                self._end_processing()
+                break
+            future, callback, name, t_submitted, copy_in_s = task
+            try:
+                result, t_start, compute_s, copy_out_s = future.result()
+                t0 = time.time()
+                result = _unshare_arrays(result)
+                copy_out_s = copy_out_s + time.time() - t0
+                if callback is not None:
+                    self.upload_queue.put({'function':callback,'args':[result],'kwargs':{}})
+                self.stats.add(name, copy_in_s, t_start - t_submitted, compute_s, copy_out_s, time.time() - t_submitted)
+            except Exception as e:
+                self.stats.add(name, failed=True)
+                print('fov task ' + name + ' failed: ' + str(e))
+            self.task_slots.release()
+            self.fov_task_queue.task_done()
+
+    def submit_fov_task(self, function, images, args=[], kwargs={}, callback=None):
+        """
+        :brief: runs function(*images, *args, **kwargs) in a processing process.
+            the images are copied into shared memory rather than pickled, and
+            can be reused by the caller as soon as this returns. the function
+            must be picklable (defined at module level), and gets the images as
+            read-only-by-convention views of the shared memory. the result is
+            passed to callback in the upload thread, in the order the tasks were
+            submitted. blocks while max_pending_tasks tasks are in flight. with
+            num_processes = 0, the function runs in the processing thread.
+        """
+        name = getattr(function, '__name__', str(function))
+        t_submitted = time.time()
+        if self.pool is None:
+            images = [np.copy(image) for image in images]
+            def process(images=images):
+                t_start = time.time()
+                result = function(*images, *args, **kwargs)
+                t_computed = time.time()
+                self.stats.add(name, queued_s=t_start-t_submitted, compute_s=t_computed-t_start, latency_s=t_computed-t_submitted)
+                return {'function':callback if callback is not None else (lambda result: None),'args':[result],'kwargs':{}}
+            self.processing_queue.put({'function':process,'args':[],'kwargs':{}})
+            return
+        self.task_slots.acquire()
+        t0 = time.time()
+        with self.stats.lock:
+            self.stats.blocked_time_s = self.stats.blocked_time_s + t0 - t_submitted
+        frames = [self.frame_pool.put(image) for image in images]
+        copy_in_s = time.time() - t0
+        try:
+            future = self.pool.submit(run_fov_task, function, frames, args, kwargs)
+        except BrokenProcessPool:
+            # a process of the pool died (e.g. a task crashed it), which breaks the whole
+            # pool - the tasks that were in it fail, and later ones go to a new pool
+            self._restart_pool()
+            try:
+                future = self.pool.submit(run_fov_task, function, frames, args, kwargs)
+            except BrokenProcessPool as e:
+                for frame in frames:
+                    self.frame_pool.release(frame)
+                self.task_slots.release()
+                self.stats.add(name, failed=True)
+                print('fov task ' + name + ' failed: ' + str(e))
+                return
+        # the buffers can be reused as soon as the task is done with them
+        future.add_done_callback(lambda future, frames=frames: [self.frame_pool.release(frame) for frame in frames])
+        self.fov_task_queue.put((future, callback, name, t0, copy_in_s))
+
+    def join(self):
+        """
+        :brief: wait until every queued task has been processed and uploaded
+        """
+        self.processing_queue.join()
+        self.fov_task_queue.join()
+        self.upload_queue.join()
+
+    def reset_stats(self):
+        self.stats.reset()
+
+    def get_stats(self):
+        return self.stats.as_dict()
+
+    def print_stats(self):
+        stats = self.get_stats()
+        for name, task in stats['tasks'].items():
+            print('fov task ' + name + ': ' + str(task['count']) + ' done, ' + str(task['failed']) + ' failed, ' +
+                'copy in ' + '{:.2f}'.format(task['mean_copy_in_ms']) + ' ms, ' +
+                'queued ' + '{:.2f}'.format(task['mean_queued_ms']) + ' ms, ' +
+                'compute ' + '{:.2f}'.format(task['mean_compute_ms']) + ' ms, ' +
+                'copy out ' + '{:.2f}'.format(task['mean_copy_out_ms']) + ' ms, ' +
+                'latency ' + '{:.2f}'.format(task['mean_latency_ms']) + ' ms (max ' + '{:.2f}'.format(task['max_latency_ms']) + ' ms)')
+        if stats['blocked_time_s'] > 0:
+            print('waited ' + '{:.2f}'.format(stats['blocked_time_s']) + ' s for fov task slots')
+
     def start_processing(self, queue_timeout=None):
+        # the pool is kept between acquisitions, since starting the processes takes a while
+        if self.num_processes > 0 and self.pool is None:
+            self.pool = self._create_pool()
+        if self.pool is not None:
+            self.delivery_thread = threading.Thread(target=self.fov_task_delivery_handler)
+            self.delivery_thread.start()
         self.processing_thread =\
         threading.Thread(target=self.processing_queue_handler, args=[queue_timeout])
         self.processing_thread.start()
@@ -89,7 +369,31 @@ class ProcessingHandler():
     def end_uploading(self, *args, **kwargs):
         return {'function':'end'}
     def end_processing(self):
+        if self.delivery_thread is not None and self.delivery_thread.is_alive():
+            # after the results of the fov tasks submitted so far
+            self.fov_task_queue.put(None)
+        else:
+            self._end_processing()
+    def _end_processing(self):
         self.processing_queue.put({'function':self.end_uploading,'args':[],
                                    'kwargs':{}})
         self.processing_queue.put({'function':'end'})
+    def _create_pool(self):
+        # spawn rather than fork - the acquisition process is full of (qt) threads
+        return ProcessPoolExecutor(max_workers=self.num_processes,mp_context=multiprocessing.get_context('spawn'))
+
+    def _restart_pool(self):
+        print('fov task processes stopped unexpectedly, restarting them')
+        self.pool.shutdown(wait=False)
+        self.pool = self._create_pool()
+
+    def close(self):
+        """
+        :brief: stops the processing processes and frees the shared memory of the
+            frames - call once processing is done for good, e.g. when the GUI closes
+        """
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+        self.frame_pool.close()
 
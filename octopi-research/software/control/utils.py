@@ -1,3 +1,4 @@
+import sys
 import cv2
 from numpy import std, square, mean
 import numpy as np
@@ -64,6 +65,82 @@ def rotate_and_flip_image(image,rotate_image_angle,flip_image):
 
     return ret_image
 
+def rotate_and_flip_view(image,rotate_image_angle,flip_image):
+    """
+    :brief: same as rotate_and_flip_image, but returns a (non-contiguous) view of image instead of a copy
+    """
+    if rotate_image_angle == 90:
+        image = np.rot90(image,-1) # clockwise
+    elif rotate_image_angle == -90:
+        image = np.rot90(image,1)
+    elif rotate_image_angle == 180:
+        image = image[::-1,::-1]
+    if flip_image == 'Vertical':
+        image = image[::-1]
+    elif flip_image == 'Horizontal':
+        image = image[:,::-1]
+    elif flip_image == 'Both':
+        image = image[::-1,::-1]
+    return image
+
+# the 8 combinations of rotating and flipping, as single cv2 operations that write into dst,
+# keyed by what they do to [[0,1],[2,3]]
+_ORIENTATION_OPS = {
+    (0,1,2,3): lambda src,dst: np.copyto(dst,src),
+    (2,0,3,1): lambda src,dst: cv2.rotate(src,cv2.ROTATE_90_CLOCKWISE,dst=dst),
+    (1,3,0,2): lambda src,dst: cv2.rotate(src,cv2.ROTATE_90_COUNTERCLOCKWISE,dst=dst),
+    (3,2,1,0): lambda src,dst: cv2.flip(src,-1,dst=dst),
+    (2,3,0,1): lambda src,dst: cv2.flip(src,0,dst=dst),
+    (1,0,3,2): lambda src,dst: cv2.flip(src,1,dst=dst),
+    (0,2,1,3): lambda src,dst: cv2.transpose(src,dst=dst),
+    (3,1,2,0): lambda src,dst: cv2.flip(cv2.rotate(src,cv2.ROTATE_90_CLOCKWISE,dst=dst),0,dst=dst),
+}
+
+class FrameBuffers():
+    """
+    :brief: crops, rotates and flips frames with a single copy (or one cv2 operation), into output buffers
+        that are reused once nothing refers to them anymore (e.g. a queued signal, or
+        a view for display). frames are returned read-only, since they can be shared
+        by several consumers - copy a frame before changing it.
+    """
+    def __init__(self,num_buffers=4):
+        self.buffers = [None]*num_buffers
+        self.next_index = 0
+        self.allocations = 0
+
+    def transform(self,image,crop_width,crop_height,rotate_image_angle,flip_image,squeeze=False):
+        cropped = crop_image(image,crop_width,crop_height)
+        if squeeze:
+            cropped = np.squeeze(cropped)
+        # rotate_and_flip_view gives the output shape, and the order of the pixels to check against
+        view = rotate_and_flip_view(cropped,rotate_image_angle,flip_image)
+        frame = self._get_buffer(view.shape,view.dtype)
+        orientation = tuple(rotate_and_flip_view(np.array([[0,1],[2,3]]),rotate_image_angle,flip_image).flatten())
+        try:
+            # cv2 rotates much faster than copying a rotated view
+            _ORIENTATION_OPS[orientation](cropped,frame)
+        except cv2.error:
+            np.copyto(frame,view) # e.g. a dtype cv2 doesn't support
+        frame.flags.writeable = False
+        return frame
+
+    def _get_buffer(self,shape,dtype):
+        for i in range(len(self.buffers)):
+            index = (self.next_index + i) % len(self.buffers)
+            buffer = self.buffers[index]
+            # referenced only by self.buffers, buffer and the getrefcount argument
+            if buffer is not None and buffer.shape == shape and buffer.dtype == dtype and sys.getrefcount(buffer) <= 3:
+                self.next_index = (index + 1) % len(self.buffers)
+                buffer.flags.writeable = True
+                return buffer
+        # all buffers are in use (or have the wrong size) - replace the oldest, which will be
+        # freed once its consumers are done with it
+        buffer = np.empty(shape,dtype=dtype)
+        self.buffers[self.next_index] = buffer
+        self.next_index = (self.next_index + 1) % len(self.buffers)
+        self.allocations = self.allocations + 1
+        return buffer
+
 def generate_dpc(im_left, im_right):
     # Normalize the images
     im_left = im_left.astype(float)/255
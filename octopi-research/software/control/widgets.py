@@ -532,8 +532,10 @@ class FocusMapWidget(QWidget):
         except IndexError:
             pass
         try:
-            x,y,z = self.autofocusController.focus_map_coords[2]
-            self.fmap_coord_3.setText(f"Focus Map Point 3: ({x:.3f},{y:.3f},{z:.3f})")
+            # with more than 3 points, show the last one
+            n = len(self.autofocusController.focus_map_coords)
+            x,y,z = self.autofocusController.focus_map_coords[max(2,n-1)]
+            self.fmap_coord_3.setText(f"Focus Map Point {max(3,n)}: ({x:.3f},{y:.3f},{z:.3f})")
         except IndexError:
             pass
 
@@ -2932,6 +2934,7 @@ class NapariMultiChannelWidget(QWidget):
 class NapariTiledDisplayWidget(QWidget):
 
     signal_coordinates_clicked = Signal(int, int, int, int, int, int, float, float)
+    signal_stage_coordinates_clicked = Signal(float, float)
     signal_layer_contrast_limits = Signal(str, float, float)
 
     def __init__(self, configurationManager, parent=None):
@@ -2939,6 +2942,7 @@ class NapariTiledDisplayWidget(QWidget):
         # Initialize placeholders for the acquisition parameters
         self.configurationManager = configurationManager
         self.downsample_factor = PRVIEW_DOWNSAMPLE_FACTOR
+        self.mosaic = None
         self.image_width = 0
         self.image_height = 0
         self.dtype = np.uint8
@@ -2990,6 +2994,12 @@ class NapariTiledDisplayWidget(QWidget):
              (channel_info['hex'] & 0xFF) / 255)             # Normalize the Blue component
         return Colormap(colors=[c0, c1], controls=[0, 1], name=channel_info['name'])
 
+    def getChannelColormap(self, channel_name):
+        channel_info = CHANNEL_COLORS_MAP.get(self.extractWavelength(channel_name), {'hex': 0xFFFFFF, 'name': 'gray'})
+        if channel_info['name'] in AVAILABLE_COLORMAPS:
+            return AVAILABLE_COLORMAPS[channel_info['name']]
+        return self.generateColormap(channel_info)
+
     def initLayers(self, image_height, image_width, image_dtype):
         """Initializes the full canvas for each channel based on the acquisition parameters."""
         self.viewer.layers.clear()
@@ -3013,11 +3023,7 @@ class NapariTiledDisplayWidget(QWidget):
                 color = None  # No colormap for RGB images
                 canvas = np.zeros((self.Nz, self.Ny * self.image_height, self.Nx * self.image_width, 3), dtype=self.dtype)
             else:
-                channel_info = CHANNEL_COLORS_MAP.get(self.extractWavelength(channel_name), {'hex': 0xFFFFFF, 'name': 'gray'})
-                if channel_info['name'] in AVAILABLE_COLORMAPS:
-                    color = AVAILABLE_COLORMAPS[channel_info['name']]
-                else:
-                    color = self.generateColormap(channel_info)
+                color = self.getChannelColormap(channel_name)
                 canvas = np.zeros((self.Nz, self.Ny * self.image_height, self.Nx * self.image_width), dtype=self.dtype)
 
             limits = self.getContrastLimits(self.dtype)
@@ -3045,6 +3051,43 @@ class NapariTiledDisplayWidget(QWidget):
         self.viewer.dims.set_point(0, k)
         layer.refresh()
 
+    def initMosaic(self, mosaic):
+        """Shows the mosaic (control.mosaic.MosaicPyramid) of a new acquisition, replacing the previous one."""
+        self.viewer.layers.clear()
+        self.mosaic = mosaic
+        self.layers_initialized = True
+        self.viewer_scale_initialized = False
+
+    def releaseMosaic(self):
+        """Removes the mosaic layers, so that napari no longer holds the mosaic's memory-mapped files open."""
+        if self.mosaic is None:
+            return
+        self.viewer.layers.clear()
+        self.mosaic = None
+
+    def updateMosaic(self, channel_name, k):
+        """Redraws the channel after a tile was added to the mosaic; napari reads only the part of the level on screen."""
+        if self.mosaic is None:
+            return
+        levels = self.mosaic.get_levels(channel_name)
+        if channel_name not in self.viewer.layers:
+            if channel_name not in self.channels:
+                self.channels.append(channel_name)
+            rgb = len(levels[0].shape) == 4
+            color = None if rgb else self.getChannelColormap(channel_name)
+            limits = self.getContrastLimits(levels[0].dtype)
+            layer = self.viewer.add_image(levels, multiscale=True, name=channel_name, visible=True, rgb=rgb, colormap=color, contrast_limits=limits, blending='additive')
+            layer.contrast_limits = self.contrast_limits.get(channel_name, limits)
+            layer.events.contrast_limits.connect(self.signalContrastLimits)
+            layer.mouse_double_click_callbacks.append(self.onDoubleClick)
+        else:
+            self.viewer.layers[channel_name].refresh()
+
+        if not self.viewer_scale_initialized:
+            self.resetView()
+            self.viewer_scale_initialized = True
+        self.viewer.dims.set_point(0, k)
+
     def signalContrastLimits(self, event):
         layer = event.source
         min_val, max_val = map(float, layer.contrast_limits) 
@@ -3064,6 +3107,12 @@ class NapariTiledDisplayWidget(QWidget):
     def onDoubleClick(self, layer, event):
         """Handle double-click events and emit centered coordinates if within the data range."""
         coords = layer.world_to_data(event.position) 
+        if layer.multiscale and self.mosaic is not None:
+            # mosaic layers are in level 0 pixels, which map to stage coordinates directly
+            if coords is not None and (0 <= int(coords[-1]) < self.mosaic.width and 0 <= int(coords[-2]) < self.mosaic.height):
+                x_mm, y_mm = self.mosaic.to_stage_mm(coords[-2], coords[-1])
+                self.signal_stage_coordinates_clicked.emit(x_mm, y_mm)
+            return
         layer_shape = layer.data.shape[0:3] if len(layer.data.shape) >= 4 else layer.data.shape
 
         if coords is not None and (0 <= int(coords[-1]) < layer_shape[-1] and (0 <= int(coords[-2]) < layer_shape[-2])):
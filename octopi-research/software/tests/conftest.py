@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the control package is imported from the software folder, like the main_*.py scripts do
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from control._def import FocusMap
+from control.core import AutoFocusController
+
+
+def make_autofocus_controller():
+    navigation_controller = SimpleNamespace(x_pos_mm=0,y_pos_mm=0,z_pos_mm=0)
+    return AutoFocusController(camera=None,navigationController=navigation_controller,liveController=None)
+
+
+def test_fov_near_an_added_point_skips_autofocus():
+    autofocus_controller = make_autofocus_controller()
+    assert not autofocus_controller.is_near_focus_map_point(0,0)
+
+    # the first fov autofocuses and adds its result, as MultiPointWorker does during an acquisition
+    autofocus_controller.add_focus_map_point(0,0,1.5)
+
+    assert autofocus_controller.is_near_focus_map_point(FocusMap.MIN_POINT_SPACING_MM/2,0)
+    assert not autofocus_controller.is_near_focus_map_point(2*FocusMap.MIN_POINT_SPACING_MM,0)
+
+
+def test_clear_focus_map_resets_the_surface():
+    autofocus_controller = make_autofocus_controller()
+    for x, y in [(0,0),(10,0),(0,10)]:
+        autofocus_controller.add_focus_map_point(x,y,1.5)
+    assert autofocus_controller.use_focus_map
+    assert len(autofocus_controller.focus_surface.points) == 3
+
+    autofocus_controller.clear_focus_map()
+
+    assert not autofocus_controller.use_focus_map
+    assert autofocus_controller.focus_surface.points == []
+    assert not autofocus_controller.is_near_focus_map_point(0,0)
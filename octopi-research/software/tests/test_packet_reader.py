@@ -0,0 +1,60 @@
+import random
+
+from crc import CrcCalculator, Crc8
+
+from control.microcontroller import MCU_PACKET, PacketReader
+
+crc_calculator = CrcCalculator(Crc8.CCITT,table_based=True)
+
+
+class FakeSerial(object):
+    def __init__(self,chunks):
+        self.chunks = list(chunks)
+        self.in_waiting = 0
+
+    def read(self,n):
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+def make_packet(i,with_crc=True):
+    packet = bytearray(MCU_PACKET.pack(i%256,0,1000+i,2000+i,300+i,0,0,0))
+    if with_crc:
+        packet[-1] = crc_calculator.calculate_checksum(packet[:-1])
+    return bytes(packet)
+
+
+def read_all(chunks):
+    reader = PacketReader(FakeSerial(chunks),MCU_PACKET.size,crc_calculator)
+    packets = []
+    while reader.serial.chunks:
+        packet = reader.read()
+        if packet is not None:
+            packets.append(packet)
+    return reader, packets
+
+
+def test_leading_garbage_never_publishes_misaligned_packets():
+    for seed in range(300):
+        rng = random.Random(seed)
+        packets = [make_packet(i) for i in range(20)]
+        stream = bytes(rng.randrange(256) for i in range(rng.randrange(30))) + b''.join(packets)
+        chunks = []
+        while stream:
+            n = rng.choice([1,5,7,24,30,48])
+            chunks.append(stream[:n])
+            stream = stream[n:]
+
+        reader, received = read_all(chunks)
+
+        assert received
+        assert all(packet in packets for packet in received)
+        assert not reader.legacy
+
+
+def test_firmware_without_crc_is_framed_by_arrival():
+    packets = [make_packet(i,with_crc=False) for i in range(10)]
+
+    reader, received = read_all(packets)
+
+    assert reader.legacy
+    assert received == packets[PacketReader.LEGACY_SYNC_PACKETS-1:]
@@ -0,0 +1,133 @@
+'''
+Time-to-focus of contrast autofocus on a simulated z stack.
+
+Frames are a random texture blurred in proportion to the distance from a focal
+plane placed at a random z within the search range, plus camera noise. Moving
+the stage and exposing a frame sleep for as long as they would take on the
+microscope (--move_ms per step plus --settle_ms per move, --exposure_ms per
+frame). Compares the previous autofocus loop, which computed the focus measure
+on the full crop between moves, with control.autofocus.FocusSearch, which
+computes it on a downsampled crop in a worker thread, for each search method.
+Reports time-to-focus, frames taken and the distance of the final position
+from the focal plane, averaged over --trials focal planes.
+
+example:
+    python tools/benchmark_autofocus.py --N 20 --crop 1500 --downsample 2
+'''
+import argparse
+import contextlib
+import io
+import time
+
+import cv2
+import numpy as np
+
+from control import utils
+from control import autofocus
+
+
+class SimulatedStack(object):
+
+    def __init__(self,crop,N,z_focus_usteps,deltaZ_usteps,move_ms,settle_ms,exposure_ms,seed=0):
+        rng = np.random.default_rng(seed)
+        # a texture with detail at several scales
+        texture = np.zeros((crop,crop),np.float32)
+        for scale in (1,4,16):
+            texture = texture + cv2.resize(rng.random((crop//scale,crop//scale),dtype=np.float32),(crop,crop),interpolation=cv2.INTER_CUBIC)
+        self.texture = cv2.normalize(texture,None,20,235,cv2.NORM_MINMAX)
+        self.rng = rng
+        self.z_focus_usteps = z_focus_usteps
+        self.deltaZ_usteps = deltaZ_usteps
+        self.move_ms = move_ms
+        self.settle_ms = settle_ms
+        self.exposure_ms = exposure_ms
+        self.z_usteps = 0
+        # frames are rendered up front, so that rendering doesn't count towards time-to-focus
+        self.frames = {}
+        for i in range(-(N//2)-1,N//2+2):
+            self.frames[i*deltaZ_usteps] = self.render(i*deltaZ_usteps)
+
+    def move_z_usteps(self,usteps):
+        time.sleep((self.settle_ms + self.move_ms*abs(usteps)/self.deltaZ_usteps)/1000)
+        self.z_usteps = self.z_usteps + usteps
+
+    def acquire(self):
+        time.sleep(self.exposure_ms/1000)
+        if self.z_usteps not in self.frames:
+            self.frames[self.z_usteps] = self.render(self.z_usteps)
+        return self.frames[self.z_usteps]
+
+    def render(self,z_usteps):
+        # one deltaZ out of focus blurs by a pixel
+        sigma = abs(z_usteps - self.z_focus_usteps)/self.deltaZ_usteps
+        frame = cv2.GaussianBlur(self.texture,(0,0),sigma) if sigma > 0 else self.texture
+        frame = frame + self.rng.normal(0,2,frame.shape).astype(np.float32)
+        return np.clip(frame,0,255).astype(np.uint8)
+
+
+def previous_autofocus(stack,N,deltaZ_usteps,stop_threshold):
+    # the loop AutofocusWorker used before FocusSearch (without the backlash maneuvers)
+    focus_measure_vs_z = [0]*N
+    focus_measure_max = 0
+    z_af_offset_usteps = deltaZ_usteps*round(N/2)
+    stack.move_z_usteps(-z_af_offset_usteps)
+    steps_moved = 0
+    frames = 0
+    for i in range(N):
+        stack.move_z_usteps(deltaZ_usteps)
+        steps_moved = steps_moved + 1
+        image = stack.acquire()
+        frames = frames + 1
+        focus_measure = utils.calculate_focus_measure(image,'LAPE')
+        focus_measure_vs_z[i] = focus_measure
+        focus_measure_max = max(focus_measure, focus_measure_max)
+        if focus_measure < focus_measure_max*stop_threshold:
+            break
+    idx_in_focus = focus_measure_vs_z.index(max(focus_measure_vs_z))
+    stack.move_z_usteps((idx_in_focus+1)*deltaZ_usteps-steps_moved*deltaZ_usteps)
+    return frames
+
+
+def run(name,args,search):
+    times = []
+    frames = []
+    errors = []
+    rng = np.random.default_rng(1)
+    half_range_usteps = args.deltaZ_usteps*(args.N//2 - 1)
+    for trial in range(args.trials):
+        z_focus_usteps = int(rng.integers(-half_range_usteps,half_range_usteps+1))
+        stack = SimulatedStack(args.crop,args.N,z_focus_usteps,args.deltaZ_usteps,args.move_ms,args.settle_ms,args.exposure_ms,seed=trial)
+        t_start = time.time()
+        with contextlib.redirect_stdout(io.StringIO()): # FocusSearch prints every focus measure
+            frames.append(search(stack))
+        times.append(time.time() - t_start)
+        errors.append(abs(stack.z_usteps - z_focus_usteps)/args.deltaZ_usteps)
+    print(name.ljust(28) + '{:10.3f}'.format(np.mean(times)) + '{:10.1f}'.format(np.mean(frames)) + '{:12.2f}'.format(np.mean(errors)))
+
+
+def focus_search(method,args):
+    def search(stack):
+        focus_search = autofocus.FocusSearch(stack.move_z_usteps,stack.acquire,'LAPE',args.downsample,0,args.stop_threshold)
+        focus_search.run(method,args.N,args.deltaZ_usteps,args.coarse_step_factor)
+        return focus_search.frames
+    return search
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='autofocus time-to-focus benchmark on a simulated z stack')
+    parser.add_argument('--N',type=int,default=20,help='number of z positions in the search range')
+    parser.add_argument('--deltaZ_usteps',type=int,default=24,help='z step')
+    parser.add_argument('--crop',type=int,default=1500,help='width and height of the focus crop')
+    parser.add_argument('--downsample',type=int,default=2,help='focus measure downsampling for FocusSearch')
+    parser.add_argument('--coarse_step_factor',type=int,default=3)
+    parser.add_argument('--stop_threshold',type=float,default=0.85)
+    parser.add_argument('--move_ms',type=float,default=10,help='time to move one step')
+    parser.add_argument('--settle_ms',type=float,default=5,help='extra time per move')
+    parser.add_argument('--exposure_ms',type=float,default=10,help='exposure and readout time')
+    parser.add_argument('--trials',type=int,default=5)
+    args = parser.parse_args()
+
+    print('search                     time (s)    frames   error (steps)')
+    run('previous',args,lambda stack: previous_autofocus(stack,args.N,args.deltaZ_usteps,args.stop_threshold))
+    for method in autofocus.SEARCH_METHODS:
+        run('FocusSearch ' + method,args,focus_search(method,args))
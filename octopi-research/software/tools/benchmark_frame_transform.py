@@ -0,0 +1,60 @@
+'''
+Per-frame latency of cropping, rotating and flipping camera frames.
+
+Compares the previous path (utils.crop_image followed by
+utils.rotate_and_flip_image, which copies the frame and then rotates and flips
+it with cv2) with utils.FrameBuffers, which does all three with a single copy
+into a reused buffer, at several sensor sizes.
+
+example:
+    python tools/benchmark_frame_transform.py --rotate 90 --flip Horizontal
+'''
+import argparse
+import time
+
+import numpy as np
+
+from control import utils
+
+
+SENSOR_SIZES = {
+    '2MP': (1200,1920),
+    '5MP': (2048,2448),
+    '12MP': (3000,4000),
+    '20MP': (3648,5472),
+    '26MP': (4176,6248),
+}
+
+
+def median_latency_ms(transform, frames):
+    latencies = []
+    for frame in frames:
+        t0 = time.perf_counter()
+        output = transform(frame)
+        latencies.append(time.perf_counter() - t0)
+        del output
+    return 1000*np.median(latencies)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='frame crop/rotate/flip latency benchmark')
+    parser.add_argument('--rotate',type=int,default=90,help='0, 90, -90 or 180')
+    parser.add_argument('--flip',default='Horizontal',help='None, Vertical, Horizontal or Both')
+    parser.add_argument('--dtype',default='uint8',help='uint8 or uint16')
+    parser.add_argument('--crop',type=float,default=1.0,help='fraction of the sensor width and height to keep')
+    parser.add_argument('--frames',type=int,default=30,help='frames per measurement')
+    args = parser.parse_args()
+    flip = None if args.flip == 'None' else args.flip
+
+    print('sensor   size (MB)   previous (ms)   FrameBuffers (ms)')
+    for name, (height, width) in SENSOR_SIZES.items():
+        # a few different frames, like a camera that delivers a new array for every frame
+        frames = [np.random.randint(0,255,size=(height,width)).astype(args.dtype) for i in range(3)]
+        frames = [frames[i%3] for i in range(args.frames)]
+        crop_width = int(width*args.crop)
+        crop_height = int(height*args.crop)
+
+        previous = median_latency_ms(lambda frame: utils.rotate_and_flip_image(utils.crop_image(frame,crop_width,crop_height),rotate_image_angle=args.rotate,flip_image=flip),frames)
+        frame_buffers = utils.FrameBuffers()
+        current = median_latency_ms(lambda frame: frame_buffers.transform(frame,crop_width,crop_height,args.rotate,flip),frames)
+        print(name.ljust(9) + '{:9.1f}'.format(frames[0].nbytes/1e6) + '{:16.2f}'.format(previous) + '{:20.2f}'.format(current))
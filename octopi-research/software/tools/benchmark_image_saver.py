@@ -0,0 +1,79 @@
+'''
+Sustained saving throughput of the image saver, fed by Camera_Simulation.
+
+Frames are triggered as fast as the saver accepts them (or at --fps), for
+--duration seconds, and written to a temporary folder (or --path). Since the
+saver blocks instead of discarding frames, the time the camera callback spends
+blocked is how far saving falls behind acquisition.
+
+example:
+    python tools/benchmark_image_saver.py --format files ome_zarr --threads 1 4 --pixel_format MONO12
+'''
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from control.camera import Camera_Simulation
+import control.image_saver as image_saver
+
+
+def run(output_format,num_writer_threads,buffer_size,pixel_format,duration,fps,path):
+    writer = image_saver.create_writer(output_format)
+    saver = image_saver.FrameSaver(writer,num_writer_threads=num_writer_threads,buffer_size=buffer_size)
+    saving_path = os.path.join(path,output_format + '_' + str(num_writer_threads))
+    os.makedirs(saving_path)
+    saver.start(saving_path)
+
+    camera = Camera_Simulation()
+    camera.set_pixel_format(pixel_format)
+    camera.set_callback(lambda camera: saver.enqueue(camera.current_frame,camera.frame_ID,camera.timestamp))
+    camera.enable_callback()
+    camera.start_streaming()
+
+    t_start = time.time()
+    t_next_trigger = t_start
+    while time.time() - t_start < duration:
+        if fps is not None:
+            time.sleep(max(0,t_next_trigger - time.time()))
+            t_next_trigger = t_next_trigger + 1/fps
+        camera.send_trigger()
+    t_acquired = time.time() - t_start
+    saver.stop()
+    t_saved = time.time() - t_start
+
+    stats = saver.stats.as_dict()
+    print(output_format.ljust(10) + str(num_writer_threads).rjust(8) +
+        '{:10.1f}'.format(stats['frames_received']/t_acquired) +
+        '{:10.1f}'.format(stats['frames_saved']/t_saved) +
+        '{:10.1f}'.format(stats['bytes_saved']/t_saved/1e6) +
+        '{:12.3f}'.format(stats['blocked_time_s']) +
+        '{:10.2f}'.format(stats['mean_write_time_ms']) +
+        str(stats['frames_dropped'] + stats['frames_failed']).rjust(8))
+    shutil.rmtree(saving_path,ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='image saver throughput benchmark')
+    parser.add_argument('--format',nargs='+',default=['files','ome_zarr','tiff_stack'],help='output formats to test')
+    parser.add_argument('--threads',nargs='+',type=int,default=[1,4],help='numbers of writer threads to test')
+    parser.add_argument('--buffer_size',type=int,default=32,help='number of frames in the ring buffer')
+    parser.add_argument('--pixel_format',default='MONO8',help='MONO8, MONO12 or MONO16')
+    parser.add_argument('--duration',type=float,default=10,help='seconds of acquisition per run')
+    parser.add_argument('--fps',type=float,default=None,help='trigger rate (default: as fast as frames are accepted)')
+    parser.add_argument('--path',default=None,help='where to save (default: a temporary folder)')
+    args = parser.parse_args()
+
+    path = args.path if args.path is not None else tempfile.mkdtemp()
+    print('format     threads  acq fps  save fps    MB/s   blocked s  write ms  lost')
+    for output_format in args.format:
+        for num_writer_threads in args.threads:
+            try:
+                run(output_format,num_writer_threads,args.buffer_size,args.pixel_format,args.duration,args.fps,path)
+            except RuntimeError as e:
+                print(output_format.ljust(10) + ' skipped: ' + str(e))
+            if output_format == 'tiff_stack':
+                break # always a single writer thread
+    if args.path is None:
+        shutil.rmtree(path,ignore_errors=True)
@@ -0,0 +1,116 @@
+'''
+Per-frame latency of locating the laser autofocus spot.
+
+Compares the previous centroid calculation of LaserAutofocusController (float
+coordinate grids from np.meshgrid, and scipy.signal.find_peaks on every frame)
+with control.laser_spot.SpotCentroid, on recorded focus camera frames (e.g. the
+*_focus_camera.bmp images a multipoint acquisition saves when the laser
+autofocus fails) or, without --images, on simulated frames of two spots that
+drift along x like during a closed-loop move. Reports the median latency and the
+largest difference between the two centroids. The centroids differ only when
+a spot has two separate, equal maxima in the x profile, where find_peaks picks
+either one.
+
+example:
+    python tools/benchmark_laser_af.py --images "/path/to/acquisition/0/*_focus_camera.bmp"
+'''
+import argparse
+import glob
+import time
+
+import cv2
+import numpy as np
+import scipy.signal
+
+from control import laser_spot
+
+
+def previous_centroid(image,has_two_interfaces,use_glass_top):
+    # LaserAutofocusController._caculate_centroid before SpotCentroid
+    if has_two_interfaces == False:
+        h,w = image.shape
+        x,y = np.meshgrid(range(w),range(h))
+        I = image.astype(float)
+        I = I - np.amin(I)
+        I[I/np.amax(I)<0.2] = 0
+        x = np.sum(x*I)/np.sum(I)
+        y = np.sum(y*I)/np.sum(I)
+        return x,y
+    else:
+        I = image
+        tmp = np.sum(I,axis=1)
+        y0 = np.argmax(tmp)
+        I = I[y0-96:y0+96,:]
+        tmp = np.sum(I,axis=0)
+        peak_locations,_ = scipy.signal.find_peaks(tmp,distance=100)
+        idx = np.argsort(tmp[peak_locations])
+        peak_0_location = peak_locations[idx[-1]]
+        peak_1_location = peak_locations[idx[-2]]
+        if use_glass_top:
+            x1 = peak_1_location
+        else:
+            x1 = peak_0_location
+        h,w = I.shape
+        x,y = np.meshgrid(range(w),range(h))
+        I = I[:,max(0,x1-64):min(w-1,x1+64)]
+        x = x[:,max(0,x1-64):min(w-1,x1+64)]
+        y = y[:,max(0,x1-64):min(w-1,x1+64)]
+        I = I.astype(float)
+        I = I - np.amin(I)
+        I[I/np.amax(I)<0.1] = 0
+        x1 = np.sum(x*I)/np.sum(I)
+        y1 = np.sum(y*I)/np.sum(I)
+        return x1,y0-96+y1
+
+
+def simulated_frames(n,width,height,dtype):
+    rng = np.random.default_rng(0)
+    y,x = np.mgrid[0:height,0:width]
+    max_value = np.iinfo(dtype).max
+    frames = []
+    for i in range(n):
+        # spots 300 pixels apart, drifting by a few pixels per frame
+        x0 = width/3 + 20*np.sin(i/5)
+        y0 = height/2 + 2*np.cos(i/7)
+        frame = 0.6*np.exp(-((x-x0)**2+(y-y0)**2)/(2*8**2)) + 0.35*np.exp(-((x-x0-300)**2+(y-y0)**2)/(2*8**2))
+        frame = max_value*(0.05 + 0.9*frame) + rng.normal(0,0.01*max_value,frame.shape)
+        frames.append(np.clip(frame,0,max_value).astype(dtype))
+    return frames
+
+
+def median_latency_ms(centroid,frames):
+    latencies = []
+    results = []
+    for frame in frames:
+        t0 = time.perf_counter()
+        results.append(centroid(frame))
+        latencies.append(time.perf_counter() - t0)
+    return 1000*np.median(latencies), np.array(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='laser autofocus spot centroid latency benchmark')
+    parser.add_argument('--images',default=None,help='glob of recorded focus camera frames')
+    parser.add_argument('--frames',type=int,default=200,help='number of simulated frames')
+    parser.add_argument('--width',type=int,default=1536,help='simulated frame width (LASER_AF_CROP_WIDTH)')
+    parser.add_argument('--height',type=int,default=256,help='simulated frame height (LASER_AF_CROP_HEIGHT)')
+    parser.add_argument('--dtype',default='uint8',help='simulated frame dtype, uint8 or uint16')
+    parser.add_argument('--one_interface',action='store_true',help='centroid of the whole frame, as with has_two_interfaces=False')
+    parser.add_argument('--use_glass_top',type=int,default=1)
+    args = parser.parse_args()
+
+    if args.images is not None:
+        frames = [cv2.imread(filename,cv2.IMREAD_UNCHANGED) for filename in sorted(glob.glob(args.images))]
+        frames = [frame if frame.ndim == 2 else frame[:,:,0] for frame in frames if frame is not None]
+        print(str(len(frames)) + ' recorded frames')
+    else:
+        frames = simulated_frames(args.frames,args.width,args.height,np.dtype(args.dtype))
+        print(str(len(frames)) + ' simulated ' + str(args.width) + 'x' + str(args.height) + ' ' + args.dtype + ' frames')
+    has_two_interfaces = not args.one_interface
+
+    previous_ms, previous_results = median_latency_ms(lambda frame: previous_centroid(frame,has_two_interfaces,args.use_glass_top),frames)
+    spot_centroid = laser_spot.SpotCentroid(has_two_interfaces,args.use_glass_top)
+    current_ms, current_results = median_latency_ms(spot_centroid.calculate,frames)
+    print('previous centroid:  ' + '{:.3f}'.format(previous_ms) + ' ms per frame')
+    print('SpotCentroid:       ' + '{:.3f}'.format(current_ms) + ' ms per frame (' + str(spot_centroid.full_searches) + ' full peak searches)')
+    print('largest difference: ' + '{:.4f}'.format(np.nanmax(np.abs(previous_results - current_results))) + ' pixels')
@@ -0,0 +1,100 @@
+'''
+Loopback benchmark of reading microcontroller packets.
+
+Packets built by Microcontroller_Simulation are written to a pyserial loop://
+port at --rate packets/s, and read back either with PacketReader, like
+Microcontroller does, or with the previous reader, which polled in_waiting and
+read one byte at a time. Reports CPU use, packets parsed and the latency from
+writing a packet to decoding it.
+
+example:
+    python tools/benchmark_microcontroller_reader.py --rate 100 --duration 10
+'''
+import argparse
+import threading
+import time
+
+import numpy as np
+import serial
+
+from control._def import *
+from control.microcontroller import MCU_PACKET, PacketReader, Microcontroller_Simulation
+
+
+def legacy_read(port, rx_buffer_length, stop, on_packet):
+    # the reader Microcontroller used before PacketReader
+    def payload_to_int(payload,number_of_bytes):
+        signed = 0
+        for i in range(number_of_bytes):
+            signed = signed + int(payload[i])*(256**(number_of_bytes-1-i))
+        if signed >= 256**number_of_bytes/2:
+            signed = signed - 256**number_of_bytes
+        return signed
+    while not stop.is_set():
+        if port.in_waiting==0:
+            continue
+        if port.in_waiting % rx_buffer_length != 0:
+            continue
+        num_bytes_in_rx_buffer = port.in_waiting
+        if num_bytes_in_rx_buffer > rx_buffer_length:
+            for i in range(num_bytes_in_rx_buffer-rx_buffer_length):
+                port.read()
+        msg=[]
+        for i in range(rx_buffer_length):
+            msg.append(ord(port.read()))
+        x_pos = payload_to_int(msg[2:6],MicrocontrollerDef.N_BYTES_POS)
+        on_packet(x_pos,time.time())
+
+
+def packet_reader_read(port, rx_buffer_length, stop, on_packet):
+    reader = PacketReader(port,rx_buffer_length,Microcontroller_Simulation().crc_calculator)
+    while not stop.is_set():
+        packet = reader.read()
+        if packet is not None:
+            on_packet(MCU_PACKET.unpack(packet)[2],time.time())
+    print('    PacketReader: ' + str(reader.packets_received) + ' packets, ' + str(reader.packets_superseded) + ' superseded, ' + str(reader.crc_errors) + ' CRC errors')
+
+
+def run(name, read, rate, duration):
+    port = serial.serial_for_url('loop://',timeout=0.1)
+    mcu = Microcontroller_Simulation()
+    mcu.close() # only used to build packets
+    stop = threading.Event()
+    t_sent = {}
+    latencies = []
+
+    def on_packet(sequence_number,timestamp):
+        if sequence_number in t_sent:
+            latencies.append(timestamp - t_sent[sequence_number])
+
+    thread = threading.Thread(target=read,args=(port,MicrocontrollerDef.MSG_LENGTH,stop,on_packet))
+    thread.start()
+    cpu_start = time.process_time()
+    t_start = time.time()
+    n = 0
+    while time.time() - t_start < duration:
+        # the x position carries a sequence number, to match packets up with when they were sent
+        mcu.x_pos = n
+        t_sent[n] = time.time()
+        port.write(mcu._simulation_build_packet())
+        n = n + 1
+        time.sleep(max(0,t_start + n/rate - time.time()))
+    time.sleep(0.2) # let the reader catch up
+    stop.set()
+    thread.join()
+    cpu_per_s = (time.process_time() - cpu_start)/(time.time() - t_start)
+    port.close()
+    print(name.ljust(14) + 'sent ' + str(n) + ', decoded ' + str(len(latencies)) +
+        ', cpu ' + '{:.0f}'.format(100*cpu_per_s) + '% of a core' +
+        ', latency median ' + '{:.3f}'.format(1000*np.median(latencies) if latencies else float('nan')) + ' ms' +
+        ', max ' + '{:.3f}'.format(1000*np.max(latencies) if latencies else float('nan')) + ' ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='microcontroller packet reader loopback benchmark')
+    parser.add_argument('--rate',type=float,default=100,help='packets per second (the mcu sends 100)')
+    parser.add_argument('--duration',type=float,default=10,help='seconds per reader')
+    args = parser.parse_args()
+
+    run('legacy',legacy_read,args.rate,args.duration)
+    run('PacketReader',packet_reader_read,args.rate,args.duration)
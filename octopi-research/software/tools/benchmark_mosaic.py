@@ -0,0 +1,80 @@
+'''
+Cost of adding fovs to the tiled preview of a wellplate scan.
+
+Simulates a scan of --wells wells of --nx x --ny fovs each, --pitch mm apart, and
+places every fov into a control.mosaic.MosaicPyramid by its stage coordinates.
+Reports the time per fov, the size of the mosaic (all levels), how much of it is
+mapped into memory at the end (written back to disk, so reclaimable), and the
+time to read a viewer-sized (--view pixels) region of the whole-plate level -
+what napari loads when zoomed out. For comparison, the memory an in-memory
+canvas of the plate at the same downsampling (like the previous tiled preview,
+which only covered one well) would take.
+
+example:
+    python tools/benchmark_mosaic.py --wells 24 --nx 5 --ny 5 --size 3000
+'''
+import argparse
+import time
+
+import numpy as np
+
+from control import mosaic
+
+
+def resident_mb():
+    # resident memory of this process (linux)
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])/1024
+    return float('nan')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='tiled preview mosaic benchmark')
+    parser.add_argument('--wells',type=int,default=24)
+    parser.add_argument('--wells_per_row',type=int,default=6)
+    parser.add_argument('--pitch',type=float,default=19.3,help='well spacing (mm), 19.3 for a 24 well plate')
+    parser.add_argument('--nx',type=int,default=5)
+    parser.add_argument('--ny',type=int,default=5)
+    parser.add_argument('--size',type=int,default=3000,help='frame width and height')
+    parser.add_argument('--pixel_size_um',type=float,default=0.376)
+    parser.add_argument('--downsample',type=int,default=5)
+    parser.add_argument('--channels',type=int,default=2)
+    parser.add_argument('--view',type=int,default=1024,help='viewer width and height (pixels)')
+    args = parser.parse_args()
+
+    fov_mm = args.size*args.pixel_size_um/1000
+    coordinates = []
+    for well in range(args.wells):
+        x0 = (well%args.wells_per_row)*args.pitch
+        y0 = (well//args.wells_per_row)*args.pitch
+        for i in range(args.ny):
+            for j in range(args.nx):
+                coordinates.append((x0+j*fov_mm,y0+i*fov_mm))
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0,255,size=(args.size,args.size),dtype=np.uint8) for i in range(4)]
+
+    memory_before_mb = resident_mb()
+    pyramid = mosaic.MosaicPyramid(coordinates,args.pixel_size_um,1,args.downsample)
+    t_start = time.time()
+    for n, (x_mm,y_mm) in enumerate(coordinates):
+        for c in range(args.channels):
+            pyramid.add_tile(frames[(n+c)%4],x_mm,y_mm,0,'channel ' + str(c))
+    t_tiles = time.time() - t_start
+    levels = pyramid.get_levels('channel 0')
+    mosaic_mb = args.channels*sum(level.nbytes for level in levels)/1024**2
+
+    # a viewer-sized read of the level that shows the whole plate in the view
+    level = next((level for level in levels if max(level.shape[1:]) <= 2*args.view),levels[-1])
+    t_start = time.time()
+    region = np.array(level[0,:args.view,:args.view])
+    t_view = time.time() - t_start
+
+    canvas_mb = args.channels*levels[0].nbytes/1024**2
+    print(str(len(coordinates)) + ' fovs x ' + str(args.channels) + ' channels, level 0 ' + str(levels[0].shape[2]) + 'x' + str(levels[0].shape[1]) + ', ' + str(len(levels)) + ' levels')
+    print('time per fov and channel: ' + '{:.2f}'.format(1000*t_tiles/(len(coordinates)*args.channels)) + ' ms')
+    print('mosaic (memory-mapped):   ' + '{:.0f}'.format(mosaic_mb) + ' MB, resident ' + '{:.0f}'.format(resident_mb()-memory_before_mb) + ' MB')
+    print('in-memory canvas:         ' + '{:.0f}'.format(canvas_mb) + ' MB')
+    print('viewer read (' + str(level.shape[2]) + 'x' + str(level.shape[1]) + ' level): ' + '{:.2f}'.format(1000*t_view) + ' ms')
+    pyramid.close()
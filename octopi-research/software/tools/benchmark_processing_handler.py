@@ -0,0 +1,65 @@
+'''
+Throughput of per-FOV processing through ProcessingHandler.submit_fov_task.
+
+For every FOV, a DPC image is generated from a pair of frames
+(utils.generate_dpc) and a mask is labeled and colorized
+(utils.colorize_mask_get_counts), either in the processing thread
+(--processes 0, like before) or in a pool of processes that get the frames
+through shared memory. FOVs are submitted as fast as the handler accepts them;
+the time submitting was held back is the backpressure the acquisition would
+see. Results are checked to arrive in the order they were submitted.
+
+example:
+    python tools/benchmark_processing_handler.py --processes 0 4 --fovs 100 --size 2048
+'''
+import argparse
+import time
+
+import numpy as np
+
+from control import utils
+from control.processing_handler import ProcessingHandler
+
+
+def run(num_processes,fovs,size,max_pending_tasks):
+    rng = np.random.default_rng(0)
+    # a few different frames, reused across fovs
+    frames = [rng.integers(0,255,size=(size,size),dtype=np.uint8) for i in range(4)]
+    masks = [rng.random((size,size)) > 0.7 for i in range(2)]
+
+    handler = ProcessingHandler(num_processes=num_processes,max_pending_tasks=max_pending_tasks,queue_size=64)
+    handler.start_processing()
+    handler.start_uploading()
+    if num_processes > 0:
+        # start the processes before timing
+        handler.submit_fov_task(utils.generate_dpc,[frames[0][:8,:8],frames[1][:8,:8]])
+        handler.join()
+        handler.reset_stats()
+
+    delivered = []
+    t_start = time.time()
+    for i in range(fovs):
+        handler.submit_fov_task(utils.generate_dpc,[frames[i%4],frames[(i+1)%4]],callback=lambda result, i=i: delivered.append(('dpc',i)))
+        handler.submit_fov_task(utils.colorize_mask_get_counts,[masks[i%2]],callback=lambda result, i=i: delivered.append(('mask',i)))
+    t_submitted = time.time() - t_start
+    handler.join()
+    t_done = time.time() - t_start
+    handler.end_processing()
+
+    in_order = [i for kind, i in delivered] == sorted(i for kind, i in delivered)
+    print(str(num_processes).rjust(9) + '{:10.1f}'.format(fovs/t_done) + '{:14.2f}'.format(t_submitted) + '{:12.2f}'.format(t_done) + str(in_order).rjust(10))
+    handler.print_stats()
+    handler.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='fov processing throughput benchmark')
+    parser.add_argument('--processes',nargs='+',type=int,default=[0,4],help='numbers of processes to test, 0 runs tasks in the processing thread')
+    parser.add_argument('--fovs',type=int,default=50)
+    parser.add_argument('--size',type=int,default=2048,help='frame width and height')
+    parser.add_argument('--max_pending_tasks',type=int,default=8)
+    args = parser.parse_args()
+
+    print('processes  fovs/s  submitting (s)  total (s)  in order')
+    for num_processes in args.processes:
+        run(num_processes,args.fovs,args.size,args.max_pending_tasks)
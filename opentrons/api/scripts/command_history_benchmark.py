@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark the memory use of the protocol engine's CommandHistory against run length.
+
+This runs synthetic aspirate commands through a CommandHistory: each command is
+queued, run and succeeded, like the engine does when it executes it. For each
+run length, it reports the memory that the history holds on to afterwards, the
+time to add a command, and the time to get a page of commands from a random
+place in the run, like robot-server's GET /runs/{runId}/commands does. It does
+this once with every command kept in memory, and once with older finished
+commands moved to a command log on disk.
+
+Usage: python scripts/command_history_benchmark.py [--lengths 1000 10000 100000]
+"""
+
+import argparse
+import gc
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from opentrons.protocol_engine import commands
+from opentrons.protocol_engine.state.command_history import CommandHistory
+from opentrons.protocol_engine.state.command_log import CommandLog
+from opentrons.protocol_engine.types import DeckPoint, WellLocation
+
+
+_NOW = datetime(year=2024, month=1, day=1)
+_PAGE_LENGTH = 20
+_PAGES = 200
+
+
+def _aspirate(command_id: str, status: commands.CommandStatus) -> commands.Aspirate:
+    return commands.Aspirate(
+        id=command_id,
+        key=command_id,
+        createdAt=_NOW,
+        startedAt=_NOW if status != commands.CommandStatus.QUEUED else None,
+        completedAt=_NOW if status == commands.CommandStatus.SUCCEEDED else None,
+        status=status,
+        params=commands.AspirateParams(
+            pipetteId="pipette-id",
+            labwareId="labware-id",
+            wellName="A1",
+            wellLocation=WellLocation(),
+            volume=10,
+            flowRate=5,
+        ),
+        result=(
+            commands.AspirateResult(volume=10, position=DeckPoint(x=1, y=2, z=3))
+            if status == commands.CommandStatus.SUCCEEDED
+            else None
+        ),
+    )
+
+
+def _fill(length: int, command_log: Optional[CommandLog]) -> CommandHistory:
+    command_history = CommandHistory(command_log=command_log)
+    for i in range(length):
+        command_id = f"command-{i}"
+        command_history.set_command_queued(
+            _aspirate(command_id, commands.CommandStatus.QUEUED)
+        )
+        command_history.set_command_running(
+            _aspirate(command_id, commands.CommandStatus.RUNNING)
+        )
+        command_history.set_command_succeeded(
+            _aspirate(command_id, commands.CommandStatus.SUCCEEDED)
+        )
+    return command_history
+
+
+def _run(length: int, directory: Optional[Path]) -> None:
+    def make_command_log() -> Optional[CommandLog]:
+        return CommandLog(directory) if directory is not None else None
+
+    # Measure memory separately, because tracing allocations slows everything down.
+    gc.collect()
+    tracemalloc.start()
+    command_history = _fill(length, make_command_log())
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del command_history
+
+    start = time.perf_counter()
+    command_history = _fill(length, make_command_log())
+    add_time = (time.perf_counter() - start) / length
+
+    cursors: List[int] = [
+        random.randrange(max(1, length - _PAGE_LENGTH)) for _ in range(_PAGES)
+    ]
+    start = time.perf_counter()
+    for cursor in cursors:
+        command_history.get_slice(cursor, cursor + _PAGE_LENGTH)
+    page_time = (time.perf_counter() - start) / _PAGES
+
+    mode = "command log" if directory is not None else "in memory"
+    print(
+        f"{length:>8} commands, {mode:>11}: {memory / 2**20:8.1f} MiB, "
+        f"{add_time * 1e6:6.1f} us per command, "
+        f"{page_time * 1e3:6.2f} ms per page of {_PAGE_LENGTH}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="The run lengths, in commands, to measure.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for length in args.lengths:
+            _run(length, None)
+            _run(length, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
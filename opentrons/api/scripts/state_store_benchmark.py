@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Benchmark how many actions per second the protocol engine's StateStore handles.
+
+This feeds synthetic command streams straight into a StateStore: every command
+is queued, run and succeeded, like the engine does when it executes it, but
+without any hardware or command implementations in between. It does this once
+with each action routed to the substores that handle it, and once with every
+action passed to every substore, like StateStore used to do.
+
+Usage: python scripts/state_store_benchmark.py [--commands 20000] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List
+
+from opentrons_shared_data.deck import load as load_deck
+
+from opentrons.protocol_engine import commands
+from opentrons.protocol_engine.actions import (
+    Action,
+    PlayAction,
+    QueueCommandAction,
+    RunCommandAction,
+    SucceedCommandAction,
+)
+from opentrons.protocol_engine.state import Config, StateStore
+from opentrons.protocol_engine.state.abstract_store import HandlesActions
+from opentrons.protocol_engine.state.action_router import ActionRouter
+from opentrons.protocol_engine.types import DeckType
+
+
+_NOW = datetime(year=2024, month=1, day=1)
+
+
+def _comment(command_id: str) -> List[Action]:
+    params = commands.CommentParams(message="hello")
+    return [
+        QueueCommandAction(
+            command_id=command_id,
+            created_at=_NOW,
+            request=commands.CommentCreate(params=params),
+            request_hash=None,
+        ),
+        RunCommandAction(command_id=command_id, started_at=_NOW),
+        SucceedCommandAction(
+            command=commands.Comment(
+                id=command_id,
+                key=command_id,
+                createdAt=_NOW,
+                startedAt=_NOW,
+                completedAt=_NOW,
+                status=commands.CommandStatus.SUCCEEDED,
+                params=params,
+                result=commands.CommentResult(),
+            ),
+            private_result=None,
+        ),
+    ]
+
+
+def _wait_for_duration(command_id: str) -> List[Action]:
+    params = commands.WaitForDurationParams(seconds=0)
+    return [
+        QueueCommandAction(
+            command_id=command_id,
+            created_at=_NOW,
+            request=commands.WaitForDurationCreate(params=params),
+            request_hash=None,
+        ),
+        RunCommandAction(command_id=command_id, started_at=_NOW),
+        SucceedCommandAction(
+            command=commands.WaitForDuration(
+                id=command_id,
+                key=command_id,
+                createdAt=_NOW,
+                startedAt=_NOW,
+                completedAt=_NOW,
+                status=commands.CommandStatus.SUCCEEDED,
+                params=params,
+                result=commands.WaitForDurationResult(),
+            ),
+            private_result=None,
+        ),
+    ]
+
+
+def _home(command_id: str) -> List[Action]:
+    params = commands.HomeParams()
+    return [
+        QueueCommandAction(
+            command_id=command_id,
+            created_at=_NOW,
+            request=commands.HomeCreate(params=params),
+            request_hash=None,
+        ),
+        RunCommandAction(command_id=command_id, started_at=_NOW),
+        SucceedCommandAction(
+            command=commands.Home(
+                id=command_id,
+                key=command_id,
+                createdAt=_NOW,
+                startedAt=_NOW,
+                completedAt=_NOW,
+                status=commands.CommandStatus.SUCCEEDED,
+                params=params,
+                result=commands.HomeResult(),
+            ),
+            private_result=None,
+        ),
+    ]
+
+
+_STREAMS: Dict[str, List[Callable[[str], List[Action]]]] = {
+    "comment": [_comment],
+    "home": [_home],
+    "mixed": [_comment, _wait_for_duration, _home],
+}
+
+
+def _make_actions(stream: str, command_count: int) -> List[Action]:
+    makers = _STREAMS[stream]
+    actions: List[Action] = []
+    for i in range(command_count):
+        actions.extend(makers[i % len(makers)](f"command-{i}"))
+    return actions
+
+
+def _make_state_store() -> StateStore:
+    state_store = StateStore(
+        config=Config(robot_type="OT-2 Standard", deck_type=DeckType.OT2_STANDARD),
+        deck_definition=load_deck("ot2_standard", 5),
+        deck_fixed_labware=[],
+        is_door_open=False,
+    )
+    state_store.handle_action(PlayAction(requested_at=_NOW, deck_configuration=[]))
+    return state_store
+
+
+@contextmanager
+def _dispatch_to_every_substore() -> Iterator[None]:
+    get_handlers = ActionRouter.get_handlers
+
+    def every_substore(self: ActionRouter, action: Action) -> List[HandlesActions]:
+        return self._substores
+
+    ActionRouter.get_handlers = every_substore  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        ActionRouter.get_handlers = get_handlers  # type: ignore[method-assign]
+
+
+def _time_actions(actions: List[Action], repeat: int) -> float:
+    rates = []
+    for _ in range(repeat):
+        state_store = _make_state_store()
+        start = time.perf_counter()
+        for action in actions:
+            state_store.handle_action(action)
+        rates.append(len(actions) / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commands",
+        type=int,
+        default=20000,
+        help="How many commands each stream has (3 actions per command).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="How many times to handle each stream in each mode.",
+    )
+    args = parser.parse_args()
+
+    for stream in _STREAMS:
+        actions = _make_actions(stream, args.commands)
+        with _dispatch_to_every_substore():
+            every_substore = _time_actions(actions, args.repeat)
+        routed = _time_actions(actions, args.repeat)
+        print(
+            f"{stream:>8}: {every_substore:8.0f} actions/s to every substore, "
+            f"{routed:8.0f} actions/s routed (median of {args.repeat})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Benchmark how fast the protocol engine finds the next tip in a set of tip racks.
+
+This loads tip racks into a TipStore and then, for each pipette nozzle layout,
+uses up every tip the layout can reach: it asks each tip rack in turn for its
+next tip, like the Python Protocol API does during analysis, and picks it up.
+It reports the median time per tip pickup, including the failed searches
+through tip racks that are already used up. It only uses the public TipStore
+and TipView interfaces, so it can be run on different versions of them to
+compare their tip tracking.
+
+Usage: python scripts/tip_tracking_benchmark.py [--tip-racks 10] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from opentrons_shared_data.labware import load_definition
+from opentrons_shared_data.labware.labware_definition import LabwareDefinition
+
+from opentrons.hardware_control.nozzle_manager import NozzleMap
+from opentrons.protocol_engine import actions, commands
+from opentrons.protocol_engine.resources.pipette_data_provider import (
+    VirtualPipetteDataProvider,
+)
+from opentrons.protocol_engine.state.tips import TipStore, TipView
+from opentrons.protocol_engine.types import DeckPoint
+
+
+_TIP_RACK = "opentrons_flex_96_tiprack_1000ul"
+
+# Layout name: (pipette model, back left nozzle, front right nozzle, starting nozzle)
+_LAYOUTS: Dict[str, Tuple[str, Optional[str], Optional[str], Optional[str]]] = {
+    "1-channel": ("p1000_single_v3.5", None, None, None),
+    "8-channel": ("p1000_multi_v3.5", None, None, None),
+    "96-channel": ("p1000_96_v3.6", None, None, None),
+    "96 column": ("p1000_96_v3.6", "A12", "H12", "A12"),
+    "96 single": ("p1000_96_v3.6", "H12", "H12", "H12"),
+}
+
+
+def _get_nozzle_map(layout: str) -> NozzleMap:
+    model, back_left, front_right, starting = _LAYOUTS[layout]
+    data_provider = VirtualPipetteDataProvider()
+    data_provider.configure_virtual_pipette_nozzle_layout(
+        "pipette-id", model, back_left, front_right, starting
+    )
+    return data_provider.get_nozzle_layout_for_pipette("pipette-id")
+
+
+def _make_tip_store(
+    definition: LabwareDefinition, tip_rack_count: int, nozzle_map: NozzleMap
+) -> TipStore:
+    tip_store = TipStore()
+    for i in range(tip_rack_count):
+        tip_store.handle_action(
+            actions.SucceedCommandAction(
+                private_result=None,
+                command=commands.LoadLabware.construct(  # type: ignore[call-arg]
+                    result=commands.LoadLabwareResult.construct(
+                        labwareId=f"tip-rack-{i}", definition=definition
+                    )
+                ),
+            )
+        )
+    tip_store.handle_action(
+        actions.SucceedCommandAction(
+            private_result=commands.ConfigureNozzleLayoutPrivateResult(
+                pipette_id="pipette-id", nozzle_map=nozzle_map
+            ),
+            command=commands.ConfigureNozzleLayout.construct(  # type: ignore[call-arg]
+                result=commands.ConfigureNozzleLayoutResult()
+            ),
+        )
+    )
+    return tip_store
+
+
+def _pick_up_tip(tip_store: TipStore, labware_id: str, well_name: str) -> None:
+    tip_store.handle_action(
+        actions.SucceedCommandAction(
+            private_result=None,
+            command=commands.PickUpTip.construct(  # type: ignore[call-arg]
+                params=commands.PickUpTipParams.construct(
+                    pipetteId="pipette-id", labwareId=labware_id, wellName=well_name
+                ),
+                result=commands.PickUpTipResult.construct(
+                    position=DeckPoint(x=0, y=0, z=0), tipLength=1.23
+                ),
+            ),
+        )
+    )
+
+
+def _time_pickups(
+    definition: LabwareDefinition, tip_rack_count: int, nozzle_map: NozzleMap
+) -> Tuple[float, int]:
+    """Use up the tip racks and return the time per pickup and the pickup count."""
+    tip_store = _make_tip_store(definition, tip_rack_count, nozzle_map)
+    labware_ids: List[str] = [f"tip-rack-{i}" for i in range(tip_rack_count)]
+    pickups = 0
+    start = time.perf_counter()
+    while True:
+        view = TipView(tip_store.state)
+        for labware_id in labware_ids:
+            well_name = view.get_next_tip(
+                labware_id=labware_id,
+                num_tips=nozzle_map.tip_count,
+                starting_tip_name=None,
+                nozzle_map=nozzle_map,
+            )
+            if well_name is not None:
+                break
+        else:
+            break
+        _pick_up_tip(tip_store, labware_id, well_name)
+        pickups += 1
+    return (time.perf_counter() - start) / max(pickups, 1), pickups
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tip-racks",
+        type=int,
+        default=10,
+        help="How many tip racks to load.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="How many times to use up the tip racks with each layout.",
+    )
+    args = parser.parse_args()
+
+    definition = LabwareDefinition.parse_obj(load_definition(_TIP_RACK, 1))
+    for layout in _LAYOUTS:
+        nozzle_map = _get_nozzle_map(layout)
+        results = [
+            _time_pickups(definition, args.tip_racks, nozzle_map)
+            for _ in range(args.repeat)
+        ]
+        per_pickup = statistics.median(result[0] for result in results)
+        print(
+            f"{layout:>10}: {results[0][1]:5d} pickups, "
+            f"{per_pickup * 1e6:8.1f} us per pickup (median of {args.repeat})"
+        )
+
+
+if __name__ == "__main__":
+    main()
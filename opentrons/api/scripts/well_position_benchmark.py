@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark analyzing a well-heavy protocol with and without cached labware positions.
+
+This analyzes a serial dilution across every row of a 384-well plate, which
+looks up a well position for nearly every command, and reports how long the
+analysis took and how many well positions it looked up. It does this once with
+GeometryView's labware position cache, and once with every labware position
+computed from scratch, like GeometryView used to do.
+
+Usage: python scripts/well_position_benchmark.py [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, List
+from unittest import mock
+
+from opentrons.protocol_engine.state.geometry import GeometryView
+from opentrons.protocol_reader import ProtocolReader
+from opentrons.protocol_runner import (
+    PythonAndLegacyRunner,
+    create_simulating_runner,
+)
+from opentrons.protocols.parse import PythonParseMode
+from opentrons.types import Point
+
+
+_PROTOCOL = """
+requirements = {"robotType": "OT-2", "apiLevel": "2.18"}
+
+
+def run(protocol):
+    plate = protocol.load_labware("corning_384_wellplate_112ul_flat", 1)
+    reservoir = protocol.load_labware("nest_12_reservoir_15ml", 2)
+    tip_rack = protocol.load_labware("opentrons_96_tiprack_20ul", 3)
+    pipette = protocol.load_instrument("p20_single_gen2", "right", tip_racks=[tip_rack])
+
+    for row in plate.rows():
+        pipette.pick_up_tip()
+        pipette.aspirate(20, reservoir["A1"])
+        pipette.dispense(20, row[0])
+        for source, destination in zip(row[:-1], row[1:]):
+            pipette.aspirate(10, source)
+            pipette.dispense(10, destination)
+            pipette.mix(3, 10, destination)
+            pipette.blow_out(destination.top())
+            pipette.touch_tip(destination)
+        pipette.drop_tip()
+"""
+
+
+@contextmanager
+def _count_well_positions() -> Iterator[List[int]]:
+    count = [0]
+    get_well_position = GeometryView.get_well_position
+
+    def counting_get_well_position(
+        self: GeometryView, *args: Any, **kwargs: Any
+    ) -> Point:
+        count[0] += 1
+        return get_well_position(self, *args, **kwargs)
+
+    with mock.patch.object(
+        GeometryView, "get_well_position", counting_get_well_position
+    ):
+        yield count
+
+
+@contextmanager
+def _uncached_labware_positions() -> Iterator[None]:
+    with mock.patch.object(
+        GeometryView,
+        "get_labware_position",
+        GeometryView._get_uncached_labware_position,
+    ):
+        yield
+
+
+async def _analyze(protocol_path: Path) -> None:
+    protocol_source = await ProtocolReader().read_saved(
+        files=[protocol_path], directory=None
+    )
+    runner = await create_simulating_runner(
+        robot_type=protocol_source.robot_type, protocol_config=protocol_source.config
+    )
+    assert isinstance(runner, PythonAndLegacyRunner)
+    await runner.load(
+        protocol_source=protocol_source,
+        python_parse_mode=PythonParseMode.NORMAL,
+        run_time_param_values=None,
+    )
+    result = await runner.run(deck_configuration=[])
+    assert not result.state_summary.errors, result.state_summary.errors
+
+
+def _time_analysis(protocol_path: Path, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(_analyze(protocol_path))
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="How many times to analyze the protocol in each mode.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        protocol_path = Path(directory) / "serial_dilution_384.py"
+        protocol_path.write_text(_PROTOCOL)
+
+        with _count_well_positions() as count:
+            asyncio.run(_analyze(protocol_path))
+        print(f"Well positions looked up per analysis: {count[0]}")
+
+        with _uncached_labware_positions():
+            uncached = _time_analysis(protocol_path, args.repeat)
+        cached = _time_analysis(protocol_path, args.repeat)
+
+    print(f"Uncached labware positions: {uncached:.2f} s (median of {args.repeat})")
+    print(f"Cached labware positions:   {cached:.2f} s (median of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ It is currently used by the Opentrons App to analyze protocols.
 import click
 
 from .analyze import analyze
+from .startup_profile import startup_profile
 
 
 @click.group()
@@ -19,3 +20,4 @@ def main() -> None:
 
 
 main.add_command(analyze)
+main.add_command(startup_profile)
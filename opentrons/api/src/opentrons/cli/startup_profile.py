@@ -0,0 +1,159 @@
+"""Opentrons startup-profile CLI."""
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import click
+
+
+_DEFAULT_MODULES = ("opentrons", "opentrons.simulate", "opentrons.execute")
+
+# A line of `python -X importtime` output, like:
+# "import time:       800 |     399880 |     opentrons.hardware_control.adapters"
+_IMPORT_TIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<name>.*)$"
+)
+
+
+@dataclass
+class ImportTimeNode:
+    """How long a module took to import, and what it imported first."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List["ImportTimeNode"] = field(default_factory=list)
+
+
+def parse_import_times(importtime_output: str) -> List[ImportTimeNode]:
+    """Parse `python -X importtime` output into trees of imports.
+
+    Returns:
+        The modules that were imported at the top level, each with the modules that
+        were first imported while importing it.
+    """
+    # Each module is printed after everything it imported, indented one level more.
+    # So the children of a module are the ones seen at the next depth since the
+    # last module at its own depth.
+    pending: Dict[int, List[ImportTimeNode]] = {}
+    for line in importtime_output.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        indented_name = match.group("name")
+        name = indented_name.lstrip()
+        depth = (len(indented_name) - len(name)) // 2
+        node = ImportTimeNode(
+            name=name,
+            self_us=int(match.group("self")),
+            cumulative_us=int(match.group("cumulative")),
+            children=pending.pop(depth + 1, []),
+        )
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def profile_import(module: str) -> List[ImportTimeNode]:
+    """Import a module in a fresh interpreter and return its import time trees."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise click.ClickException(f"Could not import {module}:\n{result.stderr}")
+    return parse_import_times(result.stderr)
+
+
+def format_import_time_tree(
+    roots: Sequence[ImportTimeNode],
+    min_ms: float,
+    max_depth: Optional[int],
+) -> str:
+    """Format import time trees, slowest first, hiding modules faster than `min_ms`."""
+    lines: List[str] = []
+
+    def add(node: ImportTimeNode, depth: int) -> None:
+        if node.cumulative_us / 1000 < min_ms:
+            return
+        lines.append(
+            f"{node.cumulative_us / 1000:9.1f} ms {node.self_us / 1000:9.1f} ms  "
+            + "  " * depth
+            + node.name
+        )
+        if max_depth is None or depth < max_depth:
+            for child in sorted(node.children, key=lambda c: -c.cumulative_us):
+                add(child, depth + 1)
+
+    lines.append(f"{'cumulative':>12} {'self':>12}  module")
+    for root in sorted(roots, key=lambda r: -r.cumulative_us):
+        add(root, 0)
+    return "\n".join(lines)
+
+
+@click.command("startup-profile")
+@click.argument("modules", nargs=-1)
+@click.option(
+    "--min-ms",
+    help="Hide modules that took less than this long to import, including what they imported.",
+    type=float,
+    default=5.0,
+    show_default=True,
+)
+@click.option(
+    "--max-depth",
+    help="How many levels of nested imports to show. If not specified, show all of them.",
+    type=int,
+    default=None,
+)
+@click.option(
+    "--repeat",
+    help="How many fresh interpreters to import each module in. The tree is shown for the run with the median total time.",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+)
+@click.option(
+    "--budget-ms",
+    help="Fail (via exit code) if the median time to import any of the modules is more than this.",
+    type=float,
+    default=None,
+)
+def startup_profile(
+    modules: Sequence[str],
+    min_ms: float,
+    max_depth: Optional[int],
+    repeat: int,
+    budget_ms: Optional[float],
+) -> None:
+    """Report how long it takes to import parts of the opentrons package.
+
+    Each module is imported in a fresh interpreter, and the time taken by every
+    module that it imports is shown as a tree. If no modules are specified,
+    the entry points for simulating and executing protocols are profiled.
+
+    With --repeat and --budget-ms, this can be used as a regression benchmark.
+    """
+    over_budget = []
+    for module in modules or _DEFAULT_MODULES:
+        runs = [profile_import(module) for _ in range(repeat)]
+        runs.sort(key=lambda roots: sum(root.cumulative_us for root in roots))
+        median_roots = runs[len(runs) // 2]
+        median_ms = statistics.median(
+            sum(root.cumulative_us for root in roots) / 1000 for roots in runs
+        )
+
+        click.echo(f"import {module}: {median_ms:.1f} ms (median of {repeat})")
+        click.echo(format_import_time_tree(median_roots, min_ms, max_depth))
+        click.echo()
+
+        if budget_ms is not None and median_ms > budget_ms:
+            over_budget.append(f"{module} ({median_ms:.1f} ms)")
+
+    if over_budget:
+        raise click.ClickException(
+            f"Importing took more than {budget_ms} ms: {', '.join(over_budget)}"
+        )
@@ -4,13 +4,31 @@ import asyncio
 import contextlib
 from concurrent.futures.thread import ThreadPoolExecutor
 from functools import partial
-from typing import Optional, AsyncGenerator, Union
+from typing import Any, Callable, Optional, AsyncGenerator, TypeVar, Union
 from typing_extensions import Literal
 
 from serial import Serial, serial_for_url  # type: ignore[import-untyped]
 
 TimeoutProperties = Union[Literal["write_timeout"], Literal["timeout"]]
 
+_T = TypeVar("_T")
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_shared_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs the blocking calls of every serial port.
+
+    Threads are only started as they're needed, so this is as many threads as
+    there are ports busy at the same time, rather than one per port.
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = ThreadPoolExecutor(
+            max_workers=32, thread_name_prefix="serial"
+        )
+    return _shared_executor
+
 
 class AsyncSerial:
     """Async wrapper around Serial."""
@@ -38,7 +56,7 @@ class AsyncSerial:
              writing to it
         """
         loop = loop or asyncio.get_running_loop()
-        executor = ThreadPoolExecutor(max_workers=1)
+        executor = _get_shared_executor()
         serial = await loop.run_in_executor(
             executor=executor,
             func=partial(
@@ -68,13 +86,29 @@ class AsyncSerial:
 
         Args:
             serial: connected Serial object
-            executor: a thread pool executor
+            executor: a thread pool executor, which can be shared with other ports
             loop: event loop
         """
         self._serial = serial
         self._executor = executor
         self._loop = loop
         self._reset_buffer_before_write = reset_buffer_before_write
+        self._lock = asyncio.Lock()
+        self._pending: Optional["asyncio.Future[Any]"] = None
+
+    async def _run(self, func: Callable[[], _T]) -> _T:
+        """Run a blocking call on the port in the executor.
+
+        Calls on the same port run one at a time, in order. A call that's
+        cancelled can't be stopped, so the next one still waits for it.
+        """
+        async with self._lock:
+            if self._pending is not None:
+                await asyncio.wait([self._pending])
+            future = self._pending = self._loop.run_in_executor(
+                executor=self._executor, func=func
+            )
+            return await asyncio.shield(future)
 
     async def read_until(self, match: bytes) -> bytes:
         """
@@ -88,10 +122,7 @@ class AsyncSerial:
         Returns:
             read data.
         """
-        return await self._loop.run_in_executor(
-            executor=self._executor,
-            func=partial(self._serial.read_until, expected=match),
-        )
+        return await self._run(partial(self._serial.read_until, expected=match))
 
     async def write(self, data: bytes) -> None:
         """
@@ -103,10 +134,7 @@ class AsyncSerial:
         Returns:
             None
         """
-        await self._loop.run_in_executor(
-            executor=self._executor,
-            func=lambda: self._sync_write(data=data),
-        )
+        await self._run(partial(self._sync_write, data=data))
 
     def _sync_write(self, data: bytes) -> None:
         """
@@ -129,9 +157,7 @@ class AsyncSerial:
 
         Returns: None
         """
-        return await self._loop.run_in_executor(
-            executor=self._executor, func=self._serial.open
-        )
+        return await self._run(self._serial.open)
 
     async def close(self) -> None:
         """
@@ -139,9 +165,7 @@ class AsyncSerial:
 
         Returns: None
         """
-        return await self._loop.run_in_executor(
-            executor=self._executor, func=self._serial.close
-        )
+        return await self._run(self._serial.close)
 
     async def is_open(self) -> bool:
         """
@@ -164,16 +188,12 @@ class AsyncSerial:
         override = timeout is not None and default_timeout != timeout
         try:
             if override:
-                await self._loop.run_in_executor(
-                    executor=self._executor,
-                    func=lambda: setattr(self._serial, timeout_property, timeout),
+                await self._run(
+                    partial(setattr, self._serial, timeout_property, timeout)
                 )
             yield
         finally:
             if override:
-                await self._loop.run_in_executor(
-                    executor=self._executor,
-                    func=lambda: setattr(
-                        self._serial, timeout_property, default_timeout
-                    ),
+                await self._run(
+                    partial(setattr, self._serial, timeout_property, default_timeout)
                 )
@@ -8,39 +8,78 @@ or axis)  to a deck-absolute point (not a Smoothie-coordinate point).
 
 This module is not for use outside the opentrons api module. Higher-level
 functions are available elsewhere.
+
+Most of this package's exports are only imported when they're first used,
+since importing the hardware controller and its drivers is slow and many
+users, like `opentrons.config`, only need `.types`.
 """
-from .adapters import SynchronousAdapter
-from .api import API
-from .pause_manager import PauseManager
-from .backends import Controller, Simulator
-from .types import CriticalPoint, ExecutionState, OT3Mount
-from .constants import DROP_TIP_RELEASE_DISTANCE
-from .thread_manager import ThreadManager
-from .execution_manager import ExecutionManager
-from .threaded_async_lock import ThreadedAsyncLock, ThreadedAsyncForbidden
-from .protocols import HardwareControlInterface, FlexHardwareControlInterface
-from .instruments import AbstractInstrument, Gripper
-from typing import Union
-from .ot3_calibration import OT3Transforms
-from .robot_calibration import RobotCalibration
-from opentrons.config.types import RobotConfig, OT3Config
+from typing import TYPE_CHECKING
 
-from opentrons.types import Mount
+from opentrons.util.lazy_import import lazy_attributes
 
-# TODO (lc 12-05-2022) We should 1. figure out if we need
-# to globally export a class that is strictly used in the hardware controller
-# and 2. how to properly export an ot2 and ot3 pipette.
-from .instruments.ot2.pipette import Pipette
+from .types import CriticalPoint, ExecutionState, OT3Mount  # noqa: F401
+from .constants import DROP_TIP_RELEASE_DISTANCE
 
-OT2HardwareControlAPI = HardwareControlInterface[RobotCalibration, Mount, RobotConfig]
-OT3HardwareControlAPI = FlexHardwareControlInterface[
-    OT3Transforms, Union[Mount, OT3Mount], OT3Config
-]
-HardwareControlAPI = Union[OT2HardwareControlAPI, OT3HardwareControlAPI]
+if TYPE_CHECKING:
+    from .adapters import SynchronousAdapter
+    from .api import API
+    from .pause_manager import PauseManager
+    from .backends import Controller, Simulator
+    from .thread_manager import ThreadManager
+    from .execution_manager import ExecutionManager
+    from .threaded_async_lock import ThreadedAsyncLock, ThreadedAsyncForbidden
+    from .protocols import (  # noqa: F401
+        HardwareControlInterface,
+        FlexHardwareControlInterface,
+    )
+    from .instruments import AbstractInstrument, Gripper
+    from .ot3_calibration import OT3Transforms  # noqa: F401
+    from .robot_calibration import RobotCalibration  # noqa: F401
+    from .control_api_types import (
+        OT2HardwareControlAPI,
+        OT3HardwareControlAPI,
+        HardwareControlAPI,
+        ThreadManagedHardware,
+        SyncHardwareAPI,
+    )
 
-# this type ignore is because of https://github.com/python/mypy/issues/13437
-ThreadManagedHardware = ThreadManager[HardwareControlAPI]  # type: ignore[misc]
-SyncHardwareAPI = SynchronousAdapter[HardwareControlAPI]
+    # TODO (lc 12-05-2022) We should 1. figure out if we need
+    # to globally export a class that is strictly used in the hardware controller
+    # and 2. how to properly export an ot2 and ot3 pipette.
+    from .instruments.ot2.pipette import Pipette
+else:
+    __getattr__ = lazy_attributes(
+        __name__,
+        {
+            "SynchronousAdapter": (".adapters", "SynchronousAdapter"),
+            "API": (".api", "API"),
+            "PauseManager": (".pause_manager", "PauseManager"),
+            "Controller": (".backends.controller", "Controller"),
+            "Simulator": (".backends.simulator", "Simulator"),
+            "ThreadManager": (".thread_manager", "ThreadManager"),
+            "ExecutionManager": (".execution_manager", "ExecutionManager"),
+            "ThreadedAsyncLock": (".threaded_async_lock", "ThreadedAsyncLock"),
+            "ThreadedAsyncForbidden": (
+                ".threaded_async_lock",
+                "ThreadedAsyncForbidden",
+            ),
+            "HardwareControlInterface": (".protocols", "HardwareControlInterface"),
+            "FlexHardwareControlInterface": (
+                ".protocols",
+                "FlexHardwareControlInterface",
+            ),
+            "AbstractInstrument": (".instruments", "AbstractInstrument"),
+            "Gripper": (".instruments", "Gripper"),
+            "OT3Transforms": (".ot3_calibration", "OT3Transforms"),
+            "RobotCalibration": (".robot_calibration", "RobotCalibration"),
+            "OT2HardwareControlAPI": (".control_api_types", "OT2HardwareControlAPI"),
+            "OT3HardwareControlAPI": (".control_api_types", "OT3HardwareControlAPI"),
+            "HardwareControlAPI": (".control_api_types", "HardwareControlAPI"),
+            "ThreadManagedHardware": (".control_api_types", "ThreadManagedHardware"),
+            "SyncHardwareAPI": (".control_api_types", "SyncHardwareAPI"),
+            "Pipette": (".instruments.ot2.pipette", "Pipette"),
+        },
+    )
 
 __all__ = [
     "API",
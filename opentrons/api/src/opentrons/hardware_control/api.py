@@ -6,6 +6,7 @@ import logging
 import pathlib
 from collections import OrderedDict
 from typing import (
+    TYPE_CHECKING,
     Callable,
     Dict,
     Union,
@@ -39,7 +40,7 @@ from .instruments.ot2.pipette import (
     generate_hardware_configs,
     load_from_config_and_check_skip,
 )
-from .backends import Controller, Simulator
+from .backends.simulator import Simulator
 from .execution_manager import ExecutionManagerProvider
 from .pause_manager import PauseManager
 from .module_control import AttachedModulesControl
@@ -75,6 +76,9 @@ from .motion_utilities import (
     machine_from_deck,
 )
 
+if TYPE_CHECKING:
+    from .backends.controller import Controller
+
 
 mod_log = logging.getLogger(__name__)
 
@@ -111,7 +115,7 @@ class API(
 
     def __init__(
         self,
-        backend: Union[Controller, Simulator],
+        backend: Union["Controller", Simulator],
         loop: asyncio.AbstractEventLoop,
         config: RobotConfig,
         feature_flags: Optional[HardwareFeatureFlags] = None,
@@ -195,6 +199,9 @@ class API(
             checked_config = config
         else:
             checked_config = robot_configs.load_ot2()
+        # Local import so the smoothie drivers are only loaded for real hardware.
+        from .backends.controller import Controller
+
         backend = await Controller.build(checked_config)
         backend.set_lights(button=None, rails=False)
 
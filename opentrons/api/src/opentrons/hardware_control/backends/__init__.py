@@ -1,6 +1,18 @@
-from .controller import Controller
+from typing import TYPE_CHECKING
+
+from opentrons.util.lazy_import import lazy_attributes
+
 from .simulator import Simulator
 
+if TYPE_CHECKING:
+    from .controller import Controller
+else:
+    # Controller pulls in the serial drivers for real hardware, which
+    # simulations never need, so it's only imported when it's asked for.
+    __getattr__ = lazy_attributes(
+        __name__, {"Controller": (".controller", "Controller")}
+    )
+
 # only expose the ot2 interfaces in __init__ so everything works if opentrons_hardware
 # is not present
 
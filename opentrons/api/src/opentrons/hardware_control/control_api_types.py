@@ -0,0 +1,22 @@
+"""Type aliases for the hardware controller interfaces exported by hardware_control."""
+from typing import Union
+
+from opentrons.config.types import RobotConfig, OT3Config
+from opentrons.types import Mount
+
+from .adapters import SynchronousAdapter
+from .ot3_calibration import OT3Transforms
+from .protocols import HardwareControlInterface, FlexHardwareControlInterface
+from .robot_calibration import RobotCalibration
+from .thread_manager import ThreadManager
+from .types import OT3Mount
+
+OT2HardwareControlAPI = HardwareControlInterface[RobotCalibration, Mount, RobotConfig]
+OT3HardwareControlAPI = FlexHardwareControlInterface[
+    OT3Transforms, Union[Mount, OT3Mount], OT3Config
+]
+HardwareControlAPI = Union[OT2HardwareControlAPI, OT3HardwareControlAPI]
+
+# this type ignore is because of https://github.com/python/mypy/issues/13437
+ThreadManagedHardware = ThreadManager[HardwareControlAPI]  # type: ignore[misc]
+SyncHardwareAPI = SynchronousAdapter[HardwareControlAPI]
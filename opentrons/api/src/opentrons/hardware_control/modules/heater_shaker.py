@@ -11,7 +11,7 @@ from opentrons.drivers.heater_shaker.abstract import AbstractHeaterShakerDriver
 from opentrons.drivers.heater_shaker.simulator import SimulatingDriver
 from opentrons.drivers.types import Temperature, RPM, HeaterShakerLabwareLatchStatus
 from opentrons.hardware_control.execution_manager import ExecutionManager
-from opentrons.hardware_control.poller import Reader, Poller
+from opentrons.hardware_control.poller import Reader, Poller, PollMetrics
 from opentrons.hardware_control.modules import mod_abc, update
 from opentrons.hardware_control.modules.types import (
     ModuleType,
@@ -25,6 +25,8 @@ from opentrons.hardware_control.modules.types import (
 log = logging.getLogger(__name__)
 
 POLL_PERIOD = 1.0
+# Without a target temperature or speed, there's nothing to keep up with.
+IDLE_POLL_PERIOD = 5.0
 
 # TODO(mc, 2022-06-14): this techinque copied from temperature module
 # to speed up simulation of heater-shaker protocols, but it's pretty silly
@@ -68,15 +70,21 @@ class HeaterShaker(mod_abc.AbstractModule):
             HeaterShaker instance
         """
         driver: AbstractHeaterShakerDriver
+        idle_poll_interval_seconds: Optional[float] = None
         if not simulating:
             driver = await HeaterShakerDriver.create(port=port, loop=hw_control_loop)
+            idle_poll_interval_seconds = poll_interval_seconds or IDLE_POLL_PERIOD
             poll_interval_seconds = poll_interval_seconds or POLL_PERIOD
         else:
             driver = SimulatingDriver(serial_number=sim_serial_number)
             poll_interval_seconds = poll_interval_seconds or SIMULATING_POLL_PERIOD
 
         reader = HeaterShakerReader(driver=driver)
-        poller = Poller(reader=reader, interval=poll_interval_seconds)
+        poller = Poller(
+            reader=reader,
+            interval=poll_interval_seconds,
+            idle_interval=idle_poll_interval_seconds,
+        )
         module = cls(
             port=port,
             usb_port=usb_port,
@@ -192,6 +200,11 @@ class HeaterShaker(mod_abc.AbstractModule):
     def device_info(self) -> Mapping[str, str]:
         return self._device_info
 
+    @property
+    def poll_metrics(self) -> PollMetrics:
+        """How long the module's status polls have taken."""
+        return self._poller.metrics
+
     @property
     def live_data(self) -> LiveData:
         return {
@@ -400,6 +413,10 @@ class HeaterShakerReader(Reader):
     def on_error(self, exception: Exception) -> None:
         self._set_error(exception)
 
+    def is_idle(self) -> bool:
+        """Whether the module has no target temperature or speed."""
+        return self.temperature.target is None and self.rpm.target is None
+
     async def read_temperature(self) -> None:
         self.temperature = await self._driver.get_temperature()
 
@@ -5,7 +5,7 @@ import logging
 from typing import Mapping, Optional
 
 from opentrons.hardware_control.modules.types import TemperatureStatus
-from opentrons.hardware_control.poller import Reader, Poller
+from opentrons.hardware_control.poller import Reader, Poller, PollMetrics
 from typing_extensions import Final
 from opentrons.drivers.types import Temperature
 from opentrons.drivers.temp_deck import (
@@ -20,6 +20,8 @@ from opentrons.hardware_control.modules import update, mod_abc, types
 log = logging.getLogger(__name__)
 
 TEMP_POLL_INTERVAL_SECS = 1.0
+# Without a target temperature, there's nothing to keep up with.
+TEMP_IDLE_POLL_INTERVAL_SECS = 5.0
 SIM_TEMP_POLL_INTERVAL_SECS = TEMP_POLL_INTERVAL_SECS / 20.0
 
 
@@ -57,8 +59,12 @@ class TempDeck(mod_abc.AbstractModule):
             Tempdeck instance
         """
         driver: AbstractTempDeckDriver
+        idle_poll_interval_seconds: Optional[float] = None
         if not simulating:
             driver = await TempDeckDriver.create(port=port, loop=hw_control_loop)
+            idle_poll_interval_seconds = (
+                poll_interval_seconds or TEMP_IDLE_POLL_INTERVAL_SECS
+            )
             poll_interval_seconds = poll_interval_seconds or TEMP_POLL_INTERVAL_SECS
         else:
             driver = SimulatingDriver(
@@ -67,7 +73,11 @@ class TempDeck(mod_abc.AbstractModule):
             poll_interval_seconds = poll_interval_seconds or SIM_TEMP_POLL_INTERVAL_SECS
 
         reader = TempDeckReader(driver=driver)
-        poller = Poller(reader=reader, interval=poll_interval_seconds)
+        poller = Poller(
+            reader=reader,
+            interval=poll_interval_seconds,
+            idle_interval=idle_poll_interval_seconds,
+        )
         module = cls(
             port=port,
             usb_port=usb_port,
@@ -185,6 +195,11 @@ class TempDeck(mod_abc.AbstractModule):
     def device_info(self) -> Mapping[str, str]:
         return self._device_info
 
+    @property
+    def poll_metrics(self) -> PollMetrics:
+        """How long the module's status polls have taken."""
+        return self._poller.metrics
+
     @property
     def live_data(self) -> types.LiveData:
         return {
@@ -285,3 +300,7 @@ class TempDeckReader(Reader):
     async def read(self) -> None:
         """Read the module's current and target temperatures."""
         self.temperature = await self._driver.get_temperature()
+
+    def is_idle(self) -> bool:
+        """Whether the module has no target temperature."""
+        return self.temperature.target is None
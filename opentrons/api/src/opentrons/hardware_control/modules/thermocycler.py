@@ -8,7 +8,7 @@ from opentrons.drivers.types import ThermocyclerLidStatus, Temperature, PlateTem
 from opentrons.hardware_control.modules.lid_temp_status import LidTemperatureStatus
 from opentrons.hardware_control.modules.plate_temp_status import PlateTemperatureStatus
 from opentrons.hardware_control.modules.types import TemperatureStatus
-from opentrons.hardware_control.poller import Reader, Poller
+from opentrons.hardware_control.poller import Reader, Poller, PollMetrics
 
 from ..execution_manager import ExecutionManager
 from . import types, update, mod_abc
@@ -24,6 +24,8 @@ log = logging.getLogger(__name__)
 
 POLLING_FREQUENCY_SEC = 1.0
 SIM_POLLING_FREQUENCY_SEC = POLLING_FREQUENCY_SEC / 50.0
+# Shorter than for other modules, because the lid can be moved with its button.
+IDLE_POLLING_FREQUENCY_SEC = 2.0
 
 V1_MODULE_STRING = "thermocyclerModuleV1"
 V2_MODULE_STRING = "thermocyclerModuleV2"
@@ -82,17 +84,25 @@ class Thermocycler(mod_abc.AbstractModule):
             Thermocycler instance.
         """
         driver: AbstractThermocyclerDriver
+        idle_poll_interval_seconds: Optional[float] = None
         if not simulating:
             driver = await ThermocyclerDriverFactory.create(
                 port=port, loop=hw_control_loop
             )
+            idle_poll_interval_seconds = (
+                poll_interval_seconds or IDLE_POLLING_FREQUENCY_SEC
+            )
             poll_interval_seconds = poll_interval_seconds or POLLING_FREQUENCY_SEC
         else:
             driver = SimulatingDriver(model=sim_model, serial_number=sim_serial_number)
             poll_interval_seconds = poll_interval_seconds or SIM_POLLING_FREQUENCY_SEC
 
         reader = ThermocyclerReader(driver=driver)
-        poller = Poller(reader=reader, interval=poll_interval_seconds)
+        poller = Poller(
+            reader=reader,
+            interval=poll_interval_seconds,
+            idle_interval=idle_poll_interval_seconds,
+        )
         module = cls(
             port=port,
             usb_port=usb_port,
@@ -500,6 +510,11 @@ class Thermocycler(mod_abc.AbstractModule):
     def current_step_index(self) -> Optional[int]:
         return self._current_step_index
 
+    @property
+    def poll_metrics(self) -> PollMetrics:
+        """How long the module's status polls have taken."""
+        return self._poller.metrics
+
     @property
     def live_data(self) -> types.LiveData:
         return {
@@ -646,6 +661,15 @@ class ThermocyclerReader(Reader):
     def register_error_handler(self, handle_error: Callable[[Exception], None]) -> None:
         self._handle_error = handle_error
 
+    def is_idle(self) -> bool:
+        """Whether the lid is at rest and neither the lid nor the block has a target."""
+        return (
+            self.lid_status
+            in (ThermocyclerLidStatus.OPEN, ThermocyclerLidStatus.CLOSED)
+            and self.lid_temperature.target is None
+            and self.block_temperature.target is None
+        )
+
     async def read(self) -> None:
         """Poll the thermocycler."""
         await self.read_lid_status()
@@ -1,8 +1,13 @@
 import asyncio
 import contextlib
+import heapq
+import itertools
 import logging
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List, Optional
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 from opentrons_shared_data.errors.exceptions import ModuleCommunicationError
 
 
@@ -17,6 +22,38 @@ class Reader(ABC):
     def on_error(self, exception: Exception) -> None:
         """Handle an error from calling `read`."""
 
+    def is_idle(self) -> bool:
+        """Whether the source is idle, so that it can be read less often.
+
+        This is checked after each read.
+        """
+        return False
+
+
+@dataclass
+class PollMetrics:
+    """How long a Poller's reads have taken, in seconds."""
+
+    poll_count: int = 0
+    error_count: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """The mean time taken by a read."""
+        return self.total_latency / self.poll_count if self.poll_count else 0.0
+
+    def add(self, latency: float, error: bool) -> None:
+        """Record a read."""
+        self.poll_count += 1
+        if error:
+            self.error_count += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
 
 class Poller:
     """A poller to call a given reader on an interval.
@@ -24,31 +61,52 @@ class Poller:
     Args:
         reader: An interface to read data.
         interval: The poll interval, in seconds.
+        idle_interval: The poll interval while the reader is idle and nobody is
+            waiting for a poll, in seconds. Defaults to `interval`.
+        scheduler: The scheduler to run the polls. Defaults to the shared
+            scheduler of the event loop that starts the poller.
     """
 
     interval: float
+    idle_interval: float
 
-    def __init__(self, reader: Reader, interval: float) -> None:
+    def __init__(
+        self,
+        reader: Reader,
+        interval: float,
+        idle_interval: Optional[float] = None,
+        scheduler: Optional["PollScheduler"] = None,
+    ) -> None:
         self.interval = interval
+        self.idle_interval = idle_interval if idle_interval is not None else interval
         self._reader = reader
+        self._scheduler = scheduler
+        self._started = False
         self._read_lock: Optional["asyncio.Lock"] = None
         self._poll_waiters: List["asyncio.Future[None]"] = []
-        self._poll_forever_task: Optional["asyncio.Task[None]"] = None
+        self._last_poll_at = 0.0
+        self._metrics = PollMetrics()
+
+    @property
+    def metrics(self) -> PollMetrics:
+        """How long this poller's reads have taken."""
+        return self._metrics
 
     async def start(self) -> None:
-        assert self._poll_forever_task is None, "Poller already started"
-        self._poll_forever_task = asyncio.create_task(self._poll_forever())
+        assert not self._started, "Poller already started"
+        self._scheduler = self._scheduler or get_poll_scheduler()
+        self._started = True
+        self._scheduler.add(self)
         await self.wait_next_poll()
 
     async def stop(self) -> None:
         """Stop polling."""
-        task = self._poll_forever_task
+        scheduler = self._scheduler
 
-        assert task is not None, "Poller never started"
+        assert self._started and scheduler is not None, "Poller never started"
 
         async with self._use_read_lock():
-            task.cancel()
-            await asyncio.gather(task, return_exceptions=True)
+            await scheduler.remove(self)
         for waiter in self._poll_waiters:
             waiter.cancel(msg="Module was removed")
 
@@ -59,11 +117,13 @@ class Poller:
         the next complete read. If a read raises an exception,
         it will be passed through to `wait_next_poll`.
         """
-        if not self._poll_forever_task or self._poll_forever_task.done():
+        if self._scheduler is None or not self._scheduler.is_polling(self):
             raise ModuleCommunicationError(message="Module was removed")
 
         poll_future = asyncio.get_running_loop().create_future()
         self._poll_waiters.append(poll_future)
+        # Somebody is waiting, so don't hold the next poll back to the idle interval.
+        self._scheduler.poll_by(self, self._last_poll_at + self.interval)
         await poll_future
 
     @contextlib.asynccontextmanager
@@ -73,11 +133,11 @@ class Poller:
         async with self._read_lock:
             yield
 
-    async def _poll_forever(self) -> None:
-        """Polling loop."""
-        while True:
-            await self._poll_once()
-            await asyncio.sleep(self.interval)
+    def _get_next_interval(self) -> float:
+        """Get how long to wait after a poll before the next one."""
+        if self._poll_waiters or not self._reader.is_idle():
+            return self.interval
+        return self.idle_interval
 
     @staticmethod
     def _set_waiter_complete(
@@ -93,16 +153,123 @@ class Poller:
         previous_waiters = self._poll_waiters
         self._poll_waiters = []
 
+        start = time.perf_counter()
         try:
             async with self._use_read_lock():
                 await self._reader.read()
         except asyncio.CancelledError:
             raise
         except Exception as e:
+            self._metrics.add(time.perf_counter() - start, error=True)
             log.exception("Polling exception")
             self._reader.on_error(e)
             for waiter in previous_waiters:
                 Poller._set_waiter_complete(waiter, e)
         else:
+            self._metrics.add(time.perf_counter() - start, error=False)
             for waiter in previous_waiters:
                 Poller._set_waiter_complete(waiter)
+        finally:
+            self._last_poll_at = asyncio.get_running_loop().time()
+
+
+class PollScheduler:
+    """Run the polls of many Pollers from one task.
+
+    Each Poller is polled again its interval after its last poll finished, as
+    if it had its own loop, but they all share one timer. The polls of
+    different Pollers run concurrently, so that a module that is slow to
+    answer doesn't hold up the others.
+    """
+
+    def __init__(self) -> None:
+        self._next_poll_at: Dict[Poller, float] = {}
+        self._queue: List[Tuple[float, int, Poller]] = []
+        self._order = itertools.count()
+        self._polls: Dict[Poller, "asyncio.Task[None]"] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def add(self, poller: Poller) -> None:
+        """Start polling a Poller, right away."""
+        self._schedule(poller, asyncio.get_running_loop().time())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def remove(self, poller: Poller) -> None:
+        """Stop polling a Poller, cancelling its poll if one is running."""
+        self._next_poll_at.pop(poller, None)
+        poll = self._polls.pop(poller, None)
+        if poll is not None:
+            poll.cancel()
+            await asyncio.gather(poll, return_exceptions=True)
+        self._wake()
+
+    def is_polling(self, poller: Poller) -> bool:
+        """Whether a Poller is being polled."""
+        return poller in self._next_poll_at or poller in self._polls
+
+    def poll_by(self, poller: Poller, when: float) -> None:
+        """Make sure a Poller's next poll starts no later than `when`.
+
+        This does nothing if the poll is already running.
+        """
+        next_poll_at = self._next_poll_at.get(poller)
+        if next_poll_at is not None and when < next_poll_at:
+            self._schedule(poller, when)
+
+    def _schedule(self, poller: Poller, when: float) -> None:
+        self._next_poll_at[poller] = when
+        # Entries that are rescheduled or removed are left in the queue,
+        # and skipped when they come up.
+        heapq.heappush(self._queue, (when, next(self._order), poller))
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        wakeup = self._wakeup = asyncio.Event()
+
+        while self._next_poll_at or self._polls:
+            wakeup.clear()
+            now = loop.time()
+            while self._queue and self._queue[0][0] <= now:
+                when, _, poller = heapq.heappop(self._queue)
+                if self._next_poll_at.get(poller) == when:
+                    del self._next_poll_at[poller]
+                    self._polls[poller] = asyncio.create_task(self._poll(poller))
+
+            timer = loop.call_at(self._queue[0][0], wakeup.set) if self._queue else None
+            await wakeup.wait()
+            if timer is not None:
+                timer.cancel()
+
+        self._queue.clear()
+
+    async def _poll(self, poller: Poller) -> None:
+        try:
+            await poller._poll_once()
+        except asyncio.CancelledError:
+            self._polls.pop(poller, None)
+            raise
+        del self._polls[poller]
+        self._schedule(
+            poller, asyncio.get_running_loop().time() + poller._get_next_interval()
+        )
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PollScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_poll_scheduler() -> PollScheduler:
+    """Get the poll scheduler shared by all Pollers in the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = PollScheduler()
+    return scheduler
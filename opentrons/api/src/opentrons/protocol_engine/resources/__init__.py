@@ -8,6 +8,7 @@ from . import labware_validation
 from .model_utils import ModelUtils
 from .deck_data_provider import DeckDataProvider, DeckFixedLabware
 from .labware_data_provider import LabwareDataProvider
+from .labware_definition_cache import LabwareDefinitionCache, labware_definition_cache
 from .module_data_provider import ModuleDataProvider
 from .ot3_validation import ensure_ot3_hardware
 
@@ -15,6 +16,8 @@ from .ot3_validation import ensure_ot3_hardware
 __all__ = [
     "ModelUtils",
     "LabwareDataProvider",
+    "LabwareDefinitionCache",
+    "labware_definition_cache",
     "DeckDataProvider",
     "DeckFixedLabware",
     "ModuleDataProvider",
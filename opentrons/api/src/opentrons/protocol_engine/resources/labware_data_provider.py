@@ -7,6 +7,7 @@ import logging
 from anyio import to_thread
 
 from opentrons.protocols.models import LabwareDefinition
+from opentrons.protocols.api_support.constants import OPENTRONS_NAMESPACE
 from opentrons.protocols.labware import get_labware_definition
 
 # TODO (lc 09-26-2022) We should conditionally import ot2 or ot3 calibration
@@ -15,6 +16,11 @@ from opentrons.hardware_control.instruments.ot2 import (
 )
 from opentrons.calibration_storage.types import TipLengthCalNotFound
 
+from .labware_definition_cache import (
+    get_bundled_labware_definition_key,
+    labware_definition_cache,
+)
+
 
 log = logging.getLogger(__name__)
 
@@ -30,8 +36,8 @@ class LabwareDataProvider:
     ) -> LabwareDefinition:
         """Get a labware definition given the labware's identification.
 
-        Note: this method hits the filesystem, which will have performance
-        implications if it is called often.
+        Note: this method may hit the filesystem. Definitions of bundled labware
+        are cached, so only the first call for each of them does.
         """
         return await to_thread.run_sync(
             LabwareDataProvider._get_labware_definition_sync,
@@ -44,7 +50,13 @@ class LabwareDataProvider:
     def _get_labware_definition_sync(
         load_name: str, namespace: str, version: int
     ) -> LabwareDefinition:
-        return LabwareDefinition.parse_obj(
+        if namespace == OPENTRONS_NAMESPACE:
+            return labware_definition_cache.get_or_load(
+                get_bundled_labware_definition_key(load_name, version),
+                lambda: get_labware_definition(load_name, namespace, version),
+            )
+        # Custom labware can be changed on disk, so it's looked up by content.
+        return labware_definition_cache.parse(
             get_labware_definition(load_name, namespace, version)
         )
 
@@ -0,0 +1,114 @@
+"""A process-wide cache of parsed labware definitions."""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from opentrons_shared_data.labware.dev_types import (
+    LabwareDefinition as LabwareDefDict,
+)
+
+from opentrons.protocols.api_support.constants import OPENTRONS_NAMESPACE
+from opentrons.protocols.models import LabwareDefinition
+
+# Namespace, load name, version, and a hash of the contents, if they might
+# differ between definitions with the same namespace, load name, and version.
+LabwareDefinitionKey = Tuple[str, str, int, Optional[str]]
+
+
+def get_labware_definition_key(definition: LabwareDefDict) -> LabwareDefinitionKey:
+    """Get the key that identifies a labware definition's contents."""
+    content_hash = hashlib.sha256(
+        json.dumps(definition, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return (
+        definition["namespace"],
+        definition["parameters"]["loadName"],
+        definition["version"],
+        content_hash,
+    )
+
+
+def get_bundled_labware_definition_key(
+    load_name: str, version: int
+) -> LabwareDefinitionKey:
+    """Get the key of a labware definition that comes bundled with the software.
+
+    Bundled definitions can't change while the process is running, so they're
+    identified without hashing their contents.
+    """
+    return (OPENTRONS_NAMESPACE, load_name, version, None)
+
+
+class LabwareDefinitionCache:
+    """Parsed `LabwareDefinition` models, shared by everything in the process.
+
+    Validating a definition dict into a model is by far the slowest part of
+    loading labware, and the same handful of definitions are loaded over and
+    over by every protocol run, analysis, and simulation.
+
+    Cached models are shared between all callers, so they must not be modified.
+    When the cache is full, the least recently used model is dropped.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: The most definitions to keep.
+        """
+        self._max_size = max_size
+        self._definitions: "OrderedDict[LabwareDefinitionKey, LabwareDefinition]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self,
+        key: LabwareDefinitionKey,
+        load: Callable[[], LabwareDefDict],
+    ) -> LabwareDefinition:
+        """Get the parsed definition with the given key, loading it if it's not cached.
+
+        Args:
+            key: The key that identifies the definition.
+            load: Called to get the unparsed definition if it's not cached.
+                Any exception it raises is propagated, and nothing is cached.
+        """
+        with self._lock:
+            definition = self._definitions.get(key)
+            if definition is not None:
+                self._definitions.move_to_end(key)
+                return definition
+
+        # Parse outside the lock; a concurrent parse of the same definition
+        # would give an equal model, so it doesn't matter which one is kept.
+        definition = LabwareDefinition.parse_obj(load())
+
+        with self._lock:
+            self._definitions[key] = definition
+            self._definitions.move_to_end(key)
+            while len(self._definitions) > self._max_size:
+                self._definitions.popitem(last=False)
+        return definition
+
+    def parse(self, definition: LabwareDefDict) -> LabwareDefinition:
+        """Parse a definition dict, reusing the model from an earlier parse if possible."""
+        try:
+            key = get_labware_definition_key(definition)
+        except (KeyError, TypeError, ValueError):
+            # Not even shaped like a definition. Let validation explain why.
+            return LabwareDefinition.parse_obj(definition)
+        return self.get_or_load(key, lambda: definition)
+
+    def clear(self) -> None:
+        """Drop every cached definition."""
+        with self._lock:
+            self._definitions.clear()
+
+
+_MAX_CACHED_DEFINITIONS = 256
+
+labware_definition_cache = LabwareDefinitionCache(max_size=_MAX_CACHED_DEFINITIONS)
+"""The cache that the rest of the process shares."""
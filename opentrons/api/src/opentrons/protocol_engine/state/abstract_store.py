@@ -1,6 +1,6 @@
 """Abstract state store interfaces."""
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, Optional, Tuple, TypeVar
 
 from ..actions import Action
 
@@ -19,7 +19,20 @@ class HasState(ABC, Generic[StateT]):
 
 
 class HandlesActions(ABC):
-    """Abstract interface for an object that reacts to actions."""
+    """Abstract interface for an object that reacts to actions.
+
+    The `StateStore` only passes a substore the actions it declares it handles,
+    so these declarations must cover every case in the substore's
+    `handle_action()`.
+    """
+
+    handled_action_types: Optional[Tuple[type, ...]] = None
+    """The action types `handle_action()` reacts to, or `None` for all of them."""
+
+    handled_command_result_types: Optional[Tuple[type, ...]] = None
+    """For `SucceedCommandAction`s: the types of `command.result` or `private_result`
+    that `handle_action()` reacts to, or `None` for all succeeded commands.
+    """
 
     @abstractmethod
     def handle_action(self, action: Action) -> None:
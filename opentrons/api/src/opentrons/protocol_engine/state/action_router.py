@@ -0,0 +1,57 @@
+"""Routing of actions to the substores that handle them."""
+from typing import Dict, List, Sequence, Tuple
+
+from ..actions import Action, SucceedCommandAction
+from .abstract_store import HandlesActions
+
+
+_RouteKey = Tuple[type, ...]
+
+
+class ActionRouter:
+    """Find the substores that handle an action.
+
+    Substores declare the action types, and for succeeded commands the result
+    types, that they react to (see `HandlesActions`). Which substores handle an
+    action depends only on those types, so it's worked out once per combination
+    of types and looked up afterwards, instead of every substore running its own
+    `isinstance` checks on every action.
+    """
+
+    def __init__(self, substores: Sequence[HandlesActions]) -> None:
+        """Initialize a router for the given substores, in dispatch order."""
+        self._substores = list(substores)
+        self._routes: Dict[_RouteKey, List[HandlesActions]] = {}
+
+    def get_handlers(self, action: Action) -> List[HandlesActions]:
+        """Get the substores that should handle an action, in dispatch order."""
+        if isinstance(action, SucceedCommandAction):
+            key: _RouteKey = (
+                SucceedCommandAction,
+                type(action.command.result),
+                type(action.private_result),
+            )
+        else:
+            key = (type(action),)
+
+        try:
+            return self._routes[key]
+        except KeyError:
+            handlers = [
+                substore for substore in self._substores if _handles(substore, key)
+            ]
+            self._routes[key] = handlers
+            return handlers
+
+
+def _handles(substore: HandlesActions, key: _RouteKey) -> bool:
+    action_type = key[0]
+    action_types = substore.handled_action_types
+    if action_types is not None and not issubclass(action_type, action_types):
+        return False
+
+    result_types = substore.handled_command_result_types
+    if action_type is SucceedCommandAction and result_types is not None:
+        return any(issubclass(t, result_types) for t in key[1:])
+
+    return True
@@ -152,6 +152,15 @@ DECK_SLOT_TO_CUTOUT_MAP = {
 class AddressableAreaStore(HasState[AddressableAreaState], HandlesActions):
     """Addressable area state container."""
 
+    handled_action_types = (SucceedCommandAction, AddAddressableAreaAction, PlayAction)
+    handled_command_result_types = (
+        LoadLabwareResult,
+        MoveLabwareResult,
+        LoadModuleResult,
+        MoveToAddressableAreaResult,
+        MoveToAddressableAreaForDropTipResult,
+    )
+
     _state: AddressableAreaState
 
     def __init__(
@@ -1,12 +1,17 @@
 """Protocol Engine CommandStore sub-state."""
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 
 from opentrons.ordered_set import OrderedSet
 from opentrons.protocol_engine.errors.exceptions import CommandDoesNotExistError
 
 from ..commands import Command, CommandStatus, CommandIntent
+from .command_log import CommandLog
+
+
+_COMMAND_LOG_BATCH_SIZE = 100
+"""How many finalized commands to move to the command log at a time."""
 
 
 @dataclass(frozen=True)
@@ -25,7 +30,10 @@ class CommandHistory:
     """All command IDs, in insertion order."""
 
     _commands_by_id: Dict[str, CommandEntry]
-    """All command resources, in insertion order, mapped by their unique IDs."""
+    """All command resources, in insertion order, mapped by their unique IDs.
+
+    With a command log, this only has the commands that haven't been moved to the log.
+    """
 
     _queued_command_ids: OrderedSet[str]
     """The IDs of queued commands, in FIFO order"""
@@ -42,7 +50,29 @@ class CommandHistory:
     _terminal_command_id: Optional[str]
     """ID of the most recent command that SUCCEEDED or FAILED, if any"""
 
-    def __init__(self) -> None:
+    _command_log: Optional[CommandLog]
+    """Where finalized commands are moved out of memory to, if anywhere."""
+
+    _max_finalized_commands_in_memory: int
+    """How many of the most recently finalized commands to keep in memory, with a command log."""
+
+    _finalized_command_ids_in_memory: Deque[str]
+    """With a command log, the IDs of the finalized commands still in memory, oldest first."""
+
+    def __init__(
+        self,
+        command_log: Optional[CommandLog] = None,
+        max_finalized_commands_in_memory: int = 1000,
+    ) -> None:
+        """Initialize a command history.
+
+        Args:
+            command_log: If given, once a command has SUCCEEDED or FAILED and more than
+                `max_finalized_commands_in_memory` commands have done so after it, move
+                it out of memory into this log. Commands in the log are still returned
+                by every method, but getting them means reading them back from disk.
+            max_finalized_commands_in_memory: See `command_log`.
+        """
         self._all_command_ids = []
         self._queued_command_ids = OrderedSet()
         self._queued_setup_command_ids = OrderedSet()
@@ -50,31 +80,39 @@ class CommandHistory:
         self._commands_by_id = OrderedDict()
         self._running_command_id = None
         self._terminal_command_id = None
+        self._command_log = command_log
+        self._max_finalized_commands_in_memory = max_finalized_commands_in_memory
+        self._finalized_command_ids_in_memory = deque()
 
     def length(self) -> int:
         """Get the length of all elements added to the history."""
-        return len(self._commands_by_id)
+        return len(self._all_command_ids)
 
     def has(self, command_id: str) -> bool:
         """Returns whether a command is in the history."""
-        return command_id in self._commands_by_id
+        return command_id in self._commands_by_id or (
+            self._command_log is not None
+            and self._command_log.get_index(command_id) is not None
+        )
 
     def get(self, command_id: str) -> CommandEntry:
         """Get a command entry if present, otherwise raise an exception."""
-        try:
-            return self._commands_by_id[command_id]
-        except KeyError:
+        command_entry = self.get_if_present(command_id)
+        if command_entry is None:
             raise CommandDoesNotExistError(f"Command {command_id} does not exist")
+        return command_entry
 
     def get_next(self, command_id: str) -> Optional[CommandEntry]:
         """Get the command which follows the command associated with the given ID, if any."""
         index = self.get(command_id).index
         try:
-            return self._commands_by_id[self._all_command_ids[index + 1]]
-        except KeyError:
-            raise CommandDoesNotExistError(f"Command {command_id} does not exist")
+            next_command_id = self._all_command_ids[index + 1]
         except IndexError:
             return None
+        next_command = self.get_if_present(next_command_id)
+        if next_command is None:
+            raise CommandDoesNotExistError(f"Command {command_id} does not exist")
+        return next_command
 
     def get_prev(self, command_id: str) -> Optional[CommandEntry]:
         """Get the command which precedes the command associated with the given ID, if any.
@@ -82,24 +120,26 @@ class CommandHistory:
         Returns None if the command_id corresponds to the first element in the history.
         """
         index = self.get(command_id).index
-        try:
-            prev_command = self._commands_by_id[self._all_command_ids[index - 1]]
-            return prev_command if index != 0 else None
-        except KeyError:
-            raise CommandDoesNotExistError(f"Command {command_id} does not exist")
-        except IndexError:
+        if index == 0:
             return None
+        prev_command = self.get_if_present(self._all_command_ids[index - 1])
+        if prev_command is None:
+            raise CommandDoesNotExistError(f"Command {command_id} does not exist")
+        return prev_command
 
     def get_if_present(self, command_id: str) -> Optional[CommandEntry]:
         """Get a command entry, if present."""
-        return self._commands_by_id.get(command_id)
+        command_entry = self._commands_by_id.get(command_id)
+        if command_entry is None and self._command_log is not None:
+            index = self._command_log.get_index(command_id)
+            command = self._command_log.get(index) if index is not None else None
+            if index is not None and command is not None:
+                command_entry = CommandEntry(command=command, index=index)
+        return command_entry
 
     def get_all_commands(self) -> List[Command]:
         """Get all commands."""
-        return [
-            self._commands_by_id[command_id].command
-            for command_id in self._all_command_ids
-        ]
+        return self.get_slice(0, len(self._all_command_ids))
 
     def get_all_ids(self) -> List[str]:
         """Get all command IDs."""
@@ -108,19 +148,29 @@ class CommandHistory:
     def get_slice(self, start: int, stop: int) -> List[Command]:
         """Get a list of commands between start and stop."""
         commands = self._all_command_ids[start:stop]
-        return [self._commands_by_id[command].command for command in commands]
+        if self._command_log is None or not len(self._command_log):
+            return [self._commands_by_id[command].command for command in commands]
+
+        indices = range(len(self._all_command_ids))[start:stop]
+        logged_commands = self._command_log.get_range(indices.start, indices.stop)
+        return [
+            self._commands_by_id[command].command
+            if command in self._commands_by_id
+            else logged_commands[index]
+            for index, command in zip(indices, commands)
+        ]
 
     def get_tail_command(self) -> Optional[CommandEntry]:
         """Get the command most recently added."""
-        if self._commands_by_id:
-            return next(reversed(self._commands_by_id.values()))
+        if self._all_command_ids:
+            return self.get(self._all_command_ids[-1])
         else:
             return None
 
     def get_terminal_command(self) -> Optional[CommandEntry]:
         """Get the command most recently marked as SUCCEEDED or FAILED."""
         if self._terminal_command_id is not None:
-            return self._commands_by_id[self._terminal_command_id]
+            return self.get(self._terminal_command_id)
         else:
             return None
 
@@ -215,6 +265,7 @@ class CommandHistory:
         self._remove_queue_id(command.id)
         self._remove_setup_queue_id(command.id)
         self._set_terminal_command_id(command.id)
+        self._add_finalized(command.id)
 
     def set_command_failed(self, command: Command) -> None:
         """Validate and mark a command as failed in the command history."""
@@ -240,12 +291,40 @@ class CommandHistory:
         ):
             self._set_running_command_id(None)
 
+        self._add_finalized(command.id)
+
     def _add(self, command_id: str, command_entry: CommandEntry) -> None:
         """Create or update a command entry."""
         if command_id not in self._commands_by_id:
             self._all_command_ids.append(command_id)
         self._commands_by_id[command_id] = command_entry
 
+    def _add_finalized(self, command_id: str) -> None:
+        """Note that a command is finalized, moving older ones to the command log if needed."""
+        if self._command_log is None:
+            return
+        self._finalized_command_ids_in_memory.append(command_id)
+        excess = (
+            len(self._finalized_command_ids_in_memory)
+            - self._max_finalized_commands_in_memory
+        )
+        # Move them in batches, to write to the log in fewer transactions.
+        if excess >= _COMMAND_LOG_BATCH_SIZE:
+            logged_ids = [
+                self._finalized_command_ids_in_memory.popleft() for _ in range(excess)
+            ]
+            self._command_log.append(
+                [
+                    (
+                        self._commands_by_id[logged_id].index,
+                        self._commands_by_id[logged_id].command,
+                    )
+                    for logged_id in logged_ids
+                ]
+            )
+            for logged_id in logged_ids:
+                del self._commands_by_id[logged_id]
+
     def _add_to_queue(self, command_id: str) -> None:
         """Add new ID to the queued."""
         self._queued_command_ids.add(command_id)
@@ -0,0 +1,97 @@
+"""An on-disk log of finalized commands, for CommandHistory."""
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import parse_raw_as
+
+from ..commands import Command
+
+
+class CommandLog:
+    """An append-only log of finalized commands, kept in a SQLite database file.
+
+    Commands are stored as JSON, keyed by their index in the command history.
+    Only the index of each command ID is kept in memory.
+
+    The database file is a scratch file: it's created in the given directory,
+    and deleted when the log is closed or garbage-collected.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Create a new, empty log in a file in the given directory."""
+        file_descriptor, path = tempfile.mkstemp(
+            prefix="command_history_", suffix=".sqlite", dir=directory
+        )
+        os.close(file_descriptor)
+        # State views can be read from other threads than the one that updates
+        # the state, so the connection is shared, behind a lock.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._index_by_id: Dict[str, int] = {}
+        # The file doesn't need to survive a crash, so don't pay for that.
+        self._connection.execute("PRAGMA journal_mode = OFF")
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.execute(
+            "CREATE TABLE command (idx INTEGER PRIMARY KEY, command TEXT NOT NULL)"
+        )
+        self._finalizer = weakref.finalize(
+            self, _close_and_remove, self._connection, path
+        )
+
+    def __len__(self) -> int:
+        """Get the number of commands in the log."""
+        return len(self._index_by_id)
+
+    def get_index(self, command_id: str) -> Optional[int]:
+        """Get the index of a command in the log, if it's there."""
+        return self._index_by_id.get(command_id)
+
+    def append(self, commands: Sequence[Tuple[int, Command]]) -> None:
+        """Add finalized commands, with their indices, to the log."""
+        rows = [
+            (index, command.json(by_alias=True))
+            for index, command in commands
+            if command.id not in self._index_by_id
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT INTO command VALUES (?, ?)", rows)
+        for index, command in commands:
+            self._index_by_id[command.id] = index
+
+    def get(self, index: int) -> Optional[Command]:
+        """Get the command at an index, if it's in the log."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT command FROM command WHERE idx = ?", (index,)
+            ).fetchone()
+        return _parse_command(row[0]) if row is not None else None
+
+    def get_range(self, start: int, stop: int) -> Dict[int, Command]:
+        """Get the commands in the log with an index from start up to stop."""
+        with self._lock:
+            rows: List[Tuple[int, str]] = self._connection.execute(
+                "SELECT idx, command FROM command WHERE idx >= ? AND idx < ?",
+                (start, stop),
+            ).fetchall()
+        return {index: _parse_command(command) for index, command in rows}
+
+    def close(self) -> None:
+        """Close the log and delete its file."""
+        self._finalizer()
+
+
+def _parse_command(command_json: str) -> Command:
+    return parse_raw_as(Command, command_json)  # type: ignore[arg-type]
+
+
+def _close_and_remove(connection: sqlite3.Connection, path: str) -> None:
+    connection.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
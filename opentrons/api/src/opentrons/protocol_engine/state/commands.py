@@ -50,6 +50,7 @@ from .command_history import (
     CommandEntry,
     CommandHistory,
 )
+from .command_log import CommandLog
 from .config import Config
 
 
@@ -210,7 +211,13 @@ class CommandStore(HasState[CommandState], HandlesActions):
         """Initialize a CommandStore and its state."""
         self._config = config
         self._state = CommandState(
-            command_history=CommandHistory(),
+            command_history=CommandHistory(
+                command_log=(
+                    CommandLog(config.command_history_directory)
+                    if config.command_history_directory is not None
+                    else None
+                )
+            ),
             queue_status=QueueStatus.SETUP,
             is_door_blocking=is_door_open and config.block_on_door_open,
             run_result=None,
@@ -1,5 +1,7 @@
 """Top-level ProtocolEngine configuration options."""
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
 
 from opentrons_shared_data.robot.dev_types import RobotType
 
@@ -27,6 +29,9 @@ class Config:
             configuration instead of loading a provided configuration
         block_on_door_open: Protocol execution should pause if the
             front door is opened.
+        command_history_directory: If set, only the most recently finished
+            commands are kept in memory. Older ones are moved to a scratch file
+            in this directory, to keep memory use bounded during long runs.
     """
 
     robot_type: RobotType
@@ -37,3 +42,4 @@ class Config:
     use_virtual_gripper: bool = False
     use_simulated_deck_config: bool = False
     block_on_door_open: bool = False
+    command_history_directory: Optional[Path] = None
@@ -12,6 +12,19 @@ from opentrons_shared_data.pipette import PIPETTE_X_SPAN
 from opentrons_shared_data.pipette.dev_types import ChannelCount
 
 from .. import errors
+from ..actions import (
+    Action,
+    QueueCommandAction,
+    RunCommandAction,
+    SucceedCommandAction,
+)
+from ..commands import (
+    LoadLabwareResult,
+    LoadModuleResult,
+    MoveLabwareResult,
+    ReloadLabwareResult,
+)
+from ..commands.calibration.calibrate_module import CalibrateModuleResult
 from ..errors import (
     LabwareNotLoadedOnLabwareError,
     LabwareNotLoadedOnModuleError,
@@ -74,6 +87,31 @@ class _GripperMoveType(enum.Enum):
 _LabwareLocation = TypeVar("_LabwareLocation", bound=LabwareLocation)
 
 
+def _may_move_labware(action: Action) -> bool:
+    """Whether an action might change where any loaded labware is.
+
+    This errs on the side of True: anything that isn't known to leave the deck
+    alone is assumed to change it.
+    """
+    if isinstance(action, (QueueCommandAction, RunCommandAction)):
+        return False
+    if isinstance(action, SucceedCommandAction):
+        # These are the results that change labware locations, labware offsets,
+        # module locations, or module calibration. Any new command that does
+        # must be added here.
+        return isinstance(
+            action.command.result,
+            (
+                LoadLabwareResult,
+                ReloadLabwareResult,
+                MoveLabwareResult,
+                LoadModuleResult,
+                CalibrateModuleResult,
+            ),
+        )
+    return True
+
+
 # TODO(mc, 2021-06-03): continue evaluation of which selectors should go here
 # vs which selectors should be in LabwareView
 class GeometryView:
@@ -94,6 +132,17 @@ class GeometryView:
         self._pipettes = pipette_view
         self._addressable_areas = addressable_area_view
         self._last_drop_tip_location_spot: Dict[str, _TipDropSection] = {}
+        # Calibrated labware positions, by labware ID. Computing one walks the
+        # labware's whole stack of parents, and well positions need it every time.
+        self._labware_positions: Dict[str, Point] = {}
+
+    def invalidate_cached_positions(self, action: Action) -> None:
+        """Forget cached positions if an action might have changed them.
+
+        The state store must call this for every action it handles.
+        """
+        if _may_move_labware(action):
+            self._labware_positions.clear()
 
     def get_labware_highest_z(self, labware_id: str) -> float:
         """Get the highest Z-point of a labware."""
@@ -359,6 +408,13 @@ class GeometryView:
 
     def get_labware_position(self, labware_id: str) -> Point:
         """Get the calibrated origin of the labware."""
+        position = self._labware_positions.get(labware_id)
+        if position is None:
+            position = self._get_uncached_labware_position(labware_id)
+            self._labware_positions[labware_id] = position
+        return position
+
+    def _get_uncached_labware_position(self, labware_id: str) -> Point:
         origin_pos = self.get_labware_origin_position(labware_id)
         cal_offset = self._labware.get_labware_offset_vector(labware_id)
 
@@ -379,18 +435,22 @@ class GeometryView:
         well_def = self._labware.get_well_definition(labware_id, well_name)
         well_depth = well_def.depth
 
-        offset = WellOffset(x=0, y=0, z=well_depth)
+        offset_x = 0.0
+        offset_y = 0.0
+        offset_z = well_depth
         if well_location is not None:
-            offset = well_location.offset
+            offset_x = well_location.offset.x
+            offset_y = well_location.offset.y
+            offset_z = well_location.offset.z
             if well_location.origin == WellOrigin.TOP:
-                offset = offset.copy(update={"z": offset.z + well_depth})
+                offset_z = offset_z + well_depth
             elif well_location.origin == WellOrigin.CENTER:
-                offset = offset.copy(update={"z": offset.z + well_depth / 2.0})
+                offset_z = offset_z + well_depth / 2.0
 
         return Point(
-            x=labware_pos.x + offset.x + well_def.x,
-            y=labware_pos.y + offset.y + well_def.y,
-            z=labware_pos.z + offset.z + well_def.z,
+            x=labware_pos.x + offset_x + well_def.x,
+            y=labware_pos.y + offset_y + well_def.y,
+            z=labware_pos.z + offset_z + well_def.z,
         )
 
     def get_nominal_well_position(
@@ -113,6 +113,17 @@ class LabwareState:
 class LabwareStore(HasState[LabwareState], HandlesActions):
     """Labware state container."""
 
+    handled_action_types = (
+        SucceedCommandAction,
+        AddLabwareOffsetAction,
+        AddLabwareDefinitionAction,
+    )
+    handled_command_result_types = (
+        LoadLabwareResult,
+        ReloadLabwareResult,
+        MoveLabwareResult,
+    )
+
     _state: LabwareState
 
     def __init__(
@@ -18,6 +18,8 @@ class LiquidState:
 class LiquidStore(HasState[LiquidState], HandlesActions):
     """Liquid state container."""
 
+    handled_action_types = (AddLiquidAction,)
+
     _state: LiquidState
 
     def __init__(self) -> None:
@@ -178,6 +178,28 @@ class ModuleState:
 class ModuleStore(HasState[ModuleState], HandlesActions):
     """Module state container."""
 
+    handled_action_types = (SucceedCommandAction, AddModuleAction)
+    handled_command_result_types = (
+        LoadModuleResult,
+        CalibrateModuleResult,
+        heater_shaker.SetTargetTemperatureResult,
+        heater_shaker.DeactivateHeaterResult,
+        heater_shaker.SetAndWaitForShakeSpeedResult,
+        heater_shaker.DeactivateShakerResult,
+        heater_shaker.OpenLabwareLatchResult,
+        heater_shaker.CloseLabwareLatchResult,
+        temperature_module.SetTargetTemperatureResult,
+        temperature_module.DeactivateTemperatureResult,
+        thermocycler.SetTargetBlockTemperatureResult,
+        thermocycler.DeactivateBlockResult,
+        thermocycler.SetTargetLidTemperatureResult,
+        thermocycler.DeactivateLidResult,
+        thermocycler.OpenLidResult,
+        thermocycler.CloseLidResult,
+        absorbance_reader.InitializeResult,
+        absorbance_reader.MeasureAbsorbanceResult,
+    )
+
     _state: ModuleState
 
     def __init__(
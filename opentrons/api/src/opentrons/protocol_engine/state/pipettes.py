@@ -138,6 +138,40 @@ class PipetteState:
 class PipetteStore(HasState[PipetteState], HandlesActions):
     """Pipette state container."""
 
+    handled_action_types = (
+        SucceedCommandAction,
+        FailCommandAction,
+        SetPipetteMovementSpeedAction,
+    )
+    handled_command_result_types = (
+        PipetteConfigUpdateResultMixin,
+        PipetteNozzleLayoutResultMixin,
+        LoadPipetteResult,
+        AspirateResult,
+        AspirateInPlaceResult,
+        DispenseResult,
+        DispenseInPlaceResult,
+        BlowOutResult,
+        BlowOutInPlaceResult,
+        PrepareToAspirateResult,
+        PickUpTipResult,
+        DropTipResult,
+        DropTipInPlaceResult,
+        TouchTipResult,
+        MoveToWellResult,
+        MoveToCoordinatesResult,
+        MoveRelativeResult,
+        MoveToAddressableAreaResult,
+        MoveToAddressableAreaForDropTipResult,
+        MoveLabwareResult,
+        HomeResult,
+        RetractAxisResult,
+        thermocycler.OpenLidResult,
+        thermocycler.CloseLidResult,
+        heater_shaker.SetAndWaitForShakeSpeedResult,
+        heater_shaker.OpenLabwareLatchResult,
+    )
+
     _state: PipetteState
 
     def __init__(self) -> None:
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, cast
 from typing_extensions import ParamSpec
 
 from opentrons_shared_data.deck.dev_types import DeckDefinitionV5
@@ -13,6 +13,7 @@ from opentrons.util.change_notifier import ChangeNotifier
 from ..resources import DeckFixedLabware
 from ..actions import Action, ActionHandler
 from .abstract_store import HasState, HandlesActions
+from .action_router import ActionRouter
 from .commands import CommandState, CommandStore, CommandView
 from .addressable_areas import (
     AddressableAreaState,
@@ -193,6 +194,7 @@ class StateStore(StateView, ActionHandler):
             self._liquid_store,
             self._tip_store,
         ]
+        self._action_router = ActionRouter(self._substores)
         self._config = config
         self._change_notifier = change_notifier or ChangeNotifier()
         self._notify_robot_server = notify_publishers
@@ -203,12 +205,16 @@ class StateStore(StateView, ActionHandler):
 
         Arguments:
             action: An action object representing a state change. Will be
-                passed to all substores so they can react accordingly.
+                passed to the substores that handle its type so they can
+                react accordingly.
         """
-        for substore in self._substores:
+        substores = self._action_router.get_handlers(action)
+        for substore in substores:
             substore.handle_action(action)
 
-        self._update_state_views()
+        self._geometry.invalidate_cached_positions(action)
+        if substores:
+            self._update_state_views(substores)
 
     async def wait_for(
         self,
@@ -323,6 +329,15 @@ class StateStore(StateView, ActionHandler):
         self._modules = ModuleView(state.modules)
         self._liquid = LiquidView(state.liquids)
         self._tips = TipView(state.tips)
+        self._views_by_substore: Dict[HandlesActions, HasState[Any]] = {
+            self._command_store: self._commands,
+            self._addressable_area_store: self._addressable_areas,
+            self._labware_store: self._labware,
+            self._pipette_store: self._pipettes,
+            self._module_store: self._modules,
+            self._liquid_store: self._liquid,
+            self._tip_store: self._tips,
+        }
 
         # Derived states
         self._geometry = GeometryView(
@@ -341,17 +356,16 @@ class StateStore(StateView, ActionHandler):
             module_view=self._modules,
         )
 
-    def _update_state_views(self) -> None:
-        """Update state view interfaces to use latest underlying values."""
-        next_state = self._get_next_state()
-        self._state = next_state
-        self._commands._state = next_state.commands
-        self._addressable_areas._state = next_state.addressable_areas
-        self._labware._state = next_state.labware
-        self._pipettes._state = next_state.pipettes
-        self._modules._state = next_state.modules
-        self._liquid._state = next_state.liquids
-        self._tips._state = next_state.tips
+    def _update_state_views(self, changed_substores: Sequence[HandlesActions]) -> None:
+        """Update state view interfaces to use latest underlying values.
+
+        Only the views of the substores that handled the action are updated;
+        the others can't have changed.
+        """
+        self._state = self._get_next_state()
+        for substore in changed_substores:
+            substore_state = cast(HasState[Any], substore).state
+            self._views_by_substore[substore]._state = substore_state
         self._change_notifier.notify()
         if self._notify_robot_server is not None:
             self._notify_robot_server()
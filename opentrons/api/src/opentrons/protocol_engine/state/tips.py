@@ -1,7 +1,6 @@
 """Tip state tracking."""
 from dataclasses import dataclass
-from enum import Enum
-from typing import Dict, Optional, List, Union
+from typing import Dict, Iterator, Optional, List, Tuple
 
 from .abstract_store import HasState, HandlesActions
 from ..actions import (
@@ -27,22 +26,80 @@ from ..error_recovery_policy import ErrorRecoveryType
 from opentrons.hardware_control.nozzle_manager import NozzleMap
 
 
-class TipRackWellState(Enum):
-    """The state of a single tip in a tip rack's well."""
+@dataclass(frozen=True)
+class _TipCluster:
+    """A group of tips that a partial nozzle layout picks up together."""
 
-    CLEAN = "clean"
-    USED = "used"
+    first_well: str
+    mask: int
+    final_column_mask: int
+    final_row_mask: int
 
 
-TipRackStateByWellName = Dict[str, TipRackWellState]
+class TipRackLayout:
+    """The wells of a tip rack, indexed for tip availability bitmaps.
+
+    A tip rack's bitmap has bit `i` set if the tip in `well_names[i]` has been
+    used. Wells are in the order of the tip rack definition, column by column.
+    """
+
+    def __init__(self, columns: List[List[str]]) -> None:
+        """Index the wells of a tip rack, given as its definition's ordering."""
+        self.columns = columns
+        self.well_names = [well_name for column in columns for well_name in column]
+        self.index_by_well_name = {
+            well_name: index for index, well_name in enumerate(self.well_names)
+        }
+        self.all_tips = (1 << len(self.well_names)) - 1
+        self.column_masks = [self.get_mask(column) for column in columns]
+        self._tip_clusters: Dict[Tuple[str, int, int], List[_TipCluster]] = {}
+
+    def get_tip_clusters(
+        self, entry_well: str, active_columns: int, active_rows: int
+    ) -> List[_TipCluster]:
+        """Get the clusters of tips a nozzle layout can pick up, in search order.
+
+        Args:
+            entry_well: The corner of the tip rack that the search starts at.
+            active_columns: The number of columns of nozzles in the layout.
+            active_rows: The number of rows of nozzles in the layout.
+        """
+        key = (entry_well, active_columns, active_rows)
+        try:
+            return self._tip_clusters[key]
+        except KeyError:
+            tip_clusters = [
+                _TipCluster(
+                    first_well=tip_cluster[0],
+                    mask=self.get_mask(tip_cluster),
+                    # The tip cluster list is ordered: each row from a column,
+                    # in order by columns.
+                    final_column_mask=self.get_mask(tip_cluster[-active_rows:]),
+                    final_row_mask=self.get_mask(
+                        tip_cluster[active_rows - 1 :: active_rows]
+                    ),
+                )
+                for tip_cluster in _get_tip_clusters(
+                    self.columns, entry_well, active_columns, active_rows
+                )
+            ]
+            self._tip_clusters[key] = tip_clusters
+            return tip_clusters
+
+    def get_mask(self, well_names: List[str]) -> int:
+        """Get the bitmap of the given wells."""
+        mask = 0
+        for well_name in well_names:
+            mask |= 1 << self.index_by_well_name[well_name]
+        return mask
 
 
 @dataclass
 class TipState:
     """State of all tips."""
 
-    tips_by_labware_id: Dict[str, TipRackStateByWellName]
-    column_by_labware_id: Dict[str, List[List[str]]]
+    tip_rack_by_labware_id: Dict[str, TipRackLayout]
+    used_tips_by_labware_id: Dict[str, int]
     channels_by_pipette_id: Dict[str, int]
     length_by_pipette_id: Dict[str, float]
     active_channels_by_pipette_id: Dict[str, int]
@@ -52,18 +109,32 @@ class TipState:
 class TipStore(HasState[TipState], HandlesActions):
     """Tip state container."""
 
+    handled_action_types = (SucceedCommandAction, FailCommandAction, ResetTipsAction)
+    handled_command_result_types = (
+        PipetteConfigUpdateResultMixin,
+        PipetteNozzleLayoutResultMixin,
+        LoadLabwareResult,
+        PickUpTipResult,
+        DropTipResult,
+        DropTipInPlaceResult,
+    )
+
     _state: TipState
 
     def __init__(self) -> None:
         """Initialize a liquid store and its state."""
         self._state = TipState(
-            tips_by_labware_id={},
-            column_by_labware_id={},
+            tip_rack_by_labware_id={},
+            used_tips_by_labware_id={},
             channels_by_pipette_id={},
             length_by_pipette_id={},
             active_channels_by_pipette_id={},
             nozzle_map_by_pipette_id={},
         )
+        # Tip racks of the same type share a layout, and so its tip clusters.
+        self._tip_rack_by_ordering: Dict[
+            Tuple[Tuple[str, ...], ...], TipRackLayout
+        ] = {}
 
     def handle_action(self, action: Action) -> None:
         """Modify state in reaction to an action."""
@@ -93,12 +164,7 @@ class TipStore(HasState[TipState], HandlesActions):
             self._handle_failed_command(action)
 
         elif isinstance(action, ResetTipsAction):
-            labware_id = action.labware_id
-
-            for well_name in self._state.tips_by_labware_id[labware_id].keys():
-                self._state.tips_by_labware_id[labware_id][
-                    well_name
-                ] = TipRackWellState.CLEAN
+            self._state.used_tips_by_labware_id[action.labware_id] = 0
 
     def _handle_succeeded_command(self, command: Command) -> None:
         if (
@@ -106,15 +172,15 @@ class TipStore(HasState[TipState], HandlesActions):
             and command.result.definition.parameters.isTiprack
         ):
             labware_id = command.result.labwareId
-            definition = command.result.definition
-            self._state.tips_by_labware_id[labware_id] = {
-                well_name: TipRackWellState.CLEAN
-                for column in definition.ordering
-                for well_name in column
-            }
-            self._state.column_by_labware_id[labware_id] = [
-                column for column in definition.ordering
-            ]
+            ordering = tuple(
+                tuple(column) for column in command.result.definition.ordering
+            )
+            tip_rack = self._tip_rack_by_ordering.get(ordering)
+            if tip_rack is None:
+                tip_rack = TipRackLayout([list(column) for column in ordering])
+                self._tip_rack_by_ordering[ordering] = tip_rack
+            self._state.tip_rack_by_labware_id[labware_id] = tip_rack
+            self._state.used_tips_by_labware_id[labware_id] = 0
 
         elif isinstance(command.result, PickUpTipResult):
             labware_id = command.params.labwareId
@@ -155,8 +221,10 @@ class TipStore(HasState[TipState], HandlesActions):
     def _set_used_tips(  # noqa: C901
         self, pipette_id: str, well_name: str, labware_id: str
     ) -> None:
-        columns = self._state.column_by_labware_id.get(labware_id, [])
-        wells = self._state.tips_by_labware_id.get(labware_id, {})
+        tip_rack = self._state.tip_rack_by_labware_id.get(labware_id)
+        if tip_rack is None:
+            return
+        columns = tip_rack.columns
         nozzle_map = self._state.nozzle_map_by_pipette_id[pipette_id]
 
         # TODO (cb, 02-28-2024): Transition from using partial nozzle map to full instrument map for the set used logic
@@ -170,28 +238,35 @@ class TipStore(HasState[TipState], HandlesActions):
                 critical_row = column.index(well_name)
                 critical_column = columns.index(column)
 
+        used_wells = []
         for i in range(num_nozzle_cols):
             for j in range(num_nozzle_rows):
                 if nozzle_map.starting_nozzle == "A1":
                     if (critical_column + i < len(columns)) and (
                         critical_row + j < len(columns[critical_column])
                     ):
-                        well = columns[critical_column + i][critical_row + j]
-                        wells[well] = TipRackWellState.USED
+                        used_wells.append(
+                            columns[critical_column + i][critical_row + j]
+                        )
                 elif nozzle_map.starting_nozzle == "A12":
                     if (critical_column - i >= 0) and (
                         critical_row + j < len(columns[critical_column])
                     ):
-                        well = columns[critical_column - i][critical_row + j]
-                        wells[well] = TipRackWellState.USED
+                        used_wells.append(
+                            columns[critical_column - i][critical_row + j]
+                        )
                 elif nozzle_map.starting_nozzle == "H1":
                     if (critical_column + i < len(columns)) and (critical_row - j >= 0):
-                        well = columns[critical_column + i][critical_row - j]
-                        wells[well] = TipRackWellState.USED
+                        used_wells.append(
+                            columns[critical_column + i][critical_row - j]
+                        )
                 elif nozzle_map.starting_nozzle == "H12":
                     if (critical_column - i >= 0) and (critical_row - j >= 0):
-                        well = columns[critical_column - i][critical_row - j]
-                        wells[well] = TipRackWellState.USED
+                        used_wells.append(
+                            columns[critical_column - i][critical_row - j]
+                        )
+
+        self._state.used_tips_by_labware_id[labware_id] |= tip_rack.get_mask(used_wells)
 
 
 class TipView(HasState[TipState]):
@@ -215,190 +290,11 @@ class TipView(HasState[TipState]):
         nozzle_map: Optional[NozzleMap],
     ) -> Optional[str]:
         """Get the next available clean tip. Does not support use of a starting tip if the pipette used is in a partial configuration."""
-        wells = self._state.tips_by_labware_id.get(labware_id, {})
-        columns = self._state.column_by_labware_id.get(labware_id, [])
-
-        def _identify_tip_cluster(
-            active_columns: int,
-            active_rows: int,
-            critical_column: int,
-            critical_row: int,
-            entry_well: str,
-        ) -> Optional[List[str]]:
-            tip_cluster = []
-            for i in range(active_columns):
-                if entry_well == "A1" or entry_well == "H1":
-                    if critical_column - i >= 0:
-                        column = columns[critical_column - i]
-                    else:
-                        return None
-                elif entry_well == "A12" or entry_well == "H12":
-                    if critical_column + i < len(columns):
-                        column = columns[critical_column + i]
-                    else:
-                        return None
-                else:
-                    raise ValueError(
-                        f"Invalid entry well {entry_well} for tip cluster identification."
-                    )
-                for j in range(active_rows):
-                    if entry_well == "A1" or entry_well == "A12":
-                        if critical_row - j >= 0:
-                            well = column[critical_row - j]
-                        else:
-                            return None
-                    elif entry_well == "H1" or entry_well == "H12":
-                        if critical_row + j < len(column):
-                            well = column[critical_row + j]
-                        else:
-                            return None
-                    tip_cluster.append(well)
-
-            if any(well not in [*wells] for well in tip_cluster):
-                return None
-
-            return tip_cluster
-
-        def _validate_tip_cluster(
-            active_columns: int, active_rows: int, tip_cluster: List[str]
-        ) -> Union[str, int, None]:
-            if not any(wells[well] == TipRackWellState.USED for well in tip_cluster):
-                return tip_cluster[0]
-            elif all(wells[well] == TipRackWellState.USED for well in tip_cluster):
-                return None
-            else:
-                # In the case of an 8ch pipette where a column has mixed state tips we may simply progress to the next column in our search
-                if (
-                    nozzle_map is not None
-                    and len(nozzle_map.full_instrument_map_store) == 8
-                ):
-                    return None
-
-                # In the case of a 96ch we can attempt to index in by singular rows and columns assuming that indexed direction is safe
-                # The tip cluster list is ordered: Each row from a column in order by columns
-                tip_cluster_final_column = []
-                for i in range(active_rows):
-                    tip_cluster_final_column.append(
-                        tip_cluster[((active_columns * active_rows) - 1) - i]
-                    )
-                tip_cluster_final_row = []
-                for i in range(active_columns):
-                    tip_cluster_final_row.append(
-                        tip_cluster[(active_rows - 1) + (i * active_rows)]
-                    )
-                if all(
-                    wells[well] == TipRackWellState.USED
-                    for well in tip_cluster_final_column
-                ):
-                    return None
-                elif all(
-                    wells[well] == TipRackWellState.USED
-                    for well in tip_cluster_final_row
-                ):
-                    return None
-                else:
-                    # Tiprack has no valid tip selection, cannot progress
-                    return -1
-
-        # Search through the tiprack beginning at A1
-        def _cluster_search_A1(active_columns: int, active_rows: int) -> Optional[str]:
-            critical_column = active_columns - 1
-            critical_row = active_rows - 1
-
-            while critical_column < len(columns):
-                tip_cluster = _identify_tip_cluster(
-                    active_columns, active_rows, critical_column, critical_row, "A1"
-                )
-                if tip_cluster is not None:
-                    result = _validate_tip_cluster(
-                        active_columns, active_rows, tip_cluster
-                    )
-                    if isinstance(result, str):
-                        return result
-                    elif isinstance(result, int) and result == -1:
-                        return None
-                if critical_row + active_rows < len(columns[0]):
-                    critical_row = critical_row + active_rows
-                else:
-                    critical_column += 1
-                    critical_row = active_rows - 1
-            return None
-
-        # Search through the tiprack beginning at A12
-        def _cluster_search_A12(active_columns: int, active_rows: int) -> Optional[str]:
-            critical_column = len(columns) - active_columns
-            critical_row = active_rows - 1
-
-            while critical_column >= 0:
-                tip_cluster = _identify_tip_cluster(
-                    active_columns, active_rows, critical_column, critical_row, "A12"
-                )
-                if tip_cluster is not None:
-                    result = _validate_tip_cluster(
-                        active_columns, active_rows, tip_cluster
-                    )
-                    if isinstance(result, str):
-                        return result
-                    elif isinstance(result, int) and result == -1:
-                        return None
-                if critical_row + active_rows < len(columns[0]):
-                    critical_row = critical_row + active_rows
-                else:
-                    critical_column -= 1
-                    critical_row = active_rows - 1
-            return None
-
-        # Search through the tiprack beginning at H1
-        def _cluster_search_H1(active_columns: int, active_rows: int) -> Optional[str]:
-            critical_column = active_columns - 1
-            critical_row = len(columns[critical_column]) - active_rows
-
-            while critical_column <= len(columns):  # change to max size of labware
-                tip_cluster = _identify_tip_cluster(
-                    active_columns, active_rows, critical_column, critical_row, "H1"
-                )
-                if tip_cluster is not None:
-                    result = _validate_tip_cluster(
-                        active_columns, active_rows, tip_cluster
-                    )
-                    if isinstance(result, str):
-                        return result
-                    elif isinstance(result, int) and result == -1:
-                        return None
-                if critical_row - active_rows >= 0:
-                    critical_row = critical_row - active_rows
-                else:
-                    critical_column += 1
-                    if critical_column >= len(columns):
-                        return None
-                    critical_row = len(columns[critical_column]) - active_rows
-            return None
-
-        # Search through the tiprack beginning at H12
-        def _cluster_search_H12(active_columns: int, active_rows: int) -> Optional[str]:
-            critical_column = len(columns) - active_columns
-            critical_row = len(columns[critical_column]) - active_rows
-
-            while critical_column >= 0:
-                tip_cluster = _identify_tip_cluster(
-                    active_columns, active_rows, critical_column, critical_row, "H12"
-                )
-                if tip_cluster is not None:
-                    result = _validate_tip_cluster(
-                        active_columns, active_rows, tip_cluster
-                    )
-                    if isinstance(result, str):
-                        return result
-                    elif isinstance(result, int) and result == -1:
-                        return None
-                if critical_row - active_rows >= 0:
-                    critical_row = critical_row - active_rows
-                else:
-                    critical_column -= 1
-                    if critical_column < 0:
-                        return None
-                    critical_row = len(columns[critical_column]) - active_rows
+        tip_rack = self._state.tip_rack_by_labware_id.get(labware_id)
+        if tip_rack is None:
             return None
+        used_tips = self._state.used_tips_by_labware_id[labware_id]
+        columns = tip_rack.columns
 
         if starting_tip_name is None and nozzle_map is not None and columns:
             num_channels = len(nozzle_map.full_instrument_map_store)
@@ -412,21 +308,70 @@ class TipView(HasState[TipState]):
             #   The 96 channel will then progress towards the opposite corner, either going up or down, left or right depending on configuration.
 
             if num_channels == 1:
-                return _cluster_search_A1(num_nozzle_cols, num_nozzle_rows)
+                return _search_tip_clusters(
+                    tip_rack,
+                    used_tips,
+                    num_channels,
+                    "A1",
+                    num_nozzle_cols,
+                    num_nozzle_rows,
+                )
             elif num_channels == 8:
                 if nozzle_map.starting_nozzle == "A1":
-                    return _cluster_search_H1(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "H1",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
                 elif nozzle_map.starting_nozzle == "H1":
-                    return _cluster_search_A1(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "A1",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
             elif num_channels == 96:
                 if nozzle_map.starting_nozzle == "A1":
-                    return _cluster_search_H12(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "H12",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
                 elif nozzle_map.starting_nozzle == "A12":
-                    return _cluster_search_H1(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "H1",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
                 elif nozzle_map.starting_nozzle == "H1":
-                    return _cluster_search_A12(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "A12",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
                 elif nozzle_map.starting_nozzle == "H12":
-                    return _cluster_search_A1(num_nozzle_cols, num_nozzle_rows)
+                    return _search_tip_clusters(
+                        tip_rack,
+                        used_tips,
+                        num_channels,
+                        "A1",
+                        num_nozzle_cols,
+                        num_nozzle_rows,
+                    )
                 else:
                     raise ValueError(
                         f"Nozzle {nozzle_map.starting_nozzle} is an invalid starting tip for automatic tip pickup."
@@ -448,26 +393,32 @@ class TipView(HasState[TipState]):
                             else:
                                 starting_column_index = idx
 
-                for column in columns[starting_column_index:]:
-                    if not any(wells[well] == TipRackWellState.USED for well in column):
+                for column, column_mask in zip(
+                    columns[starting_column_index:],
+                    tip_rack.column_masks[starting_column_index:],
+                ):
+                    if not used_tips & column_mask:
                         return column[0]
 
-            elif num_tips == len(wells.keys()):  # Get next tips for 96 channel
+            elif num_tips == len(tip_rack.well_names):  # Get next tips for 96 channel
                 if starting_tip_name and starting_tip_name != columns[0][0]:
                     return None
 
-                if not any(
-                    tip_state == TipRackWellState.USED for tip_state in wells.values()
-                ):
-                    return next(iter(wells))
+                if not used_tips and tip_rack.well_names:
+                    return tip_rack.well_names[0]
 
             else:  # Get next tips for single channel
+                clean_tips = tip_rack.all_tips & ~used_tips
                 if starting_tip_name is not None:
-                    wells = _drop_wells_before_starting_tip(wells, starting_tip_name)
+                    # Drop any wells that come before the starting tip.
+                    starting_index = tip_rack.index_by_well_name.get(starting_tip_name)
+                    if starting_index is None:
+                        return None
+                    clean_tips &= ~((1 << starting_index) - 1)
 
-                for well_name, tip_state in wells.items():
-                    if tip_state == TipRackWellState.CLEAN:
-                        return well_name
+                if clean_tips:
+                    lowest_clean_tip = clean_tips & -clean_tips
+                    return tip_rack.well_names[lowest_clean_tip.bit_length() - 1]
         return None
 
     def get_pipette_channels(self, pipette_id: str) -> int:
@@ -493,25 +444,176 @@ class TipView(HasState[TipState]):
             True if the labware is a tip rack and the well has a clean tip,
             otherwise False.
         """
-        tip_rack = self._state.tips_by_labware_id.get(labware_id)
-        well_state = tip_rack.get(well_name) if tip_rack else None
+        tip_rack = self._state.tip_rack_by_labware_id.get(labware_id)
+        index = tip_rack.index_by_well_name.get(well_name) if tip_rack else None
+        if index is None:
+            return False
 
-        return well_state == TipRackWellState.CLEAN
+        return not self._state.used_tips_by_labware_id[labware_id] >> index & 1
 
     def get_tip_length(self, pipette_id: str) -> float:
         """Return the given pipette's tip length."""
         return self._state.length_by_pipette_id.get(pipette_id, 0)
 
 
-def _drop_wells_before_starting_tip(
-    wells: TipRackStateByWellName, starting_tip_name: str
-) -> TipRackStateByWellName:
-    """Drop any wells that come before the starting tip and return the remaining ones after."""
-    seen_starting_well = False
-    remaining_wells = {}
-    for well_name, tip_state in wells.items():
-        if well_name == starting_tip_name:
-            seen_starting_well = True
-        if seen_starting_well:
-            remaining_wells[well_name] = tip_state
-    return remaining_wells
+def _search_tip_clusters(
+    tip_rack: TipRackLayout,
+    used_tips: int,
+    num_channels: int,
+    entry_well: str,
+    active_columns: int,
+    active_rows: int,
+) -> Optional[str]:
+    """Get the first well of the first tip cluster that has all of its tips."""
+    for tip_cluster in tip_rack.get_tip_clusters(
+        entry_well, active_columns, active_rows
+    ):
+        used_in_cluster = used_tips & tip_cluster.mask
+        if not used_in_cluster:
+            return tip_cluster.first_well
+        elif used_in_cluster == tip_cluster.mask:
+            continue
+        # In the case of an 8ch pipette where a column has mixed state tips we may simply progress to the next column in our search
+        elif num_channels == 8:
+            continue
+        # In the case of a 96ch we can attempt to index in by singular rows and columns assuming that indexed direction is safe
+        elif (
+            used_tips & tip_cluster.final_column_mask == tip_cluster.final_column_mask
+            or used_tips & tip_cluster.final_row_mask == tip_cluster.final_row_mask
+        ):
+            continue
+        else:
+            # Tiprack has no valid tip selection, cannot progress
+            return None
+    return None
+
+
+def _get_tip_clusters(
+    columns: List[List[str]],
+    entry_well: str,
+    active_columns: int,
+    active_rows: int,
+) -> Iterator[List[str]]:
+    """Get the wells of the tip clusters to check, in order, when searching a tip rack.
+
+    Each tip cluster is ordered: each row from a column, in order by columns,
+    starting with the well the cluster is picked up from.
+    """
+    for critical_column, critical_row in _walk_critical_wells(
+        columns, entry_well, active_columns, active_rows
+    ):
+        tip_cluster = _identify_tip_cluster(
+            columns,
+            entry_well,
+            active_columns,
+            active_rows,
+            critical_column,
+            critical_row,
+        )
+        if tip_cluster is not None:
+            yield tip_cluster
+
+
+def _walk_critical_wells(  # noqa: C901
+    columns: List[List[str]],
+    entry_well: str,
+    active_columns: int,
+    active_rows: int,
+) -> Iterator[Tuple[int, int]]:
+    """Walk the (column, row) of the wells that tip clusters are picked up from."""
+    # Search through the tiprack beginning at A1
+    if entry_well == "A1":
+        critical_column = active_columns - 1
+        critical_row = active_rows - 1
+
+        while critical_column < len(columns):
+            yield critical_column, critical_row
+            if critical_row + active_rows < len(columns[0]):
+                critical_row = critical_row + active_rows
+            else:
+                critical_column += 1
+                critical_row = active_rows - 1
+
+    # Search through the tiprack beginning at A12
+    elif entry_well == "A12":
+        critical_column = len(columns) - active_columns
+        critical_row = active_rows - 1
+
+        while critical_column >= 0:
+            yield critical_column, critical_row
+            if critical_row + active_rows < len(columns[0]):
+                critical_row = critical_row + active_rows
+            else:
+                critical_column -= 1
+                critical_row = active_rows - 1
+
+    # Search through the tiprack beginning at H1
+    elif entry_well == "H1":
+        critical_column = active_columns - 1
+        critical_row = len(columns[critical_column]) - active_rows
+
+        while True:
+            yield critical_column, critical_row
+            if critical_row - active_rows >= 0:
+                critical_row = critical_row - active_rows
+            else:
+                critical_column += 1
+                if critical_column >= len(columns):
+                    return
+                critical_row = len(columns[critical_column]) - active_rows
+
+    # Search through the tiprack beginning at H12
+    elif entry_well == "H12":
+        critical_column = len(columns) - active_columns
+        critical_row = len(columns[critical_column]) - active_rows
+
+        while critical_column >= 0:
+            yield critical_column, critical_row
+            if critical_row - active_rows >= 0:
+                critical_row = critical_row - active_rows
+            else:
+                critical_column -= 1
+                if critical_column < 0:
+                    return
+                critical_row = len(columns[critical_column]) - active_rows
+
+    else:
+        raise ValueError(
+            f"Invalid entry well {entry_well} for tip cluster identification."
+        )
+
+
+def _identify_tip_cluster(
+    columns: List[List[str]],
+    entry_well: str,
+    active_columns: int,
+    active_rows: int,
+    critical_column: int,
+    critical_row: int,
+) -> Optional[List[str]]:
+    tip_cluster = []
+    for i in range(active_columns):
+        if entry_well == "A1" or entry_well == "H1":
+            if critical_column - i >= 0:
+                column = columns[critical_column - i]
+            else:
+                return None
+        else:
+            if critical_column + i < len(columns):
+                column = columns[critical_column + i]
+            else:
+                return None
+        for j in range(active_rows):
+            if entry_well == "A1" or entry_well == "A12":
+                if critical_row - j >= 0:
+                    well = column[critical_row - j]
+                else:
+                    return None
+            else:
+                if critical_row + j < len(column):
+                    well = column[critical_row + j]
+                else:
+                    return None
+            tip_cluster.append(well)
+
+    return tip_cluster
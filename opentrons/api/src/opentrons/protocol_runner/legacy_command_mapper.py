@@ -32,10 +32,10 @@ from opentrons.protocol_engine.error_recovery_policy import ErrorRecoveryType
 from opentrons.protocol_engine.resources import (
     ModelUtils,
     ModuleDataProvider,
+    labware_definition_cache,
     pipette_data_provider,
 )
 
-from opentrons_shared_data.labware.labware_definition import LabwareDefinition
 from opentrons_shared_data.errors import ErrorCodes, EnumeratedError, PythonException
 
 
@@ -653,7 +653,7 @@ class LegacyCommandMapper:
             notes=[],
             result=pe_commands.LoadLabwareResult.construct(
                 labwareId=labware_id,
-                definition=LabwareDefinition.parse_obj(
+                definition=labware_definition_cache.parse(
                     labware_load_info.labware_definition
                 ),
                 offsetId=labware_load_info.offset_id,
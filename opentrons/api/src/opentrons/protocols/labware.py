@@ -11,6 +11,7 @@ import jsonschema  # type: ignore
 
 from opentrons.protocols.api_support.util import ModifiedList
 from opentrons_shared_data import load_shared_data, get_shared_data_root
+from opentrons_shared_data.labware import load_definition
 from opentrons.protocols.api_support.constants import (
     OPENTRONS_NAMESPACE,
     CUSTOM_NAMESPACE,
@@ -234,9 +235,13 @@ def _get_standard_labware_definition(
         )
 
     namespace = namespace.lower()
-    def_path = _get_path_to_labware(load_name, namespace, checked_version)
 
     try:
+        if namespace == OPENTRONS_NAMESPACE:
+            # Bundled definitions are cached by shared-data, so this is cheap
+            # to call repeatedly.
+            return load_definition(load_name, checked_version)
+        def_path = _get_path_to_labware(load_name, namespace, checked_version)
         with open(def_path, "rb") as f:
             labware_def = json.loads(f.read().decode("utf-8"))
     except FileNotFoundError:
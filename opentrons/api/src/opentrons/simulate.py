@@ -69,7 +69,7 @@ from opentrons.protocols.api_support.deck_type import (
     should_load_fixed_trash_labware_for_python_protocol,
 )
 from opentrons.protocols.api_support.types import APIVersion
-from opentrons_shared_data.labware.labware_definition import LabwareDefinition
+from opentrons.protocol_engine.resources import labware_definition_cache
 
 from .util import entrypoint_util
 
@@ -507,6 +507,36 @@ def simulate(
     stack_logger.propagate = propagate_logs
     # _CommandScraper will set the level of this logger.
 
+    protocol = _parse_protocol_file(
+        protocol_file=protocol_file,
+        file_name=file_name,
+        extra_labware=_get_extra_labware(custom_labware_paths),
+        extra_data=_get_extra_data(custom_data_paths),
+    )
+
+    with _make_hardware_simulator_cm(
+        config_file_path=(
+            None
+            if hardware_simulator_file_path is None
+            else pathlib.Path(hardware_simulator_file_path)
+        ),
+        robot_type=protocol.robot_type,
+    ) as hardware_simulator:
+        return _simulate_protocol(
+            protocol=protocol,
+            protocol_file=protocol_file,
+            hardware_simulator=hardware_simulator,
+            stack_logger=stack_logger,
+            log_level=log_level,
+            duration_estimator=duration_estimator,
+            custom_data_paths=custom_data_paths,
+        )
+
+
+def _get_extra_labware(
+    custom_labware_paths: Optional[List[str]],
+) -> Dict[str, "LabwareDefinitionDict"]:
+    """Load the custom labware definitions that `simulate()` makes available."""
     # TODO(mm, 2023-10-02): Switch this truthy check to `is not None`
     # to match documented behavior.
     # See notes in https://github.com/Opentrons/opentrons/pull/13107
@@ -514,20 +544,30 @@ def simulate(
         extra_labware = entrypoint_util.labware_from_paths(custom_labware_paths)
     else:
         extra_labware = entrypoint_util.find_jupyter_labware() or {}
+    return {uri: details.definition for uri, details in extra_labware.items()}
 
+
+def _get_extra_data(custom_data_paths: Optional[List[str]]) -> Dict[str, bytes]:
+    """Load the custom data files that `simulate()` makes available."""
     if custom_data_paths:
-        extra_data = entrypoint_util.datafiles_from_paths(custom_data_paths)
+        return entrypoint_util.datafiles_from_paths(custom_data_paths)
     else:
-        extra_data = {}
+        return {}
+
 
+def _parse_protocol_file(
+    protocol_file: Union[BinaryIO, TextIO],
+    file_name: Optional[str],
+    extra_labware: Dict[str, "LabwareDefinitionDict"],
+    extra_data: Dict[str, bytes],
+) -> Protocol:
+    """Parse a protocol file and check that it can be simulated on this device."""
     contents = protocol_file.read()
     try:
         protocol = parse.parse(
             contents,
             file_name,
-            extra_labware={
-                uri: details.definition for uri, details in extra_labware.items()
-            },
+            extra_labware=extra_labware,
             extra_data=extra_data,
         )
     except parse.JSONSchemaVersionTooNewError as e:
@@ -542,38 +582,43 @@ def simulate(
 
     _validate_can_simulate_for_robot_type(protocol.robot_type)
 
-    with _make_hardware_simulator_cm(
-        config_file_path=(
-            None
-            if hardware_simulator_file_path is None
-            else pathlib.Path(hardware_simulator_file_path)
-        ),
-        robot_type=protocol.robot_type,
-    ) as hardware_simulator:
-        if protocol.api_level < ENGINE_CORE_API_VERSION:
-            return _run_file_non_pe(
-                protocol=protocol,
-                hardware_api=hardware_simulator,
-                logger=stack_logger,
-                level=log_level,
-                duration_estimator=duration_estimator,
-            )
-        else:
-            # TODO(mm, 2023-07-06): Once these NotImplementedErrors are resolved, consider removing
-            # the enclosing if-else block and running everything through _run_file_pe() for simplicity.
-            if custom_data_paths:
-                raise NotImplementedError(
-                    f"The custom_data_paths argument is not currently supported for Python protocols"
-                    f" with apiLevel {ENGINE_CORE_API_VERSION} or newer."
-                )
-            protocol_file.seek(0)
-            return _run_file_pe(
-                protocol=protocol,
-                robot_type=protocol.robot_type,
-                hardware_api=hardware_simulator,
-                stack_logger=stack_logger,
-                log_level=log_level,
+    return protocol
+
+
+def _simulate_protocol(
+    protocol: Protocol,
+    protocol_file: Union[BinaryIO, TextIO],
+    hardware_simulator: ThreadManagedHardware,
+    stack_logger: logging.Logger,
+    log_level: str,
+    duration_estimator: Optional[DurationEstimator],
+    custom_data_paths: Optional[List[str]],
+) -> _SimulateResult:
+    """Simulate a parsed protocol on the given hardware simulator."""
+    if protocol.api_level < ENGINE_CORE_API_VERSION:
+        return _run_file_non_pe(
+            protocol=protocol,
+            hardware_api=hardware_simulator,
+            logger=stack_logger,
+            level=log_level,
+            duration_estimator=duration_estimator,
+        )
+    else:
+        # TODO(mm, 2023-07-06): Once these NotImplementedErrors are resolved, consider removing
+        # the enclosing if-else block and running everything through _run_file_pe() for simplicity.
+        if custom_data_paths:
+            raise NotImplementedError(
+                f"The custom_data_paths argument is not currently supported for Python protocols"
+                f" with apiLevel {ENGINE_CORE_API_VERSION} or newer."
             )
+        protocol_file.seek(0)
+        return _run_file_pe(
+            protocol=protocol,
+            robot_type=protocol.robot_type,
+            hardware_api=hardware_simulator,
+            stack_logger=stack_logger,
+            log_level=log_level,
+        )
 
 
 def format_runlog(runlog: List[Mapping[str, Any]]) -> str:
@@ -817,7 +862,7 @@ def _create_live_context_pe(
     # Non-async would use call_soon_threadsafe(), which makes the waiting harder.
     async def add_all_extra_labware() -> None:
         for labware_definition_dict in extra_labware.values():
-            labware_definition = LabwareDefinition.parse_obj(labware_definition_dict)
+            labware_definition = labware_definition_cache.parse(labware_definition_dict)
             pe.add_labware_definition(labware_definition)
 
     # Add extra_labware to ProtocolEngine, being careful not to modify ProtocolEngine from this
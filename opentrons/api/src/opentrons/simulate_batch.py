@@ -0,0 +1,384 @@
+"""opentrons.simulate_batch: simulate many protocols in parallel.
+
+This module has functions that provide a console entrypoint for checking that
+a batch of protocols simulate without errors, for example in a CI job.
+
+Protocols are spread across a pool of worker processes. Each worker pays for
+importing the protocol stack and loading custom labware once, and then reuses
+them for every protocol it simulates, instead of paying for them once per
+protocol like separate ``opentrons_simulate`` invocations would. Each protocol
+still gets its own hardware simulator, so that its results don't depend on
+what ran before it.
+"""
+import argparse
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import opentrons
+from opentrons.util import entrypoint_util
+
+from opentrons.simulate import (
+    _SimulateResultRunLog,
+    _get_extra_labware,
+    _make_hardware_simulator_cm,
+    _parse_protocol_file,
+    _simulate_protocol,
+    format_runlog,
+)
+
+if TYPE_CHECKING:
+    from opentrons_shared_data.labware.dev_types import (
+        LabwareDefinition as LabwareDefinitionDict,
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchSimulateResult:
+    """The outcome of simulating one protocol in a batch."""
+
+    protocol_path: str
+    """The path of the simulated protocol, as it was passed in."""
+
+    runlog: str
+    """The protocol's run log, formatted like :py:obj:`simulate.format_runlog`.
+
+    Empty if the protocol failed to simulate.
+    """
+
+    errors: List[str]
+    """Descriptions of what went wrong. Empty if the protocol simulated successfully."""
+
+    duration: float
+    """How long it took to parse and simulate the protocol, in seconds."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the protocol simulated without errors."""
+        return not self.errors
+
+
+class _Worker:
+    """The resources that one worker process reuses across protocols."""
+
+    def __init__(
+        self,
+        custom_labware_paths: Optional[List[str]],
+        hardware_simulator_file_path: Optional[str],
+        log_level: str,
+    ) -> None:
+        self._extra_labware: Dict[str, "LabwareDefinitionDict"] = _get_extra_labware(
+            custom_labware_paths
+        )
+        self._hardware_simulator_file_path = hardware_simulator_file_path
+        self._log_level = log_level
+        self._stack_logger = logging.getLogger("opentrons")
+        self._stack_logger.propagate = False
+
+    def simulate(self, protocol_path: str) -> BatchSimulateResult:
+        start = time.monotonic()
+        scraped: _SimulateResultRunLog = []
+        errors: List[str] = []
+        try:
+            with open(protocol_path, "rb") as protocol_file:
+                protocol = _parse_protocol_file(
+                    protocol_file=protocol_file,
+                    file_name=os.path.basename(protocol_path),
+                    extra_labware=self._extra_labware,
+                    extra_data={},
+                )
+                # A fresh simulator, because resetting one doesn't forget
+                # things like the gantry position and attached instruments.
+                with _make_hardware_simulator_cm(
+                    config_file_path=(
+                        None
+                        if self._hardware_simulator_file_path is None
+                        else pathlib.Path(self._hardware_simulator_file_path)
+                    ),
+                    robot_type=protocol.robot_type,
+                ) as hardware_simulator:
+                    scraped, _ = _simulate_protocol(
+                        protocol=protocol,
+                        protocol_file=protocol_file,
+                        hardware_simulator=hardware_simulator,
+                        stack_logger=self._stack_logger,
+                        log_level=self._log_level,
+                        duration_estimator=None,
+                        custom_data_paths=None,
+                    )
+        except entrypoint_util.ProtocolEngineExecuteError as error:
+            errors.append(error.to_stderr_string())
+        except Exception as error:
+            errors.append(f"{type(error).__name__}: {error}")
+        return BatchSimulateResult(
+            protocol_path=protocol_path,
+            # Run logs hold objects from the protocol that can't be sent
+            # between processes, so they're formatted here.
+            runlog=format_runlog(scraped),
+            errors=errors,
+            duration=time.monotonic() - start,
+        )
+
+
+_worker: Optional[_Worker] = None
+
+
+def _initialize_worker(
+    custom_labware_paths: Optional[List[str]],
+    hardware_simulator_file_path: Optional[str],
+    log_level: str,
+) -> None:
+    global _worker
+    _worker = _Worker(
+        custom_labware_paths=custom_labware_paths,
+        hardware_simulator_file_path=hardware_simulator_file_path,
+        log_level=log_level,
+    )
+
+
+def _simulate_in_worker(protocol_path: str) -> BatchSimulateResult:
+    assert _worker is not None, "Worker process was not initialized."
+    return _worker.simulate(protocol_path)
+
+
+_WorkerArgs = Tuple[Optional[List[str]], Optional[str], str]
+
+
+def _make_executor(max_workers: int, worker_args: _WorkerArgs) -> ProcessPoolExecutor:
+    # Don't fork: the parent process may have threads, like hardware simulator
+    # threads from get_protocol_api(), that would be copied in a broken state.
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=worker_args,
+    )
+
+
+def _simulate_in_pool(
+    protocol_paths: Sequence[str], max_workers: int, worker_args: _WorkerArgs
+) -> Tuple[Dict[int, BatchSimulateResult], List[int]]:
+    """Simulate protocols across a pool of workers.
+
+    Returns the results by index in ``protocol_paths``, and the indices of
+    the protocols that didn't get a result because a worker process died.
+    """
+    results: Dict[int, BatchSimulateResult] = {}
+    unfinished: List[int] = []
+    with _make_executor(max_workers, worker_args) as executor:
+        futures: Dict["Future[BatchSimulateResult]", int] = {}
+        for index, protocol_path in enumerate(protocol_paths):
+            try:
+                futures[executor.submit(_simulate_in_worker, protocol_path)] = index
+            except BrokenProcessPool:
+                unfinished.extend(range(index, len(protocol_paths)))
+                break
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except BrokenProcessPool:
+                unfinished.append(futures[future])
+    return results, sorted(unfinished)
+
+
+def _simulate_one_at_a_time(
+    protocol_paths: Sequence[str], worker_args: _WorkerArgs
+) -> List[BatchSimulateResult]:
+    """Simulate protocols one after another in a single worker.
+
+    If the worker dies, the protocol it was simulating is reported as failed,
+    and the rest are simulated in a new worker.
+    """
+    results: List[BatchSimulateResult] = []
+    executor: Optional[ProcessPoolExecutor] = None
+    try:
+        for protocol_path in protocol_paths:
+            if executor is None:
+                executor = _make_executor(1, worker_args)
+            start = time.monotonic()
+            try:
+                results.append(
+                    executor.submit(_simulate_in_worker, protocol_path).result()
+                )
+            except BrokenProcessPool:
+                executor.shutdown()
+                executor = None
+                results.append(
+                    BatchSimulateResult(
+                        protocol_path=protocol_path,
+                        runlog="",
+                        errors=[
+                            "The process simulating this protocol exited unexpectedly."
+                        ],
+                        duration=time.monotonic() - start,
+                    )
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def simulate_batch(
+    protocol_paths: Sequence[str],
+    custom_labware_paths: Optional[List[str]] = None,
+    hardware_simulator_file_path: Optional[str] = None,
+    log_level: str = "warning",
+    max_workers: Optional[int] = None,
+) -> List[BatchSimulateResult]:
+    """Simulate many protocols in parallel.
+
+    Unlike :py:obj:`simulate.simulate`, this does not raise if a protocol fails
+    to simulate. Each protocol's errors are reported in its result instead.
+
+    :param protocol_paths: The paths of the protocol files to simulate.
+    :param custom_labware_paths: A list of directories to search for custom labware.
+                                 See :py:obj:`simulate.simulate`.
+    :param hardware_simulator_file_path: A path to a JSON file defining a
+                                         hardware simulator.
+    :param log_level: The level of logs to capture in the run logs:
+                      ``"debug"``, ``"info"``, ``"warning"``, ``"error"``, or ``"none"``.
+                      Defaults to ``"warning"``.
+    :param max_workers: How many protocols to simulate at once.
+                        Defaults to the number of CPUs.
+    :returns: One result per protocol, in the same order as ``protocol_paths``.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(protocol_paths)))
+    worker_args: _WorkerArgs = (
+        custom_labware_paths,
+        hardware_simulator_file_path,
+        log_level,
+    )
+
+    results, unfinished = _simulate_in_pool(protocol_paths, max_workers, worker_args)
+    # A worker died, for example because a protocol crashed the interpreter,
+    # and took the whole pool with it. Its protocols can't be told apart from
+    # the others that were waiting, so retry them one at a time to find out
+    # which ones fail.
+    retried = _simulate_one_at_a_time(
+        [protocol_paths[index] for index in unfinished], worker_args
+    )
+    results.update(zip(unfinished, retried))
+
+    return [results[index] for index in range(len(protocol_paths))]
+
+
+def format_report(results: Sequence[BatchSimulateResult], show_runlogs: bool) -> str:
+    """Format the results of :py:obj:`simulate_batch` into a human-readable report.
+
+    :param results: The output of a call to :py:obj:`simulate_batch`
+    :param show_runlogs: Whether to include each protocol's run log.
+    """
+    lines = []
+    for result in results:
+        status = "OK" if result.ok else "FAILED"
+        lines.append(f"{status} {result.protocol_path} ({result.duration:.2f}s)")
+        if show_runlogs and result.runlog:
+            lines.append(result.runlog)
+        lines.extend(result.errors)
+    failed = sum(1 for result in results if not result.ok)
+    lines.append(
+        f"{len(results) - failed} of {len(results)} protocols simulated successfully"
+        f" in {sum(result.duration for result in results):.2f}s of simulation time."
+    )
+    return "\n".join(lines)
+
+
+# Note - this script is also set up as a setuptools entrypoint and thus does
+# an absolute minimum of work since setuptools does something odd generating
+# the scripts
+def main() -> int:
+    """Run the batch simulation."""
+    parser = argparse.ArgumentParser(
+        prog="opentrons_simulate_batch",
+        description="Simulate many protocols for an Opentrons robot in parallel",
+    )
+    parser.add_argument(
+        "-l",
+        "--log-level",
+        choices=["debug", "info", "warning", "error", "none"],
+        default="warning",
+        help="Specify the level filter for logs to capture in run logs.",
+    )
+    parser.add_argument(
+        "-L",
+        "--custom-labware-path",
+        action="append",
+        default=[os.getcwd()],
+        help="Specify directories to search for custom labware definitions. "
+        "See opentrons_simulate --help.",
+    )
+    parser.add_argument(
+        "-s",
+        "--custom-hardware-simulator-file",
+        type=str,
+        default=None,
+        help="Specify a file that describes the features present in the "
+        "hardware simulator. Features can be instruments, modules, and "
+        "configuration.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="How many protocols to simulate at once. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="store",
+        help="What to output: a summary of each protocol, the summary with "
+        "each protocol's run log, or a JSON report.",
+        choices=["summary", "runlog", "json"],
+        default="summary",
+    )
+    parser.add_argument(
+        "protocols",
+        metavar="PROTOCOL",
+        nargs="+",
+        help="The protocol files to simulate.",
+    )
+    parser.add_argument(
+        "-v",
+        "--version",
+        action="version",
+        version=f"%(prog)s {opentrons.__version__}",
+        help="Print the opentrons package version and exit",
+    )
+
+    args = parser.parse_args()
+
+    results = simulate_batch(
+        protocol_paths=args.protocols,
+        custom_labware_paths=args.custom_labware_path,
+        hardware_simulator_file_path=args.custom_hardware_simulator_file,
+        log_level=args.log_level,
+        max_workers=args.jobs,
+    )
+
+    if args.output == "json":
+        print(
+            json.dumps(
+                [{**dataclasses.asdict(result), "ok": result.ok} for result in results],
+                indent=2,
+            )
+        )
+    else:
+        print(format_report(results, show_runlogs=args.output == "runlog"))
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
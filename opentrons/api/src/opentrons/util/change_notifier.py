@@ -18,6 +18,10 @@ class ChangeNotifier:
         await self._event.wait()
         self._event.clear()
 
+    def clear(self) -> None:
+        """Discard a state change notification that no `wait`'er has seen yet."""
+        self._event.clear()
+
 
 class ChangeNotifier_ts(ChangeNotifier):
     """ChangeNotifier initialized with Event_ts."""
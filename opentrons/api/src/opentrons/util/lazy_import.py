@@ -0,0 +1,45 @@
+"""Helpers for importing a package's heavy contents only when they're used."""
+
+import importlib
+import sys
+from typing import Any, Callable, Mapping, Tuple
+
+
+def lazy_attributes(
+    module_name: str, attributes: Mapping[str, Tuple[str, str]]
+) -> Callable[[str], Any]:
+    """Return a module ``__getattr__`` that imports the given attributes on first access.
+
+    Assign the result to ``__getattr__`` in a module (see PEP 562) to let
+    callers keep writing ``from package import Name`` without the package
+    importing ``Name``'s module, and everything it depends on, up front.
+    Once an attribute is imported, it's stored on the module, so later
+    accesses cost the same as for an eagerly imported one.
+
+    To keep type-checking precise, also import the attributes eagerly under
+    ``if TYPE_CHECKING:``, and only define ``__getattr__`` under
+    ``if not TYPE_CHECKING:``.
+
+    Args:
+        module_name: The ``__name__`` of the module that will use the result.
+        attributes: Each lazily imported attribute's name, mapped to the name of
+            the module to import it from, which may be relative to the
+            module's package, and its name in that module.
+    """
+
+    def __getattr__(attrname: str) -> Any:
+        try:
+            source_module_name, source_attrname = attributes[attrname]
+        except KeyError:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {attrname!r}"
+            ) from None
+        module = sys.modules[module_name]
+        source_module = importlib.import_module(
+            source_module_name, package=module.__package__
+        )
+        value = getattr(source_module, source_attrname)
+        setattr(module, attrname, value)
+        return value
+
+    return __getattr__
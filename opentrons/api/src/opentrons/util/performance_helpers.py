@@ -12,7 +12,11 @@ from opentrons.config import (
 )
 
 if typing.TYPE_CHECKING:
-    from performance_metrics import RobotContextState, SupportsTracking
+    from performance_metrics import (
+        ContextStateSummary,
+        RobotContextState,
+        SupportsTracking,
+    )
 
 
 _UnderlyingFunctionParameters = typing.ParamSpec("_UnderlyingFunctionParameters")
@@ -59,6 +63,14 @@ class StubbedTracker:
         """Do nothing."""
         pass
 
+    def close(self) -> None:
+        """Do nothing."""
+        pass
+
+    def summarize(self) -> typing.Dict["RobotContextState", "ContextStateSummary"]:
+        """Return no statistics."""
+        return {}
+
 
 # Ensure that StubbedTracker implements SupportsTracking
 # but do not create a runtime dependency on performance_metrics
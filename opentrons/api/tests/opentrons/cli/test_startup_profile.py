@@ -0,0 +1,59 @@
+"""Test the startup-profile CLI."""
+import textwrap
+
+from click.testing import CliRunner
+
+from opentrons.cli.startup_profile import (
+    ImportTimeNode,
+    parse_import_times,
+    startup_profile,
+)
+
+
+def test_parse_import_times() -> None:
+    """It should nest each module under the module that imported it."""
+    output = textwrap.dedent(
+        """\
+        import time: self [us] | cumulative | imported package
+        import time:       100 |        100 | site
+        import time:        10 |         10 |     c
+        import time:        20 |         30 |   b
+        import time:        40 |         40 |   d
+        import time:         5 |         75 | a
+        """
+    )
+
+    assert parse_import_times(output) == [
+        ImportTimeNode(name="site", self_us=100, cumulative_us=100),
+        ImportTimeNode(
+            name="a",
+            self_us=5,
+            cumulative_us=75,
+            children=[
+                ImportTimeNode(
+                    name="b",
+                    self_us=20,
+                    cumulative_us=30,
+                    children=[ImportTimeNode(name="c", self_us=10, cumulative_us=10)],
+                ),
+                ImportTimeNode(name="d", self_us=40, cumulative_us=40),
+            ],
+        ),
+    ]
+
+
+def test_startup_profile() -> None:
+    """It should show the modules that were imported."""
+    result = CliRunner().invoke(startup_profile, ["json", "--min-ms", "0"])
+
+    assert result.exit_code == 0, result.output
+    assert "import json:" in result.output
+    assert "json.decoder" in result.output
+
+
+def test_startup_profile_budget() -> None:
+    """It should fail if importing takes longer than the budget."""
+    result = CliRunner().invoke(startup_profile, ["json", "--budget-ms", "0"])
+
+    assert result.exit_code != 0
+    assert "Importing took more than 0.0 ms: json" in result.output
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -136,3 +137,31 @@ def test_reset_input_buffer(mock_serial: MagicMock, subject: AsyncSerial):
     """It should call the underlying serial port's Reset function"""
     subject.reset_input_buffer()
     mock_serial.reset_input_buffer.assert_called_once()
+
+
+async def test_cancelled_call_blocks_port(
+    mock_serial: MagicMock, subject: AsyncSerial
+) -> None:
+    """It should not start a call on the port until a cancelled one is done."""
+    read_started = threading.Event()
+    finish_read = threading.Event()
+
+    def read_until(expected: bytes) -> bytes:
+        read_started.set()
+        finish_read.wait(timeout=5)
+        return expected
+
+    mock_serial.read_until.side_effect = read_until
+
+    read = asyncio.create_task(subject.read_until(b"\n"))
+    await asyncio.get_running_loop().run_in_executor(None, read_started.wait, 5)
+    read.cancel()
+    write = asyncio.create_task(subject.write(b"data"))
+
+    await asyncio.sleep(0.1)
+    assert read.cancelled()
+    mock_serial.write.assert_not_called()
+
+    finish_read.set()
+    await asyncio.wait_for(write, timeout=5)
+    mock_serial.write.assert_called_once_with(data=b"data")
@@ -3,7 +3,11 @@ from typing import AsyncGenerator
 
 import pytest
 from decoy import Decoy, matchers
-from opentrons.hardware_control.poller import Poller, Reader
+from opentrons.hardware_control.poller import (
+    Poller,
+    Reader,
+    get_poll_scheduler,
+)
 
 
 POLLING_INTERVAL = 0.1
@@ -173,9 +177,58 @@ async def test_poller_cancelled_wait(
     wait_task_1.cancel()
     ok_to_finish_read_event.set()
 
-    assert (
-        subject._poll_forever_task is not None and not subject._poll_forever_task.done()
-    )
+    assert subject._scheduler is not None and subject._scheduler.is_polling(subject)
 
     await asyncio.sleep(2 * subject.interval)
     assert wait_task_2.done() is True
+
+
+async def test_poller_idle_interval(decoy: Decoy, mock_reader: Reader) -> None:
+    """It should poll an idle reader less often, unless somebody is waiting."""
+    decoy.when(mock_reader.is_idle()).then_return(True)
+    subject = Poller(reader=mock_reader, interval=0.01, idle_interval=60)
+
+    await subject.start()
+    await asyncio.sleep(0.1)
+    decoy.verify(await mock_reader.read(), times=1)
+
+    await asyncio.wait_for(subject.wait_next_poll(), timeout=1)
+    decoy.verify(await mock_reader.read(), times=2)
+
+    await subject.stop()
+
+
+async def test_poller_metrics(
+    decoy: Decoy, mock_reader: Reader, subject: Poller
+) -> None:
+    """It should count its reads and how long they took."""
+    await subject.start()
+
+    decoy.when(await mock_reader.read()).then_raise(RuntimeError("oh no"))
+    with pytest.raises(RuntimeError, match="oh no"):
+        await subject.wait_next_poll()
+
+    assert subject.metrics.poll_count == 2
+    assert subject.metrics.error_count == 1
+    assert subject.metrics.max_latency >= subject.metrics.last_latency >= 0
+    assert subject.metrics.mean_latency <= subject.metrics.max_latency
+
+
+async def test_pollers_share_scheduler(decoy: Decoy, mock_reader: Reader) -> None:
+    """Pollers in the same event loop should share a scheduler and its task."""
+    pollers = [Poller(reader=mock_reader, interval=POLLING_INTERVAL) for _ in range(3)]
+    for poller in pollers:
+        await poller.start()
+
+    scheduler = get_poll_scheduler()
+    assert all(poller._scheduler is scheduler for poller in pollers)
+    assert all(scheduler.is_polling(poller) for poller in pollers)
+
+    await asyncio.gather(*(poller.wait_next_poll() for poller in pollers))
+    decoy.verify(await mock_reader.read(), times=6)
+
+    for poller in pollers:
+        await poller.stop()
+    assert not any(scheduler.is_polling(poller) for poller in pollers)
+    assert scheduler._task is not None
+    await asyncio.wait_for(scheduler._task, timeout=1)
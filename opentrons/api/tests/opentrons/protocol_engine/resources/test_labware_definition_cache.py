@@ -0,0 +1,103 @@
+"""Tests for the LabwareDefinitionCache."""
+import pytest
+from pydantic import ValidationError
+
+from opentrons_shared_data.labware import load_definition
+from opentrons_shared_data.labware.dev_types import LabwareDefinition as LabwareDefDict
+from opentrons.protocols.models import LabwareDefinition
+
+from opentrons.protocol_engine.resources.labware_definition_cache import (
+    LabwareDefinitionCache,
+    get_bundled_labware_definition_key,
+)
+
+
+@pytest.fixture
+def definition_dict() -> LabwareDefDict:
+    """Get an unparsed labware definition."""
+    return load_definition("opentrons_96_tiprack_300ul", 1)
+
+
+def test_parse_reuses_model(definition_dict: LabwareDefDict) -> None:
+    """It should parse equal definitions only once, and share the model."""
+    subject = LabwareDefinitionCache(max_size=10)
+
+    result = subject.parse(definition_dict)
+
+    assert result == LabwareDefinition.parse_obj(definition_dict)
+    assert subject.parse(load_definition("opentrons_96_tiprack_300ul", 1)) is result
+
+
+def test_parse_distinguishes_contents(definition_dict: LabwareDefDict) -> None:
+    """It should not mix up definitions with the same identity but different contents."""
+    subject = LabwareDefinitionCache(max_size=10)
+    original = subject.parse(definition_dict)
+
+    definition_dict["metadata"]["displayName"] = "Modified"
+    modified = subject.parse(definition_dict)
+
+    assert modified is not original
+    assert modified.metadata.displayName == "Modified"
+    assert original.metadata.displayName != "Modified"
+
+
+def test_parse_invalid() -> None:
+    """It should raise validation errors for things that aren't definitions."""
+    subject = LabwareDefinitionCache(max_size=10)
+
+    with pytest.raises(ValidationError):
+        subject.parse({})  # type: ignore[typeddict-item]
+
+
+def test_get_or_load(definition_dict: LabwareDefDict) -> None:
+    """It should only load a definition when it's not cached."""
+    subject = LabwareDefinitionCache(max_size=10)
+    key = get_bundled_labware_definition_key("opentrons_96_tiprack_300ul", 1)
+    load_count = 0
+
+    def load() -> LabwareDefDict:
+        nonlocal load_count
+        load_count += 1
+        return definition_dict
+
+    result = subject.get_or_load(key, load)
+
+    assert subject.get_or_load(key, load) is result
+    assert load_count == 1
+
+
+def test_get_or_load_error() -> None:
+    """It should propagate loading errors without caching anything."""
+    subject = LabwareDefinitionCache(max_size=10)
+    key = get_bundled_labware_definition_key("not_a_real_labware", 1)
+
+    def load() -> LabwareDefDict:
+        raise FileNotFoundError("oh no")
+
+    with pytest.raises(FileNotFoundError):
+        subject.get_or_load(key, load)
+    with pytest.raises(FileNotFoundError):
+        subject.get_or_load(key, load)
+
+
+def test_evicts_least_recently_used(definition_dict: LabwareDefDict) -> None:
+    """It should drop the least recently used definition when it's full."""
+    subject = LabwareDefinitionCache(max_size=2)
+    keys = [
+        get_bundled_labware_definition_key("opentrons_96_tiprack_300ul", version)
+        for version in (1, 2, 3)
+    ]
+
+    first = subject.get_or_load(keys[0], lambda: definition_dict)
+    subject.get_or_load(keys[1], lambda: definition_dict)
+    # Using the first key makes the second one the least recently used.
+    assert subject.get_or_load(keys[0], lambda: definition_dict) is first
+    subject.get_or_load(keys[2], lambda: definition_dict)
+
+    assert subject.get_or_load(keys[0], lambda: definition_dict) is first
+
+    def fail() -> LabwareDefDict:
+        raise AssertionError("Should have been cached.")
+
+    with pytest.raises(AssertionError):
+        subject.get_or_load(keys[1], fail)
@@ -0,0 +1,91 @@
+"""Tests for routing actions to the substores that handle them."""
+from datetime import datetime
+
+from decoy import Decoy
+
+from opentrons.hardware_control.nozzle_manager import NozzleMap
+from opentrons.protocol_engine import commands
+from opentrons.protocol_engine.actions import (
+    Action,
+    AddLiquidAction,
+    PlayAction,
+    SucceedCommandAction,
+)
+from opentrons.protocol_engine.commands.configuring_common import (
+    PipetteNozzleLayoutResultMixin,
+)
+from opentrons.protocol_engine.state.abstract_store import HandlesActions
+from opentrons.protocol_engine.state.action_router import ActionRouter
+from opentrons.protocol_engine.types import Liquid
+
+from .command_fixtures import create_succeeded_command
+
+
+class _Substore(HandlesActions):
+    def handle_action(self, action: Action) -> None:
+        pass
+
+
+class _AllActionsSubstore(_Substore):
+    pass
+
+
+class _LiquidSubstore(_Substore):
+    handled_action_types = (AddLiquidAction,)
+
+
+class _HomeSubstore(_Substore):
+    handled_action_types = (SucceedCommandAction, PlayAction)
+    handled_command_result_types = (commands.HomeResult,)
+
+
+class _NozzleLayoutSubstore(_Substore):
+    handled_action_types = (SucceedCommandAction,)
+    handled_command_result_types = (PipetteNozzleLayoutResultMixin,)
+
+
+def test_route_by_action_type() -> None:
+    """It should only route actions to substores that handle their type."""
+    every = _AllActionsSubstore()
+    liquid = _LiquidSubstore()
+    home = _HomeSubstore()
+    subject = ActionRouter([every, liquid, home])
+
+    add_liquid = AddLiquidAction(
+        liquid=Liquid(id="liquid-id", displayName="water", description="")
+    )
+    play = PlayAction(
+        requested_at=datetime(year=2021, month=1, day=1), deck_configuration=[]
+    )
+
+    assert subject.get_handlers(add_liquid) == [every, liquid]
+    assert subject.get_handlers(play) == [every, home]
+
+
+def test_route_succeeded_command_by_result_type(decoy: Decoy) -> None:
+    """It should route succeeded commands by their result and private result."""
+    every = _AllActionsSubstore()
+    home = _HomeSubstore()
+    nozzle_layout = _NozzleLayoutSubstore()
+    subject = ActionRouter([every, home, nozzle_layout])
+
+    succeed_home = SucceedCommandAction(
+        command=create_succeeded_command(result=commands.HomeResult()),
+        private_result=None,
+    )
+    succeed_comment = SucceedCommandAction(
+        command=create_succeeded_command(result=commands.CommentResult()),
+        private_result=None,
+    )
+    succeed_nozzle_layout = SucceedCommandAction(
+        command=create_succeeded_command(result=commands.CommentResult()),
+        private_result=commands.ConfigureNozzleLayoutPrivateResult(
+            pipette_id="pipette-id", nozzle_map=decoy.mock(cls=NozzleMap)
+        ),
+    )
+
+    assert subject.get_handlers(succeed_home) == [every, home]
+    assert subject.get_handlers(succeed_comment) == [every]
+    assert subject.get_handlers(succeed_nozzle_layout) == [every, nozzle_layout]
+    # the route is remembered, not worked out again
+    assert subject.get_handlers(succeed_home) is subject.get_handlers(succeed_home)
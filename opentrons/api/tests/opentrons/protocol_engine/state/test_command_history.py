@@ -1,11 +1,21 @@
 """CommandHistory state store tests."""
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 
 from opentrons.ordered_set import OrderedSet
 
 from opentrons.protocol_engine.errors.exceptions import CommandDoesNotExistError
 from opentrons.protocol_engine.state.command_history import CommandHistory, CommandEntry
-from opentrons.protocol_engine.commands import CommandIntent, CommandStatus
+from opentrons.protocol_engine.state.command_log import CommandLog
+from opentrons.protocol_engine.commands import (
+    Comment,
+    CommentParams,
+    CommentResult,
+    CommandIntent,
+    CommandStatus,
+)
 
 from .command_fixtures import (
     create_queued_command,
@@ -299,3 +309,42 @@ def test_remove_id_from_setup_queue(command_history: CommandHistory) -> None:
     command_history._add_to_setup_queue("1")
     command_history._remove_setup_queue_id("0")
     assert command_history.get_setup_queue_ids() == OrderedSet(["1"])
+
+
+def test_command_log(tmp_path: Path) -> None:
+    """It should move older finalized commands to the command log, and still return them."""
+    subject = CommandHistory(
+        command_log=CommandLog(tmp_path), max_finalized_commands_in_memory=10
+    )
+
+    def create_comment(command_id: str, status: CommandStatus) -> Comment:
+        return Comment(
+            id=command_id,
+            key=command_id,
+            createdAt=datetime(year=2021, month=1, day=1),
+            status=status,
+            params=CommentParams(message=command_id),
+            result=CommentResult() if status == CommandStatus.SUCCEEDED else None,
+        )
+
+    succeeded_commands = []
+    for i in range(250):
+        subject.set_command_queued(create_comment(f"{i}", CommandStatus.QUEUED))
+        subject.set_command_running(create_comment(f"{i}", CommandStatus.RUNNING))
+        succeeded_command = create_comment(f"{i}", CommandStatus.SUCCEEDED)
+        subject.set_command_succeeded(succeeded_command)
+        succeeded_commands.append(succeeded_command)
+    queued_command = create_comment("250", CommandStatus.QUEUED)
+    subject.set_command_queued(queued_command)
+
+    # 200 commands moved to the log, in 2 batches of 100.
+    assert len(subject._commands_by_id) == 51
+    assert subject.length() == 251
+    assert subject.has("3")
+    assert subject.get("3") == CommandEntry(succeeded_commands[3], 3)
+    assert subject.get_next("199") == CommandEntry(succeeded_commands[200], 200)
+    assert subject.get_prev("200") == CommandEntry(succeeded_commands[199], 199)
+    assert subject.get_slice(195, 205) == succeeded_commands[195:205]
+    assert subject.get_all_commands() == succeeded_commands + [queued_command]
+    assert subject.get_terminal_command() == CommandEntry(succeeded_commands[249], 249)
+    assert subject.get_tail_command() == CommandEntry(queued_command, 250)
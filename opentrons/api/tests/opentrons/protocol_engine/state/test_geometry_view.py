@@ -50,6 +50,9 @@ from opentrons.protocol_engine.types import (
     LoadedPipette,
     TipGeometry,
     ModuleDefinition,
+    LabwareMovementStrategy,
+    LabwareOffsetCreate,
+    LabwareOffsetLocation,
 )
 from opentrons.protocol_engine.commands import (
     CommandStatus,
@@ -60,7 +63,10 @@ from opentrons.protocol_engine.commands import (
     LoadModule,
     LoadModuleParams,
 )
-from opentrons.protocol_engine.actions import SucceedCommandAction
+from opentrons.protocol_engine.actions import (
+    AddLabwareOffsetAction,
+    SucceedCommandAction,
+)
 from opentrons.protocol_engine.state import move_types
 from opentrons.protocol_engine.state.config import Config
 from opentrons.protocol_engine.state.labware import LabwareView, LabwareStore
@@ -78,6 +84,10 @@ from opentrons.protocol_engine.state.addressable_areas import (
 )
 from opentrons.protocol_engine.state.geometry import GeometryView, _GripperMoveType
 from ..pipette_fixtures import get_default_nozzle_map
+from .command_fixtures import (
+    create_aspirate_command,
+    create_move_labware_command,
+)
 
 
 @pytest.fixture
@@ -1176,6 +1186,83 @@ def test_get_labware_position(
     )
 
 
+def test_get_labware_position_cached(
+    decoy: Decoy,
+    well_plate_def: LabwareDefinition,
+    mock_labware_view: LabwareView,
+    mock_addressable_area_view: AddressableAreaView,
+    subject: GeometryView,
+) -> None:
+    """It should reuse labware positions until an action might change them."""
+    labware_data = LoadedLabware(
+        id="labware-id",
+        loadName="load-name",
+        definitionUri="definition-uri",
+        location=DeckSlotLocation(slotName=DeckSlotName.SLOT_4),
+        offsetId=None,
+    )
+    decoy.when(mock_labware_view.get("labware-id")).then_return(labware_data)
+    decoy.when(mock_labware_view.get_definition("labware-id")).then_return(
+        well_plate_def
+    )
+    decoy.when(mock_labware_view.get_labware_offset_vector("labware-id")).then_return(
+        LabwareOffsetVector(x=0, y=0, z=0)
+    )
+    decoy.when(
+        mock_addressable_area_view.get_addressable_area_position(DeckSlotName.SLOT_4.id)
+    ).then_return(Point(1, 2, 3))
+    original_position = subject.get_labware_position("labware-id")
+
+    decoy.when(
+        mock_addressable_area_view.get_addressable_area_position(DeckSlotName.SLOT_4.id)
+    ).then_return(Point(4, 5, 6))
+    subject.invalidate_cached_positions(
+        SucceedCommandAction(
+            command=create_aspirate_command(
+                pipette_id="pipette-id", volume=1, flow_rate=1
+            ),
+            private_result=None,
+        )
+    )
+    assert subject.get_labware_position("labware-id") == original_position
+
+    subject.invalidate_cached_positions(
+        SucceedCommandAction(
+            command=create_move_labware_command(
+                new_location=DeckSlotLocation(slotName=DeckSlotName.SLOT_4),
+                strategy=LabwareMovementStrategy.MANUAL_MOVE_WITH_PAUSE,
+            ),
+            private_result=None,
+        )
+    )
+    moved_position = subject.get_labware_position("labware-id")
+    assert moved_position == Point(
+        x=original_position.x + 3,
+        y=original_position.y + 3,
+        z=original_position.z + 3,
+    )
+
+    decoy.when(mock_labware_view.get_labware_offset_vector("labware-id")).then_return(
+        LabwareOffsetVector(x=1, y=1, z=1)
+    )
+    subject.invalidate_cached_positions(
+        AddLabwareOffsetAction(
+            labware_offset_id="offset-id",
+            created_at=datetime(year=2024, month=1, day=1),
+            request=LabwareOffsetCreate(
+                definitionUri="definition-uri",
+                location=LabwareOffsetLocation(slotName=DeckSlotName.SLOT_4),
+                vector=LabwareOffsetVector(x=1, y=1, z=1),
+            ),
+        )
+    )
+    assert subject.get_labware_position("labware-id") == Point(
+        x=moved_position.x + 1,
+        y=moved_position.y + 1,
+        z=moved_position.z + 1,
+    )
+
+
 def test_get_well_position(
     decoy: Decoy,
     well_plate_def: LabwareDefinition,
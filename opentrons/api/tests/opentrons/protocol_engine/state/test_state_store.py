@@ -8,9 +8,9 @@ from decoy import Decoy
 from opentrons_shared_data.deck.dev_types import DeckDefinitionV5
 from opentrons.util.change_notifier import ChangeNotifier
 
-from opentrons.protocol_engine.actions import PlayAction
+from opentrons.protocol_engine.actions import AddLiquidAction, PlayAction
 from opentrons.protocol_engine.state import State, StateStore, Config
-from opentrons.protocol_engine.types import DeckType
+from opentrons.protocol_engine.types import DeckType, Liquid
 
 
 @pytest.fixture
@@ -80,6 +80,23 @@ def test_notify_on_state_change(
     decoy.verify(change_notifier.notify(), times=1)
 
 
+def test_route_action_to_substores(
+    decoy: Decoy,
+    change_notifier: ChangeNotifier,
+    subject: StateStore,
+) -> None:
+    """It should update the views of the substores that handle an action."""
+    liquid = Liquid(id="liquid-id", displayName="water", description="")
+    commands_before = subject.state.commands
+
+    subject.handle_action(AddLiquidAction(liquid=liquid))
+
+    assert subject.liquid.get_all() == [liquid]
+    assert subject.state.liquids.liquids_by_id == {"liquid-id": liquid}
+    assert subject.state.commands is commands_before
+    decoy.verify(change_notifier.notify(), times=1)
+
+
 async def test_wait_for(
     decoy: Decoy,
     change_notifier: ChangeNotifier,
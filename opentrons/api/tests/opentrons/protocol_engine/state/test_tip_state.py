@@ -14,7 +14,7 @@ from opentrons_shared_data.pipette.pipette_definition import ValidNozzleMaps
 
 from opentrons.hardware_control.nozzle_manager import NozzleMap
 from opentrons.protocol_engine import actions, commands
-from opentrons.protocol_engine.state.tips import TipStore, TipView
+from opentrons.protocol_engine.state.tips import TipRackLayout, TipStore, TipView
 from opentrons.protocol_engine.types import FlowRates, DeckPoint
 from opentrons.protocol_engine.resources.pipette_data_provider import (
     LoadedStaticPipetteData,
@@ -1456,3 +1456,19 @@ def test_next_tip_automatic_tip_tracking_tiprack_limits(
     for x in range(96):
         _get_next_and_pickup(map)
     assert _get_next_and_pickup(map) is None
+
+
+def test_tip_rack_layout_tip_clusters() -> None:
+    """It should index tip clusters by well and remember them per nozzle layout."""
+    subject = TipRackLayout([["A1", "B1", "C1"], ["A2", "B2", "C2"]])
+
+    assert subject.get_mask(["A1", "C2"]) == 0b100001
+
+    # A two-column, two-row layout entering the tip rack at A1.
+    tip_clusters = subject.get_tip_clusters("A1", 2, 2)
+    assert [tip_cluster.first_well for tip_cluster in tip_clusters] == ["B2"]
+    assert tip_clusters[0].mask == subject.get_mask(["B2", "A2", "B1", "A1"])
+    assert tip_clusters[0].final_column_mask == subject.get_mask(["B1", "A1"])
+    assert tip_clusters[0].final_row_mask == subject.get_mask(["A2", "A1"])
+
+    assert subject.get_tip_clusters("A1", 2, 2) is tip_clusters
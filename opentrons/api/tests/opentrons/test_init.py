@@ -1,6 +1,9 @@
-import pytest
+import subprocess
+import sys
 from pathlib import Path
 
+import pytest
+
 
 def test_find_smoothie_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     import opentrons
@@ -11,3 +14,39 @@ def test_find_smoothie_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) ->
 
     monkeypatch.setattr(opentrons, "IS_ROBOT", True)
     assert opentrons._find_smoothie_file() == (dummy_file, "edge-2cac98asda")
+
+
+def test_import_is_lazy() -> None:
+    """Importing opentrons should not import the hardware controller or its drivers."""
+    heavy_modules = [
+        "opentrons.hardware_control.api",
+        "opentrons.hardware_control.thread_manager",
+        "opentrons.hardware_control.backends.controller",
+        "opentrons.drivers.serial_communication",
+        "opentrons.protocol_engine",
+    ]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, opentrons;"
+            f" print([m for m in {heavy_modules!r} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_attributes() -> None:
+    """Lazily imported attributes should still be available."""
+    from opentrons import hardware_control
+    from opentrons.hardware_control.api import API
+    from opentrons.hardware_control.backends.controller import Controller
+
+    assert hardware_control.API is API
+    assert hardware_control.Controller is Controller
+    assert hardware_control.backends.Controller is Controller
+    with pytest.raises(AttributeError):
+        getattr(hardware_control, "NotARealAttribute")
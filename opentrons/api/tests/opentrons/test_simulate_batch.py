@@ -0,0 +1,98 @@
+"""Tests for `opentrons.simulate_batch`."""
+
+from pathlib import Path
+
+import pytest
+
+from opentrons import simulate, simulate_batch
+
+
+HERE = Path(__file__).parent
+
+
+@pytest.fixture
+def worker() -> simulate_batch._Worker:
+    """Return a worker that runs in this process."""
+    return simulate_batch._Worker(
+        custom_labware_paths=[str(HERE / "data")],
+        hardware_simulator_file_path=None,
+        log_level="warning",
+    )
+
+
+@pytest.mark.parametrize("protocol_file", ["testosaur_v2.py", "testosaur_v2_14.py"])
+def test_worker_simulates_independently(
+    worker: simulate_batch._Worker, protocol_file: str
+) -> None:
+    """Protocols simulated in a reused worker should match fresh simulations."""
+    protocol_path = str(HERE / "data" / protocol_file)
+    with open(protocol_path, "rb") as protocol_file_obj:
+        expected_runlog, _ = simulate.simulate(
+            protocol_file_obj,
+            file_name=protocol_file,
+            custom_labware_paths=[str(HERE / "data")],
+        )
+
+    first = worker.simulate(protocol_path)
+    second = worker.simulate(protocol_path)
+
+    assert first.ok and second.ok
+    assert first.runlog == second.runlog == simulate.format_runlog(expected_runlog)
+    assert first.duration > 0
+
+
+def test_worker_reports_errors(worker: simulate_batch._Worker, tmp_path: Path) -> None:
+    """Protocols that fail should be reported instead of raised."""
+    protocol_path = tmp_path / "bad_protocol.py"
+    protocol_path.write_text(
+        "requirements = {'apiLevel': '2.15'}\n"
+        "def run(ctx):\n"
+        "    ctx.comment('before the error')\n"
+        "    raise RuntimeError('oh no')\n"
+    )
+
+    result = worker.simulate(str(protocol_path))
+
+    assert not result.ok
+    assert result.runlog == ""
+    assert len(result.errors) == 1
+    assert "oh no" in result.errors[0]
+
+
+def test_simulate_batch(tmp_path: Path) -> None:
+    """It should simulate every protocol and report them in order."""
+    bad_protocol = tmp_path / "bad_protocol.py"
+    bad_protocol.write_text("this is not python")
+    protocol_paths = [
+        str(HERE / "data" / "testosaur_v2.py"),
+        str(bad_protocol),
+        str(HERE / "data" / "testosaur_v2_14.py"),
+    ]
+
+    results = simulate_batch.simulate_batch(protocol_paths, max_workers=2)
+
+    assert [result.protocol_path for result in results] == protocol_paths
+    assert [result.ok for result in results] == [True, False, True]
+    assert "Picking up tip" in results[0].runlog
+
+
+def test_simulate_batch_worker_crash(tmp_path: Path) -> None:
+    """It should report a protocol that kills its worker, and simulate the rest."""
+    crashing_protocol = tmp_path / "crashing_protocol.py"
+    crashing_protocol.write_text(
+        "import os\n"
+        "requirements = {'apiLevel': '2.15'}\n"
+        "def run(ctx):\n"
+        "    os._exit(1)\n"
+    )
+    protocol_paths = [
+        str(HERE / "data" / "testosaur_v2.py"),
+        str(crashing_protocol),
+        str(HERE / "data" / "testosaur_v2_14.py"),
+    ]
+
+    results = simulate_batch.simulate_batch(protocol_paths, max_workers=2)
+
+    assert [result.protocol_path for result in results] == protocol_paths
+    assert [result.ok for result in results] == [True, False, True]
+    assert "exited unexpectedly" in results[1].errors[0]
@@ -81,3 +81,17 @@ async def test_notify_while_busy() -> None:
     assert results == ["TEST", "TEST"]
 
     task.cancel()
+
+
+async def test_clear() -> None:
+    """Test that clear() discards a notification that has not been waited for."""
+    subject = ChangeNotifier()
+    subject.notify()
+    subject.clear()
+
+    result = asyncio.create_task(subject.wait())
+    await asyncio.sleep(0.1)
+    assert result.done() is False
+
+    subject.notify()
+    await result
@@ -366,34 +366,37 @@ class CanMessenger:
     async def _read_task(self) -> None:
         """Read task."""
         async for message in self._drive:
-            message_definition = get_definition(
-                MessageId(message.arbitration_id.parts.message_id)
-            )
-            if message_definition:
-                try:
-                    build = message_definition.payload_type.build(message.data)
+            self._handle_message(message)
+
+    def _handle_message(self, message: CanMessage) -> None:
+        """Decode an incoming message and dispatch it to the listeners."""
+        message_definition = get_definition(message.arbitration_id.parts.message_id)
+        if message_definition:
+            try:
+                build = message_definition.payload_type.build(message.data)
+                if log.isEnabledFor(logging.DEBUG):
                     log.debug(
                         f"Received <--\n\tarbitration_id: {message.arbitration_id},\n\t"
                         f"payload: {build}"
                     )
-                    handled = False
-                    for listener, filter in self._listeners.values():
-                        if filter and not filter(message.arbitration_id):
-                            continue
-                        listener(message_definition(payload=build), message.arbitration_id)  # type: ignore[arg-type]
-                        handled = True
-                    if not handled:
-                        if (
-                            message.arbitration_id.parts.message_id
-                            == MessageId.error_message
-                        ):
-                            log.error(f"Asynchronous error message ignored: {message}")
-                        else:
-                            log.info(f"Message ignored: {message}")
-                except BinarySerializableException:
-                    log.exception(f"Failed to build from {message}")
-            else:
-                log.error(f"Message {message} is not recognized.")
+                handled = False
+                for listener, filter in self._listeners.values():
+                    if filter and not filter(message.arbitration_id):
+                        continue
+                    listener(message_definition(payload=build), message.arbitration_id)  # type: ignore[arg-type]
+                    handled = True
+                if not handled:
+                    if (
+                        message.arbitration_id.parts.message_id
+                        == MessageId.error_message
+                    ):
+                        log.error(f"Asynchronous error message ignored: {message}")
+                    else:
+                        log.info(f"Message ignored: {message}")
+            except BinarySerializableException:
+                log.exception(f"Failed to build from {message}")
+        else:
+            log.error(f"Message {message} is not recognized.")
 
     @property
     def exclusive_writer(self) -> asyncio.Lock:
@@ -1,6 +1,5 @@
 """Message types."""
-from functools import lru_cache
-from typing import Union, Optional, Type
+from typing import Union, Optional, Type, Dict
 
 from typing_extensions import get_args
 
@@ -114,20 +113,32 @@ MessageDefinition = Union[
 ]
 
 
-@lru_cache(maxsize=None)
-def get_definition(message_id: MessageId) -> Optional[Type[MessageDefinition]]:
+def _build_definition_table() -> Dict[int, Type[MessageDefinition]]:
+    """Index every message definition by its message id.
+
+    This also precompiles the payload layout of each definition so that
+    decoding the first frame of a given type is as cheap as any other.
+    """
+    table: Dict[int, Type[MessageDefinition]] = {}
+    for definition in get_args(MessageDefinition):
+        # Keep the first definition for an id, like the old linear search did.
+        table.setdefault(definition.message_id, definition)
+        definition.payload_type.precompile()
+    return table
+
+
+_definitions_by_id = _build_definition_table()
+
+
+def get_definition(
+    message_id: Union[MessageId, int]
+) -> Optional[Type[MessageDefinition]]:
     """Get the message type for a message id.
 
     Args:
-        message_id: A message id
+        message_id: A message id, or the raw integer id from an arbitration id
 
     Returns: The message definition for a type
 
     """
-    # Dumb linear search, but the result is memoized.
-    for i in get_args(MessageDefinition):
-        if i.message_id == message_id:
-            # get args returns Tuple[Any...]
-            return i  # type: ignore[no-any-return]
-
-    return None
+    return _definitions_by_id.get(message_id)
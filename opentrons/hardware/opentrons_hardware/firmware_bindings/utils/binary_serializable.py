@@ -2,8 +2,19 @@
 
 from __future__ import annotations
 import struct
-from dataclasses import dataclass, fields, astuple
-from typing import TypeVar, Generic, Type, Optional, Dict, Any, Sequence
+from dataclasses import dataclass, fields
+from typing import (
+    TypeVar,
+    Generic,
+    Type,
+    Optional,
+    Dict,
+    Any,
+    Sequence,
+    Tuple,
+    Callable,
+    NamedTuple,
+)
 
 from opentrons_shared_data.errors.exceptions import (
     InternalMessageFormatError,
@@ -185,10 +196,10 @@ class BinarySerializable:
         Returns:
             Byte buffer
         """
-        string = self._get_format_string()
-        vals = [x.value for x in astuple(self)]
+        layout = self._get_layout()
+        vals = [getattr(self, name).value for name in layout.names]
         try:
-            return struct.pack(string, *vals)
+            return layout.packer.pack(*vals)
         except struct.error as e:
             raise SerializationException(e)
 
@@ -209,32 +220,46 @@ class BinarySerializable:
         Returns:
             cls
         """
+        layout = cls._get_layout()
         try:
-            format_string = cls._get_format_string()
-            size = cls.get_size()
             # ignore bytes beyond the size of message.
-            b = struct.unpack(format_string, data[:size])
-            # we have to do message index special until we update to python 3.10 since we can't make it a kw_only arg
-            # 3.10 has an updated dataclass field option that will make this go away, see payloads.py
-            args = {
-                v.name: v.type.build(b[i])
-                for i, v in enumerate(fields(cls))
-                if not (v.name == "message_index")
-            }
-            message_index = next(
-                (
-                    v.type.build(b[i])
-                    for i, v in enumerate(fields(cls))
-                    if v.name == "message_index"
-                ),
-                None,
-            )
-            ret_instance = cls(**args)
-            if message_index is not None:
-                ret_instance.message_index = message_index  # type: ignore[attr-defined]
-            return ret_instance
+            b = layout.packer.unpack_from(data)
         except struct.error as e:
             raise InvalidFieldException("Bad data for field", data, e)
+        # we have to do message index special until we update to python 3.10 since we can't make it a kw_only arg
+        # 3.10 has an updated dataclass field option that will make this go away, see payloads.py
+        ret_instance = cls(
+            **{name: builder(b[i]) for i, name, builder in layout.init_builders}
+        )
+        if layout.message_index_builder is not None:
+            i, builder = layout.message_index_builder
+            ret_instance.message_index = builder(b[i])  # type: ignore[attr-defined]
+        return ret_instance
+
+    @classmethod
+    def precompile(cls) -> bool:
+        """Compile and cache the struct layout for this class ahead of time.
+
+        Classes that override build() to parse variable length data may not
+        have a fixed layout; for those this does nothing.
+
+        Returns:
+            True if a fixed layout was compiled.
+        """
+        try:
+            cls._get_layout()
+        except BinarySerializableException:
+            return False
+        return True
+
+    @classmethod
+    def _get_layout(cls) -> _SerializableLayout:
+        """Get the compiled struct layout for this class."""
+        try:
+            return _layouts[cls]
+        except KeyError:
+            layout = _layouts[cls] = _compile_layout(cls)
+            return layout
 
     @classmethod
     def _get_format_string(cls) -> str:
@@ -258,7 +283,43 @@ class BinarySerializable:
     @classmethod
     def get_size(cls) -> int:
         """Get the size of the serializable in bytes."""
-        return struct.calcsize(cls._get_format_string())
+        return cls._get_layout().packer.size
+
+
+class _SerializableLayout(NamedTuple):
+    """The precompiled packing information of a BinarySerializable class."""
+
+    packer: struct.Struct
+    """The compiled struct for all fields, in declaration order."""
+    names: Tuple[str, ...]
+    """The names of all fields, in declaration order."""
+    init_builders: Tuple[Tuple[int, str, Callable[[Any], BinaryFieldBase[Any]]], ...]
+    """Position, name and field factory of each field passed to the constructor."""
+    message_index_builder: Optional[Tuple[int, Callable[[Any], BinaryFieldBase[Any]]]]
+    """Position and field factory of the message index, if the class has one."""
+
+
+_layouts: Dict[Type[BinarySerializable], _SerializableLayout] = {}
+"""Compiled layouts by class, so each class only pays for introspection once."""
+
+
+def _compile_layout(cls: Type[BinarySerializable]) -> _SerializableLayout:
+    """Build the struct and field factories for a class."""
+    packer = struct.Struct(cls._get_format_string())
+    dataclass_fields = fields(cls)
+    init_builders = []
+    message_index_builder = None
+    for i, v in enumerate(dataclass_fields):
+        if v.name == "message_index":
+            message_index_builder = (i, v.type.build)
+        else:
+            init_builders.append((i, v.name, v.type.build))
+    return _SerializableLayout(
+        packer=packer,
+        names=tuple(v.name for v in dataclass_fields),
+        init_builders=tuple(init_builders),
+        message_index_builder=message_index_builder,
+    )
 
 
 class LittleEndianMixIn:
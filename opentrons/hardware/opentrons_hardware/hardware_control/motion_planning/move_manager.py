@@ -1,7 +1,7 @@
 """Move manager."""
 import logging
 from typing import List, Tuple, Generic
-from opentrons_hardware.hardware_control.motion_planning import move_utils
+from opentrons_hardware.hardware_control.motion_planning import move_utils, vectorized
 from opentrons_hardware.hardware_control.motion_planning.types import (
     Coordinates,
     Move,
@@ -17,13 +17,18 @@ log = logging.getLogger(__name__)
 class MoveManager(Generic[AxisKey]):
     """A manager that handles a list of moves for the hardware control system."""
 
-    def __init__(self, constraints: SystemConstraints[AxisKey]) -> None:
+    def __init__(
+        self, constraints: SystemConstraints[AxisKey], vectorized: bool = False
+    ) -> None:
         """Constructor.
 
         Args:
             constraints: system contraints
+            vectorized: blend the whole target list at once with array math
+                instead of building every move on every blending pass
         """
         self._constraints = constraints
+        self._vectorized = vectorized
         self._blend_log: List[List[Move[AxisKey]]] = []
 
     def update_constraints(self, constraints: SystemConstraints[AxisKey]) -> None:
@@ -65,6 +70,8 @@ class MoveManager(Generic[AxisKey]):
     ) -> Tuple[bool, List[List[Move[AxisKey]]]]:
         """Create and blend moves from targets."""
         self._clear_blend_log()
+        if self._vectorized:
+            return self._plan_motion_vectorized(origin, target_list, iteration_limit)
         to_blend = self._get_initial_moves_from_targets(origin, target_list)
         assert to_blend, "Check target list"
         for i in range(iteration_limit):
@@ -99,3 +106,27 @@ class MoveManager(Generic[AxisKey]):
                 to_blend = self._blend_log[-1]
         log.error("Could not converge!")
         return False, self._blend_log
+
+    def _plan_motion_vectorized(
+        self,
+        origin: Coordinates[AxisKey, CoordinateValue],
+        target_list: List[MoveTarget[AxisKey]],
+        iteration_limit: int,
+    ) -> Tuple[bool, List[List[Move[AxisKey]]]]:
+        """Create and blend moves from targets, building only the final moves.
+
+        The blend log only holds the blended moves, not every pass.
+        """
+        converged, blended, passes = vectorized.plan_moves(
+            origin, target_list, self._constraints, iteration_limit
+        )
+        self._blend_log.append(blended)
+        if converged:
+            log.debug(
+                f"built {len(blended)} moves with "
+                f"{sum(m.nonzero_blocks for m in blended)} "
+                f"non-zero blocks after {passes} iteration(s)"
+            )
+        else:
+            log.error("Could not converge!")
+        return converged, self._blend_log
@@ -304,4 +304,5 @@ def is_unit_vector(position: Coordinates[AxisKey, np.float64]) -> bool:
     """Check whether a coordinate vector has unit magnitude."""
     vectorized = vectorize(position)
     magnitude = np.linalg.norm(vectorized)
-    return cast(bool, np.isclose(magnitude, 1.0))
+    # the tolerance of np.isclose(magnitude, 1.0), which is slow on scalars
+    return bool(abs(magnitude - 1.0) <= 1.001e-05)
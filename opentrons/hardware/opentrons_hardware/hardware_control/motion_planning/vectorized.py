@@ -0,0 +1,499 @@
+"""Array based blending of a whole list of moves at once.
+
+This implements the same constraints as ``move_utils.build_move`` and
+``move_utils.all_blended``, but keeps the unit vectors, distances and junction
+speeds of every move in NumPy arrays so that each blending pass is a handful of
+array operations per axis rather than a Python loop over every move and axis.
+``Move`` objects are only built once the speeds have converged.
+
+Like ``move_utils.targets_to_moves``, moves with a tiny component along some
+axis are split into several moves.
+
+Each pass first limits the initial speed of every move based on the final speed
+of the move before it, as in the previous pass. The final speed of every move
+is then limited based on the initial speed of the move after it as computed in
+*this* pass, so that slowdowns propagate backwards along the path one move per
+pass faster than when every move is built from the previous pass alone.
+"""
+import logging
+from typing import List, NamedTuple, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from opentrons_hardware.hardware_control.motion_planning.move_utils import (
+    FLOAT_THRESHOLD,
+    MINIMUM_DISPLACEMENT,
+    MINIMUM_VECTOR_COMPONENT,
+    de_diagonalize_unit_vector,
+)
+from opentrons_hardware.hardware_control.motion_planning.types import (
+    AxisKey,
+    Block,
+    Coordinates,
+    CoordinateValue,
+    Move,
+    MoveTarget,
+    SystemConstraints,
+    ZeroLengthMoveError,
+    vectorize,
+)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+log = logging.getLogger(__name__)
+
+
+class _AxisArrays(NamedTuple):
+    """Per-axis constraints, in the same order as the columns of the unit vectors."""
+
+    max_acceleration: "NDArray[np.float64]"
+    max_speed_discont: "NDArray[np.float64]"
+    max_direction_change_speed_discont: "NDArray[np.float64]"
+
+
+class _MoveArrays(NamedTuple):
+    """The moves to blend, padded with a stopped move at either end."""
+
+    unit_vectors: "NDArray[np.float64]"
+    distances: "NDArray[np.float64]"
+    max_speeds: "NDArray[np.float64]"
+    accelerations: "NDArray[np.float64]"
+
+
+class _Profile(NamedTuple):
+    """The block distances and junction speeds of every padded move."""
+
+    first_distances: "NDArray[np.float64]"
+    coast_distances: "NDArray[np.float64]"
+    final_distances: "NDArray[np.float64]"
+    initial_speeds: "NDArray[np.float64]"
+    final_speeds: "NDArray[np.float64]"
+
+
+def _axis_arrays(
+    axes: List[AxisKey], constraints: SystemConstraints[AxisKey]
+) -> _AxisArrays:
+    return _AxisArrays(
+        max_acceleration=np.array(
+            [constraints[axis].max_acceleration for axis in axes], dtype=np.float64
+        ),
+        max_speed_discont=np.array(
+            [constraints[axis].max_speed_discont for axis in axes], dtype=np.float64
+        ),
+        max_direction_change_speed_discont=np.array(
+            [constraints[axis].max_direction_change_speed_discont for axis in axes],
+            dtype=np.float64,
+        ),
+    )
+
+
+def _block_accelerations(
+    unit_vectors: "NDArray[np.float64]", max_acceleration: "NDArray[np.float64]"
+) -> "NDArray[np.float64]":
+    """Get the acceleration magnitude ``build_blocks`` would use for each move."""
+    max_acc = np.where(unit_vectors != 0, max_acceleration, 0.0)
+    acc_v = np.linalg.norm(max_acc, axis=1)[:, np.newaxis] * unit_vectors
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(unit_vectors.shape[1]):
+            over = np.abs(acc_v[:, i]) > max_acc[:, i]
+            acc_v *= np.where(over, max_acc[:, i] / acc_v[:, i], 1.0)[:, np.newaxis]
+    return np.linalg.norm(acc_v, axis=1)  # type: ignore[no-any-return]
+
+
+def _coordinates(
+    axes: List[AxisKey], values: "NDArray[np.float64]"
+) -> Coordinates[AxisKey, np.float64]:
+    return dict(zip(axes, values))
+
+
+def _targets_to_move_arrays(
+    origin: Coordinates[AxisKey, CoordinateValue],
+    targets: List[MoveTarget[AxisKey]],
+    constraints: SystemConstraints[AxisKey],
+) -> Tuple[List[AxisKey], _AxisArrays, _MoveArrays]:
+    """Do what ``move_utils.targets_to_moves`` does, for every target at once."""
+    all_axes: Set[AxisKey] = set()
+    for target in targets:
+        all_axes.update(set(target.position.keys()))
+    axes = list(all_axes)
+    axis_arrays = _axis_arrays(axes, constraints)
+
+    positions = np.array(
+        [[origin.get(axis, 0) for axis in axes]]
+        + [[target.position.get(axis, 0) for axis in axes] for target in targets],
+        dtype=np.float64,
+    )
+    displacements = np.diff(positions, axis=0)
+    displacements[np.abs(displacements) < MINIMUM_DISPLACEMENT] = 0
+    distances = np.linalg.norm(displacements, axis=1)
+    zero_length = (distances == 0) | np.all(positions[:-1] == positions[1:], axis=1)
+    if np.any(zero_length):
+        index = int(np.argmax(zero_length))
+        raise ZeroLengthMoveError(
+            _coordinates(axes, positions[index]),
+            _coordinates(axes, positions[index + 1]),
+        )
+    unit_vectors = displacements / distances[:, np.newaxis]
+    target_speeds = np.array([target.max_speed for target in targets])
+
+    too_small = (unit_vectors != 0) & (np.abs(unit_vectors) < MINIMUM_VECTOR_COMPONENT)
+    if np.any(too_small):
+        split_vectors: List["NDArray[np.float64]"] = []
+        split_distances: List[np.float64] = []
+        split_speeds: List[np.float64] = []
+        for unit_vector, distance, speed, split in zip(
+            unit_vectors, distances, target_speeds, np.any(too_small, axis=1)
+        ):
+            if not split:
+                split_vectors.append(unit_vector)
+                split_distances.append(distance)
+                split_speeds.append(speed)
+                continue
+            for vector, vector_distance in de_diagonalize_unit_vector(
+                _coordinates(axes, unit_vector), distance, MINIMUM_VECTOR_COMPONENT
+            ):
+                split_vectors.append(vectorize(vector))
+                split_distances.append(vector_distance)
+                split_speeds.append(speed)
+        unit_vectors = np.array(split_vectors)
+        distances = np.array(split_distances)
+        target_speeds = np.array(split_speeds)
+
+    # see limit_max_speed
+    axis_max_speeds = np.array([constraints[axis].max_speed for axis in axes])
+    requested_speeds = np.abs(unit_vectors * target_speeds[:, np.newaxis])
+    with np.errstate(divide="ignore"):
+        ratios = np.where(
+            requested_speeds != 0, axis_max_speeds / requested_speeds, np.inf
+        )
+    max_speeds = target_speeds * np.minimum(1.0, np.min(ratios, axis=1))
+
+    stopped = np.zeros((1, len(axes)))
+    stopped[0, 0] = 1.0
+    padded_unit_vectors = np.concatenate((stopped, unit_vectors, stopped))
+    zero = np.zeros(1)
+    return (
+        axes,
+        axis_arrays,
+        _MoveArrays(
+            unit_vectors=padded_unit_vectors,
+            distances=np.concatenate((zero, distances, zero)),
+            max_speeds=np.concatenate((zero, max_speeds, zero)),
+            accelerations=_block_accelerations(
+                padded_unit_vectors, axis_arrays.max_acceleration
+            ),
+        ),
+    )
+
+
+def _limit_junction_speeds(
+    moves: _MoveArrays,
+    axis_arrays: _AxisArrays,
+    speeds: "NDArray[np.float64]",
+    neighbor_components: "NDArray[np.float64]",
+    neighbor_speeds: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    """Limit the speeds of the inner moves at their junctions with their neighbors.
+
+    This is ``find_initial_speed`` and ``find_final_speed`` for every inner move:
+    the two are the same but for which neighbor they look at.
+    """
+    components = moves.unit_vectors[1:-1]
+    for i in range(components.shape[1]):
+        component = components[:, i]
+        neighbor_component = neighbor_components[:, i]
+        moving = np.abs(component * speeds) >= FLOAT_THRESHOLD
+        safe_component = np.abs(np.where(component == 0, 1.0, component))
+        stopping = (neighbor_component == 0) | (neighbor_speeds == 0)
+        same_direction = neighbor_component * component > 0
+        limit = np.where(
+            stopping,
+            axis_arrays.max_speed_discont[i],
+            np.where(
+                same_direction,
+                np.maximum(
+                    np.abs(neighbor_speeds * neighbor_component),
+                    axis_arrays.max_speed_discont[i],
+                ),
+                axis_arrays.max_direction_change_speed_discont[i],
+            ),
+        )
+        speeds = np.where(moving, np.minimum(limit / safe_component, speeds), speeds)
+    return speeds
+
+
+def _limit_achievable_final_speeds(
+    moves: _MoveArrays,
+    axis_arrays: _AxisArrays,
+    initial_speeds: "NDArray[np.float64]",
+    final_speeds: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    """Run ``achievable_final`` for every inner move."""
+    components = moves.unit_vectors[1:-1]
+    distances = moves.distances[1:-1]
+    for i in range(components.shape[1]):
+        component = components[:, i]
+        moving = component != 0
+        safe_component = np.where(moving, component, 1.0)
+        max_final_sq = (
+            initial_speeds * safe_component
+        ) ** 2 + 2 * axis_arrays.max_acceleration[i] * distances
+        max_final = (
+            np.copysign(
+                np.sqrt(max_final_sq) / safe_component, final_speeds - initial_speeds
+            )
+            + initial_speeds
+        )
+        constrained = np.copysign(
+            np.minimum(np.abs(max_final), np.abs(final_speeds)), final_speeds
+        )
+        final_speeds = np.where(moving, constrained, final_speeds)
+    return final_speeds
+
+
+def _block_final_speed(
+    initial_speed: "NDArray[np.float64]",
+    acceleration: "NDArray[np.float64]",
+    distance: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    """Get ``Block.final_speed`` for arrays of blocks."""
+    speed_squared = initial_speed**2 + acceleration * distance * 2
+    return np.sqrt(np.maximum(speed_squared, 0.0))  # type: ignore[no-any-return]
+
+
+def _build_profile(
+    moves: _MoveArrays,
+    initial_speeds: "NDArray[np.float64]",
+    final_speeds: "NDArray[np.float64]",
+) -> _Profile:
+    """Run ``build_blocks`` for every inner move.
+
+    The junction speeds returned are those of the resulting moves, which is what
+    ``Move.initial_speed`` and ``Move.final_speed`` would report.
+    """
+    distances = moves.distances[1:-1]
+    acceleration = moves.accelerations[1:-1]
+    initial_speed_sq = initial_speeds**2
+    final_speed_sq = final_speeds**2
+
+    max_achievable_speed = np.sqrt(
+        0.5 * (2 * acceleration * distances + initial_speed_sq + final_speed_sq)
+    )
+    max_speed_sq = np.minimum(max_achievable_speed, moves.max_speeds[1:-1]) ** 2
+    first_distances = np.abs(max_speed_sq - initial_speed_sq) / (2 * acceleration)
+    final_distances = np.abs(max_speed_sq - final_speed_sq) / (2 * acceleration)
+
+    # see build_blocks: fall back to the larger of the junction speeds when
+    # the acceleration and deceleration phases do not fit in the move
+    overshoot = first_distances + final_distances > (distances + FLOAT_THRESHOLD)
+    max_speed_sq = np.where(
+        overshoot, np.maximum(initial_speed_sq, final_speed_sq), max_speed_sq
+    )
+    first_distances = np.abs(max_speed_sq - initial_speed_sq) / (2 * acceleration)
+    final_distances = np.abs(max_speed_sq - final_speed_sq) / (2 * acceleration)
+
+    coast = first_distances + final_distances < (distances - FLOAT_THRESHOLD)
+    coast_distances = np.where(
+        coast, distances - first_distances - final_distances, 0.0
+    )
+
+    top_speeds = _block_final_speed(initial_speeds, acceleration, first_distances)
+    end_speeds = _block_final_speed(top_speeds, -acceleration, final_distances)
+    zero = np.zeros(1)
+    return _Profile(
+        first_distances=first_distances,
+        coast_distances=coast_distances,
+        final_distances=final_distances,
+        initial_speeds=np.concatenate(
+            (
+                zero,
+                np.where(
+                    first_distances != 0,
+                    initial_speeds,
+                    np.where(
+                        (coast_distances != 0) | (final_distances != 0),
+                        top_speeds,
+                        0.0,
+                    ),
+                ),
+                zero,
+            )
+        ),
+        final_speeds=np.concatenate(
+            (
+                zero,
+                np.where(
+                    final_distances != 0,
+                    end_speeds,
+                    np.where(
+                        (coast_distances != 0) | (first_distances != 0),
+                        top_speeds,
+                        0.0,
+                    ),
+                ),
+                zero,
+            )
+        ),
+    )
+
+
+def _less_or_close(
+    constraint: "NDArray[np.float64]", value: "NDArray[np.float64]"
+) -> "NDArray[np.bool_]":
+    """Run ``check_less_or_close`` on arrays."""
+    return (np.abs(value) <= constraint) | np.isclose(value, constraint)
+
+
+def _all_blended(
+    moves: _MoveArrays, axis_arrays: _AxisArrays, profile: _Profile
+) -> bool:
+    """Run ``all_blended`` on the inner moves."""
+    if len(moves.distances) <= 3:
+        return True
+    distances = moves.distances[1:-1]
+    distance_sums = (
+        profile.first_distances + profile.coast_distances + profile.final_distances
+    )
+    if np.any(np.abs(distance_sums - distances) > FLOAT_THRESHOLD) or not np.all(
+        np.isclose(distance_sums, distances)
+    ):
+        log.debug("Block distances do not match move distances")
+        return False
+
+    first_components = moves.unit_vectors[1:-2]
+    second_components = moves.unit_vectors[2:-1]
+    final_speeds = profile.final_speeds[1:-2, np.newaxis] * first_components
+    initial_speeds = profile.initial_speeds[2:-1, np.newaxis] * second_components
+    same_direction_limit = axis_arrays.max_speed_discont
+    direction_change_limit = axis_arrays.max_direction_change_speed_discont
+    blended = np.where(
+        first_components * second_components > 0,
+        (np.abs(initial_speeds - final_speeds) < FLOAT_THRESHOLD)
+        | _less_or_close(same_direction_limit, final_speeds)
+        | _less_or_close(same_direction_limit, initial_speeds),
+        _less_or_close(direction_change_limit, final_speeds)
+        | _less_or_close(direction_change_limit, initial_speeds),
+    )
+    return bool(np.all(blended))
+
+
+def _build_moves(
+    axes: List[AxisKey],
+    moves: _MoveArrays,
+    initial_speeds: "NDArray[np.float64]",
+    profile: _Profile,
+) -> List[Move[AxisKey]]:
+    """Build the blocks of every inner move like ``build_blocks`` does."""
+    blended = []
+    for (
+        unit_vector,
+        distance,
+        max_speed,
+        acceleration,
+        initial_speed,
+        *distances,
+    ) in zip(
+        moves.unit_vectors[1:-1],
+        moves.distances[1:-1],
+        moves.max_speeds[1:-1],
+        moves.accelerations[1:-1],
+        initial_speeds,
+        profile.first_distances,
+        profile.coast_distances,
+        profile.final_distances,
+    ):
+        first_distance, coast_distance, final_distance = distances
+        first = Block(
+            distance=first_distance,
+            initial_speed=initial_speed,
+            acceleration=acceleration,
+        )
+        final = Block(
+            distance=final_distance,
+            initial_speed=first.final_speed,
+            acceleration=-acceleration,
+        )
+        if coast_distance:
+            coast = Block(
+                distance=coast_distance,
+                initial_speed=final.initial_speed,
+                acceleration=np.float64(0),
+            )
+        else:
+            coast = Block(np.float64(0), np.float64(0), np.float64(0))
+        blended.append(
+            Move(
+                unit_vector=_coordinates(axes, unit_vector),
+                distance=distance,
+                max_speed=max_speed,
+                blocks=(first, coast, final),
+            )
+        )
+    return blended
+
+
+def plan_moves(
+    origin: Coordinates[AxisKey, CoordinateValue],
+    targets: List[MoveTarget[AxisKey]],
+    constraints: SystemConstraints[AxisKey],
+    iteration_limit: int,
+) -> Tuple[bool, List[Move[AxisKey]], int]:
+    """Create and blend the moves that go through a list of targets.
+
+    Args:
+        origin: Where the path starts.
+        targets: The targets to move through.
+        constraints: The system constraints.
+        iteration_limit: The maximum number of blending passes.
+
+    Returns:
+        Whether the moves converged, the blended moves, and how many passes
+        it took.
+    """
+    assert targets, "Check target list"
+    assert iteration_limit > 0, "At least one blending pass is needed"
+    axes, axis_arrays, arrays = _targets_to_move_arrays(origin, targets, constraints)
+    prev_components = np.where(
+        (arrays.distances[:-2] > FLOAT_THRESHOLD)[:, np.newaxis],
+        arrays.unit_vectors[:-2],
+        0.0,
+    )
+    next_components = np.where(
+        (arrays.distances[2:] > FLOAT_THRESHOLD)[:, np.newaxis],
+        arrays.unit_vectors[2:],
+        0.0,
+    )
+    zero = np.zeros(1)
+
+    # like the moves from targets_to_moves, start at max speed throughout
+    initial_speeds = arrays.max_speeds.copy()
+    final_speeds = arrays.max_speeds.copy()
+    converged = False
+    for passes in range(1, iteration_limit + 1):
+        inner_initial = _limit_junction_speeds(
+            arrays,
+            axis_arrays,
+            initial_speeds[1:-1],
+            prev_components,
+            final_speeds[:-2],
+        )
+        inner_final = _limit_junction_speeds(
+            arrays,
+            axis_arrays,
+            final_speeds[1:-1],
+            next_components,
+            np.concatenate((inner_initial[1:], zero)),
+        )
+        inner_final = _limit_achievable_final_speeds(
+            arrays, axis_arrays, inner_initial, inner_final
+        )
+        profile = _build_profile(arrays, inner_initial, inner_final)
+        initial_speeds = profile.initial_speeds
+        final_speeds = profile.final_speeds
+        if _all_blended(arrays, axis_arrays, profile):
+            converged = True
+            break
+
+    log.debug(f"blended {len(arrays.distances) - 2} moves in {passes} pass(es)")
+    return converged, _build_moves(axes, arrays, inner_initial, profile), passes
@@ -0,0 +1,166 @@
+"""Measure how many frames per second the CanMessenger read loop can decode.
+
+This runs entirely in process against an in-memory driver, so it measures
+the host side decode and dispatch cost and nothing else.
+"""
+import argparse
+import asyncio
+import struct
+import time
+from dataclasses import fields
+from typing import List, Type
+
+from opentrons_hardware.drivers.can_bus.abstract_driver import AbstractCanDriver
+from opentrons_hardware.drivers.can_bus.can_messenger import CanMessenger
+from opentrons_hardware.firmware_bindings import ArbitrationId, ArbitrationIdParts
+from opentrons_hardware.firmware_bindings.constants import (
+    FunctionCode,
+    MessageId,
+    NodeId,
+    SensorId,
+    SensorType,
+)
+from opentrons_hardware.firmware_bindings.message import CanMessage
+from opentrons_hardware.firmware_bindings.messages import (
+    MessageDefinition,
+    payloads,
+)
+from opentrons_hardware.firmware_bindings.messages.fields import (
+    SensorIdField,
+    SensorTypeField,
+)
+from opentrons_hardware.firmware_bindings.utils import (
+    BinarySerializable,
+    Int32Field,
+    UInt32Field,
+)
+
+
+class _ReplayDriver(AbstractCanDriver):
+    """A driver that replays a fixed list of frames and then stops."""
+
+    def __init__(self, frames: List[CanMessage]) -> None:
+        self._frames = iter(frames)
+
+    async def send(self, message: CanMessage) -> None:
+        """Discard sent messages."""
+        pass
+
+    async def read(self) -> CanMessage:
+        """Return the next recorded frame."""
+        try:
+            return next(self._frames)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def shutdown(self) -> None:
+        """Nothing to shut down."""
+        pass
+
+
+def _sensor_frames(count: int) -> List[CanMessage]:
+    """Build pressure sensor readings like the ones streamed during LLD."""
+    arbitration_id = ArbitrationId(
+        parts=ArbitrationIdParts(
+            message_id=MessageId.read_sensor_response,
+            node_id=NodeId.host,
+            function_code=FunctionCode.network_management,
+            originating_node_id=NodeId.pipette_left,
+        )
+    )
+    frames = []
+    for i in range(count):
+        payload = payloads.ReadFromSensorResponsePayload(
+            sensor=SensorTypeField(SensorType.pressure),
+            sensor_id=SensorIdField(SensorId.S0),
+            sensor_data=Int32Field(i),
+        )
+        payload.message_index = UInt32Field(i)
+        frames.append(
+            CanMessage(arbitration_id=arbitration_id, data=payload.serialize())
+        )
+    return frames
+
+
+def _legacy_build(cls: Type[BinarySerializable], data: bytes) -> BinarySerializable:
+    """Decode a payload the way it was done before layouts were precompiled."""
+    dataclass_fields = fields(cls)
+    format_string = f"{cls.ENDIAN}{''.join(v.type.FORMAT for v in dataclass_fields)}"
+    size = struct.calcsize(format_string)
+    b = struct.unpack(format_string, data[:size])
+    args = {
+        v.name: v.type.build(b[i])
+        for i, v in enumerate(fields(cls))
+        if not (v.name == "message_index")
+    }
+    message_index = next(
+        (
+            v.type.build(b[i])
+            for i, v in enumerate(fields(cls))
+            if v.name == "message_index"
+        ),
+        None,
+    )
+    ret_instance = cls(**args)
+    if message_index is not None:
+        ret_instance.message_index = message_index  # type: ignore[attr-defined]
+    return ret_instance
+
+
+def _report(name: str, count: int, elapsed: float) -> None:
+    print(
+        f"{name:<24} {count:>8} frames in {elapsed:8.3f}s "
+        f"-> {count / elapsed:12.0f} frames/s"
+    )
+
+
+async def _run_read_loop(frames: List[CanMessage]) -> float:
+    messenger = CanMessenger(_ReplayDriver(frames))
+    received = 0
+
+    def _listener(message: MessageDefinition, arbitration_id: ArbitrationId) -> None:
+        nonlocal received
+        received += 1
+
+    messenger.add_listener(_listener)
+    start = time.perf_counter()
+    try:
+        await messenger._read_task()
+    except StopAsyncIteration:
+        pass
+    elapsed = time.perf_counter() - start
+    assert received == len(frames), f"only {received} of {len(frames)} dispatched"
+    return elapsed
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="CAN frame decode benchmark.")
+    parser.add_argument(
+        "--frames",
+        "-n",
+        type=int,
+        required=False,
+        default=100000,
+        help="the number of frames to decode",
+    )
+    args = parser.parse_args()
+
+    frames = _sensor_frames(args.frames)
+    payload_type = payloads.ReadFromSensorResponsePayload
+
+    start = time.perf_counter()
+    for frame in frames:
+        _legacy_build(payload_type, frame.data)
+    _report("legacy payload build", len(frames), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for frame in frames:
+        payload_type.build(frame.data)
+    _report("payload build", len(frames), time.perf_counter() - start)
+
+    _report("messenger read loop", len(frames), asyncio.run(_run_read_loop(frames)))
+
+
+if __name__ == "__main__":
+    main()
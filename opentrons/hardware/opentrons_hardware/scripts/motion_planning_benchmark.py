@@ -0,0 +1,151 @@
+"""Compare motion planning latency of the iterative and vectorized planners.
+
+Arc paths go between random deck positions: up to a safe height, over to the
+next position, and back down, with a short hop in between like the ones made
+when touching tips. Staircase paths are many short moves in roughly the same
+direction with very different speeds, which take several passes to blend.
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from opentrons_hardware.hardware_control.motion_planning import (
+    AxisConstraints,
+    Move,
+    MoveManager,
+    MoveTarget,
+    SystemConstraints,
+    vectorized,
+)
+
+CONSTRAINTS: SystemConstraints[str] = {
+    "X": AxisConstraints.build(1000, 10, 5, 500),
+    "Y": AxisConstraints.build(1000, 10, 5, 500),
+    "Z": AxisConstraints.build(150, 5, 2.5, 65),
+    "A": AxisConstraints.build(150, 5, 2.5, 65),
+}
+
+
+def _arc_path(
+    target_count: int, seed: int
+) -> Tuple[Dict[str, float], List[MoveTarget[str]]]:
+    rng = np.random.default_rng(seed)
+    origin = {"X": 10.0, "Y": 10.0, "Z": 150.0, "A": 200.0}
+    targets: List[MoveTarget[str]] = []
+    position = dict(origin)
+    while len(targets) < target_count:
+        kind = len(targets) % 4
+        if kind == 0:
+            position["Z"] = 200.0
+        elif kind == 1:
+            position["X"] = float(rng.uniform(10, 450))
+            position["Y"] = float(rng.uniform(10, 400))
+        elif kind == 2:
+            position["Z"] = float(rng.uniform(20, 120))
+        else:
+            position["X"] += float(rng.uniform(1, 5))
+            position["Z"] += float(rng.uniform(1, 5))
+        targets.append(MoveTarget.build(dict(position), float(rng.uniform(50, 400))))
+    return origin, targets
+
+
+def _staircase_path(
+    target_count: int, seed: int
+) -> Tuple[Dict[str, float], List[MoveTarget[str]]]:
+    rng = np.random.default_rng(seed)
+    origin = {"X": 0.0, "Y": 0.0, "Z": 100.0, "A": 100.0}
+    targets: List[MoveTarget[str]] = []
+    position = dict(origin)
+    while len(targets) < target_count:
+        position["X"] += float(rng.uniform(0.5, 20))
+        position["Y"] += float(rng.uniform(0.5, 20))
+        if rng.random() < 0.3:
+            position["Z"] = float(rng.uniform(50, 150))
+        targets.append(MoveTarget.build(dict(position), float(rng.uniform(20, 400))))
+    return origin, targets
+
+
+PATHS = {"arc": _arc_path, "staircase": _staircase_path}
+
+
+def _time(func: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Motion planning benchmark.")
+    parser.add_argument(
+        "--targets",
+        "-t",
+        type=int,
+        nargs="+",
+        default=[2, 5, 10, 20, 50, 100, 200],
+        help="the path lengths, in targets, to plan",
+    )
+    parser.add_argument(
+        "--path",
+        "-p",
+        choices=list(PATHS),
+        required=False,
+        default="arc",
+        help="arcs between random deck positions, or many short same-direction "
+        "moves whose speeds have to be blended over several passes",
+    )
+    parser.add_argument(
+        "--repeats",
+        "-r",
+        type=int,
+        required=False,
+        default=5,
+        help="how many times to plan each path",
+    )
+    parser.add_argument(
+        "--iteration-limit",
+        "-i",
+        type=int,
+        required=False,
+        default=10,
+        help="the maximum number of blending passes",
+    )
+    args = parser.parse_args()
+
+    iterative_manager = MoveManager(constraints=CONSTRAINTS)
+    vectorized_manager = MoveManager(constraints=CONSTRAINTS, vectorized=True)
+    print(
+        f"{'targets':>7} | {'iterative':>22} | {'vectorized':>22} | speedup\n"
+        f"{'':>7} | {'ms':>8} {'passes':>6} {'ok':>6} | "
+        f"{'ms':>8} {'passes':>6} {'ok':>6} |"
+    )
+    for target_count in args.targets:
+        origin, targets = PATHS[args.path](target_count, seed=target_count)
+
+        def _plan_iterative() -> Tuple[bool, List[List[Move[str]]]]:
+            return iterative_manager.plan_motion(origin, targets, args.iteration_limit)
+
+        def _plan_vectorized() -> Tuple[bool, List[List[Move[str]]]]:
+            return vectorized_manager.plan_motion(origin, targets, args.iteration_limit)
+
+        slow = _time(_plan_iterative, args.repeats)
+        slow_ok, blend_log = _plan_iterative()
+        fast = _time(_plan_vectorized, args.repeats)
+        fast_ok, _, fast_passes = vectorized.plan_moves(
+            origin, targets, CONSTRAINTS, args.iteration_limit
+        )
+        print(
+            f"{target_count:>7} | "
+            f"{slow * 1000:8.2f} {len(blend_log):>6} {str(slow_ok):>6} | "
+            f"{fast * 1000:8.2f} {fast_passes:>6} {str(fast_ok):>6} | "
+            f"{slow / fast:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
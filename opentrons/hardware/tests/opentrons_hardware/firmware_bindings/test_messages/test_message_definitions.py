@@ -3,7 +3,10 @@ import pytest
 from typing_extensions import get_args
 from dataclasses import fields
 
-from opentrons_hardware.firmware_bindings.messages.messages import MessageDefinition
+from opentrons_hardware.firmware_bindings.messages.messages import (
+    MessageDefinition,
+    get_definition,
+)
 
 
 @pytest.mark.parametrize("message_definition", get_args(MessageDefinition))
@@ -23,3 +26,20 @@ def test_payload_types(message_definition: MessageDefinition) -> None:
     assert payload_type_type is not None
     assert payload_type is not None
     assert payload_type == payload_type_type
+
+
+@pytest.mark.parametrize("message_definition", get_args(MessageDefinition))
+def test_get_definition(message_definition: MessageDefinition) -> None:
+    """It should find the definition by enum member or by raw integer id."""
+    first_with_id = next(
+        d
+        for d in get_args(MessageDefinition)
+        if d.message_id == message_definition.message_id
+    )
+    assert get_definition(message_definition.message_id) is first_with_id
+    assert get_definition(int(message_definition.message_id)) is first_with_id
+
+
+def test_get_definition_unknown() -> None:
+    """It should return None for ids that have no definition."""
+    assert get_definition(0x7FE) is None
@@ -3,6 +3,7 @@ import pytest
 
 from opentrons_hardware.firmware_bindings.messages import payloads, fields
 from opentrons_hardware.firmware_bindings import utils
+from opentrons_hardware.firmware_bindings.constants import SensorId, SensorType
 
 
 @pytest.mark.parametrize(
@@ -98,3 +99,32 @@ def test_new_get_device_info() -> None:
     assert reparsed_new.revision.secondary == new.revision.secondary
     assert reparsed_new.revision.tertiary == new.revision.tertiary
     assert reparsed_new.subidentifier == new.subidentifier
+
+
+def test_build_round_trip() -> None:
+    """A payload built from its serialized form should match the original."""
+    original = payloads.ReadFromSensorResponsePayload(
+        sensor=fields.SensorTypeField(SensorType.pressure),
+        sensor_id=fields.SensorIdField(SensorId.S1),
+        sensor_data=utils.Int32Field(-1234),
+    )
+    original.message_index = utils.UInt32Field(42)
+    data = original.serialize()
+    assert len(data) == payloads.ReadFromSensorResponsePayload.get_size()
+
+    # Extra padding bytes, like CANFD adds, are ignored.
+    reparsed = payloads.ReadFromSensorResponsePayload.build(data + b"\x00" * 4)
+    assert reparsed == original
+    assert reparsed.message_index == utils.UInt32Field(42)  # type: ignore[attr-defined]
+
+
+def test_build_short_data() -> None:
+    """Too few bytes for the layout should raise an InvalidFieldException."""
+    with pytest.raises(utils.InvalidFieldException):
+        payloads.ReadFromSensorResponsePayload.build(b"\x00\x01")
+
+
+def test_precompile() -> None:
+    """Only payloads with a fixed layout should precompile."""
+    assert payloads.ReadFromSensorResponsePayload.precompile()
+    assert not payloads.GetMotorUsageResponsePayload.precompile()
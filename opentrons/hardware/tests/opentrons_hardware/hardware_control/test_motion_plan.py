@@ -1,17 +1,23 @@
 """Tests for motion planning."""
 import numpy as np
+import pytest
 from hypothesis import given, assume, strategies as st
 from hypothesis.extra import numpy as hynp
 from typing import Iterator, List, Tuple
 
-from opentrons_hardware.hardware_control.motion_planning import move_manager
+from opentrons_hardware.hardware_control.motion_planning import (
+    move_manager,
+    move_utils,
+)
 from opentrons_hardware.hardware_control.motion_planning.types import (
     AxisConstraints,
     Coordinates,
     MoveTarget,
     SystemConstraints,
+    ZeroLengthMoveError,
     vectorize,
 )
+from opentrons_hardware.hardware_control.motion_planning.vectorized import plan_moves
 
 SIXAXES = ["X", "Y", "Z", "A", "B", "C"]
 
@@ -210,3 +216,104 @@ def test_close_move_plan(
     )
 
     assert converged, f"Failed to converge: {blend_log}"
+
+
+@given(
+    x_constraint=generate_axis_constraint(),
+    y_constraint=generate_axis_constraint(),
+    z_constraint=generate_axis_constraint(),
+    a_constraint=generate_axis_constraint(),
+    b_constraint=generate_axis_constraint(),
+    c_constraint=generate_axis_constraint(),
+    path=st.one_of(generate_far_path(), generate_close_path()),
+)
+def test_vectorized_move_plan(
+    x_constraint: AxisConstraints,
+    y_constraint: AxisConstraints,
+    z_constraint: AxisConstraints,
+    a_constraint: AxisConstraints,
+    b_constraint: AxisConstraints,
+    c_constraint: AxisConstraints,
+    path: Tuple[Coordinates[str, np.float64], List[MoveTarget[str]]],
+) -> None:
+    """Test the vectorized motion plan matches the iterative one."""
+    origin, targets = path
+    constraints: SystemConstraints[str] = {
+        "X": x_constraint,
+        "Y": y_constraint,
+        "Z": z_constraint,
+        "A": a_constraint,
+        "B": b_constraint,
+        "C": c_constraint,
+    }
+    iterative = move_manager.MoveManager(constraints=constraints)
+    vectorized = move_manager.MoveManager(constraints=constraints, vectorized=True)
+    _, iterative_log = iterative.plan_motion(
+        origin=origin, target_list=targets, iteration_limit=20
+    )
+    converged, blend_log = vectorized.plan_motion(
+        origin=origin, target_list=targets, iteration_limit=20
+    )
+
+    assert converged, f"Failed to converge: {blend_log}"
+    assert len(blend_log) == 1
+    assert move_utils.all_blended(constraints, blend_log[0])
+    assert len(blend_log[0]) == len(iterative_log[0])
+    for move, iterative_move in zip(blend_log[0], iterative_log[0]):
+        assert list(move.unit_vector) == list(iterative_move.unit_vector)
+        assert np.allclose(
+            vectorize(move.unit_vector), vectorize(iterative_move.unit_vector)
+        )
+        assert np.isclose(move.distance, iterative_move.distance)
+        assert np.isclose(move.max_speed, iterative_move.max_speed)
+
+
+def test_vectorized_move_plan_converges_in_fewer_passes() -> None:
+    """Slowdowns should propagate back along the path faster when vectorized."""
+    constraints: SystemConstraints[str] = {
+        axis: AxisConstraints.build(
+            max_acceleration=1000,
+            max_speed_discont=10,
+            max_direction_change_speed_discont=5,
+            max_speed=500,
+        )
+        for axis in ("X", "Y")
+    }
+    # many short moves in about the same direction at very different speeds
+    rng = np.random.default_rng(1)
+    origin = {"X": np.float64(0), "Y": np.float64(0)}
+    position = np.zeros(2)
+    targets = []
+    for _ in range(8):
+        position += rng.uniform(0.5, 20, 2)
+        targets.append(
+            MoveTarget.build(dict(zip(("X", "Y"), position)), rng.uniform(20, 400))
+        )
+    iterative = move_manager.MoveManager(constraints=constraints)
+    vectorized = move_manager.MoveManager(constraints=constraints, vectorized=True)
+
+    iterative_converged, iterative_log = iterative.plan_motion(
+        origin, targets, iteration_limit=20
+    )
+    converged, blend_log = vectorized.plan_motion(origin, targets, iteration_limit=20)
+
+    assert iterative_converged and converged
+    assert move_utils.all_blended(constraints, blend_log[0])
+    _, _, passes = plan_moves(origin, targets, constraints, 20)
+    assert passes < len(iterative_log)
+
+
+def test_vectorized_move_plan_zero_length() -> None:
+    """A zero length move should raise the same error as the iterative plan."""
+    constraints: SystemConstraints[str] = {
+        "X": AxisConstraints.build(1000, 10, 5, 500),
+    }
+    manager = move_manager.MoveManager(constraints=constraints, vectorized=True)
+    with pytest.raises(ZeroLengthMoveError):
+        manager.plan_motion(
+            origin={"X": 0},
+            target_list=[
+                MoveTarget.build({"X": 10}, 100),
+                MoveTarget.build({"X": 10.01}, 100),
+            ],
+        )
@@ -2,5 +2,11 @@
 
 from .robot_context_tracker import RobotContextTracker
 from .types import RobotContextState, SupportsTracking
+from .data_shapes import ContextStateSummary
 
-__all__ = ["RobotContextTracker", "RobotContextState", "SupportsTracking"]
+__all__ = [
+    "RobotContextTracker",
+    "RobotContextState",
+    "SupportsTracking",
+    "ContextStateSummary",
+]
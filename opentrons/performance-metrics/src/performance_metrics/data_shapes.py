@@ -45,6 +45,25 @@ class RawContextData(SupportsCSVStorage):
         )
 
 
+@dataclasses.dataclass(frozen=True)
+class ContextStateSummary:
+    """Summary statistics of the durations tracked for one robot context state.
+
+    Attributes:
+    - count (int): The number of durations tracked.
+    - mean (float): The mean duration, in nanoseconds.
+    - p50 (float): The estimated median duration, in nanoseconds.
+    - p95 (float): The estimated 95th percentile duration, in nanoseconds.
+    - p99 (float): The estimated 99th percentile duration, in nanoseconds.
+    """
+
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
 @dataclasses.dataclass(frozen=True)
 class MetricsMetadata:
     """Dataclass to store metadata about the metrics."""
@@ -55,12 +74,19 @@ class MetricsMetadata:
 
     @property
     def data_file_location(self) -> Path:
-        """The location of the data file."""
+        """The location of the data file, in the binary format of MetricsStore."""
+        return self.storage_dir / f"{self.name}.rcd"
+
+    @property
+    def legacy_data_file_location(self) -> Path:
+        """The location of the CSV data file written before the binary format.
+
+        It is left as it is, so that it doesn't end up with binary data after
+        its CSV rows.
+        """
         return self.storage_dir / self.name
 
     @property
     def headers_file_location(self) -> Path:
-        """The location of the header file."""
-        return self.data_file_location.with_stem(
-            self.data_file_location.stem + "_headers"
-        )
+        """The location of the header file of the legacy CSV data file."""
+        return self.storage_dir / f"{self.name}_headers"
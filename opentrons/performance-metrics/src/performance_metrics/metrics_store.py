@@ -1,37 +1,313 @@
-"""Interface for storing performance metrics data to a CSV file."""
+"""Interface for storing robot context data to a compact binary file.
 
-import csv
+Tracked data is kept in a fixed-size buffer of preallocated arrays and
+periodically appended to the data file as columnar blocks by a background
+thread. Per-state duration statistics are kept up to date as blocks are
+written, so they can be queried without reading the data file back.
+
+Each block in the data file is laid out as:
+
+- a header: the magic bytes ``RCD1`` and the number of records, as a
+  little-endian unsigned 32-bit integer
+- one unsigned byte per record: the index of its state in ``STATES``
+- one little-endian signed 64-bit integer per record: the function start time
+- one little-endian signed 64-bit integer per record: the duration
+"""
+
+import array
+import struct
+import sys
+import threading
 import typing
-from .data_shapes import MetricsMetadata
-from .types import SupportsCSVStorage
+from pathlib import Path
+
+from .data_shapes import ContextStateSummary, MetricsMetadata, RawContextData
+from .types import RobotContextState
+
+STATES: typing.Final[typing.Tuple[RobotContextState, ...]] = typing.get_args(
+    RobotContextState
+)
+"""Every state, in the order used to encode them. Only ever append to this."""
+
+_STATE_INDICES: typing.Final[typing.Dict[RobotContextState, int]] = {
+    state: index for index, state in enumerate(STATES)
+}
+
+_BLOCK_MAGIC: typing.Final = b"RCD1"
+_BLOCK_HEADER: typing.Final = struct.Struct("<4sI")
+
+DEFAULT_CAPACITY: typing.Final = 4096
+"""How many records are buffered in memory before they must be written."""
+
+DEFAULT_FLUSH_INTERVAL: typing.Final = 10.0
+"""How often, in seconds, the background thread writes buffered records."""
+
+
+class RawContextDataBuffer:
+    """A fixed-capacity buffer of RawContextData backed by preallocated arrays."""
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._states = array.array("B", bytes(capacity))
+        self._func_starts = array.array("q", bytes(8 * capacity))
+        self._durations = array.array("q", bytes(8 * capacity))
+        self._length = 0
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of records the buffer can hold."""
+        return self._capacity
+
+    def is_full(self) -> bool:
+        """Whether the buffer has no room left."""
+        return self._length == self._capacity
+
+    def append(self, context_data: RawContextData) -> None:
+        """Add a record to the end of the buffer.
+
+        The caller must make sure the buffer is not full.
+        """
+        index = self._length
+        self._states[index] = _STATE_INDICES[context_data.state]
+        self._func_starts[index] = context_data.func_start
+        self._durations[index] = context_data.duration
+        self._length = index + 1
+
+    def drain(
+        self,
+    ) -> typing.Tuple["array.array[int]", "array.array[int]", "array.array[int]"]:
+        """Remove every record from the buffer and return copies of its columns."""
+        length = self._length
+        self._length = 0
+        return (
+            self._states[:length],
+            self._func_starts[:length],
+            self._durations[:length],
+        )
+
+    def __len__(self) -> int:
+        """The number of records in the buffer."""
+        return self._length
+
+    def __getitem__(self, index: int) -> RawContextData:
+        """Get a buffered record."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("buffer index out of range")
+        return RawContextData(
+            state=STATES[self._states[index]],
+            func_start=self._func_starts[index],
+            duration=self._durations[index],
+        )
+
+    def __iter__(self) -> typing.Iterator[RawContextData]:
+        """Iterate over the buffered records, oldest first."""
+        return (self[index] for index in range(self._length))
+
 
-T = typing.TypeVar("T", bound=SupportsCSVStorage)
+class _DurationHistogram:
+    """Counts durations in log-linear buckets to estimate percentiles.
 
+    Durations below 128ns get a bucket each. Larger durations share a bucket
+    with others that have the same 7 most significant bits, which bounds the
+    error of an estimated percentile to under 1%.
+    """
 
-class MetricsStore(typing.Generic[T]):
-    """Dataclass to store data for tracking robot context."""
+    _EXACT_LIMIT = 128
+    _SUB_BUCKET_BITS = 6
 
-    def __init__(self, metadata: MetricsMetadata) -> None:
-        """Initialize the metrics store."""
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self._buckets: typing.Dict[int, int] = {}
+
+    @classmethod
+    def _bucket_for(cls, duration: int) -> int:
+        if duration < cls._EXACT_LIMIT:
+            return max(duration, 0)
+        shift = duration.bit_length() - cls._SUB_BUCKET_BITS - 1
+        return (shift << cls._SUB_BUCKET_BITS) + (duration >> shift)
+
+    @classmethod
+    def _midpoint_of(cls, bucket: int) -> float:
+        if bucket < cls._EXACT_LIMIT:
+            return float(bucket)
+        shift = (bucket >> cls._SUB_BUCKET_BITS) - 1
+        mantissa = bucket - (shift << cls._SUB_BUCKET_BITS)
+        return float((mantissa << shift) + (1 << shift) / 2)
+
+    def add(self, duration: int) -> None:
+        bucket = self._bucket_for(duration)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += duration
+
+    def percentiles(self, *fractions: float) -> typing.List[float]:
+        """Estimate the durations below which the given fractions of samples fall."""
+        results = []
+        buckets = sorted(self._buckets.items())
+        for fraction in fractions:
+            rank = max(1, round(fraction * self.count))
+            seen = 0
+            for bucket, bucket_count in buckets:
+                seen += bucket_count
+                if seen >= rank:
+                    results.append(self._midpoint_of(bucket))
+                    break
+        return results
+
+
+class MetricsStore:
+    """Buffers robot context data and writes it to the data file."""
+
+    def __init__(
+        self,
+        metadata: MetricsMetadata,
+        capacity: int = DEFAULT_CAPACITY,
+        flush_interval: typing.Optional[float] = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """Initialize the metrics store.
+
+        Args:
+            metadata: Where and how to store the data.
+            capacity: How many records to buffer in memory. When the buffer is
+                full, adding a record writes the buffer out first.
+            flush_interval: How often the background thread started by
+                `setup` writes buffered records, or None for no background
+                thread.
+        """
         self.metadata = metadata
-        self._data: typing.List[T] = []
+        self._data = RawContextDataBuffer(capacity)
+        self._flush_interval = flush_interval
+        self._histograms: typing.Dict[RobotContextState, _DurationHistogram] = {}
+        # Protects the buffer, which is appended to from tracked functions.
+        self._buffer_lock = threading.Lock()
+        # Serializes writes to the data file and updates to the histograms.
+        self._write_lock = threading.Lock()
+        self._stop_flushing = threading.Event()
+        self._flush_thread: typing.Optional[threading.Thread] = None
 
-    def add(self, context_data: T) -> None:
+    def add(self, context_data: RawContextData) -> None:
         """Add data to the store."""
-        self._data.append(context_data)
+        while True:
+            with self._buffer_lock:
+                if not self._data.is_full():
+                    self._data.append(context_data)
+                    return
+            self.store()
 
     def setup(self) -> None:
-        """Set up the data store."""
+        """Set up the data store and start writing data in the background."""
         self.metadata.storage_dir.mkdir(parents=True, exist_ok=True)
         self.metadata.data_file_location.touch(exist_ok=True)
-        self.metadata.headers_file_location.touch(exist_ok=True)
-        self.metadata.headers_file_location.write_text(",".join(self.metadata.headers))
+        if self._flush_interval is not None and self._flush_thread is None:
+            self._flush_thread = threading.Thread(
+                target=self._flush_periodically,
+                name=f"{self.metadata.name}-flush",
+                daemon=True,
+            )
+            self._flush_thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and write any buffered data."""
+        self._stop_flushing.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.store()
 
     def store(self) -> None:
-        """Clear the stored data and write it to the storage file."""
-        stored_data = self._data.copy()
-        self._data.clear()
-        rows_to_write = [context_data.csv_row() for context_data in stored_data]
-        with open(self.metadata.data_file_location, "a") as storage_file:
-            writer = csv.writer(storage_file)
-            writer.writerows(rows_to_write)
+        """Clear the buffered data and write it to the storage file."""
+        with self._write_lock:
+            with self._buffer_lock:
+                states, func_starts, durations = self._data.drain()
+            if len(states) == 0:
+                return
+            self._update_histograms(states, durations)
+            _write_block(
+                self.metadata.data_file_location, states, func_starts, durations
+            )
+
+    def summarize(self) -> typing.Dict[RobotContextState, ContextStateSummary]:
+        """Summarize the durations of everything stored so far, by state.
+
+        Buffered data is written out first so that it is included.
+        """
+        self.store()
+        with self._write_lock:
+            summaries = {}
+            for state, histogram in self._histograms.items():
+                p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99)
+                summaries[state] = ContextStateSummary(
+                    count=histogram.count,
+                    mean=histogram.total / histogram.count,
+                    p50=p50,
+                    p95=p95,
+                    p99=p99,
+                )
+            return summaries
+
+    def _update_histograms(
+        self, states: "array.array[int]", durations: "array.array[int]"
+    ) -> None:
+        for state_index, duration in zip(states, durations):
+            state = STATES[state_index]
+            histogram = self._histograms.get(state)
+            if histogram is None:
+                histogram = self._histograms[state] = _DurationHistogram()
+            histogram.add(duration)
+
+    def _flush_periodically(self) -> None:
+        assert self._flush_interval is not None
+        while not self._stop_flushing.wait(self._flush_interval):
+            self.store()
+
+
+def _to_little_endian(column: "array.array[int]") -> bytes:
+    if sys.byteorder == "big":
+        column = array.array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write_block(
+    path: Path,
+    states: "array.array[int]",
+    func_starts: "array.array[int]",
+    durations: "array.array[int]",
+) -> None:
+    with open(path, "ab") as storage_file:
+        storage_file.write(_BLOCK_HEADER.pack(_BLOCK_MAGIC, len(states)))
+        storage_file.write(states.tobytes())
+        storage_file.write(_to_little_endian(func_starts))
+        storage_file.write(_to_little_endian(durations))
+
+
+def _read_column(data: bytes, typecode: str) -> "array.array[int]":
+    column = array.array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def read_raw_context_data(path: Path) -> typing.Iterator[RawContextData]:
+    """Read back every record in a data file written by MetricsStore."""
+    data = path.read_bytes()
+    offset = 0
+    while offset < len(data):
+        magic, count = _BLOCK_HEADER.unpack_from(data, offset)
+        if magic != _BLOCK_MAGIC:
+            raise ValueError(f"{path} is not a robot context data file.")
+        offset += _BLOCK_HEADER.size
+        states = _read_column(data[offset : offset + count], "B")
+        offset += count
+        func_starts = _read_column(data[offset : offset + 8 * count], "q")
+        offset += 8 * count
+        durations = _read_column(data[offset : offset + 8 * count], "q")
+        offset += 8 * count
+        for state_index, func_start, duration in zip(states, func_starts, durations):
+            yield RawContextData(
+                state=STATES[state_index], func_start=func_start, duration=duration
+            )
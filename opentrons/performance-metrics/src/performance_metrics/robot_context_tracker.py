@@ -3,13 +3,14 @@
 import inspect
 from pathlib import Path
 import platform
+import weakref
 
 from functools import partial, wraps
 from time import perf_counter_ns
 import typing
 
 from .metrics_store import MetricsStore
-from .data_shapes import RawContextData, MetricsMetadata
+from .data_shapes import RawContextData, MetricsMetadata, ContextStateSummary
 from .types import SupportsTracking, RobotContextState
 
 _UnderlyingFunctionParameters = typing.ParamSpec("_UnderlyingFunctionParameters")
@@ -48,7 +49,7 @@ class RobotContextTracker(SupportsTracking):
 
     def __init__(self, storage_location: Path, should_track: bool) -> None:
         """Initializes the RobotContextTracker with an empty storage list."""
-        self._store = MetricsStore[RawContextData](
+        self._store = MetricsStore(
             MetricsMetadata(
                 name=self.METADATA_NAME,
                 storage_dir=storage_location,
@@ -59,6 +60,8 @@ class RobotContextTracker(SupportsTracking):
 
         if self._should_track:
             self._store.setup()
+            # Write out buffered data when the tracker goes away, or at exit.
+            self._finalizer = weakref.finalize(self, self._store.close)
 
     def track(
         self,
@@ -151,3 +154,15 @@ class RobotContextTracker(SupportsTracking):
         if not self._should_track:
             return
         self._store.store()
+
+    def close(self) -> None:
+        """Stops writing in the background and stores any buffered context data."""
+        if not self._should_track:
+            return
+        self._finalizer()
+
+    def summarize(self) -> typing.Dict[RobotContextState, ContextStateSummary]:
+        """Returns duration statistics for each tracked state."""
+        if not self._should_track:
+            return {}
+        return self._store.summarize()
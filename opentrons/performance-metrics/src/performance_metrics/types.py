@@ -3,6 +3,9 @@
 import typing
 from pathlib import Path
 
+if typing.TYPE_CHECKING:
+    from .data_shapes import ContextStateSummary
+
 _UnderlyingFunctionParameters = typing.ParamSpec("_UnderlyingFunctionParameters")
 _UnderlyingFunctionReturn = typing.TypeVar("_UnderlyingFunctionReturn")
 _UnderlyingFunction = typing.Callable[
@@ -39,6 +42,14 @@ class SupportsTracking(typing.Protocol):
         """Store the tracked data."""
         ...
 
+    def close(self) -> None:
+        """Store any buffered data and stop storing in the background."""
+        ...
+
+    def summarize(self) -> typing.Dict["RobotContextState", "ContextStateSummary"]:
+        """Get duration statistics for each tracked state."""
+        ...
+
 
 StorableData = typing.Union[int, float, str]
 
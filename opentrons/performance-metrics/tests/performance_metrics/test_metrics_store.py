@@ -4,7 +4,8 @@ from pathlib import Path
 from time import sleep
 
 from performance_metrics.robot_context_tracker import RobotContextTracker
-from performance_metrics.data_shapes import RawContextData
+from performance_metrics.data_shapes import MetricsMetadata, RawContextData
+from performance_metrics.metrics_store import MetricsStore, read_raw_context_data
 
 # Corrected times in seconds
 STARTING_TIME = 0.001
@@ -36,16 +37,126 @@ async def test_storing_to_file(tmp_path: Path) -> None:
 
     robot_context_tracker.store()
 
-    with open(robot_context_tracker._store.metadata.data_file_location, "r") as file:
-        lines = file.readlines()
-        assert len(lines) == 3, "All stored data should be written to the file."
+    stored = list(
+        read_raw_context_data(robot_context_tracker._store.metadata.data_file_location)
+    )
+    assert len(stored) == 3, "All stored data should be written to the file."
+    assert [data.state for data in stored] == [
+        "ROBOT_STARTING_UP",
+        "CALIBRATING",
+        "ANALYZING_PROTOCOL",
+    ]
 
-        split_lines: list[list[str]] = [line.strip().split(",") for line in lines]
-        assert all(
-            RawContextData.from_csv_row(line) for line in split_lines
-        ), "All lines should be valid RawContextData instances."
+    assert not robot_context_tracker._store.metadata.headers_file_location.exists()
 
-    with open(robot_context_tracker._store.metadata.headers_file_location, "r") as file:
-        headers = file.readlines()
-        assert len(headers) == 1, "Header should be written to the headers file."
-        assert tuple(headers[0].strip().split(",")) == RawContextData.headers()
+
+def test_legacy_csv_file_left_alone(tmp_path: Path) -> None:
+    """It should not append binary data to a CSV data file from before the format."""
+    metadata = MetricsMetadata(
+        name="test_data", storage_dir=tmp_path, headers=RawContextData.headers()
+    )
+    legacy_rows = "ROBOT_STARTING_UP,1,2\n"
+    metadata.legacy_data_file_location.write_text(legacy_rows)
+    store = MetricsStore(metadata, flush_interval=None)
+    store.setup()
+    written = RawContextData(state="CALIBRATING", func_start=3, duration=4)
+    store.add(written)
+    store.store()
+
+    assert metadata.legacy_data_file_location.read_text() == legacy_rows
+    assert list(read_raw_context_data(metadata.data_file_location)) == [written]
+
+
+def _make_store(tmp_path: Path, capacity: int) -> MetricsStore:
+    store = MetricsStore(
+        MetricsMetadata(
+            name="test_data",
+            storage_dir=tmp_path,
+            headers=RawContextData.headers(),
+        ),
+        capacity=capacity,
+        flush_interval=None,
+    )
+    store.setup()
+    return store
+
+
+def test_round_trip_across_blocks(tmp_path: Path) -> None:
+    """Tests that data written over several stores is read back in order."""
+    store = _make_store(tmp_path, capacity=4)
+    written = [
+        RawContextData(state="RUNNING_PROTOCOL", func_start=i, duration=i * 1000)
+        for i in range(10)
+    ]
+    written.append(
+        RawContextData(state="ROBOT_SHUTTING_DOWN", func_start=2**62, duration=-1)
+    )
+
+    for data in written:
+        store.add(data)
+    store.store()
+
+    assert list(read_raw_context_data(store.metadata.data_file_location)) == written
+
+
+def test_full_buffer_is_written(tmp_path: Path) -> None:
+    """Tests that adding to a full buffer writes it to the file first."""
+    store = _make_store(tmp_path, capacity=2)
+
+    for i in range(3):
+        store.add(RawContextData(state="CALIBRATING", func_start=i, duration=1))
+
+    assert len(store._data) == 1, "Only the data added after the flush is buffered."
+    stored = list(read_raw_context_data(store.metadata.data_file_location))
+    assert [data.func_start for data in stored] == [0, 1]
+
+
+def test_background_flush(tmp_path: Path) -> None:
+    """Tests that buffered data is written by the background thread."""
+    store = MetricsStore(
+        MetricsMetadata(
+            name="test_data",
+            storage_dir=tmp_path,
+            headers=RawContextData.headers(),
+        ),
+        flush_interval=0.01,
+    )
+    store.setup()
+    store.add(RawContextData(state="CALIBRATING", func_start=0, duration=1))
+
+    for _ in range(100):
+        if len(store._data) == 0:
+            break
+        sleep(0.01)
+
+    store.close()
+    stored = list(read_raw_context_data(store.metadata.data_file_location))
+    assert len(stored) == 1
+
+
+def test_summarize(tmp_path: Path) -> None:
+    """Tests the per-state duration statistics."""
+    store = _make_store(tmp_path, capacity=16)
+
+    for duration in range(1, 101):
+        store.add(
+            RawContextData(state="RUNNING_PROTOCOL", func_start=0, duration=duration)
+        )
+    for duration in (1_000_000, 3_000_000):
+        store.add(
+            RawContextData(state="ANALYZING_PROTOCOL", func_start=0, duration=duration)
+        )
+
+    summary = store.summarize()
+
+    assert set(summary) == {"RUNNING_PROTOCOL", "ANALYZING_PROTOCOL"}
+    running = summary["RUNNING_PROTOCOL"]
+    assert running.count == 100
+    assert running.mean == 50.5
+    assert (running.p50, running.p95, running.p99) == (50, 95, 99)
+
+    analyzing = summary["ANALYZING_PROTOCOL"]
+    assert analyzing.count == 2
+    assert analyzing.mean == 2_000_000
+    assert abs(analyzing.p50 - 1_000_000) / 1_000_000 < 0.01
+    assert abs(analyzing.p99 - 3_000_000) / 3_000_000 < 0.01
@@ -3,6 +3,7 @@
 import asyncio
 from pathlib import Path
 import pytest
+from performance_metrics.metrics_store import read_raw_context_data
 from performance_metrics.robot_context_tracker import RobotContextTracker
 from time import sleep, time_ns
 from unittest.mock import patch
@@ -300,3 +301,22 @@ def test_using_non_linux_time_functions(tmp_path: Path) -> None:
         data.duration > 0 for data in storage
     ), "All duration times should be greater than 0."
     assert len(storage) == 2, "Both operations should be tracked."
+
+
+def test_close_stores_buffered_data(
+    robot_context_tracker: RobotContextTracker,
+) -> None:
+    """Tests that closing the tracker writes out data that was not stored yet."""
+
+    @robot_context_tracker.track(state="ROBOT_SHUTTING_DOWN")
+    def shutting_down_robot() -> None:
+        pass
+
+    shutting_down_robot()
+    robot_context_tracker.close()
+
+    stored = list(
+        read_raw_context_data(robot_context_tracker._store.metadata.data_file_location)
+    )
+    assert [data.state for data in stored] == ["ROBOT_SHUTTING_DOWN"]
+    assert robot_context_tracker._store._flush_thread is None
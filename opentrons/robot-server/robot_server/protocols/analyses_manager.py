@@ -1,32 +1,66 @@
 """A collaborator for managing protocol analyses."""
-from typing import Optional
+from logging import getLogger
+from typing import List, Optional
 
-from opentrons.protocol_engine.types import RunTimeParamValuesType
+from opentrons import protocol_reader
+from opentrons.protocol_engine.types import RunTimeParameter, RunTimeParamValuesType
+from opentrons.protocol_runner import AbstractRunner
 
 from robot_server.protocols.analysis_models import (
     AnalysisStatus,
     AnalysisSummary,
 )
+from robot_server.protocols.analysis_cache import AnalysisCache, get_analysis_cache_key
 from robot_server.protocols.analysis_store import AnalysisStore
 from robot_server.protocols import protocol_analyzer
 from robot_server.protocols.protocol_store import ProtocolResource
 from robot_server.service.task_runner import TaskRunner
 
 
+_log = getLogger(__name__)
+
+
 class AnalysesManager:
     """A Collaborator that manages and provides an interface to Protocol Analyzers."""
 
-    def __init__(self, analysis_store: AnalysisStore, task_runner: TaskRunner) -> None:
+    def __init__(
+        self,
+        analysis_store: AnalysisStore,
+        task_runner: TaskRunner,
+        analysis_cache: Optional[AnalysisCache] = None,
+    ) -> None:
         self._analysis_store = analysis_store
         self._task_runner = task_runner
+        self._analysis_cache = analysis_cache
 
     async def start_analysis(
         self,
         analysis_id: str,
         protocol_resource: ProtocolResource,
         run_time_param_values: Optional[RunTimeParamValuesType],
+        force_reanalyze: bool = False,
     ) -> AnalysisSummary:
-        """Start an analysis of the given protocol resource with run time param values."""
+        """Start an analysis of the given protocol resource with run time param values.
+
+        If the same protocol files were already analyzed with the same run time
+        param values, the cached result is stored as a new completed analysis
+        right away instead, unless `force_reanalyze` is set.
+        """
+        cache_key: Optional[str] = None
+        if self._analysis_cache is not None:
+            cache_key = await self._get_cache_key(
+                protocol_resource=protocol_resource,
+                run_time_param_values=run_time_param_values,
+            )
+        if cache_key is not None and not force_reanalyze:
+            cached_summary = await self._complete_from_cache(
+                analysis_id=analysis_id,
+                protocol_resource=protocol_resource,
+                cache_key=cache_key,
+            )
+            if cached_summary is not None:
+                return cached_summary
+
         analyzer = protocol_analyzer.create_protocol_analyzer(
             analysis_store=self._analysis_store, protocol_resource=protocol_resource
         )
@@ -51,14 +85,101 @@ class AnalysesManager:
                 status=AnalysisStatus.COMPLETED,
             )
 
-        self._task_runner.run(
-            analyzer.analyze,
-            runner=protocol_runner,
-            analysis_id=analysis_id,
-            run_time_parameters=protocol_runner.run_time_parameters,
-        )
+        if cache_key is None:
+            self._task_runner.run(
+                analyzer.analyze,
+                runner=protocol_runner,
+                analysis_id=analysis_id,
+                run_time_parameters=protocol_runner.run_time_parameters,
+            )
+        else:
+            self._task_runner.run(
+                self._analyze_and_cache,
+                analyzer=analyzer,
+                runner=protocol_runner,
+                analysis_id=analysis_id,
+                run_time_parameters=protocol_runner.run_time_parameters,
+                cache_key=cache_key,
+            )
         return AnalysisSummary(
             id=analysis_id,
             status=AnalysisStatus.PENDING,
             runTimeParameters=pending.runTimeParameters,
         )
+
+    async def _get_cache_key(
+        self,
+        protocol_resource: ProtocolResource,
+        run_time_param_values: Optional[RunTimeParamValuesType],
+    ) -> Optional[str]:
+        """Get the analysis cache key, or None if the protocol can't be cached."""
+        try:
+            labware_definitions = await protocol_reader.extract_labware_definitions(
+                protocol_resource.source
+            )
+        except Exception:
+            # The analysis will report whatever is wrong with the files.
+            _log.warning(
+                f"Not caching analysis of protocol {protocol_resource.protocol_id}"
+                " because its labware definitions could not be read.",
+                exc_info=True,
+            )
+            return None
+        return get_analysis_cache_key(
+            protocol_source=protocol_resource.source,
+            run_time_param_values=run_time_param_values,
+            labware_definitions=labware_definitions,
+        )
+
+    async def _complete_from_cache(
+        self, analysis_id: str, protocol_resource: ProtocolResource, cache_key: str
+    ) -> Optional[AnalysisSummary]:
+        """Store a cached analysis under a new ID, if one is cached."""
+        assert self._analysis_cache is not None
+        cached = await self._analysis_cache.get(cache_key)
+        if cached is None:
+            return None
+        self._analysis_store.add_pending(
+            protocol_id=protocol_resource.protocol_id,
+            analysis_id=analysis_id,
+        )
+        await self._analysis_store.update(
+            analysis_id=analysis_id,
+            # Part of the cache key, so it matches the cached analysis's.
+            robot_type=protocol_resource.source.robot_type,
+            run_time_parameters=cached.runTimeParameters,
+            commands=cached.commands,
+            labware=cached.labware,
+            modules=cached.modules,
+            pipettes=cached.pipettes,
+            errors=cached.errors,
+            liquids=cached.liquids,
+        )
+        return AnalysisSummary(
+            id=analysis_id,
+            status=AnalysisStatus.COMPLETED,
+            runTimeParameters=cached.runTimeParameters,
+        )
+
+    async def _analyze_and_cache(
+        self,
+        analyzer: protocol_analyzer.ProtocolAnalyzer,
+        runner: AbstractRunner,
+        analysis_id: str,
+        run_time_parameters: List[RunTimeParameter],
+        cache_key: str,
+    ) -> None:
+        """Analyze, and cache the result if the protocol ran to completion."""
+        assert self._analysis_cache is not None
+        ran_to_completion = await analyzer.analyze(
+            runner=runner,
+            analysis_id=analysis_id,
+            run_time_parameters=run_time_parameters,
+        )
+        if ran_to_completion:
+            await self._analysis_cache.put(
+                key=cache_key,
+                analysis_document=await self._analysis_store.get_as_document(
+                    analysis_id
+                ),
+            )
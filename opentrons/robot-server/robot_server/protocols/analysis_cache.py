@@ -0,0 +1,195 @@
+"""A persistent, content-addressed cache of completed protocol analyses."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import anyio
+from typing_extensions import Final
+
+from opentrons import __version__ as opentrons_version
+from opentrons.protocol_engine.types import RunTimeParamValuesType
+from opentrons.protocol_reader import ProtocolSource
+from opentrons.protocols.models import LabwareDefinition
+
+from robot_server.persistence.pydantic import json_to_pydantic
+
+from .analysis_models import CompletedAnalysis
+
+
+_log = getLogger(__name__)
+
+# Change this whenever what's stored in a cache file, or what goes into a key,
+# changes in a way that old cache files should no longer be read.
+_CACHE_FORMAT_VERSION: Final = "2"
+
+_ENTRY_SUFFIX: Final = ".json"
+_TEMP_SUFFIX: Final = ".tmp"
+
+
+def get_analysis_cache_key(
+    protocol_source: ProtocolSource,
+    run_time_param_values: Optional[RunTimeParamValuesType],
+    labware_definitions: Sequence[LabwareDefinition],
+) -> str:
+    """Get the key that identifies an analysis of the given protocol and parameters.
+
+    Two analyses have the same key if and only if they're expected to produce the
+    same result:
+
+    * The protocol's files are identified by the source's content hash.
+    * The custom labware definitions that the analysis will be given, from
+      `extract_labware_definitions()`, are hashed in order. So a changed
+      definition gives a different key, even if the content hash is the same.
+    * The run-time parameter values are compared after the same number
+      conversions that the analysis does, so ``5`` and ``5.0`` give the same key.
+      Leaving out a parameter and explicitly passing its default give
+      different keys.
+    * The robot type is included, since the same file can analyze differently
+      on each robot.
+    * The `opentrons` package version stands in for everything that ships with the
+      software, like the analyzer itself and the bundled labware definitions.
+    """
+    key_data = {
+        "cacheFormatVersion": _CACHE_FORMAT_VERSION,
+        "opentronsVersion": opentrons_version,
+        "robotType": protocol_source.robot_type,
+        "contentHash": protocol_source.content_hash,
+        "labwareDefinitionHashes": [
+            _hash_labware_definition(definition) for definition in labware_definitions
+        ],
+        "runTimeParameterValues": {
+            name: _normalize_run_time_param_value(value)
+            for name, value in (run_time_param_values or {}).items()
+        },
+    }
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _hash_labware_definition(definition: LabwareDefinition) -> str:
+    return hashlib.sha256(definition.json(sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _normalize_run_time_param_value(
+    value: Union[int, float, bool, str]
+) -> Union[int, float, bool, str]:
+    """Give values that the analysis treats the same way the same representation.
+
+    The analysis converts numbers to the type of their parameter, so an int and
+    an equal float mean the same thing. The exception is 0 and 1: a float 0.0 or
+    1.0 can also stand for a boolean, and an int can't, so those stay as given.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return value
+    return float(value)
+
+
+class AnalysisCache:
+    """Files of completed analyses, keyed by `get_analysis_cache_key()`.
+
+    Each entry is a file holding a serialized `CompletedAnalysis`.
+    When the files take up more than the maximum size, the least recently used
+    ones are deleted. Reading an entry updates its modification time, which is
+    what tracks how recently it was used, so this survives restarts.
+
+    The analyses in the cache keep the ID of the analysis they were stored from.
+    """
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Where to store cache files. Created if it doesn't exist.
+            max_size: The maximum total size, in bytes, of the cache files.
+        """
+        self._directory = directory
+        self._max_size = max_size
+
+    async def get(self, key: str) -> Optional[CompletedAnalysis]:
+        """Get the cached analysis with the given key, if there is one."""
+        document = await anyio.to_thread.run_sync(self._read, key)
+        if document is None:
+            return None
+        try:
+            return await anyio.to_thread.run_sync(
+                json_to_pydantic, CompletedAnalysis, document
+            )
+        except Exception:
+            _log.warning(
+                f"Discarding analysis cache entry {key} that could not be parsed.",
+                exc_info=True,
+            )
+            await anyio.to_thread.run_sync(self._remove, key)
+            return None
+
+    async def put(self, key: str, analysis_document: str) -> None:
+        """Store a serialized `CompletedAnalysis` and evict old entries to make room.
+
+        Analyses bigger than the whole cache are not stored. Failing to write to
+        disk is logged rather than raised.
+        """
+        try:
+            await anyio.to_thread.run_sync(self._write, key, analysis_document)
+        except OSError:
+            # The analysis itself is already stored; only future uploads lose out.
+            _log.warning(f"Failed to cache analysis {key}.", exc_info=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self._directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def _read(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        try:
+            document = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            path.touch()
+        except FileNotFoundError:
+            # Evicted between reading and touching it; we still have the contents.
+            pass
+        return document
+
+    def _remove(self, key: str) -> None:
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def _write(self, key: str, analysis_document: str) -> None:
+        encoded = analysis_document.encode("utf-8")
+        if len(encoded) > self._max_size:
+            _log.info(
+                f"Not caching analysis of {len(encoded)} bytes,"
+                f" which is more than the cache's {self._max_size} bytes."
+            )
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        temp_path = path.with_suffix(_TEMP_SUFFIX)
+        temp_path.write_bytes(encoded)
+        # Replacing is atomic, so a concurrent reader never sees a partial file.
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries: List[Tuple[float, int, Path]] = []
+        for path in self._directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(size for _, size, _ in entries)
+        # Oldest first.
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self._max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+            _log.debug(f"Evicted analysis cache entry {path.name}.")
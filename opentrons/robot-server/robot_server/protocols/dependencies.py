@@ -3,6 +3,7 @@
 
 from asyncio import Lock as AsyncLock
 from pathlib import Path
+from typing import Optional
 from typing_extensions import Final
 import logging
 
@@ -25,6 +26,7 @@ from robot_server.persistence.fastapi_dependencies import (
 )
 from robot_server.settings import get_settings
 from .analyses_manager import AnalysesManager
+from .analysis_cache import AnalysisCache
 
 from .protocol_auto_deleter import ProtocolAutoDeleter
 from .protocol_store import (
@@ -34,6 +36,7 @@ from .analysis_store import AnalysisStore
 
 
 _PROTOCOL_FILES_SUBDIRECTORY: Final = "protocols"
+_ANALYSIS_CACHE_SUBDIRECTORY: Final = "analysis_cache"
 
 _log = logging.getLogger(__name__)
 
@@ -42,6 +45,8 @@ _protocol_store_accessor = AppStateAccessor[ProtocolStore]("protocol_store")
 
 _analysis_store_accessor = AppStateAccessor[AnalysisStore]("analysis_store")
 
+_analysis_cache_accessor = AppStateAccessor[AnalysisCache]("analysis_cache")
+
 _analyses_manager_accessor = AppStateAccessor[AnalysesManager]("analyses_manager")
 _protocol_directory_init_lock = AsyncLock()
 _protocol_directory_accessor = AppStateAccessor[Path]("protocol_directory")
@@ -111,17 +116,41 @@ async def get_analysis_store(
     return analysis_store
 
 
+async def get_analysis_cache(
+    app_state: AppState = Depends(get_app_state),
+    persistence_directory: Path = Depends(get_active_persistence_directory),
+) -> Optional[AnalysisCache]:
+    """Get a singleton AnalysisCache to reuse completed analyses, if it's enabled."""
+    maximum_size = get_settings().maximum_analysis_cache_size
+    if maximum_size == 0:
+        return None
+
+    analysis_cache = _analysis_cache_accessor.get_from(app_state)
+
+    if analysis_cache is None:
+        analysis_cache = AnalysisCache(
+            directory=persistence_directory / _ANALYSIS_CACHE_SUBDIRECTORY,
+            max_size=maximum_size,
+        )
+        _analysis_cache_accessor.set_on(app_state, analysis_cache)
+
+    return analysis_cache
+
+
 async def get_analyses_manager(
     app_state: AppState = Depends(get_app_state),
     analysis_store: AnalysisStore = Depends(get_analysis_store),
     task_runner: TaskRunner = Depends(get_task_runner),
+    analysis_cache: Optional[AnalysisCache] = Depends(get_analysis_cache),
 ) -> AnalysesManager:
     """Get a singleton AnalysesManager to keep track of analyzers."""
     analyses_manager = _analyses_manager_accessor.get_from(app_state)
 
     if analyses_manager is None:
         analyses_manager = AnalysesManager(
-            analysis_store=analysis_store, task_runner=task_runner
+            analysis_store=analysis_store,
+            task_runner=task_runner,
+            analysis_cache=analysis_cache,
         )
         _analyses_manager_accessor.set_on(app_state, analyses_manager)
 
@@ -60,8 +60,14 @@ class ProtocolAnalyzer:
         runner: AbstractRunner,
         analysis_id: str,
         run_time_parameters: Optional[List[RunTimeParameter]] = None,
-    ) -> None:
-        """Analyze a given protocol, storing the analysis when complete."""
+    ) -> bool:
+        """Analyze a given protocol, storing the analysis when complete.
+
+        Returns:
+            Whether the protocol ran to completion, as opposed to the analysis
+            failing unexpectedly. Errors in the protocol itself are part of a
+            completed run.
+        """
         assert self._protocol_resource is not None
         try:
             result = await runner.run(
@@ -74,7 +80,7 @@ class ProtocolAnalyzer:
                 error=error,
                 run_time_parameters=run_time_parameters or [],
             )
-            return
+            return False
 
         log.info(f'Completed analysis "{analysis_id}".')
 
@@ -89,6 +95,7 @@ class ProtocolAnalyzer:
             errors=result.state_summary.errors,
             liquids=result.state_summary.liquids,
         )
+        return True
 
     async def update_to_failed_analysis(
         self,
@@ -409,6 +409,7 @@ async def _start_new_analysis_if_necessary(
                 analysis_id=analysis_id,
                 protocol_resource=resource,
                 run_time_param_values=rtp_values,
+                force_reanalyze=force_reanalyze,
             )
         )
 
@@ -1,9 +1,11 @@
 """Router for /runs commands endpoints."""
+import json
 import textwrap
-from typing import Optional, Union
+from typing import Iterator, List, Optional, Union
 from typing_extensions import Final, Literal
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
 from opentrons.protocol_engine import (
     CommandPointer,
@@ -323,8 +325,7 @@ async def get_run_commands(
 # TODO (spp, 2024-05-01): explore alternatives to returning commands as list of strings.
 #                Options: 1. JSON Lines
 #                         2. Simple de-serialized commands list w/o pydantic model conversion
-@PydanticResponse.wrap_route(
-    commands_router.get,
+@commands_router.get(
     path="/runs/{runId}/commandsAsPreSerializedList",
     summary="Get all commands of a completed run as a list of pre-serialized commands",
     description=(
@@ -337,7 +338,10 @@ async def get_run_commands(
         " This is a faster alternative to fetching the full commands list using"
         " `GET /runs/{runId}/commands`. For large protocols (10k+ commands), the above"
         " endpoint can take minutes to respond, whereas this one should only take a few seconds."
+        " The response is streamed, so the robot only holds a small part of it"
+        " in memory at a time."
     ),
+    response_model=SimpleMultiBody[str],
     responses={
         status.HTTP_404_NOT_FOUND: {"model": ErrorBody[RunNotFound]},
         status.HTTP_503_SERVICE_UNAVAILABLE: {
@@ -348,7 +352,7 @@ async def get_run_commands(
 async def get_run_commands_as_pre_serialized_list(
     runId: str,
     run_data_manager: RunDataManager = Depends(get_run_data_manager),
-) -> PydanticResponse[SimpleMultiBody[str]]:
+) -> StreamingResponse:
     """Get all commands of a completed run as a list of pre-serialized (string encoded) commands.
 
     Arguments:
@@ -356,20 +360,37 @@ async def get_run_commands_as_pre_serialized_list(
         run_data_manager: Run data retrieval interface.
     """
     try:
-        commands = run_data_manager.get_all_commands_as_preserialized_list(runId)
+        batches = run_data_manager.get_all_commands_as_preserialized_batches(runId)
     except RunNotFoundError as e:
         raise RunNotFound.from_exc(e).as_error(status.HTTP_404_NOT_FOUND) from e
     except PreSerializedCommandsNotAvailableError as e:
         raise PreSerializedCommandsNotAvailable.from_exc(e).as_error(
             status.HTTP_503_SERVICE_UNAVAILABLE
         ) from e
-    return await PydanticResponse.create(
-        content=SimpleMultiBody.construct(
-            data=commands, meta=MultiBodyMeta(cursor=0, totalLength=len(commands))
-        )
+    return StreamingResponse(
+        _stream_pre_serialized_list(batches), media_type="application/json"
     )
 
 
+def _stream_pre_serialized_list(
+    batches: Iterator[List[str]],
+) -> Iterator[str]:
+    """Write out batches of commands as the JSON of a SimpleMultiBody[str].
+
+    This is a plain generator, so that StreamingResponse iterates over it in a
+    thread pool, and the database reads for each batch don't block the event loop.
+    """
+    total_length = 0
+    yield '{"data": ['
+    for batch in batches:
+        if total_length > 0:
+            yield ", "
+        yield ", ".join(json.dumps(command) for command in batch)
+        total_length += len(batch)
+    meta = MultiBodyMeta(cursor=0, totalLength=total_length)
+    yield f'], "meta": {meta.json()}}}'
+
+
 @PydanticResponse.wrap_route(
     commands_router.get,
     path="/runs/{runId}/commands/{commandId}",
@@ -1,7 +1,11 @@
 """Control an active run with Actions."""
+import asyncio
 import logging
 from datetime import datetime
+from functools import partial
 from typing import Optional
+
+from anyio import to_thread
 from opentrons.protocol_engine import ProtocolEngineError
 from opentrons_shared_data.errors.exceptions import RoboticsInteractionError
 
@@ -17,6 +21,12 @@ from robot_server.service.notifications import RunsPublisher
 
 log = logging.getLogger(__name__)
 
+# How often to store a running run's newly finished commands, so that only the
+# tail of the run is left to write when it ends.
+_COMMAND_PERSIST_INTERVAL_SECONDS = 5.0
+# The most commands to store at once, to bound the time each write takes.
+_COMMAND_PERSIST_MAX_BATCH = 10_000
+
 
 class RunActionNotAllowedError(RoboticsInteractionError):
     """Error raised when a given run action is not allowed."""
@@ -32,12 +42,14 @@ class RunController:
         engine_store: EngineStore,
         run_store: RunStore,
         runs_publisher: RunsPublisher,
+        command_persist_interval: float = _COMMAND_PERSIST_INTERVAL_SECONDS,
     ) -> None:
         self._run_id = run_id
         self._task_runner = task_runner
         self._engine_store = engine_store
         self._run_store = run_store
         self._runs_publisher = runs_publisher
+        self._command_persist_interval = command_persist_interval
 
     def create_action(
         self,
@@ -103,9 +115,14 @@ class RunController:
     async def _run_protocol_and_insert_result(
         self, deck_configuration: DeckConfigurationType
     ) -> None:
-        result = await self._engine_store.run(
-            deck_configuration=deck_configuration,
-        )
+        persist_task = asyncio.create_task(self._persist_commands_periodically())
+        try:
+            result = await self._engine_store.run(
+                deck_configuration=deck_configuration,
+            )
+        finally:
+            persist_task.cancel()
+            await asyncio.gather(persist_task, return_exceptions=True)
         self._run_store.update_run_state(
             run_id=self._run_id,
             summary=result.state_summary,
@@ -115,3 +132,28 @@ class RunController:
         await self._runs_publisher.publish_pre_serialized_commands_notification(
             self._run_id
         )
+
+    async def _persist_commands_periodically(self) -> None:
+        """Store the run's finished commands as it goes."""
+        persisted_count = 0
+        while True:
+            await asyncio.sleep(self._command_persist_interval)
+            command_slice = self._engine_store.get_command_slice(
+                cursor=persisted_count, length=_COMMAND_PERSIST_MAX_BATCH
+            )
+            # The slice is clamped to the last command when there are no new ones.
+            if command_slice.cursor != persisted_count or not command_slice.commands:
+                continue
+            try:
+                # The database is written from a worker thread, so the
+                # protocol keeps running on the event loop in the meantime.
+                persisted_count += await to_thread.run_sync(
+                    partial(
+                        self._run_store.insert_commands,
+                        run_id=self._run_id,
+                        commands=command_slice.commands,
+                        start_index=persisted_count,
+                    )
+                )
+            except Exception:
+                log.exception(f'Failed to store commands of run "{self._run_id}".')
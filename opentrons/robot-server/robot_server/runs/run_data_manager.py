@@ -1,6 +1,6 @@
 """Manage current and historical run data."""
 from datetime import datetime
-from typing import List, Optional, Callable, Union
+from typing import Iterator, List, Optional, Callable, Union
 
 from opentrons_shared_data.labware.labware_definition import LabwareDefinition
 from opentrons_shared_data.errors.exceptions import InvalidStoredData, EnumeratedError
@@ -415,8 +415,10 @@ class RunDataManager:
 
         return self._run_store.get_command(run_id=run_id, command_id=command_id)
 
-    def get_all_commands_as_preserialized_list(self, run_id: str) -> List[str]:
-        """Get all commands of a run in a serialized json list."""
+    def get_all_commands_as_preserialized_batches(
+        self, run_id: str
+    ) -> Iterator[List[str]]:
+        """Get all commands of a run as batches of serialized json commands."""
         if (
             run_id == self._engine_store.current_run_id
             and not self._engine_store.get_is_run_terminal()
@@ -424,7 +426,7 @@ class RunDataManager:
             raise PreSerializedCommandsNotAvailableError(
                 "Pre-serialized commands are only available after a run has ended."
             )
-        return self._run_store.get_all_commands_as_preserialized_list(run_id)
+        return self._run_store.get_all_commands_as_preserialized_batches(run_id)
 
     def _get_state_summary(self, run_id: str) -> Union[StateSummary, BadStateSummary]:
         if run_id == self._engine_store.current_run_id:
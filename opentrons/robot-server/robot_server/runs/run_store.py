@@ -4,14 +4,14 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
-from typing import Dict, List, Optional, Literal, Union
+from typing import Dict, Iterator, List, Optional, Literal, Sequence, Union
 
 import sqlalchemy
 from pydantic import ValidationError
 
 from opentrons.util.helpers import utc_now
 from opentrons.protocol_engine import StateSummary, CommandSlice
-from opentrons.protocol_engine.commands import Command
+from opentrons.protocol_engine.commands import Command, CommandStatus
 from opentrons.protocol_engine.types import RunTimeParameter
 
 from opentrons_shared_data.errors.exceptions import (
@@ -41,6 +41,20 @@ log = logging.getLogger(__name__)
 
 _CACHE_ENTRIES = 32
 
+# How many commands to serialize and insert per executemany() call.
+# Bounds how much serialized JSON is held in memory at once.
+_COMMAND_INSERT_BATCH_SIZE = 1000
+
+# How many pre-serialized commands to read from the database at a time
+# when streaming them out.
+_PRESERIALIZED_COMMAND_BATCH_SIZE = 500
+
+# Commands in these states will never change again, so once they are stored
+# they do not need to be rewritten.
+_FINAL_COMMAND_STATUSES = frozenset(
+    [CommandStatus.SUCCEEDED.value, CommandStatus.FAILED.value]
+)
+
 
 @dataclass(frozen=True)
 class RunResource:
@@ -102,6 +116,9 @@ class RunStore:
     ) -> None:
         """Initialize a RunStore with sql engine and notification client."""
         self._sql_engine = sql_engine
+        # How many of each run's leading commands are known to be stored and
+        # finished, so they don't have to be checked again.
+        self._persisted_command_counts: Dict[str, int] = {}
 
     def update_run_state(
         self,
@@ -137,11 +154,6 @@ class RunStore:
             )
         )
 
-        delete_existing_commands = sqlalchemy.delete(run_command_table).where(
-            run_command_table.c.run_id == run_id
-        )
-        insert_command = sqlalchemy.insert(run_command_table)
-
         select_run_resource = sqlalchemy.select(*_run_columns).where(
             run_table.c.id == run_id
         )
@@ -156,27 +168,71 @@ class RunStore:
                 raise RunNotFoundError(run_id=run_id)
 
             transaction.execute(update_run)
-            transaction.execute(delete_existing_commands)
-            for command_index, command in enumerate(commands):
-                transaction.execute(
-                    insert_command,
-                    {
-                        "run_id": run_id,
-                        "index_in_run": command_index,
-                        "command_id": command.id,
-                        "command": pydantic_to_json(command),
-                    },
-                )
+            persisted_count = _get_persisted_command_count(
+                transaction,
+                run_id,
+                commands,
+                known_count=self._persisted_command_counts.get(run_id, 0),
+            )
+            _replace_commands_from(
+                transaction,
+                run_id,
+                commands[persisted_count:],
+                start_index=persisted_count,
+            )
+            finished_count = _count_finished_commands(commands, start=persisted_count)
 
             run_row = transaction.execute(select_run_resource).one()
             action_rows = transaction.execute(select_actions).all()
 
+        self._persisted_command_counts[run_id] = finished_count
         self._clear_caches()
         maybe_run_resource = _convert_row_to_run(row=run_row, action_rows=action_rows)
         if not maybe_run_resource.ok:
             raise maybe_run_resource.error
         return maybe_run_resource
 
+    def insert_commands(
+        self, run_id: str, commands: Sequence[Command], start_index: int
+    ) -> int:
+        """Store commands of a run in progress, from the given index on.
+
+        This can be called periodically while a run is in progress with the
+        commands after the ones already stored, so that `update_run_state` only
+        has the tail of the run left to write when the run ends. Only the
+        leading commands that have succeeded or failed are stored, because
+        those will not change anymore.
+
+        Args:
+            run_id: The run to add commands to.
+            commands: The run's commands from `start_index` on, in order.
+            start_index: The index in the run of the first of `commands`.
+
+        Returns:
+            The number of commands stored, which is where the next call
+            should start from `start_index`.
+
+        Raises:
+            RunNotFoundError: Run ID was not found in the database.
+        """
+        finished_count = _count_finished_commands(commands, start=0)
+        if finished_count == 0:
+            return 0
+
+        with self._sql_engine.begin() as transaction:
+            if not self._run_exists(run_id, transaction):
+                raise RunNotFoundError(run_id=run_id)
+            _replace_commands_from(
+                transaction,
+                run_id,
+                commands[:finished_count],
+                start_index=start_index,
+            )
+
+        self._persisted_command_counts[run_id] = start_index + finished_count
+        self._clear_caches()
+        return finished_count
+
     def insert_action(self, run_id: str, action: RunAction) -> None:
         """Insert a run action into the store.
 
@@ -441,18 +497,57 @@ class RunStore:
             commands=sliced_commands,
         )
 
-    def get_all_commands_as_preserialized_list(self, run_id: str) -> List[str]:
-        """Get all commands of the run as a list of strings of json command objects."""
+    def get_all_commands_as_preserialized_batches(
+        self,
+        run_id: str,
+        batch_size: int = _PRESERIALIZED_COMMAND_BATCH_SIZE,
+    ) -> Iterator[List[str]]:
+        """Get all commands of the run as batches of strings of json command objects.
+
+        Only one batch of commands is read into memory at a time. Each batch is read in its own
+        transaction, so the database is not held open while the caller
+        handles a batch.
+
+        Args:
+            run_id: The run to pull commands from.
+            batch_size: The maximum number of commands in each batch.
+
+        Returns:
+            An iterator over lists of commands, in order.
+
+        Raises:
+            RunNotFoundError: The given run ID was not found. This is raised
+                right away, not when the batches are iterated over.
+        """
         with self._sql_engine.begin() as transaction:
             if not self._run_exists(run_id, transaction):
                 raise RunNotFoundError(run_id=run_id)
-            select_commands = (
-                sqlalchemy.select(run_command_table.c.command)
-                .where(run_command_table.c.run_id == run_id)
+        return self._iter_preserialized_command_batches(run_id, batch_size)
+
+    def _iter_preserialized_command_batches(
+        self, run_id: str, batch_size: int
+    ) -> Iterator[List[str]]:
+        next_index = 0
+        while True:
+            select_batch = (
+                sqlalchemy.select(
+                    run_command_table.c.index_in_run, run_command_table.c.command
+                )
+                .where(
+                    run_command_table.c.run_id == run_id,
+                    run_command_table.c.index_in_run >= next_index,
+                )
                 .order_by(run_command_table.c.index_in_run)
+                .limit(batch_size)
             )
-            commands_result = transaction.scalars(select_commands).all()
-        return commands_result
+            with self._sql_engine.begin() as transaction:
+                rows = transaction.execute(select_batch).all()
+            if len(rows) == 0:
+                return
+            yield [row.command for row in rows]
+            if len(rows) < batch_size:
+                return
+            next_index = rows[-1].index_in_run + 1
 
     @lru_cache(maxsize=_CACHE_ENTRIES)
     def get_command(self, run_id: str, command_id: str) -> Command:
@@ -505,6 +600,7 @@ class RunStore:
             transaction.execute(delete_commands)
             result = transaction.execute(delete_run)
 
+        self._persisted_command_counts.pop(run_id, None)
         if result.rowcount < 1:
             raise RunNotFoundError(run_id)
 
@@ -527,6 +623,100 @@ class RunStore:
         self.get_run_time_parameters.cache_clear()
 
 
+def _get_persisted_command_count(
+    connection: sqlalchemy.engine.Connection,
+    run_id: str,
+    commands: Sequence[Command],
+    known_count: int,
+) -> int:
+    """Count the leading stored commands that can be kept as-is.
+
+    A stored command can be kept if it is the same command at the same index
+    and it was already finished when it was stored.
+
+    Args:
+        connection: The connection to query with.
+        run_id: The run whose commands to check.
+        commands: All of the run's commands, in order.
+        known_count: A number of leading commands that an earlier call found
+            could be kept. Only stored commands after these are checked again,
+            as long as the last of them still matches `commands`.
+    """
+    start = 0
+    if 0 < known_count <= len(commands):
+        select_last_known = sqlalchemy.select(run_command_table.c.command_id).where(
+            run_command_table.c.run_id == run_id,
+            run_command_table.c.index_in_run == known_count - 1,
+        )
+        last_known_id = connection.execute(select_last_known).scalar_one_or_none()
+        if last_known_id == commands[known_count - 1].id:
+            start = known_count
+
+    select_stored = (
+        sqlalchemy.select(
+            run_command_table.c.index_in_run,
+            run_command_table.c.command_id,
+            sqlalchemy.func.json_extract(run_command_table.c.command, "$.status"),
+        )
+        .where(
+            run_command_table.c.run_id == run_id,
+            run_command_table.c.index_in_run >= start,
+        )
+        .order_by(run_command_table.c.index_in_run)
+    )
+    count = start
+    for index_in_run, command_id, status in connection.execute(select_stored):
+        if (
+            index_in_run != count
+            or count >= len(commands)
+            or command_id != commands[count].id
+            or status not in _FINAL_COMMAND_STATUSES
+        ):
+            break
+        count += 1
+    return count
+
+
+def _count_finished_commands(commands: Sequence[Command], start: int) -> int:
+    """Return the index of the first unfinished command at or after `start`."""
+    index = start
+    while index < len(commands) and commands[index].status in _FINAL_COMMAND_STATUSES:
+        index += 1
+    return index
+
+
+def _replace_commands_from(
+    connection: sqlalchemy.engine.Connection,
+    run_id: str,
+    commands: Sequence[Command],
+    start_index: int,
+) -> None:
+    """Replace every stored command from `start_index` on with `commands`."""
+    connection.execute(
+        sqlalchemy.delete(run_command_table).where(
+            run_command_table.c.run_id == run_id,
+            run_command_table.c.index_in_run >= start_index,
+        )
+    )
+    insert_command = sqlalchemy.insert(run_command_table)
+    for batch_start in range(0, len(commands), _COMMAND_INSERT_BATCH_SIZE):
+        batch = commands[batch_start : batch_start + _COMMAND_INSERT_BATCH_SIZE]
+        connection.execute(
+            insert_command,
+            [
+                {
+                    "run_id": run_id,
+                    "index_in_run": command_index,
+                    "command_id": command.id,
+                    "command": pydantic_to_json(command),
+                }
+                for command_index, command in enumerate(
+                    batch, start=start_index + batch_start
+                )
+            ],
+        )
+
+
 # The columns that must be present in a row passed to _convert_row_to_run().
 _run_columns = [run_table.c.id, run_table.c.protocol_id, run_table.c.created_at]
 
@@ -4,7 +4,7 @@ import logging
 import paho.mqtt.client as mqtt
 from anyio import to_thread
 from fastapi import Depends
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 from enum import Enum
 
 from ..json_api import NotifyRefetchBody, NotifyUnsubscribeBody
@@ -32,6 +32,10 @@ class MQTT_QOS(Enum):
 class NotificationClient:
     """Methods for managing interactions with the MQTT broker.
 
+    The async publish methods skip a message if the same message on the same
+    topic is already waiting to be sent: clients that act on the waiting one
+    will see whatever the skipped one was about.
+
     Args:
         host: Address of the MQTT broker.
         port: Port used to communicate with the broker.
@@ -64,6 +68,14 @@ class NotificationClient:
         )
         self._client.on_connect = self._on_connect
         self._client.on_disconnect = self._on_disconnect
+        # (publish method, topic) of the messages waiting to be sent.
+        self._queued_publishes: Set[Tuple[Callable[[str], None], str]] = set()
+        self._duplicate_publishes_skipped = 0
+
+    @property
+    def duplicate_publishes_skipped(self) -> int:
+        """The number of async publishes skipped because they were already queued."""
+        return self._duplicate_publishes_skipped
 
     def connect(self) -> None:
         """Connect the client to the MQTT broker."""
@@ -86,7 +98,7 @@ class NotificationClient:
         Args:
             topic: The topic to publish the message on.
         """
-        await to_thread.run_sync(self.publish_advise_refetch, topic)
+        await self._publish_once_async(self.publish_advise_refetch, topic)
 
     async def publish_advise_unsubscribe_async(self, topic: str) -> None:
         """Asynchronously publish an unsubscribe message on a specific topic to the MQTT broker.
@@ -94,7 +106,33 @@ class NotificationClient:
         Args:
             topic: The topic to publish the message on.
         """
-        await to_thread.run_sync(self.publish_advise_unsubscribe, topic)
+        await self._publish_once_async(self.publish_advise_unsubscribe, topic)
+
+    async def _publish_once_async(
+        self, publish: Callable[[str], None], topic: str
+    ) -> None:
+        """Publish a message in a worker thread, unless it's already waiting to be sent."""
+        key = (publish, topic)
+        if key in self._queued_publishes:
+            self._duplicate_publishes_skipped += 1
+            return
+        self._queued_publishes.add(key)
+
+        started = False
+
+        def _publish() -> None:
+            nonlocal started
+            # From here on, a new publish on the topic can't be covered by
+            # this one, so it must queue its own message.
+            started = True
+            self._queued_publishes.discard(key)
+            publish(topic)
+
+        try:
+            await to_thread.run_sync(_publish)
+        finally:
+            if not started:
+                self._queued_publishes.discard(key)
 
     def publish_advise_refetch(
         self,
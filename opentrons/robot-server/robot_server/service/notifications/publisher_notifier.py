@@ -1,5 +1,6 @@
 """Provides an interface for alerting notification publishers to events and related lifecycle utilities."""
 import asyncio
+import logging
 from fastapi import Depends
 from typing import Optional, Callable, List, Awaitable, Union
 
@@ -11,14 +12,46 @@ from server_utils.fastapi_utils.app_state import (
 
 from opentrons.util.change_notifier import ChangeNotifier, ChangeNotifier_ts
 
+from robot_server.settings import get_settings
+
+log: logging.Logger = logging.getLogger(__name__)
+
 
 class PublisherNotifier:
-    """An interface that invokes notification callbacks whenever a generic notify event occurs."""
+    """An interface that invokes notification callbacks whenever a generic notify event occurs.
+
+    Events are coalesced: after an event, the notifier waits `coalesce_window`
+    seconds, so that the events that follow it within that window (e.g. from
+    a burst of commands) are handled together, and then invokes the callbacks
+    once, concurrently. The callbacks decide for themselves whether anything
+    they publish has changed since they last ran.
+
+    Args:
+        change_notifier: The change notifier that signals events.
+        coalesce_window: Seconds to gather events before invoking the callbacks.
+    """
 
-    def __init__(self, change_notifier: Union[ChangeNotifier, ChangeNotifier_ts]):
+    def __init__(
+        self,
+        change_notifier: Union[ChangeNotifier, ChangeNotifier_ts],
+        coalesce_window: float = 0,
+    ):
         self._change_notifier = change_notifier
+        self._coalesce_window = coalesce_window
         self._notifier: Optional[asyncio.Task[None]] = None
         self._callbacks: List[Callable[[], Awaitable[None]]] = []
+        self._events_received = 0
+        self._events_published = 0
+
+    @property
+    def events_received(self) -> int:
+        """The number of events that publishers have been notified of."""
+        return self._events_received
+
+    @property
+    def events_published(self) -> int:
+        """The number of times the callbacks have been invoked for events."""
+        return self._events_published
 
     def register_publish_callbacks(
         self, callbacks: List[Callable[[], Awaitable[None]]]
@@ -32,14 +65,32 @@ class PublisherNotifier:
 
     def _notify_publishers(self) -> None:
         """A generic notifier, alerting all `waiters` of a change."""
+        self._events_received += 1
         self._change_notifier.notify()
 
     async def _wait_for_event(self) -> None:
-        """Indefinitely wait for an event to occur, then invoke each callback."""
+        """Indefinitely wait for an event to occur, then invoke the callbacks.
+
+        Events that occur while waiting out the coalesce window are handled by
+        this invocation. Events that occur while the callbacks run are handled
+        by the next one.
+        """
         while True:
             await self._change_notifier.wait()
-            for callback in self._callbacks:
-                await callback()
+            if self._coalesce_window > 0:
+                await asyncio.sleep(self._coalesce_window)
+                self._change_notifier.clear()
+            self._events_published += 1
+            results = await asyncio.gather(
+                *(callback() for callback in self._callbacks),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    log.error(
+                        "Error publishing notification.",
+                        exc_info=(type(result), result, result.__traceback__),
+                    )
 
 
 _pe_publisher_notifier_accessor: AppStateAccessor[PublisherNotifier] = AppStateAccessor[
@@ -73,7 +124,8 @@ async def initialize_pe_publisher_notifier(app_state: AppState) -> None:
     Intended to be called just once, when the server starts up.
     """
     publisher_notifier: PublisherNotifier = PublisherNotifier(
-        change_notifier=ChangeNotifier()
+        change_notifier=ChangeNotifier(),
+        coalesce_window=get_settings().notification_coalesce_window,
     )
     _pe_publisher_notifier_accessor.set_on(app_state, publisher_notifier)
 
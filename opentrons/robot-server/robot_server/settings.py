@@ -94,5 +94,25 @@ class RobotServerSettings(BaseSettings):
         ),
     )
 
+    maximum_analysis_cache_size: int = Field(
+        default=100 * 1024 * 1024,
+        ge=0,
+        description=(
+            "The maximum total size, in bytes, of completed protocol analyses to keep"
+            " so that re-uploading the same protocol with the same run-time parameter"
+            " values doesn't analyze it again. 0 disables the cache."
+        ),
+    )
+
+    notification_coalesce_window: float = Field(
+        default=0.1,
+        ge=0,
+        description=(
+            "How long, in seconds, to gather protocol engine state changes before"
+            " checking whether to publish notifications about them. Changes within"
+            " the same window are published together. 0 checks after every change."
+        ),
+    )
+
     class Config:
         env_prefix = "OT_ROBOT_SERVER_"
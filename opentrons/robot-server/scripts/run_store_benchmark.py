@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark persisting run commands with RunStore.
+
+For each run length this reports how long it takes to store all of a run's
+commands when the run ends, first by rewriting every row one INSERT at a time
+(how RunStore used to do it), then with update_run_state(), and finally with
+update_run_state() after the run's commands were stored incrementally with
+insert_commands() while it was in progress.
+
+Usage: python scripts/run_store_benchmark.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List
+
+import sqlalchemy
+
+from opentrons.protocol_engine import EngineStatus, StateSummary
+from opentrons.protocol_engine import commands as pe_commands
+
+from robot_server.persistence.database import sql_engine_ctx
+from robot_server.persistence.pydantic import pydantic_to_json
+from robot_server.persistence.tables import metadata, run_command_table
+from robot_server.runs.run_store import RunStore
+
+
+_INCREMENTAL_INTERVAL = 500
+
+
+def _make_commands(count: int) -> List[pe_commands.Command]:
+    return [
+        pe_commands.WaitForResume(
+            id=f"command-{i}",
+            key=f"key-{i}",
+            status=pe_commands.CommandStatus.SUCCEEDED,
+            createdAt=datetime(year=2024, month=1, day=1),
+            params=pe_commands.WaitForResumeParams(message=f"message {i}"),
+            result=pe_commands.WaitForResumeResult(),
+        )
+        for i in range(count)
+    ]
+
+
+def _make_summary() -> StateSummary:
+    return StateSummary(
+        errors=[],
+        labware=[],
+        pipettes=[],
+        modules=[],
+        labwareOffsets=[],
+        status=EngineStatus.SUCCEEDED,
+        liquids=[],
+    )
+
+
+def _legacy_rewrite(
+    sql_engine: sqlalchemy.engine.Engine,
+    run_id: str,
+    commands: List[pe_commands.Command],
+) -> None:
+    with sql_engine.begin() as transaction:
+        transaction.execute(
+            sqlalchemy.delete(run_command_table).where(
+                run_command_table.c.run_id == run_id
+            )
+        )
+        insert_command = sqlalchemy.insert(run_command_table)
+        for command_index, command in enumerate(commands):
+            transaction.execute(
+                insert_command,
+                {
+                    "run_id": run_id,
+                    "index_in_run": command_index,
+                    "command_id": command.id,
+                    "command": pydantic_to_json(command),
+                },
+            )
+
+
+def _time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _benchmark(count: int, directory: Path) -> None:
+    commands = _make_commands(count)
+    summary = _make_summary()
+
+    with sql_engine_ctx(directory / f"benchmark-{count}.db") as sql_engine:
+        metadata.create_all(sql_engine)
+        subject = RunStore(sql_engine=sql_engine)
+        for run_id in ("legacy", "full", "incremental"):
+            subject.insert(
+                run_id=run_id,
+                protocol_id=None,
+                created_at=datetime.now(tz=timezone.utc),
+            )
+
+        legacy = _time(lambda: _legacy_rewrite(sql_engine, "legacy", commands))
+
+        full = _time(
+            lambda: subject.update_run_state(
+                run_id="full",
+                summary=summary,
+                commands=commands,
+                run_time_parameters=[],
+            )
+        )
+
+        during_run = 0.0
+        for end in range(_INCREMENTAL_INTERVAL, count, _INCREMENTAL_INTERVAL):
+            during_run += _time(
+                lambda: subject.insert_commands(
+                    run_id="incremental",
+                    commands=commands[end - _INCREMENTAL_INTERVAL : end],
+                    start_index=end - _INCREMENTAL_INTERVAL,
+                )
+            )
+        at_end = _time(
+            lambda: subject.update_run_state(
+                run_id="incremental",
+                summary=summary,
+                commands=commands,
+                run_time_parameters=[],
+            )
+        )
+
+    print(
+        f"{count:>7} commands: "
+        f"legacy rewrite {legacy:7.3f}s | "
+        f"update_run_state {full:7.3f}s | "
+        f"incremental {during_run:7.3f}s during run, {at_end:7.3f}s at end"
+    )
+
+
+def main() -> None:
+    """Run the benchmark for each requested run length."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="The run lengths, in commands, to benchmark.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            _benchmark(count, Path(directory))
+
+
+if __name__ == "__main__":
+    main()
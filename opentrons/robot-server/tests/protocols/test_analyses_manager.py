@@ -1,10 +1,10 @@
 """Tests for the Analyses Manager interface."""
 import pytest
-from decoy import Decoy
+from decoy import Decoy, matchers
 from datetime import datetime
 from pathlib import Path
 
-from opentrons import protocol_runner
+from opentrons import protocol_reader, protocol_runner
 from opentrons.protocol_engine.types import BooleanParameter
 from opentrons.protocol_reader import ProtocolSource, JsonProtocolConfig
 from opentrons_shared_data.robot.dev_types import RobotType
@@ -12,9 +12,15 @@ from opentrons_shared_data.robot.dev_types import RobotType
 from robot_server.protocols import protocol_analyzer
 from robot_server.protocols.protocol_models import ProtocolKind
 from robot_server.protocols.analyses_manager import AnalysesManager
+from robot_server.protocols.analysis_cache import (
+    AnalysisCache,
+    get_analysis_cache_key,
+)
 from robot_server.protocols.analysis_models import (
+    AnalysisResult,
     AnalysisSummary,
     AnalysisStatus,
+    CompletedAnalysis,
     PendingAnalysis,
 )
 from robot_server.protocols.analysis_store import AnalysisStore
@@ -43,6 +49,16 @@ def patch_mock_create_protocol_analyzer(
     monkeypatch.setattr(protocol_analyzer, "create_protocol_analyzer", mock)
 
 
+@pytest.fixture(autouse=True)
+async def patch_mock_extract_labware_definitions(
+    decoy: Decoy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Replace protocol_reader.extract_labware_definitions() with a mock."""
+    mock = decoy.mock(func=protocol_reader.extract_labware_definitions)
+    decoy.when(await mock(matchers.Anything())).then_return([])
+    monkeypatch.setattr(protocol_reader, "extract_labware_definitions", mock)
+
+
 @pytest.fixture(autouse=True)
 def patch_mock_create_simulating_runner(
     decoy: Decoy, monkeypatch: pytest.MonkeyPatch
@@ -183,3 +199,207 @@ async def test_rtp_validation_error_in_start_analysis(
             run_time_parameters=[],
         )
     )
+
+
+@pytest.fixture
+def analysis_cache(decoy: Decoy) -> AnalysisCache:
+    """Get a mocked out AnalysisCache."""
+    return decoy.mock(cls=AnalysisCache)
+
+
+@pytest.fixture
+def caching_subject(
+    analysis_store: AnalysisStore,
+    task_runner: TaskRunner,
+    analysis_cache: AnalysisCache,
+) -> AnalysesManager:
+    """Get an Analyses Manager with an analysis cache."""
+    return AnalysesManager(
+        analysis_store=analysis_store,
+        task_runner=task_runner,
+        analysis_cache=analysis_cache,
+    )
+
+
+@pytest.fixture
+def protocol_resource() -> ProtocolResource:
+    """Get a protocol resource to analyze."""
+    return ProtocolResource(
+        protocol_id="protocol-id",
+        created_at=datetime(year=2024, month=6, day=6),
+        source=ProtocolSource(
+            directory=Path("/dev/null"),
+            main_file=Path("/dev/null/abc.json"),
+            config=JsonProtocolConfig(schema_version=123),
+            files=[],
+            metadata={},
+            robot_type="OT-3 Standard",
+            content_hash="abc123",
+        ),
+        protocol_key="dummy-data-111",
+        protocol_kind=ProtocolKind.STANDARD.value,
+    )
+
+
+async def test_start_analysis_from_cache(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    task_runner: TaskRunner,
+    analysis_cache: AnalysisCache,
+    protocol_resource: ProtocolResource,
+    caching_subject: AnalysesManager,
+) -> None:
+    """It should complete the analysis right away from a cached analysis."""
+    bool_parameter = BooleanParameter(
+        displayName="Foo", variableName="Bar", default=True, value=False
+    )
+    cached_analysis = CompletedAnalysis(
+        id="old-analysis-id",
+        status=AnalysisStatus.COMPLETED,
+        result=AnalysisResult.OK,
+        robotType="OT-3 Standard",
+        runTimeParameters=[bool_parameter],
+        pipettes=[],
+        labware=[],
+        modules=[],
+        commands=[],
+        errors=[],
+        liquids=[],
+    )
+    cache_key = get_analysis_cache_key(
+        protocol_source=protocol_resource.source,
+        run_time_param_values={"Bar": False},
+        labware_definitions=[],
+    )
+    decoy.when(await analysis_cache.get(cache_key)).then_return(cached_analysis)
+
+    result = await caching_subject.start_analysis(
+        analysis_id="analysis-id",
+        protocol_resource=protocol_resource,
+        run_time_param_values={"Bar": False},
+    )
+
+    assert result == AnalysisSummary(
+        id="analysis-id",
+        status=AnalysisStatus.COMPLETED,
+        runTimeParameters=[bool_parameter],
+    )
+    decoy.verify(
+        analysis_store.add_pending(
+            protocol_id="protocol-id", analysis_id="analysis-id"
+        ),
+        await analysis_store.update(
+            analysis_id="analysis-id",
+            robot_type="OT-3 Standard",
+            run_time_parameters=[bool_parameter],
+            commands=[],
+            labware=[],
+            modules=[],
+            pipettes=[],
+            errors=[],
+            liquids=[],
+        ),
+    )
+    decoy.verify(
+        protocol_analyzer.create_protocol_analyzer(
+            analysis_store=analysis_store,
+            protocol_resource=protocol_resource,
+        ),
+        times=0,
+    )
+
+
+@pytest.mark.parametrize("force_reanalyze", [True, False])
+async def test_start_analysis_and_cache(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    task_runner: TaskRunner,
+    analysis_cache: AnalysisCache,
+    protocol_resource: ProtocolResource,
+    caching_subject: AnalysesManager,
+    force_reanalyze: bool,
+) -> None:
+    """It should analyze and cache the result on a cache miss or forced reanalysis."""
+    cache_key = get_analysis_cache_key(
+        protocol_source=protocol_resource.source,
+        run_time_param_values={},
+        labware_definitions=[],
+    )
+    analyzer = decoy.mock(cls=protocol_analyzer.ProtocolAnalyzer)
+    runner = decoy.mock(cls=protocol_runner.JsonRunner)
+    decoy.when(await analysis_cache.get(cache_key)).then_return(
+        None if not force_reanalyze else decoy.mock(cls=CompletedAnalysis)
+    )
+    decoy.when(
+        protocol_analyzer.create_protocol_analyzer(
+            analysis_store=analysis_store,
+            protocol_resource=protocol_resource,
+        )
+    ).then_return(analyzer)
+    decoy.when(
+        analysis_store.add_pending(
+            protocol_id="protocol-id",
+            analysis_id="analysis-id",
+        )
+    ).then_return(PendingAnalysis(id="analysis-id"))
+    decoy.when(await analyzer.load_runner(run_time_param_values={})).then_return(runner)
+    decoy.when(runner.run_time_parameters).then_return([])
+
+    result = await caching_subject.start_analysis(
+        analysis_id="analysis-id",
+        protocol_resource=protocol_resource,
+        run_time_param_values={},
+        force_reanalyze=force_reanalyze,
+    )
+
+    assert result == AnalysisSummary(
+        id="analysis-id",
+        status=AnalysisStatus.PENDING,
+        runTimeParameters=[],
+    )
+    decoy.verify(
+        task_runner.run(
+            caching_subject._analyze_and_cache,
+            analyzer=analyzer,
+            runner=runner,
+            analysis_id="analysis-id",
+            run_time_parameters=[],
+            cache_key=cache_key,
+        )
+    )
+
+
+@pytest.mark.parametrize("ran_to_completion", [True, False])
+async def test_analyze_and_cache(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    analysis_cache: AnalysisCache,
+    caching_subject: AnalysesManager,
+    ran_to_completion: bool,
+) -> None:
+    """It should cache analyses that ran to completion, and only those."""
+    analyzer = decoy.mock(cls=protocol_analyzer.ProtocolAnalyzer)
+    runner = decoy.mock(cls=protocol_runner.JsonRunner)
+    decoy.when(
+        await analyzer.analyze(
+            runner=runner, analysis_id="analysis-id", run_time_parameters=[]
+        )
+    ).then_return(ran_to_completion)
+    decoy.when(await analysis_store.get_as_document("analysis-id")).then_return(
+        "analysis-document"
+    )
+
+    await caching_subject._analyze_and_cache(
+        analyzer=analyzer,
+        runner=runner,
+        analysis_id="analysis-id",
+        run_time_parameters=[],
+        cache_key="cache-key",
+    )
+
+    decoy.verify(
+        await analysis_cache.put(
+            key="cache-key", analysis_document="analysis-document"
+        ),
+        times=1 if ran_to_completion else 0,
+    )
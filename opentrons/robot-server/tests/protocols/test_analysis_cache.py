@@ -0,0 +1,184 @@
+"""Tests for the AnalysisCache interface."""
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pytest
+
+from opentrons.protocol_engine.types import RunTimeParamValuesType
+from opentrons.protocol_reader import JsonProtocolConfig, ProtocolSource
+from opentrons.protocols.models import LabwareDefinition
+from opentrons_shared_data.labware import load_definition
+from opentrons_shared_data.robot.dev_types import RobotType
+
+from robot_server.persistence.pydantic import pydantic_to_json
+from robot_server.protocols.analysis_cache import (
+    AnalysisCache,
+    get_analysis_cache_key,
+)
+from robot_server.protocols.analysis_models import (
+    AnalysisResult,
+    AnalysisStatus,
+    CompletedAnalysis,
+)
+
+
+def _make_source(
+    content_hash: str = "abc123", robot_type: RobotType = "OT-3 Standard"
+) -> ProtocolSource:
+    return ProtocolSource(
+        directory=Path("/dev/null"),
+        main_file=Path("/dev/null/abc.json"),
+        config=JsonProtocolConfig(schema_version=123),
+        files=[],
+        metadata={},
+        robot_type=robot_type,
+        content_hash=content_hash,
+    )
+
+
+def _make_analysis(analysis_id: str) -> CompletedAnalysis:
+    return CompletedAnalysis(
+        id=analysis_id,
+        status=AnalysisStatus.COMPLETED,
+        result=AnalysisResult.OK,
+        robotType="OT-3 Standard",
+        pipettes=[],
+        labware=[],
+        modules=[],
+        commands=[],
+        errors=[],
+        liquids=[],
+    )
+
+
+@pytest.mark.parametrize(
+    ("content_hash", "robot_type", "rtp_values", "expect_same"),
+    [
+        ("abc123", "OT-3 Standard", {"vol": 123}, True),
+        ("def456", "OT-3 Standard", {"vol": 123}, False),
+        ("abc123", "OT-2 Standard", {"vol": 123}, False),
+        ("abc123", "OT-3 Standard", {"vol": 456}, False),
+        ("abc123", "OT-3 Standard", None, False),
+    ],
+)
+def test_get_analysis_cache_key(
+    content_hash: str,
+    robot_type: RobotType,
+    rtp_values: Optional[RunTimeParamValuesType],
+    expect_same: bool,
+) -> None:
+    """It should give the same key only for the same files, robot, and values."""
+    key = get_analysis_cache_key(
+        protocol_source=_make_source(),
+        run_time_param_values={"vol": 123},
+        labware_definitions=[],
+    )
+    other_key = get_analysis_cache_key(
+        protocol_source=_make_source(content_hash=content_hash, robot_type=robot_type),
+        run_time_param_values=rtp_values,
+        labware_definitions=[],
+    )
+    assert (key == other_key) is expect_same
+
+
+def test_get_analysis_cache_key_labware_definitions() -> None:
+    """It should give a different key when a custom labware definition changes."""
+    definition = LabwareDefinition.parse_obj(
+        load_definition("opentrons_96_tiprack_300ul", 1)
+    )
+    changed_definition = definition.copy(deep=True)
+    changed_definition.metadata.displayName = "Changed"
+
+    def get_key(labware_definitions: List[LabwareDefinition]) -> str:
+        return get_analysis_cache_key(
+            protocol_source=_make_source(),
+            run_time_param_values=None,
+            labware_definitions=labware_definitions,
+        )
+
+    assert get_key([definition]) == get_key([definition.copy(deep=True)])
+    assert get_key([definition]) != get_key([changed_definition])
+    assert get_key([definition]) != get_key([])
+
+
+@pytest.mark.parametrize(
+    ("value", "other_value", "expect_same"),
+    [
+        (5, 5.0, True),
+        (2.5, 2.5, True),
+        (1, 1.0, False),
+        (0, 0.0, False),
+        (True, 1, False),
+        ("5", 5, False),
+    ],
+)
+def test_get_analysis_cache_key_normalizes_numbers(
+    value: Union[int, float, bool, str],
+    other_value: Union[int, float, bool, str],
+    expect_same: bool,
+) -> None:
+    """It should give the same key to values that the analysis treats the same."""
+    key = get_analysis_cache_key(
+        protocol_source=_make_source(),
+        run_time_param_values={"param": value},
+        labware_definitions=[],
+    )
+    other_key = get_analysis_cache_key(
+        protocol_source=_make_source(),
+        run_time_param_values={"param": other_value},
+        labware_definitions=[],
+    )
+    assert (key == other_key) is expect_same
+
+
+async def test_get_put(tmp_path: Path) -> None:
+    """It should return what was put, and nothing for unknown keys."""
+    subject = AnalysisCache(directory=tmp_path / "cache", max_size=1024 * 1024)
+    analysis = _make_analysis("analysis-id")
+
+    assert await subject.get("key") is None
+
+    await subject.put("key", pydantic_to_json(analysis))
+
+    assert await subject.get("key") == analysis
+    assert await subject.get("other-key") is None
+
+
+async def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """It should delete the least recently used entries to stay within its size."""
+    document = pydantic_to_json(_make_analysis("analysis-id"))
+    subject = AnalysisCache(directory=tmp_path, max_size=2 * len(document))
+
+    await subject.put("key-1", document)
+    await subject.put("key-2", document)
+    os.utime(tmp_path / "key-1.json", (1000, 1000))
+    os.utime(tmp_path / "key-2.json", (2000, 2000))
+    # Reading key-1 makes key-2 the least recently used.
+    assert await subject.get("key-1") is not None
+
+    await subject.put("key-3", document)
+
+    assert await subject.get("key-1") is not None
+    assert await subject.get("key-2") is None
+    assert await subject.get("key-3") is not None
+
+
+async def test_skips_oversized_analysis(tmp_path: Path) -> None:
+    """It should not store an analysis bigger than the whole cache."""
+    document = pydantic_to_json(_make_analysis("analysis-id"))
+    subject = AnalysisCache(directory=tmp_path, max_size=len(document) - 1)
+
+    await subject.put("key", document)
+
+    assert await subject.get("key") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_discards_corrupt_entry(tmp_path: Path) -> None:
+    """It should treat an entry that can't be parsed as missing, and delete it."""
+    subject = AnalysisCache(directory=tmp_path, max_size=1024 * 1024)
+    (tmp_path / "key.json").write_text("not an analysis")
+
+    assert await subject.get("key") is None
+    assert not (tmp_path / "key.json").exists()
@@ -710,6 +710,7 @@ async def test_create_existing_protocol_with_no_previous_analysis(
             analysis_id="analysis-id",
             protocol_resource=stored_protocol_resource,
             run_time_param_values={"vol": 123, "dry_run": True, "mount": "left"},
+            force_reanalyze=False,
         )
     ).then_return(pending_analysis)
 
@@ -831,6 +832,7 @@ async def test_create_existing_protocol_with_different_run_time_params(
             analysis_id="analysis-id",
             protocol_resource=stored_protocol_resource,
             run_time_param_values={"vol": 123, "dry_run": True, "mount": "left"},
+            force_reanalyze=False,
         )
     ).then_return(pending_summary)
 
@@ -1481,6 +1483,7 @@ async def test_update_protocol_analyses_with_new_rtp_values(
             analysis_id="analysis-id-2",
             protocol_resource=stored_protocol_resource,
             run_time_param_values=rtp_values,
+            force_reanalyze=False,
         )
     ).then_return(
         AnalysisSummary(
@@ -1558,6 +1561,7 @@ async def test_update_protocol_analyses_with_forced_reanalysis(
             analysis_id="analysis-id-2",
             protocol_resource=stored_protocol_resource,
             run_time_param_values={},
+            force_reanalyze=True,
         )
     ).then_return(AnalysisSummary(id="analysis-id-2", status=AnalysisStatus.PENDING))
 
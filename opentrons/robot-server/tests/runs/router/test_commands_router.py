@@ -1,4 +1,6 @@
 """Tests for the /runs/.../commands routes."""
+import json
+
 import pytest
 
 from datetime import datetime
@@ -23,12 +25,16 @@ from robot_server.runs.command_models import (
 )
 from robot_server.runs.run_store import CommandNotFoundError, RunStore
 from robot_server.runs.engine_store import EngineStore
-from robot_server.runs.run_data_manager import RunDataManager
+from robot_server.runs.run_data_manager import (
+    RunDataManager,
+    PreSerializedCommandsNotAvailableError,
+)
 from robot_server.runs.run_models import RunCommandSummary, RunNotFoundError
 from robot_server.runs.router.commands_router import (
     create_run_command,
     get_run_command,
     get_run_commands,
+    get_run_commands_as_pre_serialized_list,
     get_current_run_from_url,
 )
 
@@ -493,3 +499,72 @@ async def test_get_run_command_missing(
     assert exc_info.value.content["errors"][0]["detail"] == matchers.StringMatching(
         "oh no"
     )
+
+
+async def test_get_run_commands_as_pre_serialized_list(
+    decoy: Decoy,
+    mock_run_data_manager: RunDataManager,
+) -> None:
+    """It should stream the commands as a JSON list of strings."""
+    decoy.when(
+        mock_run_data_manager.get_all_commands_as_preserialized_batches("run-id")
+    ).then_return(
+        iter([['{"id": "command-1"}', '{"id": "command-2"}'], ['{"id": "command-3"}']])
+    )
+
+    result = await get_run_commands_as_pre_serialized_list(
+        runId="run-id",
+        run_data_manager=mock_run_data_manager,
+    )
+    body = "".join([chunk async for chunk in result.body_iterator])  # type: ignore[misc]
+
+    assert result.status_code == 200
+    assert json.loads(body) == {
+        "data": ['{"id": "command-1"}', '{"id": "command-2"}', '{"id": "command-3"}'],
+        "meta": {"cursor": 0, "totalLength": 3},
+    }
+
+
+async def test_get_run_commands_as_pre_serialized_list_empty(
+    decoy: Decoy,
+    mock_run_data_manager: RunDataManager,
+) -> None:
+    """It should stream an empty list if the run has no commands."""
+    decoy.when(
+        mock_run_data_manager.get_all_commands_as_preserialized_batches("run-id")
+    ).then_return(iter([]))
+
+    result = await get_run_commands_as_pre_serialized_list(
+        runId="run-id",
+        run_data_manager=mock_run_data_manager,
+    )
+    body = "".join([chunk async for chunk in result.body_iterator])  # type: ignore[misc]
+
+    assert json.loads(body) == {"data": [], "meta": {"cursor": 0, "totalLength": 0}}
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected_status"),
+    [
+        (RunNotFoundError("oh no"), 404),
+        (PreSerializedCommandsNotAvailableError("oh no"), 503),
+    ],
+)
+async def test_get_run_commands_as_pre_serialized_list_errors(
+    decoy: Decoy,
+    mock_run_data_manager: RunDataManager,
+    exception: Exception,
+    expected_status: int,
+) -> None:
+    """It should raise before streaming if the commands are not available."""
+    decoy.when(
+        mock_run_data_manager.get_all_commands_as_preserialized_batches("run-id")
+    ).then_raise(exception)
+
+    with pytest.raises(ApiError) as exc_info:
+        await get_run_commands_as_pre_serialized_list(
+            runId="run-id",
+            run_data_manager=mock_run_data_manager,
+        )
+
+    assert exc_info.value.status_code == expected_status
@@ -1,4 +1,5 @@
 """Tests for RunController."""
+import asyncio
 from typing import List
 
 import pytest
@@ -6,6 +7,7 @@ from datetime import datetime
 from decoy import Decoy, matchers
 
 from opentrons.protocol_engine import (
+    CommandSlice,
     EngineStatus,
     StateSummary,
     commands as pe_commands,
@@ -192,6 +194,88 @@ async def test_create_play_action_to_start(
     )
 
 
+async def test_persist_commands_during_run(
+    decoy: Decoy,
+    mock_engine_store: EngineStore,
+    mock_run_store: RunStore,
+    mock_task_runner: TaskRunner,
+    mock_runs_publisher: RunsPublisher,
+    engine_state_summary: StateSummary,
+    run_time_parameters: List[RunTimeParameter],
+    protocol_commands: List[pe_commands.Command],
+    run_id: str,
+) -> None:
+    """It should store newly finished commands while the run is in progress."""
+    subject = RunController(
+        run_id=run_id,
+        engine_store=mock_engine_store,
+        run_store=mock_run_store,
+        task_runner=mock_task_runner,
+        runs_publisher=mock_runs_publisher,
+        command_persist_interval=0.01,
+    )
+    decoy.when(mock_engine_store.run_was_started()).then_return(False)
+    command_count = len(protocol_commands)
+    decoy.when(
+        mock_engine_store.get_command_slice(cursor=0, length=matchers.IsA(int))
+    ).then_return(
+        CommandSlice(commands=protocol_commands, cursor=0, total_length=command_count)
+    )
+    # Past the end, the slice is clamped to the last command.
+    decoy.when(
+        mock_engine_store.get_command_slice(
+            cursor=command_count, length=matchers.IsA(int)
+        )
+    ).then_return(
+        CommandSlice(
+            commands=protocol_commands[-1:],
+            cursor=command_count - 1,
+            total_length=command_count,
+        )
+    )
+    decoy.when(
+        mock_run_store.insert_commands(
+            run_id=run_id, commands=protocol_commands, start_index=0
+        )
+    ).then_return(command_count)
+
+    async def _run(deck_configuration: object) -> RunResult:
+        await asyncio.sleep(0.1)
+        return RunResult(
+            commands=protocol_commands,
+            state_summary=engine_state_summary,
+            parameters=run_time_parameters,
+        )
+
+    decoy.when(await mock_engine_store.run(deck_configuration=[])).then_do(_run)
+
+    subject.create_action(
+        action_id="some-action-id",
+        action_type=RunActionType.PLAY,
+        created_at=datetime(year=2021, month=1, day=1),
+        action_payload=[],
+    )
+    background_task_captor = matchers.Captor()
+    decoy.verify(mock_task_runner.run(background_task_captor, deck_configuration=[]))
+    await background_task_captor.value(deck_configuration=[])
+
+    decoy.verify(
+        mock_run_store.insert_commands(
+            run_id=run_id, commands=matchers.Anything(), start_index=matchers.IsA(int)
+        ),
+        times=1,
+    )
+    decoy.verify(
+        mock_run_store.update_run_state(
+            run_id=run_id,
+            summary=engine_state_summary,
+            commands=protocol_commands,
+            run_time_parameters=run_time_parameters,
+        ),
+        times=1,
+    )
+
+
 def test_create_pause_action(
     decoy: Decoy,
     mock_engine_store: EngineStore,
@@ -934,34 +934,31 @@ def test_get_command_from_db_command_not_found(
         subject.get_command("run-id", "command-id")
 
 
-def test_get_all_commands_as_preserialized_list(
+def test_get_all_commands_as_preserialized_batches(
     decoy: Decoy,
     subject: RunDataManager,
     mock_run_store: RunStore,
     mock_engine_store: EngineStore,
 ) -> None:
-    """It should return the pre-serialized commands list."""
+    """It should return the pre-serialized commands in batches."""
+    batches = iter([['{"id": command-1}', '{"id": command-2}']])
     decoy.when(mock_engine_store.current_run_id).then_return(None)
     decoy.when(
-        mock_run_store.get_all_commands_as_preserialized_list("run-id")
-    ).then_return(['{"id": command-1}', '{"id": command-2}'])
-    assert subject.get_all_commands_as_preserialized_list("run-id") == [
-        '{"id": command-1}',
-        '{"id": command-2}',
-    ]
+        mock_run_store.get_all_commands_as_preserialized_batches("run-id")
+    ).then_return(batches)
+    assert subject.get_all_commands_as_preserialized_batches("run-id") is batches
 
 
-def test_get_all_commands_as_preserialized_list_errors_for_active_runs(
+def test_get_all_commands_as_preserialized_batches_errors_for_active_runs(
     decoy: Decoy,
     subject: RunDataManager,
-    mock_run_store: RunStore,
     mock_engine_store: EngineStore,
 ) -> None:
-    """It should raise an error when fetching pre-serialized commands list while run is active."""
+    """It should raise an error when fetching pre-serialized commands while run is active."""
     decoy.when(mock_engine_store.current_run_id).then_return("current-run-id")
     decoy.when(mock_engine_store.get_is_run_terminal()).then_return(False)
     with pytest.raises(PreSerializedCommandsNotAvailableError):
-        subject.get_all_commands_as_preserialized_list("current-run-id")
+        subject.get_all_commands_as_preserialized_batches("current-run-id")
 
 
 async def test_get_current_run_labware_definition(
@@ -260,6 +260,105 @@ def test_update_state_run_not_found(
         )
 
 
+def test_insert_commands(
+    subject: RunStore,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should store only the leading finished commands from the start index on."""
+    subject.insert(
+        run_id="run-id",
+        protocol_id=None,
+        created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
+    )
+    running_command = protocol_commands[1].copy(
+        update={"status": pe_commands.CommandStatus.RUNNING, "result": None}
+    )
+    in_progress = [protocol_commands[0], running_command, protocol_commands[2]]
+
+    assert (
+        subject.insert_commands(run_id="run-id", commands=in_progress, start_index=0)
+        == 1
+    )
+    assert (
+        subject.insert_commands(
+            run_id="run-id", commands=in_progress[1:], start_index=1
+        )
+        == 0
+    )
+    assert subject.get_commands_slice(
+        run_id="run-id", length=10, cursor=0
+    ).commands == [protocol_commands[0]]
+
+    assert (
+        subject.insert_commands(
+            run_id="run-id", commands=protocol_commands[1:], start_index=1
+        )
+        == 2
+    )
+    assert (
+        subject.get_commands_slice(run_id="run-id", length=10, cursor=0).commands
+        == protocol_commands
+    )
+
+
+def test_insert_commands_run_not_found(
+    subject: RunStore,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should raise if the run does not exist."""
+    with pytest.raises(RunNotFoundError, match="run-not-found"):
+        subject.insert_commands(
+            run_id="run-not-found", commands=protocol_commands, start_index=0
+        )
+
+
+def test_update_run_state_after_insert_commands(
+    subject: RunStore,
+    state_summary: StateSummary,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should keep stored finished commands and rewrite everything else."""
+    subject.insert(
+        run_id="run-id",
+        protocol_id=None,
+        created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
+    )
+    queued_command = protocol_commands[2].copy(
+        update={"status": pe_commands.CommandStatus.QUEUED, "result": None}
+    )
+    subject.update_run_state(
+        run_id="run-id",
+        summary=state_summary,
+        commands=[*protocol_commands[:2], queued_command],
+        run_time_parameters=[],
+    )
+    subject.insert_commands(
+        run_id="run-id", commands=protocol_commands[:1], start_index=0
+    )
+
+    subject.update_run_state(
+        run_id="run-id",
+        summary=state_summary,
+        commands=protocol_commands,
+        run_time_parameters=[],
+    )
+    assert (
+        subject.get_commands_slice(run_id="run-id", length=10, cursor=0).commands
+        == protocol_commands
+    )
+
+    subject.update_run_state(
+        run_id="run-id",
+        summary=state_summary,
+        commands=protocol_commands[1:],
+        run_time_parameters=[],
+    )
+    assert (
+        subject.get_commands_slice(run_id="run-id", length=10, cursor=0).commands
+        == protocol_commands[1:]
+    )
+
+
 def test_add_run(subject: RunStore) -> None:
     """It should be able to add a new run to the store."""
     result = subject.insert(
@@ -736,12 +835,14 @@ def test_get_commands_slice_run_not_found(subject: RunStore) -> None:
         subject.get_commands_slice(run_id="not-run-id", cursor=1, length=3)
 
 
-def test_get_all_commands_as_preserialized_list(
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 100])
+def test_get_all_commands_as_preserialized_batches(
     subject: RunStore,
     protocol_commands: List[pe_commands.Command],
     state_summary: StateSummary,
+    batch_size: int,
 ) -> None:
-    """It should get all commands stored in DB as a pre-serialized list."""
+    """It should get all commands stored in DB as pre-serialized batches."""
     subject.insert(
         run_id="run-id",
         protocol_id=None,
@@ -753,8 +854,13 @@ def test_get_all_commands_as_preserialized_list(
         commands=protocol_commands,
         run_time_parameters=[],
     )
-    result = subject.get_all_commands_as_preserialized_list(run_id="run-id")
-    assert result == [
+    batches = list(
+        subject.get_all_commands_as_preserialized_batches(
+            run_id="run-id", batch_size=batch_size
+        )
+    )
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    assert [command for batch in batches for command in batch] == [
         '{"id": "pause-1", "createdAt": "2021-01-01T00:00:00", "commandType": "waitForResume",'
         ' "key": "command-key", "status": "succeeded", "params": {"message": "hello world"}, "result": {}}',
         '{"id": "pause-2", "createdAt": "2022-02-02T00:00:00", "commandType": "waitForResume",'
@@ -762,3 +868,11 @@ def test_get_all_commands_as_preserialized_list(
         '{"id": "pause-3", "createdAt": "2023-03-03T00:00:00", "commandType": "waitForResume",'
         ' "key": "command-key", "status": "succeeded", "params": {"message": "sup world"}, "result": {}}',
     ]
+
+
+def test_get_all_commands_as_preserialized_batches_run_not_found(
+    subject: RunStore,
+) -> None:
+    """It should raise right away if the run does not exist."""
+    with pytest.raises(RunNotFoundError):
+        subject.get_all_commands_as_preserialized_batches(run_id="not-run-id")
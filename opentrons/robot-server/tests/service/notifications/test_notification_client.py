@@ -0,0 +1,44 @@
+"""Tests for the notification client."""
+import asyncio
+from typing import Any, Callable
+from unittest.mock import MagicMock, patch
+
+from robot_server.service.notifications import NotificationClient
+
+
+async def test_skip_duplicate_queued_publish() -> None:
+    """It should skip a publish that is already waiting to be sent."""
+    subject = NotificationClient()
+    subject._client = MagicMock()
+    release = asyncio.Event()
+
+    async def run_sync(func: Callable[[], Any]) -> Any:
+        """Hold the publish in the queue until released."""
+        await release.wait()
+        return func()
+
+    with patch(
+        "robot_server.service.notifications.notification_client.to_thread.run_sync",
+        new=run_sync,
+    ):
+        first = asyncio.create_task(subject.publish_advise_refetch_async("topic"))
+        other = asyncio.create_task(subject.publish_advise_refetch_async("other"))
+        unsubscribe = asyncio.create_task(
+            subject.publish_advise_unsubscribe_async("topic")
+        )
+        await asyncio.sleep(0)
+
+        await subject.publish_advise_refetch_async("topic")
+        assert subject.duplicate_publishes_skipped == 1
+
+        release.set()
+        await asyncio.gather(first, other, unsubscribe)
+
+        # Once sent, the same message should be published again.
+        await subject.publish_advise_refetch_async("topic")
+
+    published_topics = [
+        call.kwargs["topic"] for call in subject._client.publish.call_args_list
+    ]
+    assert published_topics == ["topic", "other", "topic", "topic"]
+    assert subject.duplicate_publishes_skipped == 1
@@ -45,31 +45,86 @@ async def test_wait_for_event() -> None:
     change_notifier = ChangeNotifier()
     publisher_notifier = PublisherNotifier(change_notifier)
 
-    callback_called = False
-    callback_2_called = False
+    callback_called = asyncio.Event()
+    callback_2_called = asyncio.Event()
 
     async def callback() -> None:
         """Mock callback."""
-        nonlocal callback_called
-        callback_called = True
+        callback_called.set()
 
     async def callback_2() -> None:
         """Mock callback."""
-        nonlocal callback_2_called
-        callback_2_called = True
+        callback_2_called.set()
 
     publisher_notifier.register_publish_callbacks([callback, callback_2])
 
-    async def trigger_callbacks() -> None:
-        """Mock trigger for callbacks."""
-        await asyncio.sleep(0.1)
-        change_notifier.notify()
+    await publisher_notifier._initialize()
+    await asyncio.sleep(0.1)
+    change_notifier.notify()
+
+    await asyncio.wait_for(callback_called.wait(), timeout=1)
+    await asyncio.wait_for(callback_2_called.wait(), timeout=1)
+
+    assert publisher_notifier._notifier is not None
+    publisher_notifier._notifier.cancel()
+
+
+async def test_coalesce_events() -> None:
+    """It should invoke the callbacks once for the events within the coalesce window."""
+    publisher_notifier = PublisherNotifier(ChangeNotifier(), coalesce_window=0.1)
+    calls = 0
+
+    async def callback() -> None:
+        """Mock callback."""
+        nonlocal calls
+        calls += 1
+
+    publisher_notifier.register_publish_callbacks([callback])
+    await publisher_notifier._initialize()
 
-    task = asyncio.create_task(publisher_notifier._initialize())
+    for _ in range(10):
+        publisher_notifier._notify_publishers()
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.3)
 
-    await asyncio.gather(trigger_callbacks(), task)
+    assert calls == 1
+    assert publisher_notifier.events_received == 10
+    assert publisher_notifier.events_published == 1
 
-    assert callback_called
-    assert callback_2_called
+    assert publisher_notifier._notifier is not None
+    publisher_notifier._notifier.cancel()
+
+
+async def test_invoke_callbacks_concurrently() -> None:
+    """It should run the callbacks concurrently, and each despite others failing."""
+    publisher_notifier = PublisherNotifier(ChangeNotifier())
+    both_running = asyncio.Event()
+    running = 0
+
+    async def callback() -> None:
+        """Mock callback that waits for the other callbacks to be running."""
+        nonlocal running
+        running += 1
+        if running == 2:
+            both_running.set()
+        await both_running.wait()
+
+    async def failing_callback() -> None:
+        """Mock callback that raises."""
+        raise RuntimeError("oh no")
+
+    publisher_notifier.register_publish_callbacks(
+        [callback, failing_callback, callback]
+    )
+    await publisher_notifier._initialize()
+    publisher_notifier._notify_publishers()
+
+    await asyncio.wait_for(both_running.wait(), timeout=1)
+
+    # It should keep handling events after a callback fails.
+    publisher_notifier._notify_publishers()
+    await asyncio.sleep(0.1)
+    assert publisher_notifier.events_published == 2
 
-    task.cancel()
+    assert publisher_notifier._notifier is not None
+    publisher_notifier._notifier.cancel()
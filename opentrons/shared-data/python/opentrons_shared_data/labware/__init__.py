@@ -2,20 +2,85 @@
 opentrons_shared_data.labware: types and functions for accessing labware defs
 """
 import json
-from typing import Any, Dict, NewType, TYPE_CHECKING
+import pickle
+import threading
+from typing import Any, Dict, NewType, Optional, TYPE_CHECKING
 
-from .. import load_shared_data
+from .. import get_shared_data_root, load_shared_data
+from .definition_index import (
+    INDEX_PATH,
+    index_key,
+    pickle_definition,
+    read_definition_index,
+)
 
 if TYPE_CHECKING:
     from .dev_types import LabwareDefinition
 
 Schema = NewType("Schema", Dict[str, Any])
 
+# Definitions that have been loaded in this process, pickled, by index_key().
+# Unpickling is several times faster than parsing JSON or deep-copying, and gives
+# every caller its own copy to modify.
+_loaded_definitions: Dict[str, bytes] = {}
+# The prebuilt index of bundled definitions, if there is one. Read on first use.
+_definition_index: Optional[Dict[str, bytes]] = None
+_definition_index_read = False
+_lock = threading.Lock()
+
+
+def _get_definition_index() -> Optional[Dict[str, bytes]]:
+    global _definition_index, _definition_index_read
+    if not _definition_index_read:
+        _definition_index = read_definition_index(get_shared_data_root() / INDEX_PATH)
+        _definition_index_read = True
+    return _definition_index
+
+
+def _get_pickled_definition(loadname: str, version: int) -> bytes:
+    key = index_key(loadname, version)
+    with _lock:
+        pickled = _loaded_definitions.get(key)
+        if pickled is not None:
+            return pickled
+        index = _get_definition_index()
+        if index is not None:
+            pickled = index.get(key)
+            if pickled is None:
+                raise FileNotFoundError(
+                    f"No labware definition {loadname} version {version}"
+                    " in the definition index."
+                )
+        else:
+            pickled = pickle_definition(
+                load_shared_data(f"labware/definitions/2/{loadname}/{version}.json")
+            )
+        _loaded_definitions[key] = pickled
+        return pickled
+
 
 def load_definition(loadname: str, version: int) -> "LabwareDefinition":
-    return json.loads(
-        load_shared_data(f"labware/definitions/2/{loadname}/{version}.json")
+    """Load a bundled labware definition.
+
+    Each definition is only read from disk once per process, and not at all if
+    the shared data includes a prebuilt index of definitions. Every call returns
+    a new copy of the definition.
+
+    :raises FileNotFoundError: If there is no such definition.
+    """
+    definition: "LabwareDefinition" = pickle.loads(
+        _get_pickled_definition(loadname, version)
     )
+    return definition
+
+
+def clear_definition_cache() -> None:
+    """Forget every loaded definition, so the next loads read them again."""
+    global _definition_index, _definition_index_read
+    with _lock:
+        _loaded_definitions.clear()
+        _definition_index = None
+        _definition_index_read = False
 
 
 def load_schema() -> Schema:
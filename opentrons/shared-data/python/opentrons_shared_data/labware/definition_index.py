@@ -0,0 +1,69 @@
+"""
+opentrons_shared_data.labware.definition_index: a prebuilt index of labware defs
+
+The index is a single file holding every bundled labware definition, already
+deserialized and pickled, so that loading a definition doesn't need to find,
+read, and parse its JSON file.
+
+This module only uses the standard library, so that setup.py can use it to
+build the index without importing the rest of the package.
+"""
+import json
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+INDEX_PATH = "labware/definitions/2_index.pickle"
+"""Where the index is, relative to the root of the shared data."""
+
+# Change this whenever the layout of the index changes, so that a stale index
+# is ignored instead of misread.
+_INDEX_FORMAT = 1
+_PICKLE_PROTOCOL = 4
+
+
+def index_key(loadname: str, version: int) -> str:
+    """Get the key that a definition is stored under in the index."""
+    return f"{loadname}/{version}"
+
+
+def pickle_definition(definition_bytes: bytes) -> bytes:
+    """Convert a definition from its JSON file's contents to how it's indexed."""
+    return pickle.dumps(json.loads(definition_bytes), protocol=_PICKLE_PROTOCOL)
+
+
+def build_definition_index(definitions_dir: Path, destination: Path) -> None:
+    """Build an index of all the labware definitions in a directory.
+
+    :param definitions_dir: The directory of version 2 labware definitions,
+        laid out as ``<loadName>/<version>.json``.
+    :param destination: The path of the index file to write.
+    """
+    definitions = {
+        index_key(path.parent.name, int(path.stem)): pickle_definition(
+            path.read_bytes()
+        )
+        for path in sorted(definitions_dir.glob("*/*.json"))
+    }
+    destination.write_bytes(
+        pickle.dumps(
+            {"format": _INDEX_FORMAT, "definitions": definitions},
+            protocol=_PICKLE_PROTOCOL,
+        )
+    )
+
+
+def read_definition_index(path: Path) -> Optional[Dict[str, bytes]]:
+    """Read an index written by :py:func:`build_definition_index`.
+
+    :returns: The pickled definitions by :py:func:`index_key`, or ``None`` if
+        there is no index or it's in a format this version doesn't understand.
+    """
+    try:
+        index = pickle.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    if not isinstance(index, dict) or index.get("format") != _INDEX_FORMAT:
+        return None
+    definitions: Dict[str, bytes] = index["definitions"]
+    return definitions
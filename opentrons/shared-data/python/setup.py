@@ -1,3 +1,4 @@
+import importlib.util
 import json
 import os
 import sys
@@ -58,6 +59,25 @@ def _minimize_and_write_json(data_file: Path, target_file: Path) -> None:
     target_file.write_text(contents, encoding="utf-8")
 
 
+def _write_labware_definition_index(package_data_dir: Path) -> None:
+    definitions_dir = Path(DATA_ROOT) / "labware" / "definitions" / "2"
+    if not definitions_dir.is_dir():
+        # Building from an sdist, which already has the index.
+        return
+    # Load the index builder on its own, since the package that contains it
+    # may not be importable while it's being built.
+    spec = importlib.util.spec_from_file_location(
+        "definition_index",
+        os.path.join(HERE, "opentrons_shared_data", "labware", "definition_index.py"),
+    )
+    assert spec is not None and spec.loader is not None
+    definition_index = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(definition_index)
+    definition_index.build_definition_index(
+        definitions_dir, package_data_dir / definition_index.INDEX_PATH
+    )
+
+
 class SDistWithData(sdist.sdist):
     description = sdist.sdist.description + " Also, include data files."
 
@@ -74,6 +94,11 @@ class SDistWithData(sdist.sdist):
                 args=(data_file, target_file),
                 msg=f"copying and minimizing {data_file} -> {target_file}",
             )
+        self.execute(
+            _write_labware_definition_index,
+            args=(Path(base_dir) / "opentrons_shared_data" / DEST_BASE_PATH,),
+            msg="writing labware definition index",
+        )
 
         super().make_release_tree(base_dir, files)
 
@@ -103,6 +128,18 @@ class BuildWithData(build_py.build_py):
         )
         return files
 
+    def run(self) -> None:
+        super().run()
+        package_data_dir = (
+            Path(self.build_lib) / "opentrons_shared_data" / DEST_BASE_PATH
+        )
+        self.mkpath(str(package_data_dir / "labware" / "definitions"))
+        self.execute(
+            _write_labware_definition_index,
+            args=(package_data_dir,),
+            msg="writing labware definition index",
+        )
+
 
 def get_version():
     buildno = os.getenv("BUILD_NUMBER")
@@ -0,0 +1,71 @@
+import json
+import pickle
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from opentrons_shared_data import get_shared_data_root, load_shared_data
+from opentrons_shared_data import labware
+from opentrons_shared_data.labware import clear_definition_cache, load_definition
+from opentrons_shared_data.labware.definition_index import (
+    build_definition_index,
+    read_definition_index,
+)
+
+from . import get_ot_defs
+
+
+@pytest.fixture(autouse=True)
+def _clear_definition_cache() -> Iterator[None]:
+    clear_definition_cache()
+    yield
+    clear_definition_cache()
+
+
+def _read_definition_file(loadname: str, version: int) -> object:
+    return json.loads(
+        load_shared_data(f"labware/definitions/2/{loadname}/{version}.json")
+    )
+
+
+def test_load_definition_returns_copies() -> None:
+    loadname, version = get_ot_defs()[0]
+    first = load_definition(loadname, version)
+    first["parameters"]["loadName"] = "modified"
+
+    second = load_definition(loadname, version)
+
+    assert second == _read_definition_file(loadname, version)
+    assert second is not first
+
+
+def test_load_definition_missing() -> None:
+    with pytest.raises(FileNotFoundError):
+        load_definition("not_a_real_labware", 1)
+
+
+def test_load_definition_from_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    build_definition_index(
+        get_shared_data_root() / "labware" / "definitions" / "2",
+        tmp_path / "index.pickle",
+    )
+    monkeypatch.setattr(labware, "INDEX_PATH", tmp_path / "index.pickle")
+    # If the index is used, no definition files should be read.
+    monkeypatch.setattr(labware, "load_shared_data", None)
+
+    for loadname, version in get_ot_defs():
+        assert load_definition(loadname, version) == _read_definition_file(
+            loadname, version
+        )
+    with pytest.raises(FileNotFoundError):
+        load_definition("not_a_real_labware", 1)
+
+
+def test_read_definition_index_ignores_other_formats(tmp_path: Path) -> None:
+    assert read_definition_index(tmp_path / "missing.pickle") is None
+
+    (tmp_path / "old.pickle").write_bytes(pickle.dumps({"format": 0}))
+    assert read_definition_index(tmp_path / "old.pickle") is None